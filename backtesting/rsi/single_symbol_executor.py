@@ -10,7 +10,7 @@ from backtesting.rsi.excel import save_to_excel
 from backtesting.rsi.strategy import run_strategy_for_symbol_internal
 from infra.telegram_logging_handler import app_logger
 from source_repository import fetch_symbols
-from technical_analysis.repositories.rsi_repository import get_candles_with_rsi
+from technical_analysis.repositories.rsi_repository import get_candles_with_rsi_frame
 
 
 if __name__ == "__main__":
@@ -33,8 +33,12 @@ if __name__ == "__main__":
         five_years_ago = datetime.now(UTC) - timedelta(days=5 * 365)
 
         # Assuming you have a valid connection and symbol_id
-        candles_data = get_candles_with_rsi(conn, filtered_symbols[0].symbol_id, five_years_ago)
-        if candles_data is None:
+        candles_data = get_candles_with_rsi_frame(
+            conn,
+            filtered_symbols[0].symbol_id,
+            five_years_ago,
+        ).reset_index()
+        if candles_data.empty:
             app_logger.error(f"No candle data found for symbol {filtered_symbols[0].symbol_name}")
             sys.exit(1)
 
@@ -15,7 +15,7 @@ if TYPE_CHECKING:
 
 def run_backtest(  # noqa: PLR0915
     symbol: Symbol,
-    candles_data: list[dict],
+    candles_data: pd.DataFrame | list[dict],
     rsi_value: int,
     tp_value: Decimal,
     sl_value: Decimal,
@@ -130,7 +130,7 @@ def run_backtest(  # noqa: PLR0915
 
 
 def run_strategy_for_symbol_internal(
-    candles_data: list[dict],
+    candles_data: pd.DataFrame | list[dict],
     symbol: Symbol,
     rsi_value: int = 30,
     tp_value: Decimal = Decimal("1.1"),
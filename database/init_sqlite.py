@@ -8,6 +8,201 @@ import sqlite3
 from datetime import UTC, datetime
 from pathlib import Path
 
+from shared_code.epoch import EPOCH_COLUMN
+
+
+# Time series tables -> ISO text column their integer epoch column is computed from
+EPOCH_TIMESTAMP_SOURCES = {
+    "HourlyCandles": "EndDate",
+    "FifteenMinCandles": "EndDate",
+    "DailyCandles": "EndDate",
+    "MovingAverages": "IndicatorDate",
+    "MACD": "IndicatorDate",
+    "VolumeHistory": "IndicatorDate",
+    "PriceRange": "IndicatorDate",
+    "MarketCapHistory": "IndicatorDate",
+    "OpenInterest": "IndicatorDate",
+    "FundingRate": "IndicatorDate",
+    "OrderBookMetrics": "IndicatorDate",
+    "CumulativeVolumeDelta": "IndicatorDate",
+    "CVDHourlySnapshots": "HourTimestamp",
+}
+
+# RSI tables are read by joining on the candle ID; these indexes cover that join
+RSI_COVERING_INDEXES = {
+    "RSI": "DailyCandleID",
+    "HourlyRSI": "HourlyCandleID",
+    "FifteenMinRSI": "FifteenMinCandleID",
+}
+
+
+def _epoch_expression(column: str) -> str:
+    """Return the SQL computing whole epoch seconds from an ISO text column.
+
+    strftime('%s') rounds fractional seconds to milliseconds, which would move
+    "23:59:59.999999" to the next midnight, so the fraction is cut off first
+    (keeping any "+00:00"/"Z" suffix) to truncate like ``to_epoch``.
+    """
+    return (
+        f"CAST(strftime('%s', CASE WHEN substr({column}, 20, 1) = '.' "
+        f"THEN substr({column}, 1, 19) || ltrim(substr({column}, 21), '0123456789') "
+        f"ELSE {column} END) AS INTEGER)"
+    )
+
+
+def _table_columns(cursor: sqlite3.Cursor, table: str) -> set[str]:
+    """Return the column names of a table, including generated ones (empty if missing)."""
+    cursor.execute(f"PRAGMA table_xinfo('{table}')")
+    return {column[1] for column in cursor.fetchall()}
+
+
+def add_epoch_timestamp_columns(cursor: sqlite3.Cursor) -> list[str]:
+    """Add the integer epoch column and its (SymbolID, Ts) index to the time series tables.
+
+    ``Ts`` is a virtual generated column (seconds since the Unix epoch, computed by
+    SQLite from the ISO text column), so every existing insert keeps it up to date
+    and only the index stores it. Tables that already have the column only get
+    the index; tables missing from the database are skipped.
+
+    Returns:
+        Names of the tables the column was added to
+
+    """
+    added = []
+    for table, source_column in EPOCH_TIMESTAMP_SOURCES.items():
+        columns = _table_columns(cursor, table)
+        if not columns:
+            # Not created in this database (yet), e.g. by an older schema version
+            continue
+        if EPOCH_COLUMN not in columns:
+            cursor.execute(
+                f"ALTER TABLE {table} ADD COLUMN {EPOCH_COLUMN} INTEGER GENERATED ALWAYS AS "
+                f"({_epoch_expression(source_column)}) VIRTUAL",
+            )
+            added.append(table)
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table.lower()}_symbol_ts "
+            f"ON {table}(SymbolID, {EPOCH_COLUMN})",
+        )
+    for table, candle_column in RSI_COVERING_INDEXES.items():
+        if _table_columns(cursor, table):
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table.lower()}_candle_value "
+                f"ON {table}({candle_column}, RSI)",
+            )
+    return added
+
+
+def add_latest_indicators_table(cursor: sqlite3.Cursor) -> bool:
+    """Create the LatestIndicators table read by the daily report, if missing.
+
+    One row per symbol and day with the latest value of every indicator for that
+    day, kept up to date by the indicator save paths and trimmed to the last seven
+    days per symbol (see ``latest_indicators_repository``).
+
+    Returns:
+        True if the table was created, so that callers can fill it from history
+
+    """
+    if _table_columns(cursor, "LatestIndicators"):
+        return False
+    cursor.execute("""
+        CREATE TABLE LatestIndicators (
+            SymbolID INTEGER NOT NULL,
+            IndicatorDate TEXT NOT NULL,
+            RSIClosePrice REAL,
+            RSI REAL,
+            MACurrentPrice REAL,
+            MA50 REAL,
+            MA200 REAL,
+            EMA50 REAL,
+            EMA200 REAL,
+            MACD REAL,
+            MACDSignal REAL,
+            MACDHistogram REAL,
+            LowPrice REAL,
+            HighPrice REAL,
+            RangePercent REAL,
+            Volume REAL,
+            MarketCap REAL,
+            OpenInterest REAL,
+            OpenInterestValue REAL,
+            FundingRate REAL,
+            FundingTime TEXT,
+            BidAskRatio REAL,
+            SpreadPct REAL,
+            BidVolume2Pct REAL,
+            AskVolume2Pct REAL,
+            LargestBidWall REAL,
+            LargestAskWall REAL,
+            PRIMARY KEY (SymbolID, IndicatorDate),
+            FOREIGN KEY (SymbolID) REFERENCES Symbols(SymbolID)
+        )
+    """)
+    return True
+
+
+def add_order_book_snapshots_table(cursor: sqlite3.Cursor) -> bool:
+    """Create the OrderBookSnapshots archive table, if missing.
+
+    Holds the top levels of each fetched order book as one compressed blob per
+    symbol, market and run.
+
+    Returns:
+        True if the table was created
+
+    """
+    if _table_columns(cursor, "OrderBookSnapshots"):
+        return False
+    cursor.execute("""
+        CREATE TABLE OrderBookSnapshots (
+            Id INTEGER PRIMARY KEY AUTOINCREMENT,
+            SymbolID INTEGER NOT NULL,
+            Market TEXT NOT NULL,
+            SnapshotTime TEXT NOT NULL,
+            Levels INTEGER NOT NULL,
+            Snapshot BLOB NOT NULL,
+            FOREIGN KEY (SymbolID) REFERENCES Symbols(SymbolID),
+            UNIQUE(SymbolID, Market, SnapshotTime)
+        )
+    """)
+    return True
+
+
+def add_indicator_state_table(cursor: sqlite3.Cursor) -> bool:
+    """Create the IndicatorState table, if missing.
+
+    One row per (symbol, timeframe): the RSI/EMA/MACD filter state after the last
+    processed candle (see ``technical_analysis/indicator_state.py``).
+
+    Returns:
+        True if the table was created
+
+    """
+    if _table_columns(cursor, "IndicatorState"):
+        return False
+    cursor.execute("""
+        CREATE TABLE IndicatorState (
+            Id INTEGER PRIMARY KEY AUTOINCREMENT,
+            SymbolID INTEGER NOT NULL,
+            Timeframe TEXT NOT NULL,
+            LastCandleEnd TEXT NOT NULL,
+            LastClose REAL NOT NULL,
+            CandleCount INTEGER NOT NULL,
+            AvgGain REAL NOT NULL,
+            AvgLoss REAL NOT NULL,
+            EMA50 REAL NOT NULL,
+            EMA200 REAL NOT NULL,
+            MACDFastEMA REAL NOT NULL,
+            MACDSlowEMA REAL NOT NULL,
+            MACDSignal REAL NOT NULL,
+            UpdatedAt TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (SymbolID) REFERENCES Symbols(SymbolID),
+            UNIQUE(SymbolID, Timeframe)
+        )
+    """)
+    return True
+
 
 def create_sqlite_database(db_path="./local_crypto.db"):
     """Create SQLite database with schema matching Azure SQL.
@@ -288,6 +483,9 @@ def create_sqlite_database(db_path="./local_crypto.db"):
         )
     """)
 
+    # Create OrderBookSnapshots table: archived top-N levels, one compressed blob per run
+    add_order_book_snapshots_table(cursor)
+
     # Create CumulativeVolumeDelta table for order flow data
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS CumulativeVolumeDelta (
@@ -334,6 +532,9 @@ def create_sqlite_database(db_path="./local_crypto.db"):
         )
     """)
 
+    # Create IndicatorState table for incremental RSI/EMA/MACD updates
+    add_indicator_state_table(cursor)
+
     # Create ETFFlows table for ETF inflows/outflows tracking
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS ETFFlows (
@@ -401,6 +602,12 @@ def create_sqlite_database(db_path="./local_crypto.db"):
         "CumulativeVolumeDelta(SymbolID, IndicatorDate)",
     )
 
+    # Integer epoch timestamps for range scans over the time series tables
+    add_epoch_timestamp_columns(cursor)
+
+    # Latest indicator values per symbol and day, read by the daily report
+    add_latest_indicators_table(cursor)
+
     # Insert default symbols (with SourceID, CoinGeckoName, and IsActive for compatibility)
     # Format: (SymbolName, FullName, SourceID, CoinGeckoName, IsActive)"
     default_symbols = [
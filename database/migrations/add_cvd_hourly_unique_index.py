@@ -0,0 +1,96 @@
+"""Ensure CVDHourlySnapshots has a unique (SymbolID, HourTimestamp) index.
+
+The hourly snapshot upsert (SQLite ``INSERT ... ON CONFLICT`` and the Azure SQL
+MERGE) accumulates into the existing row of an hour, which requires at most one
+row per symbol and hour. Databases created from init_sqlite already have the
+UNIQUE constraint; this migration adds the index where it is missing, keeping the
+newest row of any duplicated hour.
+
+For Azure SQL run ``AZURE_SQL_STATEMENT`` once against the database.
+"""
+
+import sqlite3
+from pathlib import Path
+
+from infra.telegram_logging_handler import app_logger
+
+
+INDEX_NAME = "ux_cvd_hourly_symbol_hour"
+
+AZURE_SQL_STATEMENT = """
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE name = 'ux_cvd_hourly_symbol_hour' AND object_id = OBJECT_ID('CVDHourlySnapshots')
+)
+CREATE UNIQUE INDEX ux_cvd_hourly_symbol_hour ON CVDHourlySnapshots (SymbolID, HourTimestamp);
+"""
+
+
+def _has_unique_index(cursor: sqlite3.Cursor) -> bool:
+    """Check whether a unique index covers exactly (SymbolID, HourTimestamp)."""
+    cursor.execute("PRAGMA index_list('CVDHourlySnapshots')")
+    for index in cursor.fetchall():
+        name, is_unique = index[1], index[2]
+        if not is_unique:
+            continue
+        cursor.execute(f"PRAGMA index_info('{name}')")
+        columns = [column[2] for column in cursor.fetchall()]
+        if columns == ["SymbolID", "HourTimestamp"]:
+            return True
+    return False
+
+
+def migrate_add_cvd_hourly_unique_index(db_path: str = "./local_crypto.db") -> bool:
+    """Add the unique (SymbolID, HourTimestamp) index to CVDHourlySnapshots.
+
+    Args:
+        db_path: Path to the SQLite database file.
+
+    Returns:
+        True if migration succeeded, False otherwise.
+    """
+    if not Path(db_path).exists():
+        app_logger.error(f"Database not found: {db_path}")
+        return False
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        if _has_unique_index(cursor):
+            app_logger.info("CVDHourlySnapshots unique index already exists, skipping migration")
+            conn.close()
+            return True
+
+        app_logger.info("Removing duplicate CVDHourlySnapshots rows...")
+        cursor.execute("""
+            DELETE FROM CVDHourlySnapshots
+            WHERE Id NOT IN (
+                SELECT MAX(Id) FROM CVDHourlySnapshots
+                GROUP BY SymbolID, HourTimestamp
+            )
+        """)
+
+        app_logger.info("Creating unique index on CVDHourlySnapshots...")
+        cursor.execute(f"""
+            CREATE UNIQUE INDEX {INDEX_NAME}
+            ON CVDHourlySnapshots(SymbolID, HourTimestamp)
+        """)
+
+        conn.commit()
+        conn.close()
+
+    except sqlite3.Error:
+        app_logger.exception("Migration failed")
+        return False
+    else:
+        app_logger.info("CVDHourlySnapshots unique index created successfully")
+        return True
+
+
+if __name__ == "__main__":
+    import sys
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "./local_crypto.db"
+    success = migrate_add_cvd_hourly_unique_index(db_path)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,59 @@
+"""Add integer epoch timestamp columns and (SymbolID, Ts) indexes to SQLite.
+
+Candle, CVD and indicator tables store their timestamps as ISO text, and range
+filters compared strings produced by ``isoformat()``, which breaks when the
+stored and bound values differ in their timezone suffix. This migration adds a
+generated ``Ts`` column (seconds since the Unix epoch in UTC) to every time series
+table, indexes it together with SymbolID, and adds covering (candle ID, RSI)
+indexes to the RSI tables. Repositories filter SQLite ranges on ``Ts``.
+
+Azure SQL stores these columns as DATETIME and needs no migration.
+"""
+
+import sqlite3
+from pathlib import Path
+
+from database.init_sqlite import add_epoch_timestamp_columns
+from infra.telegram_logging_handler import app_logger
+
+
+def migrate_add_epoch_timestamp_columns(db_path: str = "./local_crypto.db") -> bool:
+    """Add the epoch timestamp columns and indexes to an existing database.
+
+    Args:
+        db_path: Path to the SQLite database file.
+
+    Returns:
+        True if migration succeeded, False otherwise.
+    """
+    if not Path(db_path).exists():
+        app_logger.error(f"Database not found: {db_path}")
+        return False
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        app_logger.info("Adding epoch timestamp columns and indexes...")
+        added = add_epoch_timestamp_columns(cursor)
+
+        conn.commit()
+        conn.close()
+
+    except sqlite3.Error:
+        app_logger.exception("Migration failed")
+        return False
+    else:
+        if added:
+            app_logger.info(f"Epoch timestamp column added to: {', '.join(added)}")
+        else:
+            app_logger.info("Epoch timestamp columns already exist, indexes verified")
+        return True
+
+
+if __name__ == "__main__":
+    import sys
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "./local_crypto.db"
+    success = migrate_add_epoch_timestamp_columns(db_path)
+    sys.exit(0 if success else 1)
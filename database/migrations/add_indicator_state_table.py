@@ -0,0 +1,52 @@
+"""Add IndicatorState table to existing SQLite database.
+
+This migration adds the persisted RSI/EMA/MACD filter state that lets indicators
+be advanced one candle at a time instead of being recomputed from history.
+"""
+
+import sqlite3
+from pathlib import Path
+
+from database.init_sqlite import add_indicator_state_table
+from infra.telegram_logging_handler import app_logger
+
+
+def migrate_add_indicator_state(db_path: str = "./local_crypto.db") -> bool:
+    """Add IndicatorState table to existing database.
+
+    Args:
+        db_path: Path to the SQLite database file.
+
+    Returns:
+        True if migration succeeded, False otherwise.
+    """
+    if not Path(db_path).exists():
+        app_logger.error(f"Database not found: {db_path}")
+        return False
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        if not add_indicator_state_table(cursor):
+            app_logger.info("IndicatorState table already exists, skipping migration")
+            conn.close()
+            return True
+
+        conn.commit()
+        conn.close()
+
+    except sqlite3.Error:
+        app_logger.exception("Migration failed")
+        return False
+    else:
+        app_logger.info("IndicatorState table created successfully")
+        return True
+
+
+if __name__ == "__main__":
+    import sys
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "./local_crypto.db"
+    success = migrate_add_indicator_state(db_path)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,58 @@
+"""Add LatestIndicators table to existing SQLite database.
+
+The daily report used to rebuild the latest indicator values of the last seven
+days from the full history of every indicator table on each read. This migration
+adds the LatestIndicators table (one row per symbol and day, kept up to date by the
+indicator save paths) and fills it once from the existing history.
+"""
+
+import sqlite3
+from pathlib import Path
+
+from database.init_sqlite import add_latest_indicators_table
+from infra.telegram_logging_handler import app_logger
+from technical_analysis.repositories.latest_indicators_repository import rebuild_latest_indicators
+
+
+def migrate_add_latest_indicators(db_path: str = "./local_crypto.db") -> bool:
+    """Add the LatestIndicators table to an existing database and fill it.
+
+    Args:
+        db_path: Path to the SQLite database file.
+
+    Returns:
+        True if migration succeeded, False otherwise.
+    """
+    if not Path(db_path).exists():
+        app_logger.error(f"Database not found: {db_path}")
+        return False
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        if not add_latest_indicators_table(cursor):
+            app_logger.info("LatestIndicators table already exists, skipping migration")
+            conn.close()
+            return True
+
+        app_logger.info("Filling LatestIndicators from indicator history...")
+        rebuild_latest_indicators(cursor)
+
+        conn.commit()
+        conn.close()
+
+    except sqlite3.Error:
+        app_logger.exception("Migration failed")
+        return False
+    else:
+        app_logger.info("LatestIndicators table created")
+        return True
+
+
+if __name__ == "__main__":
+    import sys
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "./local_crypto.db"
+    success = migrate_add_latest_indicators(db_path)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,69 @@
+"""Add OrderBookSnapshots table to existing SQLite database.
+
+This migration adds the order book history archive: the top-N levels of each
+fetched book, stored as one compressed blob per symbol, market and run, so past
+liquidity can be re-analysed with new depth bands.
+
+For Azure SQL run ``AZURE_SQL_STATEMENT`` once against the database.
+"""
+
+import sqlite3
+from pathlib import Path
+
+from database.init_sqlite import add_order_book_snapshots_table
+from infra.telegram_logging_handler import app_logger
+
+
+AZURE_SQL_STATEMENT = """
+IF OBJECT_ID('OrderBookSnapshots') IS NULL
+CREATE TABLE OrderBookSnapshots (
+    Id INT IDENTITY(1,1) PRIMARY KEY,
+    SymbolID INT NOT NULL REFERENCES Symbols(SymbolID),
+    Market NVARCHAR(10) NOT NULL,
+    SnapshotTime DATETIME2 NOT NULL,
+    Levels INT NOT NULL,
+    Snapshot VARBINARY(MAX) NOT NULL,
+    CONSTRAINT UQ_OrderBookSnapshots UNIQUE (SymbolID, Market, SnapshotTime)
+);
+"""
+
+
+def migrate_add_order_book_snapshots(db_path: str = "./local_crypto.db") -> bool:
+    """Add OrderBookSnapshots table to existing database.
+
+    Args:
+        db_path: Path to the SQLite database file.
+
+    Returns:
+        True if migration succeeded, False otherwise.
+    """
+    if not Path(db_path).exists():
+        app_logger.error(f"Database not found: {db_path}")
+        return False
+
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        if not add_order_book_snapshots_table(cursor):
+            app_logger.info("OrderBookSnapshots table already exists, skipping migration")
+            conn.close()
+            return True
+
+        conn.commit()
+        conn.close()
+
+    except sqlite3.Error:
+        app_logger.exception("Migration failed")
+        return False
+    else:
+        app_logger.info("OrderBookSnapshots table created successfully")
+        return True
+
+
+if __name__ == "__main__":
+    import sys
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "./local_crypto.db"
+    success = migrate_add_order_book_snapshots(db_path)
+    sys.exit(0 if success else 1)
@@ -7,7 +7,7 @@ from datetime import UTC, datetime
 import azure.functions as func
 from dotenv import load_dotenv
 
-from infra.sql_connection import connect_to_sql
+from infra.sql_pool import pooled_connection
 from infra.telegram_logging_handler import app_logger
 from integrations.onedrive_uploader import upload_to_onedrive
 from reports.current_report import generate_crypto_situation_report
@@ -41,8 +41,8 @@ async def run_report(report_type: str = "daily", run_id: str = "AM"):
         telegram_chat_id = os.environ["TELEGRAM_CHAT_ID"]
         logger.info("Configuration loaded. Telegram enabled: %s", telegram_enabled)
 
-        conn = connect_to_sql()
-        try:
+        # Warm instances reuse the connection (and AD token) of earlier runs
+        with pooled_connection() as conn:
             if report_type == "daily":
                 await process_daily_report(
                     conn,
@@ -58,9 +58,6 @@ async def run_report(report_type: str = "daily", run_id: str = "AM"):
                     telegram_token,
                     telegram_chat_id,
                 )
-        finally:
-            if conn:
-                conn.close()
 
     except Exception:
         app_logger.exception("Function failed with error")
@@ -140,9 +137,8 @@ async def crypto_situation(req: func.HttpRequest) -> func.HttpResponse:
         save_to_onedrive = req.params.get("save_to_onedrive", "").lower() == "true"
         send_to_telegram = req.params.get("send_to_telegram", "").lower() == "true"
 
-        # Connect to database
-        conn = connect_to_sql()
-        try:
+        # Borrow a pooled database connection
+        with pooled_connection() as conn:
             # Generate the report
             report = await generate_crypto_situation_report(conn, symbol.upper())
 
@@ -194,10 +190,6 @@ async def crypto_situation(req: func.HttpRequest) -> func.HttpResponse:
             # Return the report content
             return func.HttpResponse(report, mimetype="text/markdown")
 
-        finally:
-            if conn:
-                conn.close()
-
     except (ValueError, KeyError, TypeError, OSError, RuntimeError, AttributeError) as e:
         app_logger.error(f"Error in crypto_situation function: {e!s}")
         return func.HttpResponse(f"An error occurred: {e!s}", status_code=500)
@@ -3,10 +3,24 @@
 Environment Variables:
     ARTICLE_CACHE_ROOT: Root directory for storing cached RSS articles.
                        Supports user home expansion with ~. Defaults to news/cache.
+    CANDLE_REFRESH_WORKERS: Thread pool size for concurrent candle refresh (default: 8).
+    CANDLE_REFRESH_BINANCE_CONCURRENCY: Max parallel Binance kline requests (default: 6).
+    CANDLE_REFRESH_KUCOIN_CONCURRENCY: Max parallel KuCoin kline requests (default: 3).
+    CVD_STREAM_ENABLED: A streaming aggTrade collector stores the closed CVD hours, so the
+                       CVD report only fetches the current hour (default: false).
+    CVD_STREAM_URL: Binance Futures combined-stream endpoint used by the collector.
     ENABLE_ARTICLE_CACHE: Enable/disable article caching (default: true).
+    EXCHANGE_WEIGHT_BINANCE_SPOT: Binance spot request weight per minute (default: 6000).
+    EXCHANGE_WEIGHT_BINANCE_FUTURES: Binance futures request weight per minute (default: 2400).
+    EXCHANGE_WEIGHT_KUCOIN: KuCoin public request weight per 30 seconds (default: 2000).
     KUCOIN_API_KEY: KuCoin API key for market data access.
     KUCOIN_API_SECRET: KuCoin API secret for authentication.
     KUCOIN_API_PASSPHRASE: KuCoin API passphrase for authentication.
+    PRICE_CACHE_MAX_AGE_SECONDS: How long a fetched ticker price stays valid (default: 300).
+    PRICE_CACHE_MAX_SIZE: Maximum number of cached ticker prices (default: 512).
+    SQL_POOL_SIZE: Idle database connections kept for reuse across invocations (default: 4).
+    SQL_POOL_HEALTH_CHECK_SECONDS: Idle time after which a pooled connection is checked
+                       with a round trip before reuse (default: 30).
     TELEGRAM_PARSE_MODE: Telegram message parse mode (HTML or MarkdownV2).
     TWITTER_AUTH_TOKEN: Twitter authentication token.
     TWITTER_CT0: Twitter CT0 token.
@@ -154,3 +168,101 @@ def get_ollama_settings() -> OllamaSettings:
         model=model or "gpt-oss:20b",
         timeout=timeout,
     )
+
+
+@dataclass(frozen=True)
+class CandleRefreshSettings:
+    """Concurrency limits for the multi-symbol candle refresh."""
+
+    max_workers: int
+    binance_concurrency: int
+    kucoin_concurrency: int
+
+
+def _get_positive_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment, falling back to default."""
+    raw_value = os.getenv(name, "").strip()
+    try:
+        value = int(raw_value) if raw_value else default
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def get_candle_refresh_settings() -> CandleRefreshSettings:
+    """Get candle refresh concurrency limits with sensible defaults."""
+    return CandleRefreshSettings(
+        max_workers=_get_positive_int("CANDLE_REFRESH_WORKERS", 8),
+        binance_concurrency=_get_positive_int("CANDLE_REFRESH_BINANCE_CONCURRENCY", 6),
+        kucoin_concurrency=_get_positive_int("CANDLE_REFRESH_KUCOIN_CONCURRENCY", 3),
+    )
+
+
+@dataclass(frozen=True)
+class ExchangeRateLimitSettings:
+    """Request weight budgets shared by all exchange API callers."""
+
+    binance_spot_weight_per_minute: int
+    binance_futures_weight_per_minute: int
+    kucoin_weight_per_30s: int
+
+
+def get_exchange_rate_limit_settings() -> ExchangeRateLimitSettings:
+    """Get exchange request weight budgets (defaults match the public API limits)."""
+    return ExchangeRateLimitSettings(
+        binance_spot_weight_per_minute=_get_positive_int("EXCHANGE_WEIGHT_BINANCE_SPOT", 6000),
+        binance_futures_weight_per_minute=_get_positive_int(
+            "EXCHANGE_WEIGHT_BINANCE_FUTURES",
+            2400,
+        ),
+        kucoin_weight_per_30s=_get_positive_int("EXCHANGE_WEIGHT_KUCOIN", 2000),
+    )
+
+
+@dataclass(frozen=True)
+class PriceCacheSettings:
+    """Freshness and size limits for the in-process ticker price cache."""
+
+    max_age_seconds: int
+    max_size: int
+
+
+def get_price_cache_settings() -> PriceCacheSettings:
+    """Get ticker price cache limits with sensible defaults."""
+    return PriceCacheSettings(
+        max_age_seconds=_get_positive_int("PRICE_CACHE_MAX_AGE_SECONDS", 300),
+        max_size=_get_positive_int("PRICE_CACHE_MAX_SIZE", 512),
+    )
+
+
+@dataclass(frozen=True)
+class CVDStreamSettings:
+    """Settings of the streaming aggTrade collector for CVD snapshots."""
+
+    enabled: bool
+    url: str
+
+
+def get_cvd_stream_settings() -> CVDStreamSettings:
+    """Get streaming CVD collector settings (disabled by default)."""
+    enabled = os.getenv("CVD_STREAM_ENABLED", "false").lower()
+    return CVDStreamSettings(
+        enabled=enabled in ("true", "1", "yes", "on"),
+        url=os.getenv("CVD_STREAM_URL", "").strip() or "wss://fstream.binance.com/stream",
+    )
+
+
+@dataclass(frozen=True)
+class SqlPoolSettings:
+    """Size and health check interval of the database connection pool."""
+
+    size: int
+    health_check_after_seconds: int
+
+
+def get_sql_pool_settings() -> SqlPoolSettings:
+    """Get database connection pool settings with sensible defaults."""
+    return SqlPoolSettings(
+        size=_get_positive_int("SQL_POOL_SIZE", 4),
+        health_check_after_seconds=_get_positive_int("SQL_POOL_HEALTH_CHECK_SECONDS", 30),
+    )
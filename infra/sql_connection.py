@@ -3,81 +3,140 @@
 import os
 import sqlite3
 import struct
+import threading
 import time
-from contextlib import suppress
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from pathlib import Path
+from typing import ClassVar
 
 import pyodbc
 from azure import identity
+from azure.core.credentials import AccessToken
 from dotenv import load_dotenv
 
+from database.init_sqlite import (
+    add_epoch_timestamp_columns,
+    add_indicator_state_table,
+    add_latest_indicators_table,
+    add_order_book_snapshots_table,
+)
 from infra.telegram_logging_handler import app_logger
+from technical_analysis.repositories.latest_indicators_repository import rebuild_latest_indicators
 
 
 load_dotenv()  # Load environment variables from .env file
 
 
-class SQLiteRow:
-    """Custom row class that mimics pyodbc.Row behavior.
+# ISO date strings ("YYYY-MM-DD") have this length
+_DATE_LENGTH = 10
+# Scope of the Azure AD access token for Azure SQL
+_SQL_AUTH_SCOPE = "https://database.windows.net/.default"
+# Cached tokens are renewed this many seconds before they expire
+_TOKEN_REFRESH_MARGIN_SECONDS = 300
+# Distinct result shapes whose row decoder is kept per connection
+_DECODER_CACHE_SIZE = 16
 
-    Supports both index and name-based access, and converts date strings to datetime objects.
-    """
 
-    def __init__(self, cursor, row):
-        """Initialize SQLiteRow with cursor description and row data.
+def _decode_text(value: str) -> object:
+    """Convert ISO datetime/date strings to datetime/date objects, leave other text as is.
 
-        Args:
-            cursor: SQLite cursor with column descriptions
-            row: Row data from query result
+    Handles both "2025-10-23T20:00:00" and "2025-10-23 20:00:00" datetimes and
+    "2025-10-23" dates. Only strings starting with a digit can be ISO dates, so
+    ordinary text (symbol names, sources, ...) is returned without a parse attempt.
+    """
+    if not value[:1].isdigit():
+        return value
+    if "T" in value or " " in value:
+        try:
+            return datetime.fromisoformat(value.replace(" ", "T"))
+        except ValueError:
+            return value
+    if len(value) == _DATE_LENGTH and value[4] == "-" and value[7] == "-":
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
 
-        """
-        self._data = []
-        self._names = {}
-
-        for idx, col in enumerate(cursor.description):
-            col_name = col[0]
-            value = row[idx]
-
-            # Convert string dates to datetime objects
-            date_format_length = 10
-            expected_dashes = 2
-            if value is not None and isinstance(value, str):
-                # Try to parse as datetime (ISO format: YYYY-MM-DD HH:MM:SS or YYYY-MM-DDTHH:MM:SS)
-                if "T" in value or " " in value:
-                    with suppress(ValueError, AttributeError):
-                        # Handle both formats: "2025-10-23T20:00:00" and "2025-10-23 20:00:00"
-                        value = datetime.fromisoformat(value.replace(" ", "T"))
-                # Try to parse as date only (YYYY-MM-DD)
-                elif len(value) == date_format_length and value.count("-") == expected_dashes:
-                    with suppress(ValueError, AttributeError):
-                        value = datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=UTC).date()
-
-            self._data.append(value)
-            self._names[col_name] = idx
 
-    def __getitem__(self, key):
-        """Support both index and name-based access."""
-        if isinstance(key, int):
-            return self._data[key]
-        return self._data[self._names[key]]
+class SQLiteRow(tuple):
+    """Tuple-backed row that mimics pyodbc.Row behavior.
+
+    Supports index, slice and column-name access. Each query result gets a subclass
+    (see ``_RowDecoder``) carrying the column-name map shared by all of its rows.
+    """
 
-    def __iter__(self):
-        """Support iteration."""
-        return iter(self._data)
+    __slots__ = ()
+    _names: ClassVar[dict[str, int]] = {}
 
-    def __len__(self):
-        """Support len()."""
-        return len(self._data)
+    def __getitem__(self, key):
+        """Support index, slice and name-based access."""
+        if isinstance(key, int | slice):
+            return tuple.__getitem__(self, key)
+        return tuple.__getitem__(self, self._names[key])
 
     def keys(self):
         """Return column names."""
         return self._names.keys()
 
 
-def dict_factory(cursor, row):
-    """Row factory that returns SQLiteRow objects with date conversion."""
-    return SQLiteRow(cursor, row)
+def _passes_through(declared_type: str) -> bool:
+    """Tell whether a declared column type never holds ISO date text.
+
+    Follows SQLite's type affinity rules: INTEGER, REAL, NUMERIC and BLOB columns
+    pass through; TEXT columns and columns without a declared type do not.
+    """
+    declared = declared_type.upper()
+    if not declared:
+        return False
+    return "INT" in declared or not any(text in declared for text in ("CHAR", "CLOB", "TEXT"))
+
+
+def _numeric_column_names(conn: sqlite3.Connection) -> frozenset[str]:
+    """Return the column names declared with a non-text type wherever they appear.
+
+    A name declared as TEXT (or without a type) in any table or view is left out,
+    so its values are still checked for dates.
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(
+        "SELECT p.name, p.type FROM sqlite_master AS m, pragma_table_info(m.name) AS p "
+        "WHERE m.type IN ('table', 'view')",
+    )
+    numeric: set[str] = set()
+    text: set[str] = set()
+    for name, declared_type in cursor.fetchall():
+        (numeric if _passes_through(declared_type or "") else text).add(name)
+    return frozenset(numeric - text)
+
+
+class _RowDecoder:
+    """Decodes the rows of one query result.
+
+    The column-name map and the converter plan are worked out once per query from
+    ``cursor.description`` and the declared column types: columns declared as
+    INTEGER, REAL, NUMERIC or BLOB are passed through untouched, the other columns
+    (TEXT, or expressions without a declared type) get ISO date strings converted
+    to datetime/date objects.
+    """
+
+    def __init__(self, description: tuple, numeric_columns: frozenset[str]) -> None:
+        names = {column[0]: idx for idx, column in enumerate(description)}
+        self.row_class = type("SQLiteRow", (SQLiteRow,), {"__slots__": (), "_names": names})
+        self.text_columns = tuple(
+            idx for idx, column in enumerate(description) if column[0] not in numeric_columns
+        )
+
+    def __call__(self, row: tuple) -> SQLiteRow:
+        if not self.text_columns:
+            return self.row_class(row)
+        values = list(row)
+        for idx in self.text_columns:
+            value = values[idx]
+            if value.__class__ is str:
+                values[idx] = _decode_text(value)
+        return self.row_class(values)
 
 
 class SQLiteConnectionWrapper:
@@ -96,13 +155,47 @@ class SQLiteConnectionWrapper:
 
         """
         self._conn = sqlite_conn
+        # Row decoders per result shape, keyed by the id of the cursor description
+        self._decoders: dict[int, tuple[tuple, _RowDecoder]] = {}
+        # Columns declared with a non-text type, for the schema version they were read at
+        self._schema: tuple[int, frozenset[str]] | None = None
         # Use custom row factory that converts dates and supports column access by name
-        self._conn.row_factory = dict_factory
+        self._conn.row_factory = self._decode_row
+
+    def _decode_row(self, cursor, row):
+        """Row factory reusing one decoder for all rows of a query."""
+        description = cursor.description
+        cached = self._decoders.get(id(description))
+        # The cached description is kept alive, so a matching id means the same object
+        if cached is None or cached[0] is not description:
+            if len(self._decoders) >= _DECODER_CACHE_SIZE:
+                self._decoders.clear()
+            cached = (description, _RowDecoder(description, self._numeric_columns()))
+            self._decoders[id(description)] = cached
+        return cached[1](row)
+
+    def _numeric_columns(self) -> frozenset[str]:
+        """Return the non-text column names, re-read when the schema has changed."""
+        cursor = self._conn.cursor()
+        cursor.row_factory = None
+        version = cursor.execute("PRAGMA schema_version").fetchone()[0]
+        if self._schema is None or self._schema[0] != version:
+            self._schema = (version, _numeric_column_names(self._conn))
+        return self._schema[1]
 
     def cursor(self):
         """Return a cursor that supports context manager."""
         return SQLiteCursorWrapper(self._conn.cursor())
 
+    def raw_cursor(self) -> sqlite3.Cursor:
+        """Return a cursor yielding plain tuples, without date conversion.
+
+        Used by bulk column reads, which convert whole columns at once.
+        """
+        cursor = self._conn.cursor()
+        cursor.row_factory = None
+        return cursor
+
     def execute(self, sql, params=None):
         """Execute SQL directly on the connection (pyodbc compatibility).
 
@@ -166,6 +259,50 @@ class SQLiteCursorWrapper:
         return getattr(self._cursor, name)
 
 
+class AccessTokenCache:
+    """Azure AD access token for Azure SQL, reused until shortly before it expires.
+
+    ``DefaultAzureCredential`` walks its credential chain and calls the token
+    endpoint on every ``get_token``, which takes seconds; tokens are valid for
+    about an hour, so one is shared by every connection made in the meantime.
+    """
+
+    def __init__(self, refresh_margin: float = _TOKEN_REFRESH_MARGIN_SECONDS) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            refresh_margin: Seconds before expiry at which a new token is fetched
+
+        """
+        self.refresh_margin = refresh_margin
+        self._credential: identity.DefaultAzureCredential | None = None
+        self._token: AccessToken | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> str:
+        """Return a valid access token, fetching a new one when needed."""
+        with self._lock:
+            if self._token is None or self._token.expires_on - time.time() < self.refresh_margin:
+                if self._credential is None:
+                    self._credential = identity.DefaultAzureCredential(
+                        exclude_interactive_browser_credential=False,
+                    )
+                self._token = self._credential.get_token(_SQL_AUTH_SCOPE)
+                app_logger.info(
+                    "Fetched Azure SQL access token valid until "
+                    f"{datetime.fromtimestamp(self._token.expires_on, tz=UTC).isoformat()}",
+                )
+            return self._token.token
+
+    def invalidate(self) -> None:
+        """Drop the cached token, e.g. after the server rejected it."""
+        with self._lock:
+            self._token = None
+
+
+_token_cache = AccessTokenCache()
+
+
 def connect_to_sql_sqlite(db_path=None):
     """Connect to local SQLite database.
 
@@ -197,6 +334,22 @@ def connect_to_sql_sqlite(db_path=None):
     sqlite_conn.execute("PRAGMA cache_size=-64000")  # Use 64MB cache
     sqlite_conn.execute("PRAGMA temp_store=MEMORY")  # Keep temp tables in memory
 
+    # Databases created before the epoch timestamp columns get them (and their
+    # indexes) on first connect; repositories filter time ranges on them
+    cursor = sqlite_conn.cursor()
+    added = add_epoch_timestamp_columns(cursor)
+    if added:
+        app_logger.info(f"Added epoch timestamp columns to: {', '.join(added)}")
+    # Likewise the LatestIndicators table, filled once from the indicator history
+    if add_latest_indicators_table(cursor):
+        rebuild_latest_indicators(cursor)
+        app_logger.info("Created LatestIndicators table from indicator history")
+    if add_order_book_snapshots_table(cursor):
+        app_logger.info("Created OrderBookSnapshots table")
+    if add_indicator_state_table(cursor):
+        app_logger.info("Created IndicatorState table")
+    sqlite_conn.commit()
+
     wrapped_conn = SQLiteConnectionWrapper(sqlite_conn)
 
     app_logger.info("✅ Connected to SQLite database (WAL mode enabled, 30s timeout)")
@@ -232,11 +385,7 @@ def connect_to_sql(max_retries=3):
             if is_azure:
                 try:
                     connection_string = os.environ["AZURE_SQL_CONNECTIONSTRING"]
-                    credential = identity.DefaultAzureCredential(
-                        exclude_interactive_browser_credential=False,
-                    )
-                    token = credential.get_token("https://database.windows.net/.default").token
-                    app_logger.info(f"Access token: {token}")
+                    token = _token_cache.get()
                     token_bytes = token.encode("UTF-16-LE")
                     token_struct = struct.pack(
                         f"<I{len(token_bytes)}s",
@@ -255,6 +404,8 @@ def connect_to_sql(max_retries=3):
                     app_logger.info("Successfully connected to the database.")
                 except pyodbc.Error as e:
                     app_logger.warning(f"ODBC Error: {e}")
+                    # The token may have been revoked; fetch a new one on retry
+                    _token_cache.invalidate()
                     raise
                 except Exception as e:
                     app_logger.warning(f"Unexpected error: {e!s}")
@@ -0,0 +1,182 @@
+"""Database connections kept alive and reused across Azure Functions invocations.
+
+Every report run and ``crypto-situation`` request used to call ``connect_to_sql()``
+and close the connection at the end, paying for the ODBC login (and, on Azure, an
+AD token) each time. Module state survives between invocations on a warm instance,
+so :func:`pooled_connection` hands out connections from one process-wide
+:class:`ConnectionPool` instead:
+
+- up to ``SQL_POOL_SIZE`` idle connections are kept; more may be open at once,
+  the surplus is closed when returned
+- a connection idle for longer than ``SQL_POOL_HEALTH_CHECK_SECONDS`` is checked
+  with ``SELECT 1`` before reuse and replaced if the check fails
+- returned connections are rolled back, so uncommitted work never carries over
+  to the next borrower
+- new Azure connections reuse the cached AD token (see ``AccessTokenCache``)
+
+Usage:
+------
+    ```python
+    with pooled_connection() as conn:
+        await process_daily_report(conn, ...)
+    ```
+"""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, suppress
+from typing import TYPE_CHECKING
+
+import pyodbc
+
+from infra.configuration import get_sql_pool_settings
+from infra.sql_connection import connect_to_sql
+from infra.telegram_logging_handler import app_logger
+
+
+if TYPE_CHECKING:
+    from infra.sql_connection import SQLiteConnectionWrapper
+
+    Connection = pyodbc.Connection | SQLiteConnectionWrapper
+
+
+_DATABASE_ERRORS = (pyodbc.Error, sqlite3.Error)
+
+
+def _close_quietly(conn: "Connection") -> None:
+    """Close a connection that is being discarded, ignoring errors."""
+    with suppress(*_DATABASE_ERRORS):
+        conn.close()
+
+
+class ConnectionPool:
+    """Thread-safe pool of idle database connections."""
+
+    def __init__(
+        self,
+        connect: Callable[[], "Connection"],
+        size: int,
+        health_check_after: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty pool.
+
+        Args:
+            connect: Opens a new connection
+            size: Maximum number of idle connections kept
+            health_check_after: Seconds of idleness after which a connection is
+                checked before it is handed out again
+            clock: Monotonic clock, injectable for tests
+
+        """
+        self.size = size
+        self.health_check_after = health_check_after
+        self._connect = connect
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (connection, time it was returned); the most recently used is reused first
+        self._idle: list[tuple[Connection, float]] = []
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def __len__(self) -> int:
+        """Return the number of idle connections."""
+        return len(self._idle)
+
+    def _is_alive(self, conn: "Connection") -> bool:
+        """Check a connection with one round trip."""
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            finally:
+                cursor.close()
+        except _DATABASE_ERRORS as e:
+            app_logger.warning(f"Discarding pooled database connection: {e!s}")
+            return False
+        return True
+
+    def acquire(self) -> "Connection":
+        """Return an idle connection that is still alive, or open a new one."""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, returned_at = self._idle.pop()
+            if self._clock() - returned_at < self.health_check_after or self._is_alive(conn):
+                self.reused += 1
+                return conn
+            self.discarded += 1
+            _close_quietly(conn)
+
+        conn = self._connect()
+        self.created += 1
+        return conn
+
+    def release(self, conn: "Connection") -> None:
+        """Return a connection to the pool, rolling back anything uncommitted."""
+        try:
+            conn.rollback()
+        except _DATABASE_ERRORS:
+            self.discarded += 1
+            _close_quietly(conn)
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append((conn, self._clock()))
+                return
+        _close_quietly(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator["Connection"]:
+        """Borrow a connection for the duration of a ``with`` block."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            _close_quietly(conn)
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPool:
+    """Return the process-wide pool of ``connect_to_sql()`` connections."""
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is None:
+            settings = get_sql_pool_settings()
+            _pool = ConnectionPool(
+                connect_to_sql,
+                size=settings.size,
+                health_check_after=settings.health_check_after_seconds,
+            )
+        return _pool
+
+
+@contextmanager
+def pooled_connection() -> Iterator["Connection"]:
+    """Borrow a connection from the process-wide pool."""
+    with get_connection_pool().connection() as conn:
+        yield conn
+
+
+def close_connection_pool() -> None:
+    """Close the idle connections of the process-wide pool and drop it."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
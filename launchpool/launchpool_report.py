@@ -2,9 +2,8 @@
 
 from http import HTTPStatus
 
-import requests
-
 from infra.telegram_logging_handler import app_logger
+from shared_code.http_session import get_http_session
 
 
 # Endpoint to fetch articles
@@ -16,7 +15,7 @@ def check_gempool_articles():
     seen_articles = set()
 
     # Fetch articles from the API
-    response = requests.get(URL, timeout=30)
+    response = get_http_session().get(URL, timeout=30)
     new_articles = []
 
     if response.status_code == HTTPStatus.OK:
@@ -13,6 +13,7 @@ from function_app import run_report
 from infra.sql_connection import connect_to_sql
 from infra.telegram_logging_handler import app_logger
 from reports.current_report import generate_crypto_situation_report
+from shared_code.cvd_stream import run_cvd_stream_collector
 
 
 # Load environment variables
@@ -27,19 +28,21 @@ async def main():
 
     if len(sys.argv) > 1:
         report_type = sys.argv[1].lower()
-        if report_type not in ["daily", "weekly", "current"]:
+        if report_type not in ["daily", "weekly", "current", "cvd-stream"]:
             app_logger.error(
                 "Invalid report type '%s'\n"
                 "Usage:\n"
                 "  python local_runner.py [daily|weekly] [AM|PM]\n"
                 "  python local_runner.py current <SYMBOL>\n"
+                "  python local_runner.py cvd-stream\n"
                 "\n"
                 "Examples:\n"
                 "  python local_runner.py              # Run daily report (AM)\n"
                 "  python local_runner.py daily        # Run daily report (AM)\n"
                 "  python local_runner.py daily PM     # Run daily report (PM)\n"
                 "  python local_runner.py weekly       # Run weekly report\n"
-                "  python local_runner.py current ETH  # Run current report for ETH",
+                "  python local_runner.py current ETH  # Run current report for ETH\n"
+                "  python local_runner.py cvd-stream   # Stream trades into CVD snapshots",
                 sys.argv[1],
             )
             sys.exit(1)
@@ -76,6 +79,15 @@ async def main():
                 if conn:
                     conn.close()
 
+        elif report_type == "cvd-stream":
+            # Long-running aggTrade collector keeping CVD snapshots current
+            conn = connect_to_sql()
+            try:
+                await run_cvd_stream_collector(conn)
+            finally:
+                if conn:
+                    conn.close()
+
         else:
             # Daily/weekly report
             await run_report(report_type, run_id=run_id)
@@ -22,6 +22,7 @@ from news.article_cache import (
 from news.article_processor import ArticleProcessingError, process_article_with_ollama
 from news.constants import CURRENT_REPORT_ARTICLE_LIMIT, NEWS_ARTICLE_LIMIT
 from news.symbol_detector import detect_symbols_in_text
+from shared_code.http_session import get_http_session
 from source_repository import fetch_symbols
 
 
@@ -132,7 +133,7 @@ def _has_required_hashtags(article_link: str, required_hashtags: list[str]) -> b
         True if article contains at least one required hashtag, False otherwise
     """
     try:
-        response = requests.get(article_link, timeout=10)
+        response = get_http_session().get(article_link, timeout=10)
         soup = BeautifulSoup(response.content, "html.parser")
 
         # Find all links with href containing '/tags/'
@@ -469,7 +470,7 @@ def fetch_rss_news(feed_url, source, class_name):
 def fetch_full_content(url, class_name):
     """Fetch the full content of a news article from its URL."""
     try:
-        response = requests.get(url, timeout=30)
+        response = get_http_session().get(url, timeout=30)
         soup = BeautifulSoup(response.content, "html.parser")
 
         article = soup.find("div", class_=class_name) or soup.find("article")
@@ -30,16 +30,21 @@ from news.news_agent import (
     highlight_articles,
 )
 from news.rss_parser import get_news
-from shared_code.price_checker import (
-    fetch_current_price,
-    fetch_daily_candles,
-    fetch_fifteen_min_candles,
-    fetch_hourly_candles,
+from shared_code.candle_panel import DAILY_LOOKBACK_DAYS, CandlePanel
+from shared_code.candle_refresh import (
+    TIMEFRAME_DAILY,
+    TIMEFRAME_FIFTEEN_MIN,
+    TIMEFRAME_HOURLY,
+    CandleRefreshEngine,
+    CandleRefreshRequest,
 )
+from shared_code.market_snapshot import MarketSnapshot
+from shared_code.price_checker import fetch_current_price, get_price_cache_stats
 from shared_code.telegram import send_telegram_document, send_telegram_message
 from source_repository import Symbol, fetch_symbols
 from stepn.stepn_report import fetch_stepn_report
 from technical_analysis.derivatives_report import fetch_derivatives_report
+from technical_analysis.indicator_state import refresh_indicator_states
 from technical_analysis.macd_report import calculate_macd
 from technical_analysis.marketcap_report import fetch_marketcap_report
 from technical_analysis.moving_averages_report import calculate_indicators
@@ -613,38 +618,46 @@ async def process_daily_report(  # noqa: PLR0915
     # ✅ UPDATE LATEST DATA - Ensures fresh market data for analysis
     logger.info("📊 Updating latest market data...")
 
-    # Fetch missing daily candles for all symbols (last 30 days for RSI calculation)
-    # RSI needs at least 14 periods, plus extra for Wilder's smoothing
+    # Refresh daily (longest report lookback - 200-day moving averages), hourly (last
+    # 24 hours) and 15-minute (last 2 hours) candles for all symbols. Exchange requests
+    # run concurrently; DB writes stay on this thread.
     today = datetime.now(UTC).date()
-    start_date = today - timedelta(days=30)
-    daily_candles_by_symbol = {}
-    for symbol in symbols:
-        candles = fetch_daily_candles(symbol, start_date, today, conn)
-        daily_candles_by_symbol[symbol.symbol_id] = candles
-    logger.info("✓ Daily candles: fetched for all %d symbols", len(symbols))
-
-    # Fetch missing hourly candles for all symbols (last 24 hours)
     end_time = datetime.now(UTC)
-    start_time = end_time - timedelta(hours=24)
-    hourly_updated = 0
-    for symbol in symbols:
-        candles = fetch_hourly_candles(symbol, start_time, end_time, conn)
-        hourly_updated += len(candles)
+    daily_request = CandleRefreshRequest(
+        TIMEFRAME_DAILY,
+        today - timedelta(days=DAILY_LOOKBACK_DAYS),
+        today,
+    )
+    hourly_request = CandleRefreshRequest(
+        TIMEFRAME_HOURLY,
+        end_time - timedelta(hours=24),
+        end_time,
+    )
+    refreshed = CandleRefreshEngine(conn).refresh(
+        symbols,
+        [
+            daily_request,
+            hourly_request,
+            CandleRefreshRequest(TIMEFRAME_FIFTEEN_MIN, end_time - timedelta(hours=2), end_time),
+        ],
+    )
+    logger.info("✓ Daily candles: fetched for all %d symbols", len(symbols))
+    hourly_updated = sum(len(candles) for candles in refreshed[TIMEFRAME_HOURLY].values())
     logger.info("✓ Hourly candles: %d fetched/cached for all symbols", hourly_updated)
-
-    # Fetch missing 15-minute candles for all symbols (last 2 hours)
-    end_time = datetime.now(UTC)
-    start_time = end_time - timedelta(hours=2)
-    fifteen_updated = 0
-    for symbol in symbols:
-        candles = fetch_fifteen_min_candles(symbol, start_time, end_time, conn)
-        fifteen_updated += len(candles)
+    fifteen_updated = sum(len(candles) for candles in refreshed[TIMEFRAME_FIFTEEN_MIN].values())
     logger.info("✓ 15-minute candles: %d fetched/cached for all symbols", fifteen_updated)
 
     # Commit all the data updates to the database
     conn.commit()
     logger.info("✓ All candle data updates committed to database")
 
+    # Advance the stored daily RSI/EMA/MACD filter state with the candles closed since
+    # the last run (O(1) per new candle; full rebuild only if history was rewritten).
+    # The indicator reports add today's forming candle on top without recomputing.
+    indicator_states = refresh_indicator_states(conn, symbols, (TIMEFRAME_DAILY,))
+    daily_states = indicator_states[TIMEFRAME_DAILY]
+    logger.info("✓ Daily indicator state updated for %d symbols", len(daily_states))
+
     # Fetch ETF data for institutional analysis
     logger.info("📊 Fetching latest ETF data for institutional analysis...")
     try:
@@ -653,30 +666,49 @@ async def process_daily_report(  # noqa: PLR0915
         logger.exception("⚠️ ETF data update failed")
 
     # Generate all reports
-    # NOTE: Candles are now fetched once and passed to RSI calculator
-    # This avoids duplicate fetching and ensures candle IDs are properly set
+    # NOTE: Daily and hourly candles are loaded once into a read-only panel (one query
+    # per timeframe) and every indicator report slices its window from it
+
+    candle_panel = CandlePanel.load(conn, symbols, [daily_request, hourly_request])
 
-    # Prepare symbols with their candles for RSI calculation
-    symbols_with_candles = [
-        (symbol, daily_candles_by_symbol[symbol.symbol_id]) for symbol in symbols
-    ]
+    # RSI needs at least 14 periods, plus extra for Wilder's smoothing: last 30 days
+    symbols_with_candles = []
+    for symbol in symbols:
+        rsi_series = candle_panel.daily(symbol, today - timedelta(days=30), today)
+        symbols_with_candles.append((symbol, rsi_series.to_candles() if rsi_series else []))
 
-    rsi_table = create_rsi_table(symbols_with_candles, conn, target_date=datetime.now(UTC).date())
+    rsi_table = create_rsi_table(
+        symbols_with_candles,
+        conn,
+        target_date=datetime.now(UTC).date(),
+        states=daily_states,
+    )
     ma_average_table, ema_average_table = calculate_indicators(
         symbols,
         conn,
         target_date=datetime.now(UTC).date(),
+        panel=candle_panel,
+        states=daily_states,
+    )
+    range_table = fetch_range_price(symbols, conn, panel=candle_panel)
+    # One bulk ticker download per exchange feeds prices, volumes and StepN
+    market_snapshot = MarketSnapshot.fetch()
+    stepn_table = fetch_stepn_report(conn, snapshot=market_snapshot)
+    macd_table = calculate_macd(
+        symbols,
+        conn,
+        target_date=datetime.now(UTC).date(),
+        panel=candle_panel,
+        states=daily_states,
     )
-    range_table = fetch_range_price(symbols, conn)
-    stepn_table = fetch_stepn_report(conn)
-    macd_table = calculate_macd(symbols, conn, target_date=datetime.now(UTC).date())
     launchpool_report = check_gempool_articles()
-    volume_table = fetch_volume_report(symbols, conn)
+    volume_table = fetch_volume_report(symbols, conn, snapshot=market_snapshot)
     marketcap_table = fetch_marketcap_report(symbols, conn)
     pricechange_table = fetch_price_change_report(
         symbols,
         conn,
         target_date=datetime.now(UTC).date(),
+        panel=candle_panel,
     )
     sopr_table = fetch_sopr_metrics(conn)
     derivatives_table = fetch_derivatives_report(symbols, conn)
@@ -704,7 +736,7 @@ async def process_daily_report(  # noqa: PLR0915
         )
         for sym in ordered:
             try:
-                tp = fetch_current_price(sym)
+                tp = fetch_current_price(sym, snapshot=market_snapshot)
                 rng = tp.high - tp.low if tp.high and tp.low else 0
                 pos_pct = ((tp.last - tp.low) / rng * 100) if rng > 0 else 0
                 from_low = ((tp.last - tp.low) / tp.low * 100) if tp.low else 0
@@ -719,6 +751,7 @@ async def process_daily_report(  # noqa: PLR0915
         return "Current Prices (spot / last 24h):\n<pre>" + "\n".join(lines) + "</pre>\n\n"
 
     current_prices_section = build_current_prices_section(symbols)
+    logger.info("Price cache: %s", get_price_cache_stats())
 
     message_part1 = f"Crypto Report: {today_date} ({run_id})\n" + current_prices_section
     message_part1 += f"24h Range Report:\n<pre>{range_table}</pre>"
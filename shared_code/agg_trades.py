@@ -0,0 +1,127 @@
+"""Columnar (NumPy) buffer of Binance aggregate trades.
+
+The aggTrades endpoints return one dict per trade with price and quantity as
+strings. CVD needs every trade's USD value several times (window sums, averages,
+large-trade counts, hourly buckets), so the payload is decoded once into typed
+columns and every statistic is computed with vectorised passes over them.
+
+Payload fields: ``a`` aggregate trade ID, ``T`` trade time (ms), ``p`` price,
+``q`` quantity, ``m`` is-buyer-maker (True = the seller was the taker, a sell).
+"""
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
+import numpy as np
+
+
+MS_PER_HOUR = 3_600_000
+
+
+@dataclass(frozen=True)
+class AggTradeColumns:
+    """Aggregate trades as column arrays, sorted by trade ID."""
+
+    trade_ids: np.ndarray
+    times_ms: np.ndarray
+    prices: np.ndarray
+    quantities: np.ndarray
+    is_buyer_maker: np.ndarray
+
+    def __len__(self) -> int:
+        """Return the number of trades."""
+        return len(self.trade_ids)
+
+    @classmethod
+    def empty(cls) -> "AggTradeColumns":
+        """Return a buffer without trades."""
+        return cls(
+            trade_ids=np.empty(0, dtype=np.int64),
+            times_ms=np.empty(0, dtype=np.int64),
+            prices=np.empty(0, dtype=np.float64),
+            quantities=np.empty(0, dtype=np.float64),
+            is_buyer_maker=np.empty(0, dtype=bool),
+        )
+
+    @classmethod
+    def from_payload(cls, trades: Sequence[Mapping[str, Any]]) -> "AggTradeColumns":
+        """Decode an aggTrades API response (or stream events) into columns.
+
+        Args:
+            trades: Trades with ``a``, ``T``, ``p``, ``q`` and ``m`` fields
+
+        Returns:
+            Columns sorted by trade ID
+
+        """
+        count = len(trades)
+        columns = cls(
+            trade_ids=np.fromiter((t["a"] for t in trades), dtype=np.int64, count=count),
+            times_ms=np.fromiter((t["T"] for t in trades), dtype=np.int64, count=count),
+            prices=np.array([t["p"] for t in trades], dtype=np.float64),
+            quantities=np.array([t["q"] for t in trades], dtype=np.float64),
+            is_buyer_maker=np.fromiter((t["m"] for t in trades), dtype=bool, count=count),
+        )
+        return columns.sorted()
+
+    @classmethod
+    def concat(cls, batches: Sequence["AggTradeColumns"]) -> "AggTradeColumns":
+        """Join batches (in any order) into one buffer sorted by trade ID.
+
+        Trades present in more than one batch are kept once.
+        """
+        if not batches:
+            return cls.empty()
+        joined = cls(
+            trade_ids=np.concatenate([b.trade_ids for b in batches]),
+            times_ms=np.concatenate([b.times_ms for b in batches]),
+            prices=np.concatenate([b.prices for b in batches]),
+            quantities=np.concatenate([b.quantities for b in batches]),
+            is_buyer_maker=np.concatenate([b.is_buyer_maker for b in batches]),
+        )
+        return joined.sorted()
+
+    def sorted(self) -> "AggTradeColumns":
+        """Return the trades sorted by trade ID without duplicates."""
+        _, first = np.unique(self.trade_ids, return_index=True)
+        if len(first) == len(self) and np.array_equal(first, np.arange(len(self))):
+            return self
+        return self.take(first)
+
+    def take(self, index: np.ndarray) -> "AggTradeColumns":
+        """Return the trades selected by an integer index or boolean mask."""
+        return AggTradeColumns(
+            trade_ids=self.trade_ids[index],
+            times_ms=self.times_ms[index],
+            prices=self.prices[index],
+            quantities=self.quantities[index],
+            is_buyer_maker=self.is_buyer_maker[index],
+        )
+
+    @cached_property
+    def usd_values(self) -> np.ndarray:
+        """Notional value (price x quantity) of each trade."""
+        return self.prices * self.quantities
+
+    @cached_property
+    def signed_values(self) -> np.ndarray:
+        """USD value signed by taker side: buys positive, sells negative."""
+        return np.where(self.is_buyer_maker, -self.usd_values, self.usd_values)
+
+    @cached_property
+    def hour_starts_ms(self) -> np.ndarray:
+        """Start of the hour (epoch ms) each trade falls into."""
+        return self.times_ms - self.times_ms % MS_PER_HOUR
+
+    def large_trade_counts(self, threshold: float) -> tuple[int, int]:
+        """Count buys and sells with a USD value of at least ``threshold``.
+
+        Returns:
+            Tuple of (large buy count, large sell count)
+
+        """
+        large = self.usd_values >= threshold
+        large_sells = int(np.count_nonzero(large & self.is_buyer_maker))
+        return int(np.count_nonzero(large)) - large_sells, large_sells
@@ -1,14 +1,20 @@
 """Binance API integration for cryptocurrency data fetching."""
 
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, date, datetime, timedelta
+from typing import NamedTuple
 
+import numpy as np
 import pandas as pd
 from binance.client import Client as BinanceClient
 from binance.exceptions import BinanceAPIException
+from requests import RequestException
 
 from infra.telegram_logging_handler import app_logger
+from shared_code.agg_trades import AggTradeColumns
 from shared_code.common_price import Candle, TickerPrice
+from shared_code.http_session import pooled_client
+from shared_code.order_book_depth import OrderBookDepth
 from source_repository import SourceID, Symbol
 
 
@@ -43,65 +49,86 @@ class FuturesMetrics:
         )
 
 
-def fetch_binance_futures_metrics(symbol: Symbol) -> FuturesMetrics | None:
-    """Fetch Open Interest and Funding Rate from Binance Futures.
-
-    Args:
-        symbol: Symbol object with binance_name property
-
-    Returns:
-        FuturesMetrics object if successful, None otherwise
+def _binance_client() -> BinanceClient:
+    """Create a Binance client on the pooled connections (without the startup ping).
 
+    Clients are cheap to create but keep the last response on the instance, so
+    every call (and every worker thread) gets its own.
     """
-    client = BinanceClient()
+    return pooled_client(BinanceClient(ping=False))
 
-    try:
-        # Fetch Open Interest
-        oi_response = client.futures_open_interest(symbol=symbol.binance_name)
-        open_interest = float(oi_response.get("openInterest", 0))
-        oi_timestamp = datetime.fromtimestamp(oi_response.get("time", 0) / 1000, tz=UTC)
 
-        # Fetch current price to calculate OI value
-        ticker = client.futures_ticker(symbol=symbol.binance_name)
-        last_price = float(ticker.get("lastPrice", 0))
-        open_interest_value = open_interest * last_price
+# Parallel open interest requests in the bulk futures metrics fetch
+FUTURES_METRICS_WORKERS = 8
 
-        # Fetch Funding Rate
-        funding_response = client.futures_funding_rate(symbol=symbol.binance_name, limit=1)
 
-        if not funding_response:
-            app_logger.warning(f"No funding rate data for {symbol.symbol_name}")
-            return None
+def fetch_binance_futures_metrics_bulk(
+    symbols: list[Symbol],
+    max_workers: int = FUTURES_METRICS_WORKERS,
+) -> list[tuple[Symbol, FuturesMetrics | None]]:
+    """Fetch Open Interest and Funding Rate for many symbols in roughly N + 2 calls.
 
-        funding_rate = (
-            float(funding_response[0].get("fundingRate", 0)) * 100
-        )  # Convert to percentage
+    Funding rate and next funding time of every perpetual come from one
+    all-symbols premiumIndex call and last prices from one all-symbols price
+    ticker call; only open interest is requested per symbol, concurrently.
 
-        # Get next funding time from mark price
-        mark_price = client.futures_mark_price(symbol=symbol.binance_name)
-        next_funding_time = datetime.fromtimestamp(
-            mark_price.get("nextFundingTime", 0) / 1000,
-            tz=UTC,
-        )
+    Args:
+        symbols: Symbols to fetch (non-Binance symbols are skipped)
+        max_workers: Number of parallel open interest requests
 
-        return FuturesMetrics(
-            symbol=symbol.symbol_name,
-            open_interest=open_interest,
-            open_interest_value=open_interest_value,
-            funding_rate=funding_rate,
-            next_funding_time=next_funding_time,
-            timestamp=oi_timestamp,
-        )
+    Returns:
+        (symbol, metrics) pairs in the order of ``symbols``; metrics is None for
+        symbols without a perpetual contract or whose request failed
 
+    """
+    binance_symbols = [s for s in symbols if s.source_id == SourceID.BINANCE]
+    if not binance_symbols:
+        return []
+
+    try:
+        client = _binance_client()
+        premium_index = {item["symbol"]: item for item in client.futures_mark_price()}
+        last_prices = {
+            item["symbol"]: float(item["price"]) for item in client.futures_symbol_ticker()
+        }
     except BinanceAPIException as e:
-        app_logger.error(f"Error fetching futures metrics for {symbol.symbol_name}: {e.message}")
-        return None
-    except (KeyError, ValueError, TypeError, ConnectionError) as e:
-        app_logger.error(
-            f"Unexpected error fetching futures metrics for {symbol.symbol_name}: {e!s}",
-        )
+        app_logger.error(f"Error fetching futures premium index and prices: {e.message}")
+        return [(symbol, None) for symbol in binance_symbols]
+    except (KeyError, ValueError, TypeError, ConnectionError, RequestException) as e:
+        app_logger.error(f"Unexpected error fetching futures premium index and prices: {e!s}")
+        return [(symbol, None) for symbol in binance_symbols]
+
+    def fetch(symbol: Symbol) -> FuturesMetrics | None:
+        index = premium_index.get(symbol.binance_name)
+        if index is None:
+            app_logger.warning(f"No perpetual futures contract for {symbol.symbol_name}")
+            return None
+        try:
+            oi_response = _binance_client().futures_open_interest(symbol=symbol.binance_name)
+            open_interest = float(oi_response.get("openInterest", 0))
+            last_price = last_prices.get(symbol.binance_name, float(index.get("markPrice", 0)))
+            return FuturesMetrics(
+                symbol=symbol.symbol_name,
+                open_interest=open_interest,
+                open_interest_value=open_interest * last_price,
+                funding_rate=float(index.get("lastFundingRate", 0)) * 100,
+                next_funding_time=datetime.fromtimestamp(
+                    index.get("nextFundingTime", 0) / 1000,
+                    tz=UTC,
+                ),
+                timestamp=datetime.fromtimestamp(oi_response.get("time", 0) / 1000, tz=UTC),
+            )
+        except BinanceAPIException as e:
+            app_logger.error(f"Error fetching open interest for {symbol.symbol_name}: {e.message}")
+        except (KeyError, ValueError, TypeError, ConnectionError, RequestException) as e:
+            app_logger.error(
+                f"Unexpected error fetching open interest for {symbol.symbol_name}: {e!s}",
+            )
         return None
 
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="futures-oi") as executor:
+        return list(zip(binance_symbols, executor.map(fetch, binance_symbols), strict=True))
+
 
 class OrderBookMetrics:
     """Data class for order book liquidity metrics."""
@@ -123,6 +150,7 @@ class OrderBookMetrics:
         largest_ask_wall_price: float,
         depth_levels: dict,
         timestamp: datetime,
+        book: OrderBookDepth | None = None,
     ):
         """Initialize order book metrics with liquidity data."""
         self.symbol = symbol
@@ -138,8 +166,10 @@ class OrderBookMetrics:
         self.largest_bid_wall_price = largest_bid_wall_price
         self.largest_ask_wall = largest_ask_wall
         self.largest_ask_wall_price = largest_ask_wall_price
-        self.depth_levels = depth_levels  # {"0.5%": {"bid": x, "ask": y}, "1%": {...}, "2%": {...}}
+        self.depth_levels = depth_levels  # {"0.5%": {"bid": x, "ask": y}, ..., "10.0%": {...}}
         self.timestamp = timestamp
+        # Parsed book for further band, imbalance and slippage queries
+        self.book = book
 
     def __repr__(self):
         """Return a string representation of the OrderBookMetrics object."""
@@ -156,7 +186,6 @@ def _calculate_order_book_metrics(
     symbol_name: str,
     bids: list,
     asks: list,
-    current_price: float,  # noqa: ARG001
 ) -> OrderBookMetrics | None:
     """Calculate liquidity metrics from raw order book data.
 
@@ -164,7 +193,6 @@ def _calculate_order_book_metrics(
         symbol_name: Symbol name (e.g., "BTC")
         bids: List of [price, quantity] bid orders (highest first)
         asks: List of [price, quantity] ask orders (lowest first)
-        current_price: Current market price for USD value calculation
 
     Returns:
         OrderBookMetrics object with calculated liquidity data
@@ -174,44 +202,9 @@ def _calculate_order_book_metrics(
         return None
 
     try:
-        # Best bid/ask
-        best_bid = float(bids[0][0])
-        best_bid_qty = float(bids[0][1])
-        best_ask = float(asks[0][0])
-        best_ask_qty = float(asks[0][1])
-
-        # Mid-price and spread
-        mid_price = (best_bid + best_ask) / 2
-        spread_pct = ((best_ask - best_bid) / mid_price) * 100 if mid_price > 0 else 0
-
-        # Calculate volume at different price levels
-        def calc_volume_at_level(
-            orders: list,
-            mid: float,
-            pct: float,
-            *,
-            is_bid: bool,
-        ) -> float:
-            """Calculate total USD volume within pct% of mid-price."""
-            total_volume = 0.0
-            for price_str, qty_str in orders:
-                price = float(price_str)
-                qty = float(qty_str)
-                if is_bid:
-                    # For bids, include orders above (mid * (1 - pct/100))
-                    if price >= mid * (1 - pct / 100):
-                        total_volume += price * qty
-                # For asks, include orders below (mid * (1 + pct/100))
-                elif price <= mid * (1 + pct / 100):
-                    total_volume += price * qty
-            return total_volume
-
-        # Calculate depth at multiple levels
-        depth_levels = {}
-        for pct in [0.5, 1.0, 2.0]:
-            bid_vol = calc_volume_at_level(bids, mid_price, pct, is_bid=True)
-            ask_vol = calc_volume_at_level(asks, mid_price, pct, is_bid=False)
-            depth_levels[f"{pct}%"] = {"bid": bid_vol, "ask": ask_vol}
+        # Parse the levels once; every band query is a searchsorted on cumulative sums
+        book = OrderBookDepth.from_levels(bids, asks)
+        depth_levels = book.depth_levels()
 
         bid_volume_2pct = depth_levels["2.0%"]["bid"]
         ask_volume_2pct = depth_levels["2.0%"]["ask"]
@@ -219,50 +212,18 @@ def _calculate_order_book_metrics(
         # Bid/Ask ratio (avoid division by zero)
         bid_ask_ratio = bid_volume_2pct / ask_volume_2pct if ask_volume_2pct > 0 else 0
 
-        # Find largest walls (orders > 2x average within 2% range)
-        def find_largest_wall(
-            orders: list,
-            mid: float,
-            pct: float,
-            *,
-            is_bid: bool,
-        ) -> tuple:
-            """Find the largest single order within pct% of mid-price."""
-            largest_value = 0.0
-            largest_price = 0.0
-            for price_str, qty_str in orders:
-                price = float(price_str)
-                qty = float(qty_str)
-                order_value = price * qty
-                if is_bid:
-                    if price >= mid * (1 - pct / 100) and order_value > largest_value:
-                        largest_value = order_value
-                        largest_price = price
-                elif price <= mid * (1 + pct / 100) and order_value > largest_value:
-                    largest_value = order_value
-                    largest_price = price
-            return largest_value, largest_price
-
-        largest_bid_wall, largest_bid_wall_price = find_largest_wall(
-            bids,
-            mid_price,
-            2.0,
-            is_bid=True,
-        )
-        largest_ask_wall, largest_ask_wall_price = find_largest_wall(
-            asks,
-            mid_price,
-            2.0,
-            is_bid=False,
-        )
+        # Largest single orders within 2% of mid-price
+        bid_wall, ask_wall = book.largest_walls(2.0)
+        largest_bid_wall, largest_bid_wall_price = bid_wall
+        largest_ask_wall, largest_ask_wall_price = ask_wall
 
         return OrderBookMetrics(
             symbol=symbol_name,
-            best_bid=best_bid,
-            best_bid_qty=best_bid_qty,
-            best_ask=best_ask,
-            best_ask_qty=best_ask_qty,
-            spread_pct=spread_pct,
+            best_bid=book.best_bid,
+            best_bid_qty=float(book.bids.quantities[0]),
+            best_ask=book.best_ask,
+            best_ask_qty=float(book.asks.quantities[0]),
+            spread_pct=book.spread_pct,
             bid_volume_2pct=bid_volume_2pct,
             ask_volume_2pct=ask_volume_2pct,
             bid_ask_ratio=bid_ask_ratio,
@@ -272,6 +233,7 @@ def _calculate_order_book_metrics(
             largest_ask_wall_price=largest_ask_wall_price,
             depth_levels=depth_levels,
             timestamp=datetime.now(UTC),
+            book=book,
         )
 
     except (IndexError, ValueError, TypeError, ZeroDivisionError) as e:
@@ -279,88 +241,96 @@ def _calculate_order_book_metrics(
         return None
 
 
-def fetch_binance_order_book(symbol: Symbol, limit: int = 100) -> OrderBookMetrics | None:
-    """Fetch order book depth from Binance Spot API.
-
-    Args:
-        symbol: Symbol object with binance_name property
-        limit: Number of price levels to fetch (default 100, max 5000)
-               Weight: 1-100=5, 101-500=25, 501-1000=50, 1001-5000=250
+def _fetch_depth_metrics(
+    client: BinanceClient,
+    symbol: Symbol,
+    limit: int,
+    *,
+    futures: bool,
+) -> OrderBookMetrics | None:
+    """Fetch one spot or futures depth snapshot and derive its liquidity metrics."""
+    if futures:
+        depth = client.futures_order_book(symbol=symbol.binance_name, limit=limit)
+    else:
+        depth = client.get_order_book(symbol=symbol.binance_name, limit=limit)
 
-    Returns:
-        OrderBookMetrics object if successful, None otherwise
+    return _calculate_order_book_metrics(
+        symbol_name=symbol.symbol_name,
+        bids=depth.get("bids", []),
+        asks=depth.get("asks", []),
+    )
 
-    """
-    client = BinanceClient()
 
-    try:
-        # Fetch order book depth
-        depth = client.get_order_book(symbol=symbol.binance_name, limit=limit)
+# Parallel depth requests per batch; also the HTTP connection pool size
+ORDER_BOOK_FETCH_WORKERS = 8
 
-        bids = depth.get("bids", [])
-        asks = depth.get("asks", [])
 
-        # Get current price for USD calculations
-        ticker = client.get_ticker(symbol=symbol.binance_name)
-        current_price = float(ticker.get("lastPrice", 0))
+class OrderBookPair(NamedTuple):
+    """Spot and futures order book metrics of one symbol (None where unavailable)."""
 
-        return _calculate_order_book_metrics(
-            symbol_name=symbol.symbol_name,
-            bids=bids,
-            asks=asks,
-            current_price=current_price,
-        )
+    symbol: Symbol
+    spot: OrderBookMetrics | None
+    futures: OrderBookMetrics | None
 
-    except BinanceAPIException as e:
-        app_logger.error(f"Error fetching order book for {symbol.symbol_name}: {e.message}")
-        return None
-    except (KeyError, ValueError, TypeError, ConnectionError) as e:
-        app_logger.error(f"Unexpected error fetching order book for {symbol.symbol_name}: {e!s}")
-        return None
 
+def fetch_binance_order_books(
+    symbols: list[Symbol],
+    limit: int = 100,
+    *,
+    include_futures: bool = True,
+    max_workers: int = ORDER_BOOK_FETCH_WORKERS,
+) -> list[OrderBookPair]:
+    """Fetch spot and futures order books for many symbols concurrently.
 
-def fetch_binance_futures_order_book(symbol: Symbol, limit: int = 100) -> OrderBookMetrics | None:
-    """Fetch order book depth from Binance Futures API.
+    All requests go through the pooled, rate limited connections, so they draw
+    from the shared Binance weight budget.
 
     Args:
-        symbol: Symbol object with binance_name property
-        limit: Number of price levels to fetch (default 100)
+        symbols: Symbols to fetch (non-Binance symbols are skipped)
+        limit: Number of price levels to fetch per book
+        include_futures: Also fetch the futures order book of every symbol
+        max_workers: Number of parallel requests
 
     Returns:
-        OrderBookMetrics object if successful, None otherwise
+        One OrderBookPair per Binance symbol, in the order of ``symbols``
 
     """
-    client = BinanceClient()
-
-    try:
-        # Fetch futures order book depth
-        depth = client.futures_order_book(symbol=symbol.binance_name, limit=limit)
-
-        bids = depth.get("bids", [])
-        asks = depth.get("asks", [])
-
-        # Get current futures price
-        ticker = client.futures_ticker(symbol=symbol.binance_name)
-        current_price = float(ticker.get("lastPrice", 0))
-
-        return _calculate_order_book_metrics(
-            symbol_name=symbol.symbol_name,
-            bids=bids,
-            asks=asks,
-            current_price=current_price,
-        )
+    binance_symbols = [s for s in symbols if s.source_id == SourceID.BINANCE]
+    if not binance_symbols:
+        return []
 
-    except BinanceAPIException as e:
-        app_logger.error(
-            f"Error fetching futures order book for {symbol.symbol_name}: {e.message}",
-        )
-        return None
-    except (KeyError, ValueError, TypeError, ConnectionError) as e:
-        app_logger.error(
-            f"Unexpected error fetching futures order book for {symbol.symbol_name}: {e!s}",
-        )
+    def fetch(symbol: Symbol, *, futures: bool) -> OrderBookMetrics | None:
+        market = "futures" if futures else "spot"
+        try:
+            return _fetch_depth_metrics(_binance_client(), symbol, limit, futures=futures)
+        except BinanceAPIException as e:
+            app_logger.warning(f"No {market} order book for {symbol.symbol_name}: {e.message}")
+        except (KeyError, ValueError, TypeError, ConnectionError, RequestException) as e:
+            app_logger.warning(
+                f"Error fetching {market} order book for {symbol.symbol_name}: {e!s}",
+            )
         return None
 
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="order-book") as executor:
+        spot = [executor.submit(fetch, s, futures=False) for s in binance_symbols]
+        futures = [
+            executor.submit(fetch, s, futures=True) if include_futures else None
+            for s in binance_symbols
+        ]
+        return [
+            OrderBookPair(
+                symbol=symbol,
+                spot=spot_future.result(),
+                futures=futures_future.result() if futures_future else None,
+            )
+            for symbol, spot_future, futures_future in zip(
+                binance_symbols,
+                spot,
+                futures,
+                strict=True,
+            )
+        ]
+
 
 class CVDMetrics:
     """Data class for Cumulative Volume Delta (order flow) metrics."""
@@ -412,7 +382,7 @@ class CVDMetrics:
 # CVD API constants
 CVD_TRADES_PER_REQUEST = 1000  # Max trades per API call
 CVD_MAX_TRADES = 100000  # Safety limit (100 API calls per symbol)
-CVD_RATE_LIMIT_DELAY = 0.5  # Delay between API calls to avoid rate limiting
+# Pacing between aggTrades calls (20 weight each) is left to the shared rate limiter
 
 
 # CVD threshold for "large" trade multiplier
@@ -455,12 +425,61 @@ class CVDHourlySnapshot:
         )
 
 
-def _get_hour_start(dt: datetime) -> datetime:
-    """Round datetime down to start of hour."""
-    return dt.replace(minute=0, second=0, microsecond=0)
+def build_hourly_snapshots(
+    columns: AggTradeColumns,
+    symbol_id: int,
+    large_threshold: float | None = None,
+) -> list[CVDHourlySnapshot]:
+    """Bucket aggregate trades into hourly CVD snapshots.
+
+    Args:
+        columns: Trades to bucket
+        symbol_id: Database ID for the symbol
+        large_threshold: USD value from which a trade counts as large (default:
+            CVD_LARGE_TRADE_MULTIPLIER times the average size of ``columns``)
+
+    Returns:
+        One CVDHourlySnapshot per hour with trades, oldest first
+
+    """
+    if not len(columns):
+        return []
+    usd_values = columns.usd_values
+    is_sell = columns.is_buyer_maker
+    if large_threshold is None:
+        large_threshold = float(usd_values.mean()) * CVD_LARGE_TRADE_MULTIPLIER
+    is_large = usd_values >= large_threshold
+
+    hours, bucket = np.unique(columns.hour_starts_ms, return_inverse=True)
+    size = len(hours)
+    trade_counts = np.bincount(bucket, minlength=size)
+    buy_volumes = np.bincount(bucket, weights=np.where(is_sell, 0.0, usd_values), minlength=size)
+    sell_volumes = np.bincount(bucket, weights=np.where(is_sell, usd_values, 0.0), minlength=size)
+    cvds = np.bincount(bucket, weights=columns.signed_values, minlength=size)
+    volumes = np.bincount(bucket, weights=usd_values, minlength=size)
+    large_buys = np.bincount(bucket[is_large & ~is_sell], minlength=size)
+    large_sells = np.bincount(bucket[is_large & is_sell], minlength=size)
+    last_trade_ids = np.zeros(size, dtype=np.int64)
+    np.maximum.at(last_trade_ids, bucket, columns.trade_ids)
+
+    return [
+        CVDHourlySnapshot(
+            symbol_id=symbol_id,
+            hour_timestamp=datetime.fromtimestamp(int(hours[i]) / 1000, tz=UTC),
+            cvd=float(cvds[i]),
+            buy_volume=float(buy_volumes[i]),
+            sell_volume=float(sell_volumes[i]),
+            trade_count=int(trade_counts[i]),
+            large_buy_count=int(large_buys[i]),
+            large_sell_count=int(large_sells[i]),
+            avg_trade_size=float(volumes[i] / trade_counts[i]),
+            last_trade_id=int(last_trade_ids[i]),
+        )
+        for i in range(size)
+    ]
 
 
-def fetch_binance_cvd(  # noqa: PLR0912, PLR0915
+def fetch_binance_cvd(
     symbol: Symbol,
     hours: int = 24,
 ) -> CVDMetrics | None:
@@ -485,7 +504,7 @@ def fetch_binance_cvd(  # noqa: PLR0912, PLR0915
         CVDMetrics object if successful, None otherwise
 
     """
-    client = BinanceClient()
+    client = _binance_client()
 
     try:
         # Calculate time ranges
@@ -497,7 +516,8 @@ def fetch_binance_cvd(  # noqa: PLR0912, PLR0915
         # Fetch aggregate trades for the period from Futures API
         # Note: API returns max 1000 trades per call, we may need multiple calls
         # Fetch from most recent trades backward to ensure we capture 1h and 4h windows
-        all_trades = []
+        batches: list[AggTradeColumns] = []
+        trade_count = 0
         end_time = int(now.timestamp() * 1000)
 
         # Fetch trades in batches (limit 1000 per call), going backward in time
@@ -514,7 +534,9 @@ def fetch_binance_cvd(  # noqa: PLR0912, PLR0915
             if not trades:
                 break
 
-            all_trades.extend(trades)
+            # Decode each batch once into typed columns
+            batches.append(AggTradeColumns.from_payload(trades))
+            trade_count += len(trades)
 
             # Get earliest trade time to continue backward
             earliest_trade_time = trades[0]["T"]
@@ -528,99 +550,43 @@ def fetch_binance_cvd(  # noqa: PLR0912, PLR0915
                 break
 
             # Safety limit to prevent infinite loops
-            if len(all_trades) > CVD_MAX_TRADES:
+            if trade_count > CVD_MAX_TRADES:
                 app_logger.warning(
                     f"CVD fetch for {symbol.symbol_name}: Hit {CVD_MAX_TRADES} trade limit",
                 )
                 break
 
-            # Rate limit: small delay between API calls to avoid hitting 2400 weight/min limit
-            time.sleep(CVD_RATE_LIMIT_DELAY)
-
             # Move end_time backward for next batch
             end_time = earliest_trade_time - 1
 
-        if not all_trades:
+        if not batches:
             app_logger.warning(f"No aggregate trades found for {symbol.symbol_name}")
             return None
 
-        # Process trades and calculate CVD
-        cvd_1h = 0.0
-        cvd_4h = 0.0
-        cvd_24h = 0.0
-        buy_volume_1h = 0.0
-        sell_volume_1h = 0.0
-        buy_volume_24h = 0.0
-        sell_volume_24h = 0.0
-        trade_count_1h = 0
-        trade_count_24h = 0
-        trade_sizes = []
-
-        for trade in all_trades:
-            trade_time = trade["T"]  # Trade time in ms
-            qty = float(trade["q"])  # Quantity
-            price = float(trade["p"])  # Price
-            is_buyer_maker = trade["m"]  # True = seller was taker (sell)
-            usd_value = qty * price
-
-            trade_sizes.append(usd_value)
-            trade_count_24h += 1
-
-            # Determine buy vs sell
-            # isBuyerMaker=True means the buyer was maker, so taker was seller (SELL)
-            # isBuyerMaker=False means the seller was maker, so taker was buyer (BUY)
-            if is_buyer_maker:
-                # Seller was taker = SELL
-                sell_volume_24h += usd_value
-                cvd_24h -= usd_value
-            else:
-                # Buyer was taker = BUY
-                buy_volume_24h += usd_value
-                cvd_24h += usd_value
-
-            # 4h window
-            if trade_time >= start_time_4h:
-                if is_buyer_maker:
-                    cvd_4h -= usd_value
-                else:
-                    cvd_4h += usd_value
-
-            # 1h window
-            if trade_time >= start_time_1h:
-                trade_count_1h += 1
-                if is_buyer_maker:
-                    sell_volume_1h += usd_value
-                    cvd_1h -= usd_value
-                else:
-                    buy_volume_1h += usd_value
-                    cvd_1h += usd_value
-
-        # Calculate average trade size and count large trades
-        avg_trade_size = sum(trade_sizes) / len(trade_sizes) if trade_sizes else 0
-        large_threshold = avg_trade_size * CVD_LARGE_TRADE_MULTIPLIER
-
-        large_buy_count = 0
-        large_sell_count = 0
-
-        for trade in all_trades:
-            usd_value = float(trade["q"]) * float(trade["p"])
-            if usd_value >= large_threshold:
-                if trade["m"]:  # Seller was taker
-                    large_sell_count += 1
-                else:
-                    large_buy_count += 1
+        columns = AggTradeColumns.concat(batches)
+        usd_values = columns.usd_values
+        signed_values = columns.signed_values
+        is_sell = columns.is_buyer_maker
+        in_4h = columns.times_ms >= start_time_4h
+        in_1h = columns.times_ms >= start_time_1h
+
+        # Average trade size; trades of at least twice the average count as large
+        avg_trade_size = float(usd_values.mean())
+        large_buy_count, large_sell_count = columns.large_trade_counts(
+            avg_trade_size * CVD_LARGE_TRADE_MULTIPLIER,
+        )
 
         return CVDMetrics(
             symbol=symbol.symbol_name,
-            cvd_1h=cvd_1h,
-            cvd_4h=cvd_4h,
-            cvd_24h=cvd_24h,
-            buy_volume_1h=buy_volume_1h,
-            sell_volume_1h=sell_volume_1h,
-            buy_volume_24h=buy_volume_24h,
-            sell_volume_24h=sell_volume_24h,
-            trade_count_1h=trade_count_1h,
-            trade_count_24h=trade_count_24h,
+            cvd_1h=float(signed_values[in_1h].sum()),
+            cvd_4h=float(signed_values[in_4h].sum()),
+            cvd_24h=float(signed_values.sum()),
+            buy_volume_1h=float(usd_values[in_1h & ~is_sell].sum()),
+            sell_volume_1h=float(usd_values[in_1h & is_sell].sum()),
+            buy_volume_24h=float(usd_values[~is_sell].sum()),
+            sell_volume_24h=float(usd_values[is_sell].sum()),
+            trade_count_1h=int(np.count_nonzero(in_1h)),
+            trade_count_24h=len(columns),
             avg_trade_size=avg_trade_size,
             large_buy_count=large_buy_count,
             large_sell_count=large_sell_count,
@@ -635,7 +601,7 @@ def fetch_binance_cvd(  # noqa: PLR0912, PLR0915
         return None
 
 
-def fetch_cvd_trades_incremental(  # noqa: PLR0912, PLR0915
+def fetch_cvd_trades_incremental(  # noqa: PLR0912
     symbol: Symbol,
     symbol_id: int,
     start_time: datetime | None = None,
@@ -659,17 +625,15 @@ def fetch_cvd_trades_incremental(  # noqa: PLR0912, PLR0915
         List of CVDHourlySnapshot objects, one per hour with trades
 
     """
-    client = BinanceClient()
+    client = _binance_client()
     now = datetime.now(UTC)
 
     if start_time is None:
         start_time = now - timedelta(hours=max_hours)
 
-    # Buckets: hour_timestamp -> {cvd, buy_vol, sell_vol, trades, etc.}
-    hourly_buckets: dict[datetime, dict] = {}
-
     try:
-        all_trades = []
+        batches: list[AggTradeColumns] = []
+        trade_count = 0
 
         if last_trade_id is not None:
             # Incremental fetch: get trades after the last known trade ID
@@ -687,7 +651,8 @@ def fetch_cvd_trades_incremental(  # noqa: PLR0912, PLR0915
                 if not trades:
                     break
 
-                all_trades.extend(trades)
+                batches.append(AggTradeColumns.from_payload(trades))
+                trade_count += len(trades)
 
                 # Check if we've caught up to current time
                 latest_trade_time = trades[-1]["T"]
@@ -698,15 +663,12 @@ def fetch_cvd_trades_incremental(  # noqa: PLR0912, PLR0915
                 from_id = trades[-1]["a"] + 1
 
                 # Safety limit
-                if len(all_trades) > CVD_MAX_TRADES:
+                if trade_count > CVD_MAX_TRADES:
                     app_logger.warning(
                         f"CVD incremental fetch for {symbol.symbol_name}: "
                         f"Hit {CVD_MAX_TRADES} trade limit",
                     )
                     break
-
-                time.sleep(CVD_RATE_LIMIT_DELAY)
-
         else:
             # Full fetch: get trades from start_time going forward
             # Fetch backward from now to ensure we get all recent trades
@@ -725,7 +687,8 @@ def fetch_cvd_trades_incremental(  # noqa: PLR0912, PLR0915
                 if not trades:
                     break
 
-                all_trades.extend(trades)
+                batches.append(AggTradeColumns.from_payload(trades))
+                trade_count += len(trades)
 
                 # Get earliest trade time to continue backward
                 earliest_trade_time = trades[0]["T"]
@@ -739,95 +702,25 @@ def fetch_cvd_trades_incremental(  # noqa: PLR0912, PLR0915
                     break
 
                 # Safety limit
-                if len(all_trades) > CVD_MAX_TRADES:
+                if trade_count > CVD_MAX_TRADES:
                     app_logger.warning(
                         f"CVD full fetch for {symbol.symbol_name}: "
                         f"Hit {CVD_MAX_TRADES} trade limit",
                     )
                     break
 
-                time.sleep(CVD_RATE_LIMIT_DELAY)
-
                 # Move end_time backward
                 end_time = earliest_trade_time - 1
 
-        if not all_trades:
+        if not batches:
             app_logger.info(f"No new trades found for {symbol.symbol_name}")
             return []
 
         app_logger.info(
-            f"Fetched {len(all_trades)} trades for {symbol.symbol_name}",
+            f"Fetched {trade_count} trades for {symbol.symbol_name}",
         )
 
-        # Calculate average trade size for large trade detection
-        trade_sizes = [float(t["q"]) * float(t["p"]) for t in all_trades]
-        overall_avg_size = sum(trade_sizes) / len(trade_sizes) if trade_sizes else 0
-        large_threshold = overall_avg_size * CVD_LARGE_TRADE_MULTIPLIER
-
-        # Bucket trades by hour
-        for trade in all_trades:
-            trade_time_ms = trade["T"]
-            trade_dt = datetime.fromtimestamp(trade_time_ms / 1000, tz=UTC)
-            hour_start = _get_hour_start(trade_dt)
-
-            if hour_start not in hourly_buckets:
-                hourly_buckets[hour_start] = {
-                    "cvd": 0.0,
-                    "buy_volume": 0.0,
-                    "sell_volume": 0.0,
-                    "trade_count": 0,
-                    "large_buy_count": 0,
-                    "large_sell_count": 0,
-                    "trade_sizes": [],
-                    "last_trade_id": 0,
-                }
-
-            bucket = hourly_buckets[hour_start]
-            qty = float(trade["q"])
-            price = float(trade["p"])
-            usd_value = qty * price
-            is_buyer_maker = trade["m"]
-            trade_id = trade["a"]
-
-            bucket["trade_sizes"].append(usd_value)
-            bucket["trade_count"] += 1
-            bucket["last_trade_id"] = max(bucket["last_trade_id"], trade_id)
-
-            if is_buyer_maker:
-                # Seller was taker = SELL
-                bucket["sell_volume"] += usd_value
-                bucket["cvd"] -= usd_value
-                if usd_value >= large_threshold:
-                    bucket["large_sell_count"] += 1
-            else:
-                # Buyer was taker = BUY
-                bucket["buy_volume"] += usd_value
-                bucket["cvd"] += usd_value
-                if usd_value >= large_threshold:
-                    bucket["large_buy_count"] += 1
-
-        # Convert buckets to CVDHourlySnapshot objects
-        snapshots = []
-        for hour_ts, bucket in sorted(hourly_buckets.items()):
-            avg_size = (
-                sum(bucket["trade_sizes"]) / len(bucket["trade_sizes"])
-                if bucket["trade_sizes"]
-                else 0
-            )
-            snapshots.append(
-                CVDHourlySnapshot(
-                    symbol_id=symbol_id,
-                    hour_timestamp=hour_ts,
-                    cvd=bucket["cvd"],
-                    buy_volume=bucket["buy_volume"],
-                    sell_volume=bucket["sell_volume"],
-                    trade_count=bucket["trade_count"],
-                    large_buy_count=bucket["large_buy_count"],
-                    large_sell_count=bucket["large_sell_count"],
-                    avg_trade_size=avg_size,
-                    last_trade_id=bucket["last_trade_id"],
-                ),
-            )
+        snapshots = build_hourly_snapshots(AggTradeColumns.concat(batches), symbol_id)
 
     except BinanceAPIException as e:
         app_logger.error(
@@ -846,7 +739,7 @@ def fetch_cvd_trades_incremental(  # noqa: PLR0912, PLR0915
 def fetch_binance_price(symbol: Symbol) -> TickerPrice | None:
     """Fetch price data from Binance exchange."""
     # Initialize the client
-    client = BinanceClient()
+    client = _binance_client()
     try:
         # Get 24hr stats
         ticker = client.get_ticker(symbol=symbol.binance_name)
@@ -867,9 +760,44 @@ def fetch_binance_price(symbol: Symbol) -> TickerPrice | None:
         return None
 
 
+def fetch_binance_all_tickers() -> dict[str, TickerPrice]:
+    """Fetch 24hr stats for every Binance spot symbol in a single request.
+
+    Returns:
+        Dictionary of Binance symbol name (e.g. "BTCUSDT") -> TickerPrice,
+        empty if the request failed
+
+    """
+    client = _binance_client()
+    try:
+        tickers = client.get_ticker()
+    except BinanceAPIException as e:
+        app_logger.error(f"Error fetching Binance tickers: {e.message}")
+        return {}
+    except (ValueError, TypeError, ConnectionError, RequestException) as e:
+        app_logger.error(f"Unexpected error fetching Binance tickers: {e!s}")
+        return {}
+
+    result: dict[str, TickerPrice] = {}
+    for ticker in tickers:
+        try:
+            result[ticker["symbol"]] = TickerPrice(
+                source=SourceID.BINANCE,
+                symbol=ticker["symbol"],
+                low=float(ticker["lowPrice"]),
+                high=float(ticker["highPrice"]),
+                last=float(ticker["lastPrice"]),
+                volume=float(ticker["volume"]),
+                volume_quote=float(ticker.get("quoteVolume", 0)),
+            )
+        except (KeyError, ValueError, TypeError):
+            app_logger.debug("Skipping unparseable ticker %s", ticker.get("symbol"))
+    return result
+
+
 def fetch_close_prices_from_binance(symbol: str, lookback_days: int = 14) -> pd.DataFrame:
     """Fetch historical close prices from Binance for a given symbol."""
-    client = BinanceClient()
+    client = _binance_client()
 
     try:
         start_time = datetime.now(UTC) - timedelta(days=lookback_days)
@@ -924,7 +852,7 @@ def fetch_binance_daily_kline(symbol: Symbol, end_date: date | None = None) -> C
     """Fetch open and close prices from Binance for the last full day."""
     if end_date is None:
         end_date = datetime.now(UTC).date()
-    client = BinanceClient()
+    client = _binance_client()
 
     # Get yesterday's date
     end_date_timestamp = datetime.combine(end_date, datetime.min.time()).timestamp()
@@ -981,7 +909,7 @@ def fetch_binance_hourly_kline(symbol: Symbol, end_time: datetime) -> Candle | N
         Candle object if successful, None otherwise
 
     """
-    client = BinanceClient()
+    client = _binance_client()
 
     # Start time is 1 hour before end time
     start_time = end_time - timedelta(hours=1)
@@ -1036,7 +964,7 @@ def fetch_binance_fifteen_min_kline(symbol: Symbol, end_time: datetime) -> Candl
         Candle object if successful, None otherwise
 
     """
-    client = BinanceClient()
+    client = _binance_client()
 
     if end_time.tzinfo is None:
         # Convert naive datetime to timezone-aware
@@ -1104,7 +1032,7 @@ def fetch_binance_fifteen_min_klines_batch(
 
     """
     max_candles_per_request = 1000
-    client = BinanceClient()
+    client = _binance_client()
 
     # Ensure timezone-aware datetimes
     if start_time.tzinfo is None:
@@ -1212,7 +1140,7 @@ def fetch_binance_hourly_klines_batch(
 
     """
     max_candles_per_request = 1000
-    client = BinanceClient()
+    client = _binance_client()
 
     # Ensure timezone-aware datetimes
     if start_time.tzinfo is None:
@@ -1317,7 +1245,7 @@ def fetch_binance_daily_klines_batch(
 
     """
     max_candles_per_request = 1000
-    client = BinanceClient()
+    client = _binance_client()
 
     # Convert dates to datetime objects for timestamp calculation
     start_datetime = datetime.combine(start_date, datetime.min.time(), tzinfo=UTC)
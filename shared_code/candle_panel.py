@@ -0,0 +1,171 @@
+"""Run-scoped, read-only candle windows shared by the daily indicator reports.
+
+Within one daily report run the moving averages (200 days), MACD (60 days) and price
+change (7 days) reports all read daily candles, and the price range report reads the
+last 24 hourly candles. Loading each window per report and per symbol repeats the
+same database reads and DataFrame construction several times. A ``CandlePanel`` is
+loaded once, right after the candle refresh, with the longest lookback of every
+timeframe (one query per timeframe for all symbols) and each report slices the
+window it needs from it.
+
+The panel is immutable: its mappings are read-only proxies and the underlying
+NumPy columns are non-writeable, so reports cannot affect each other.
+
+Usage:
+------
+    ```python
+    panel = CandlePanel.load(conn, symbols, requests)
+    series = panel.daily(symbol, target_date - timedelta(days=60), target_date)
+    if series is not None:
+        df = series.to_frame()
+    ```
+"""
+
+from collections.abc import Mapping
+from datetime import UTC, date, datetime
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+from infra.telegram_logging_handler import app_logger
+from shared_code.candle_refresh import (
+    TIMEFRAME_DAILY,
+    TIMEFRAME_FIFTEEN_MIN,
+    TIMEFRAME_HOURLY,
+    CandleRefreshRequest,
+)
+from shared_code.candle_series import CandleSeries
+from source_repository import Symbol
+from technical_analysis.repositories.daily_candle_repository import DailyCandleRepository
+from technical_analysis.repositories.fifteen_min_candle_repository import (
+    FifteenMinCandleRepository,
+)
+from technical_analysis.repositories.hourly_candle_repository import HourlyCandleRepository
+
+
+if TYPE_CHECKING:
+    import pyodbc
+
+    from infra.sql_connection import SQLiteConnectionWrapper
+    from technical_analysis.repositories.candle_repository import CandleRepository
+
+
+# Longest daily lookback of the reports (200-day moving averages)
+DAILY_LOOKBACK_DAYS = 200
+
+_REPOSITORIES: dict[str, type["CandleRepository"]] = {
+    TIMEFRAME_DAILY: DailyCandleRepository,
+    TIMEFRAME_HOURLY: HourlyCandleRepository,
+    TIMEFRAME_FIFTEEN_MIN: FifteenMinCandleRepository,
+}
+
+
+def _window_start(value: date | datetime) -> datetime:
+    """Convert a window start to an aware datetime (dates start at midnight UTC)."""
+    if not isinstance(value, datetime):
+        return datetime.combine(value, datetime.min.time(), tzinfo=UTC)
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+def _window_end(value: date | datetime) -> datetime:
+    """Convert a window end to an aware datetime (dates end at 23:59:59.999999 UTC)."""
+    if not isinstance(value, datetime):
+        return datetime.combine(value, datetime.max.time(), tzinfo=UTC)
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+class CandlePanel:
+    """Candle windows for many symbols and timeframes, loaded once per run."""
+
+    def __init__(
+        self,
+        windows: Mapping[str, tuple[datetime, datetime]],
+        series: Mapping[str, Mapping[int, CandleSeries]],
+    ) -> None:
+        """Initialize the panel from already loaded series.
+
+        Args:
+            windows: Loaded (start, end) window per timeframe
+            series: Candle series per timeframe, keyed by symbol ID
+
+        """
+        self._windows = MappingProxyType(dict(windows))
+        self._series = MappingProxyType(
+            {timeframe: MappingProxyType(dict(rows)) for timeframe, rows in series.items()},
+        )
+
+    @classmethod
+    def load(
+        cls,
+        conn: "pyodbc.Connection | SQLiteConnectionWrapper",
+        symbols: list[Symbol],
+        requests: list[CandleRefreshRequest],
+    ) -> "CandlePanel":
+        """Load every requested window for all symbols (one query per timeframe).
+
+        Args:
+            conn: Database connection
+            symbols: Symbols to load
+            requests: Timeframes and windows, usually the ones just refreshed
+
+        Returns:
+            Read-only panel covering the requested windows
+
+        """
+        windows = {}
+        series = {}
+        for request in requests:
+            start, end = _window_start(request.start), _window_end(request.end)
+            repo = _REPOSITORIES[request.timeframe](conn)
+            windows[request.timeframe] = (start, end)
+            series[request.timeframe] = repo.get_candle_series(symbols, start, end)
+            app_logger.info(
+                "Candle panel: loaded %d %s candles for %d symbols",
+                sum(len(s) for s in series[request.timeframe].values()),
+                request.timeframe,
+                len(symbols),
+            )
+        return cls(windows, series)
+
+    def get(
+        self,
+        timeframe: str,
+        symbol: Symbol,
+        start: date | datetime | None = None,
+        end: date | datetime | None = None,
+    ) -> CandleSeries | None:
+        """Return a symbol's candles within a window of a loaded timeframe.
+
+        Args:
+            timeframe: Candle timeframe
+            symbol: Symbol to look up
+            start: Window start, defaults to the start of the loaded window
+            end: Window end, defaults to the end of the loaded window
+
+        Returns:
+            The candles in the window, or None when the panel does not cover the
+            timeframe, symbol or window (callers then read from the database)
+
+        """
+        loaded = self._windows.get(timeframe)
+        series = self._series.get(timeframe, {}).get(symbol.symbol_id)
+        if loaded is None or series is None:
+            return None
+
+        window_start = loaded[0] if start is None else _window_start(start)
+        window_end = loaded[1] if end is None else _window_end(end)
+        if window_start < loaded[0] or window_end > loaded[1]:
+            return None
+        return series.between(window_start, window_end)
+
+    def daily(
+        self,
+        symbol: Symbol,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> CandleSeries | None:
+        """Return a symbol's daily candles between two dates (inclusive)."""
+        return self.get(TIMEFRAME_DAILY, symbol, start_date, end_date)
+
+    def hourly(self, symbol: Symbol) -> CandleSeries | None:
+        """Return a symbol's hourly candles over the whole loaded window."""
+        return self.get(TIMEFRAME_HOURLY, symbol)
@@ -0,0 +1,461 @@
+"""Concurrent multi-symbol candle refresh.
+
+The daily report needs daily, hourly and 15-minute candles for every active symbol.
+Fetching them one symbol at a time makes wall time grow linearly with the symbol list,
+so this module fans the exchange requests out over a bounded thread pool instead.
+
+Threading model:
+----------------
+Timeframes are refreshed finest first, so hourly candles can be derived from the
+15-minute ones and daily from hourly (see shared_code/candle_resampling.py).
+
+1. Plan (calling thread): read cached candles from the database and work out which
+   slots are missing for every (symbol, timeframe) pair. Missing slots that are
+   fully covered by closed finer candles are resampled locally and saved right away.
+   Only sources labelling candles with their close time (Binance) are resampled;
+   KuCoin labels them with their open time and is always fetched.
+2. Fetch (worker threads): call the batch kline endpoints for the missing slots only.
+   Each exchange has its own semaphore so one slow exchange cannot starve the other
+   and neither receives more parallel requests than its rate limits tolerate.
+3. Persist (calling thread): bulk-save fetched candles, which returns their database IDs.
+   Intraday candles that were still forming when fetched are kept for this run only:
+   their slots are never refetched, so storing them would freeze a partial candle.
+
+Workers never touch the database connection, so the calling thread is the single
+writer - neither SQLite nor pyodbc connections are shared across threads.
+
+Usage:
+------
+    ```python
+    engine = CandleRefreshEngine(conn)
+    result = engine.refresh(
+        symbols,
+        [
+            CandleRefreshRequest(TIMEFRAME_DAILY, start_date, today),
+            CandleRefreshRequest(TIMEFRAME_HOURLY, start_time, end_time),
+        ],
+    )
+    daily_candles_by_symbol = result[TIMEFRAME_DAILY]  # {symbol_id: [Candle, ...]}
+    ```
+"""
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from infra.configuration import get_candle_refresh_settings
+from infra.telegram_logging_handler import app_logger
+from shared_code.candle_resampling import (
+    OPEN_TIME_LABELLED_SOURCES,
+    candle_close_time,
+    resample_to_daily,
+    resample_to_hourly,
+)
+from shared_code.common_price import Candle
+from shared_code.price_checker import (
+    BATCH_KLINE_SOURCES,
+    fetch_daily_candle,
+    fetch_fifteen_min_candle,
+    fetch_hourly_candle,
+    fetch_missing_candles_batch,
+    fetch_missing_daily_candles_batch,
+    parse_candle_datetime,
+)
+from source_repository import SourceID, Symbol
+from technical_analysis.repositories.daily_candle_repository import DailyCandleRepository
+from technical_analysis.repositories.fifteen_min_candle_repository import (
+    FifteenMinCandleRepository,
+)
+from technical_analysis.repositories.hourly_candle_repository import HourlyCandleRepository
+
+
+if TYPE_CHECKING:
+    import pyodbc
+
+    from infra.sql_connection import SQLiteConnectionWrapper
+    from technical_analysis.repositories.candle_repository import CandleRepository
+
+
+TIMEFRAME_DAILY = "daily"
+TIMEFRAME_HOURLY = "hourly"
+TIMEFRAME_FIFTEEN_MIN = "fifteen_min"
+
+# Slot key: a date for daily candles, a rounded UTC datetime for intraday candles
+SlotKey = date | datetime
+
+
+@dataclass(frozen=True)
+class CandleRefreshRequest:
+    """A timeframe and time window to refresh for every symbol."""
+
+    timeframe: str
+    start: date | datetime
+    end: date | datetime
+
+
+@dataclass
+class _RefreshTask:
+    """Per (symbol, timeframe) refresh state built during planning."""
+
+    symbol: Symbol
+    timeframe: str
+    candles: dict[SlotKey, Candle]
+    missing: list[SlotKey]
+    derived: list[Candle]
+    # When the exchange fetch started, and slots whose candle was still forming then
+    fetched_at: datetime | None = None
+    forming: set[SlotKey] = field(default_factory=set)
+
+
+def _floor_to_minutes(value: datetime, minutes: int) -> datetime:
+    """Round a datetime down to the given minute interval, forcing UTC."""
+    value = value.replace(tzinfo=UTC) if value.tzinfo is None else value
+    floored_minute = (value.minute // minutes) * minutes
+    return value.replace(minute=floored_minute, second=0, microsecond=0)
+
+
+class _TimeframeSpec:
+    """Slot arithmetic and persistence details for one candle timeframe."""
+
+    def __init__(
+        self,
+        repository_class: type["CandleRepository"],
+        step: timedelta,
+        *,
+        refresh_latest: bool,
+        source_timeframe: str | None = None,
+        resample: Callable[[list[Candle]], list[Candle]] | None = None,
+    ) -> None:
+        """Initialize the timeframe spec.
+
+        Args:
+            repository_class: Repository used to read and save this timeframe
+            step: Distance between consecutive slots
+            refresh_latest: Always refetch the newest slot because it may still be open
+            source_timeframe: Finer timeframe this one can be resampled from
+            resample: Builds complete candles of this timeframe from source candles
+
+        """
+        self.repository_class = repository_class
+        self.step = step
+        self.refresh_latest = refresh_latest
+        self.source_timeframe = source_timeframe
+        self.resample = resample
+
+    def normalize(self, value: date | datetime) -> SlotKey:
+        """Round a boundary of the requested window to a slot key."""
+        if self.step == timedelta(days=1):
+            return value.date() if isinstance(value, datetime) else value
+        if not isinstance(value, datetime):
+            value = datetime.combine(value, datetime.min.time(), tzinfo=UTC)
+        return _floor_to_minutes(value, int(self.step.total_seconds() // 60))
+
+    def slots(self, start: SlotKey, end: SlotKey) -> list[SlotKey]:
+        """List every expected slot between start and end (inclusive)."""
+        result = []
+        current = start
+        while current <= end:
+            result.append(current)
+            current += self.step
+        return result
+
+    def key_for(self, candle: Candle) -> SlotKey:
+        """Return the slot a stored or fetched candle belongs to."""
+        if self.step == timedelta(days=1):
+            return parse_candle_datetime(candle.end_date, round_to_hour=True).date()
+        candle_datetime = parse_candle_datetime(candle.end_date, round_to_hour=False)
+        return _floor_to_minutes(candle_datetime, int(self.step.total_seconds() // 60))
+
+    def db_range(self, start: SlotKey, end: SlotKey) -> tuple[datetime, datetime]:
+        """Return the EndDate range covering the given slots in the database."""
+        if isinstance(start, datetime) and isinstance(end, datetime):
+            return start, end
+        # Daily candles are stored anywhere between 00:00 and 23:59:59.999999 of their day.
+        # SQLite compares these bounds as whole epoch seconds against the Ts column.
+        return (
+            datetime.combine(start, datetime.min.time(), tzinfo=UTC),
+            datetime.combine(end, datetime.max.time(), tzinfo=UTC),
+        )
+
+    def period(self, slot: SlotKey) -> tuple[datetime, datetime]:
+        """Return the (start, end] time period a slot's candle covers."""
+        if isinstance(slot, datetime):
+            return slot - self.step, slot
+        start = datetime.combine(slot, datetime.min.time(), tzinfo=UTC)
+        return start, start + self.step
+
+
+_TIMEFRAMES: dict[str, _TimeframeSpec] = {
+    TIMEFRAME_DAILY: _TimeframeSpec(
+        DailyCandleRepository,
+        timedelta(days=1),
+        refresh_latest=True,
+        source_timeframe=TIMEFRAME_HOURLY,
+        resample=resample_to_daily,
+    ),
+    TIMEFRAME_HOURLY: _TimeframeSpec(
+        HourlyCandleRepository,
+        timedelta(hours=1),
+        refresh_latest=False,
+        source_timeframe=TIMEFRAME_FIFTEEN_MIN,
+        resample=resample_to_hourly,
+    ),
+    TIMEFRAME_FIFTEEN_MIN: _TimeframeSpec(
+        FifteenMinCandleRepository,
+        timedelta(minutes=15),
+        refresh_latest=False,
+    ),
+}
+
+
+# Single-candle fetchers for sources without batch endpoints (called without a connection)
+_SINGLE_CANDLE_FETCHERS: dict[str, Callable[..., Candle | None]] = {
+    TIMEFRAME_DAILY: fetch_daily_candle,
+    TIMEFRAME_HOURLY: fetch_hourly_candle,
+    TIMEFRAME_FIFTEEN_MIN: fetch_fifteen_min_candle,
+}
+
+
+def _fetch_missing(symbol: Symbol, timeframe: str, missing: list[SlotKey]) -> list[Candle]:
+    """Fetch the missing slots of one (symbol, timeframe) pair from its exchange."""
+    if symbol.source_id not in BATCH_KLINE_SOURCES:
+        # No batch endpoint: fall back to one request per missing slot
+        fetch_single = _SINGLE_CANDLE_FETCHERS[timeframe]
+        candles = (fetch_single(symbol, slot) for slot in missing)
+        return [candle for candle in candles if candle is not None]
+    if timeframe == TIMEFRAME_DAILY:
+        return fetch_missing_daily_candles_batch(symbol, missing)  # type: ignore[arg-type]
+    return fetch_missing_candles_batch(symbol, missing, timeframe)  # type: ignore[arg-type]
+
+
+class CandleRefreshEngine:
+    """Refresh candles for many symbols and timeframes with concurrent API fetches."""
+
+    def __init__(
+        self,
+        conn: "pyodbc.Connection | SQLiteConnectionWrapper | None",
+        max_workers: int | None = None,
+        exchange_concurrency: dict[SourceID, int] | None = None,
+        fetch_function: Callable[[Symbol, str, list[SlotKey]], list[Candle]] | None = None,
+    ) -> None:
+        """Initialize the refresh engine.
+
+        Args:
+            conn: Database connection, only ever used from the calling thread
+            max_workers: Thread pool size (defaults to CANDLE_REFRESH_WORKERS)
+            exchange_concurrency: Max parallel requests per exchange
+                (defaults to CANDLE_REFRESH_*_CONCURRENCY)
+            fetch_function: Override for the exchange fetch (symbol, timeframe, missing slots)
+
+        """
+        settings = get_candle_refresh_settings()
+        self.conn = conn
+        self.max_workers = max_workers or settings.max_workers
+        limits = exchange_concurrency or {
+            SourceID.BINANCE: settings.binance_concurrency,
+            SourceID.KUCOIN: settings.kucoin_concurrency,
+        }
+        self._exchange_slots = {
+            source: threading.BoundedSemaphore(limit) for source, limit in limits.items()
+        }
+        self._default_slots = threading.BoundedSemaphore(1)
+        self.fetch_function = fetch_function or _fetch_missing
+        self.logger = app_logger
+
+    def refresh(
+        self,
+        symbols: list[Symbol],
+        requests: list[CandleRefreshRequest],
+    ) -> dict[str, dict[int, list[Candle]]]:
+        """Refresh all requested timeframes for all symbols.
+
+        Args:
+            symbols: Symbols to refresh
+            requests: Timeframes and windows to refresh
+
+        Returns:
+            Dictionary timeframe -> symbol_id -> candles sorted by end date
+
+        """
+        # Finest timeframe first so coarser ones can be resampled from its candles
+        ordered = sorted(requests, key=lambda request: _TIMEFRAMES[request.timeframe].step)
+        tasks_by_timeframe: dict[str, dict[int, _RefreshTask]] = {}
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="candle-refresh",
+        ) as executor:
+            for request in ordered:
+                spec = _TIMEFRAMES[request.timeframe]
+                source_tasks = tasks_by_timeframe.get(spec.source_timeframe or "", {})
+                tasks = [
+                    self._plan(symbol, request, source_tasks.get(symbol.symbol_id))
+                    for symbol in symbols
+                ]
+                tasks_by_timeframe[request.timeframe] = {
+                    task.symbol.symbol_id: task for task in tasks
+                }
+                self._run_stage(executor, request.timeframe, tasks)
+
+        result: dict[str, dict[int, list[Candle]]] = {}
+        for timeframe, tasks_by_symbol in tasks_by_timeframe.items():
+            result[timeframe] = {
+                symbol_id: [task.candles[key] for key in sorted(task.candles)]
+                for symbol_id, task in tasks_by_symbol.items()
+            }
+        return result
+
+    def _run_stage(
+        self,
+        executor: ThreadPoolExecutor,
+        timeframe: str,
+        tasks: list[_RefreshTask],
+    ) -> None:
+        """Save resampled candles, then fetch and save the remaining missing slots."""
+        derived_count = 0
+        for task in tasks:
+            if task.derived:
+                derived_count += len(task.derived)
+                self._persist(task, task.derived)
+
+        pending = [task for task in tasks if task.missing]
+        self.logger.info(
+            "Candle refresh (%s): %d resampled locally, %d of %d symbols need exchange data",
+            timeframe,
+            derived_count,
+            len(pending),
+            len(tasks),
+        )
+        if not pending:
+            return
+
+        futures: dict[Future[list[Candle]], _RefreshTask] = {
+            executor.submit(self._fetch_with_limit, task): task for task in pending
+        }
+        # Persist on the calling thread as results arrive (single DB writer)
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                fetched = future.result()
+            except Exception:
+                self.logger.exception(
+                    "Candle refresh failed for %s (%s)",
+                    task.symbol.symbol_name,
+                    task.timeframe,
+                )
+                continue
+            self._persist(task, fetched)
+
+    def _plan(
+        self,
+        symbol: Symbol,
+        request: CandleRefreshRequest,
+        source_task: _RefreshTask | None = None,
+    ) -> _RefreshTask:
+        """Load cached candles and determine missing slots for one pair.
+
+        Args:
+            symbol: Symbol to plan for
+            request: Timeframe and window to refresh
+            source_task: Same symbol's task for the finer source timeframe, if it
+                was refreshed in this run
+
+        """
+        spec = _TIMEFRAMES[request.timeframe]
+        start = spec.normalize(request.start)
+        end = spec.normalize(request.end)
+        expected = spec.slots(start, end)
+
+        candles: dict[SlotKey, Candle] = {}
+        if self.conn:
+            repo = spec.repository_class(self.conn)
+            db_start, db_end = spec.db_range(start, end)
+            for candle in repo.get_candles(symbol, db_start, db_end):
+                candles[spec.key_for(candle)] = candle
+
+        missing = [slot for slot in expected if slot not in candles]
+        if spec.refresh_latest and expected and expected[-1] not in missing:
+            missing.append(expected[-1])
+
+        derived = self._resample_missing(symbol, spec, missing, source_task)
+        derived_slots = {spec.key_for(candle) for candle in derived}
+
+        return _RefreshTask(
+            symbol=symbol,
+            timeframe=request.timeframe,
+            candles=candles,
+            missing=[slot for slot in missing if slot not in derived_slots],
+            derived=derived,
+        )
+
+    def _resample_missing(
+        self,
+        symbol: Symbol,
+        spec: _TimeframeSpec,
+        missing: list[SlotKey],
+        source_task: _RefreshTask | None,
+    ) -> list[Candle]:
+        """Build missing candles from closed finer candles that fully cover their period."""
+        if not missing or spec.source_timeframe is None or spec.resample is None:
+            return []
+        if symbol.source_id.value in OPEN_TIME_LABELLED_SOURCES:
+            # The resampler expects close-time labels
+            return []
+
+        source_spec = _TIMEFRAMES[spec.source_timeframe]
+        source: dict[SlotKey, Candle] = dict(source_task.candles) if source_task else {}
+        if self.conn:
+            repo = source_spec.repository_class(self.conn)
+            first_start, _ = spec.period(min(missing))
+            _, last_end = spec.period(max(missing))
+            for candle in repo.get_candles(symbol, first_start + source_spec.step, last_end):
+                source[source_spec.key_for(candle)] = candle
+
+        # A part that was still forming would make a partial period look complete
+        forming = source_task.forming if source_task else set()
+        now = datetime.now(UTC)
+        parts = [
+            candle
+            for key, candle in source.items()
+            if key not in forming and candle_close_time(candle, source_spec.step) <= now
+        ]
+        wanted = set(missing)
+        return [candle for candle in spec.resample(parts) if spec.key_for(candle) in wanted]
+
+    def _fetch_with_limit(self, task: _RefreshTask) -> list[Candle]:
+        """Fetch missing candles while holding the exchange's concurrency slot."""
+        slots = self._exchange_slots.get(task.symbol.source_id, self._default_slots)
+        with slots:
+            task.fetched_at = datetime.now(UTC)
+            return self.fetch_function(task.symbol, task.timeframe, task.missing)
+
+    def _persist(self, task: _RefreshTask, fetched: list[Candle]) -> None:
+        """Save fetched or resampled candles and merge them (with IDs) into the task."""
+        if not fetched:
+            return
+
+        spec = _TIMEFRAMES[task.timeframe]
+        if task.fetched_at is not None and not spec.refresh_latest:
+            for candle in fetched:
+                if candle_close_time(candle, spec.step) > task.fetched_at:
+                    task.forming.add(spec.key_for(candle))
+                    task.candles[spec.key_for(candle)] = candle
+            fetched = [candle for candle in fetched if spec.key_for(candle) not in task.forming]
+
+        if not self.conn:
+            # No database connection, just use fetched candles without IDs
+            for candle in fetched:
+                task.candles[spec.key_for(candle)] = candle
+            return
+
+        repo = spec.repository_class(self.conn)
+        # Bulk save returns the candles with their database-assigned IDs
+        for candle in repo.save_candles(
+            task.symbol,
+            fetched,
+            source=task.symbol.source_id.value,
+        ):
+            task.candles[spec.key_for(candle)] = candle
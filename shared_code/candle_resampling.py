@@ -0,0 +1,142 @@
+"""Derive coarser candles from finer ones instead of downloading them again.
+
+An hourly candle is exactly the aggregate of its four 15-minute candles, and a
+daily candle is exactly the aggregate of its 24 hourly candles. When the finer
+candles of a period are all stored, the coarser candle can be built locally and
+the exchange only has to be asked for periods that are not fully covered.
+
+End date conventions follow the Binance fetchers:
+- 15-minute and hourly candles: ``end_date`` is the candle's close boundary
+  (the hourly candle ending 13:00 covers 12:00-13:00 and is built from the
+  15-minute candles ending 12:15, 12:30, 12:45 and 13:00).
+- Daily candles: ``end_date`` is 23:59:59.999999 UTC of the candle's day, built
+  from the hourly candles ending 01:00 of that day through 00:00 of the next day.
+
+KuCoin batch candles are labelled with their open time instead (see
+``OPEN_TIME_LABELLED_SOURCES``), so they must not be passed to the resamplers.
+
+Only complete periods are returned - a period with any missing finer candle is
+skipped so a partial aggregate is never stored as if it were exchange data.
+Callers pass closed candles only; the resamplers cannot tell a finished part from
+one that was still forming when it was fetched.
+"""
+
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from shared_code.common_price import Candle
+from shared_code.price_checker import parse_candle_datetime
+from source_repository import SourceID
+
+
+FIFTEEN_MINUTES = timedelta(minutes=15)
+ONE_HOUR = timedelta(hours=1)
+
+# Sources whose batch klines are labelled with the candle's open time (``kline[0]``)
+OPEN_TIME_LABELLED_SOURCES = frozenset({SourceID.KUCOIN.value})
+
+# Number of finer candles that make up one complete coarser candle
+FIFTEEN_MIN_PER_HOUR = 4
+HOURS_PER_DAY = 24
+
+
+def candle_close_time(candle: Candle, period: timedelta) -> datetime:
+    """Return the time a candle closes, whichever boundary its end date labels.
+
+    Args:
+        candle: Stored or fetched candle
+        period: Duration of the candle's timeframe
+
+    Returns:
+        Close time as an aware UTC datetime
+
+    """
+    end = parse_candle_datetime(candle.end_date, round_to_hour=False)
+    return end + period if candle.source in OPEN_TIME_LABELLED_SOURCES else end
+
+
+def _aggregate(parts: list[Candle], end_date: str) -> Candle:
+    """Combine consecutive candles (sorted by end date) into one candle."""
+    first, last = parts[0], parts[-1]
+    return Candle(
+        symbol=first.symbol,
+        source=first.source,
+        end_date=end_date,
+        open=first.open if first.open is not None else first.close,
+        close=last.close,
+        last=last.last,
+        high=max(c.high for c in parts),
+        low=min(c.low for c in parts),
+        volume=sum(c.volume for c in parts),
+        volume_quote=sum(c.volume_quote for c in parts),
+    )
+
+
+def _resample(
+    candles: list[Candle],
+    step: timedelta,
+    parts_per_bucket: int,
+    bucket_for: Callable[[datetime], datetime | date],
+    end_date_for: Callable[[Any], str],
+) -> list[Candle]:
+    """Group candles into buckets and aggregate every complete bucket."""
+    buckets: dict[datetime | date, dict[datetime, Candle]] = defaultdict(dict)
+    for candle in candles:
+        end = parse_candle_datetime(candle.end_date, round_to_hour=False)
+        # Snap to the candle grid so slightly off timestamps still line up
+        end = datetime.fromtimestamp(
+            round(end.timestamp() / step.total_seconds()) * step.total_seconds(),
+            tz=UTC,
+        )
+        buckets[bucket_for(end)][end] = candle
+
+    result = []
+    for bucket in sorted(buckets):
+        parts = buckets[bucket]
+        if len(parts) == parts_per_bucket:
+            result.append(_aggregate([parts[end] for end in sorted(parts)], end_date_for(bucket)))
+    return result
+
+
+def resample_to_hourly(fifteen_min_candles: list[Candle]) -> list[Candle]:
+    """Build hourly candles from complete sets of four 15-minute candles.
+
+    Args:
+        fifteen_min_candles: 15-minute candles of one symbol, in any order
+
+    Returns:
+        Hourly candles sorted by end date, one per fully covered hour
+
+    """
+
+    def hour_end(end: datetime) -> datetime:
+        return (end - FIFTEEN_MINUTES).replace(minute=0) + ONE_HOUR
+
+    return _resample(
+        fifteen_min_candles,
+        FIFTEEN_MINUTES,
+        FIFTEEN_MIN_PER_HOUR,
+        hour_end,
+        lambda end: end.isoformat(),
+    )
+
+
+def resample_to_daily(hourly_candles: list[Candle]) -> list[Candle]:
+    """Build daily candles from complete sets of 24 hourly candles.
+
+    Args:
+        hourly_candles: Hourly candles of one symbol, in any order
+
+    Returns:
+        Daily candles sorted by end date, one per fully covered UTC day
+
+    """
+    return _resample(
+        hourly_candles,
+        ONE_HOUR,
+        HOURS_PER_DAY,
+        lambda end: (end - ONE_HOUR).date(),
+        lambda day: datetime.combine(day, datetime.max.time(), tzinfo=UTC).isoformat(),
+    )
@@ -0,0 +1,204 @@
+"""Columnar (NumPy) representation of one symbol's candles.
+
+Report code mostly needs whole columns (closes for RSI/MACD, highs and lows for
+ranges) rather than individual ``Candle`` objects. ``CandleSeries`` keeps one
+symbol's candles as read-only arrays sorted by end date, built straight from
+database rows or column arrays without creating a ``Candle`` per row.
+
+End dates are stored as ``datetime64[us]`` in naive UTC, matching how the reports
+normalise dates before building DataFrames.
+"""
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, fields
+from datetime import UTC, date, datetime
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from numpy.typing import ArrayLike, DTypeLike
+
+from shared_code.common_price import Candle
+
+
+# Row layout produced by the candle repositories' SELECT statements
+_ID = 0
+_SOURCE = 2
+_END_DATE = 3
+_OPEN = 4
+_CLOSE = 5
+_HIGH = 6
+_LOW = 7
+_LAST = 8
+_VOLUME = 9
+_VOLUME_QUOTE = 10
+
+# Placeholder for candles that have no database ID (not saved yet)
+MISSING_ID = -1
+
+
+def to_datetime64(value: str | datetime | date | np.datetime64) -> np.datetime64:
+    """Convert a candle end date to naive-UTC ``datetime64[us]``."""
+    if isinstance(value, np.datetime64):
+        return value.astype("datetime64[us]")
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return np.datetime64(value, "us")
+
+
+def _readonly(values: ArrayLike, dtype: DTypeLike) -> np.ndarray:
+    """Build an array that cannot be modified by consumers sharing it."""
+    array = np.asarray(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+
+@dataclass(frozen=True)
+class CandleSeries:
+    """Read-only column arrays of one symbol's candles, sorted by end date."""
+
+    symbol: str
+    ids: np.ndarray
+    sources: np.ndarray
+    end_dates: np.ndarray
+    open: np.ndarray
+    close: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    last: np.ndarray
+    volume: np.ndarray
+    volume_quote: np.ndarray
+
+    def __len__(self) -> int:
+        """Return the number of candles."""
+        return len(self.end_dates)
+
+    @classmethod
+    def from_rows(cls, symbol: str, rows: Sequence[Sequence[Any]]) -> "CandleSeries":
+        """Build a series from candle repository rows already sorted by end date.
+
+        Args:
+            symbol: Symbol name the candles belong to
+            rows: Rows in the repository column order (Id, SymbolID, SourceID,
+                EndDate, Open, Close, High, Low, Last, Volume, VolumeQuote)
+
+        """
+
+        def column(index: int) -> list[Any]:
+            return [row[index] for row in rows]
+
+        def floats(index: int) -> np.ndarray:
+            return _readonly([np.nan if v is None else v for v in column(index)], np.float64)
+
+        return cls(
+            symbol=symbol,
+            ids=_readonly(column(_ID), np.int64),
+            sources=_readonly(column(_SOURCE), np.int64),
+            end_dates=_readonly([to_datetime64(v) for v in column(_END_DATE)], "datetime64[us]"),
+            open=floats(_OPEN),
+            close=floats(_CLOSE),
+            high=floats(_HIGH),
+            low=floats(_LOW),
+            last=floats(_LAST),
+            volume=floats(_VOLUME),
+            volume_quote=floats(_VOLUME_QUOTE),
+        )
+
+    @classmethod
+    def from_columns(cls, symbol: str, columns: Mapping[str, np.ndarray]) -> "CandleSeries":
+        """Build a series from column arrays already sorted by end date.
+
+        Args:
+            symbol: Symbol name the candles belong to
+            columns: Arrays keyed by the repository column names, as returned by
+                ``fetch_columns`` (EndDate as int64 UTC epoch seconds)
+
+        """
+        return cls(
+            symbol=symbol,
+            ids=_readonly(columns["Id"], np.int64),
+            sources=_readonly(columns["SourceID"], np.int64),
+            end_dates=_readonly(
+                np.asarray(columns["EndDate"], dtype=np.int64).astype("datetime64[s]"),
+                "datetime64[us]",
+            ),
+            open=_readonly(columns["Open"], np.float64),
+            close=_readonly(columns["Close"], np.float64),
+            high=_readonly(columns["High"], np.float64),
+            low=_readonly(columns["Low"], np.float64),
+            last=_readonly(columns["Last"], np.float64),
+            volume=_readonly(columns["Volume"], np.float64),
+            volume_quote=_readonly(columns["VolumeQuote"], np.float64),
+        )
+
+    @classmethod
+    def from_candles(cls, symbol: str, candles: Iterable[Candle]) -> "CandleSeries":
+        """Build a series from Candle objects (sorted by end date on the way in)."""
+        rows = sorted(
+            (
+                (
+                    MISSING_ID if c.id is None else c.id,
+                    None,
+                    c.source,
+                    c.end_date,
+                    c.open,
+                    c.close,
+                    c.high,
+                    c.low,
+                    c.last,
+                    c.volume,
+                    c.volume_quote,
+                )
+                for c in candles
+            ),
+            key=lambda row: to_datetime64(row[_END_DATE]),
+        )
+        return cls.from_rows(symbol, rows)
+
+    def between(
+        self,
+        start: str | datetime | date | np.datetime64,
+        end: str | datetime | date | np.datetime64,
+    ) -> "CandleSeries":
+        """Return the candles with start <= end date <= end (array views, no copies)."""
+        first = int(np.searchsorted(self.end_dates, to_datetime64(start), side="left"))
+        last = int(np.searchsorted(self.end_dates, to_datetime64(end), side="right"))
+        window = slice(first, last)
+        values = {f.name: getattr(self, f.name)[window] for f in fields(self) if f.name != "symbol"}
+        return CandleSeries(symbol=self.symbol, **values)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the OHLCV columns as a DataFrame indexed by naive-UTC end date."""
+        return pd.DataFrame(
+            {
+                "Open": self.open,
+                "High": self.high,
+                "Low": self.low,
+                "Close": self.close,
+                "Volume": self.volume,
+            },
+            index=pd.DatetimeIndex(self.end_dates, name="Date"),
+        )
+
+    def to_candles(self) -> list[Candle]:
+        """Materialise Candle objects for code that still works on candle lists."""
+        return [
+            Candle(
+                id=None if self.ids[i] == MISSING_ID else int(self.ids[i]),
+                symbol=self.symbol,
+                source=int(self.sources[i]),
+                end_date=pd.Timestamp(self.end_dates[i]).tz_localize(UTC).isoformat(),
+                open=float(self.open[i]),
+                close=float(self.close[i]),
+                high=float(self.high[i]),
+                low=float(self.low[i]),
+                last=float(self.last[i]),
+                volume=float(self.volume[i]),
+                volume_quote=float(self.volume_quote[i]),
+            )
+            for i in range(len(self))
+        ]
@@ -4,13 +4,14 @@ from pycoingecko import CoinGeckoAPI
 
 from infra.telegram_logging_handler import app_logger
 from shared_code.common_price import TickerPrice
+from shared_code.http_session import pooled_client
 from source_repository import SourceID, Symbol
 
 
 def fetch_coingecko_price(symbol: Symbol) -> TickerPrice:
     """Fetch current price from CoinGecko API and return as TickerPrice object."""
     try:
-        cg = CoinGeckoAPI()
+        cg = pooled_client(CoinGeckoAPI())
         price_data = cg.get_price(ids=symbol.full_name, vs_currencies="usd")
         return TickerPrice(
             source=SourceID.COINGECKO,
@@ -0,0 +1,349 @@
+"""Streaming aggTrade collector that keeps the hourly CVD snapshots current.
+
+Instead of paging the aggTrades REST endpoint backwards at report time, a
+long-running collector subscribes to the ``<symbol>@aggTrade`` streams of all
+tracked Binance symbols over one multiplexed WebSocket connection, buffers the
+trades in memory and writes one ``CVDHourlySnapshot`` per symbol and hour through
+``CVDRepository.save_hourly_snapshots`` once the hour has closed. With the
+collector running (``CVD_STREAM_ENABLED``), ``fetch_cvd_report`` only fetches the
+trades after the last stored one (the current hour) and keeps them in memory.
+
+Each connection is opened first and starts buffering; then the trades its
+symbols missed (while the collector was down, or during a disconnect) are
+backfilled over REST from the last stored trade ID (the last 24 hours for symbols
+without any). Until its backfill is stored a symbol's buffered trades are held
+back, and streamed trades the backfill already covered are dropped afterwards, so
+neither a restart nor a reconnect leaves a gap or counts a trade twice. Before
+reconnecting, the trades buffered up to the disconnect are stored as partial
+hours, so the backfill starts right after them.
+
+An hour counts as closed when a later trade of any symbol arrives (stream time)
+or when the wall clock passes its end, so quiet symbols are flushed too. Trades
+still buffered when the collector stops are flushed as a partial hour; the
+repository adds later trades of the same hour on top (they have newer trade IDs).
+
+Usage:
+------
+    ```python
+    collector = AggTradeStreamCollector(CVDRepository(conn), symbols)
+    await collector.run()
+    ```
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import Callable, Collection, Mapping
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import numpy as np
+
+from infra.configuration import get_cvd_stream_settings
+from infra.telegram_logging_handler import app_logger
+from shared_code.agg_trades import MS_PER_HOUR, AggTradeColumns
+from shared_code.binance import (
+    CVDHourlySnapshot,
+    build_hourly_snapshots,
+    fetch_cvd_trades_incremental,
+)
+from source_repository import SourceID, Symbol, fetch_symbols
+from technical_analysis.repositories.cvd_repository import CVDRepository
+
+
+if TYPE_CHECKING:
+    import pyodbc
+
+    from infra.sql_connection import SQLiteConnectionWrapper
+
+
+# Binance allows up to 200 streams per combined-stream connection
+MAX_STREAMS_PER_CONNECTION = 200
+RECONNECT_DELAY_SECONDS = 5.0
+CLOCK_FLUSH_INTERVAL_SECONDS = 60.0
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def stream_url(base_url: str, symbols: list[Symbol]) -> str:
+    """Build the combined-stream URL subscribing to the symbols' aggTrade streams."""
+    streams = "/".join(f"{symbol.binance_name.lower()}@aggTrade" for symbol in symbols)
+    return f"{base_url}?streams={streams}"
+
+
+class HourlyTradeBuffer:
+    """Trades per symbol that belong to hours not written to the database yet."""
+
+    def __init__(self, last_trade_ids: Mapping[int, int | None] | None = None) -> None:
+        """Initialize the buffer.
+
+        Args:
+            last_trade_ids: Last stored trade ID per symbol ID; older trades are dropped
+
+        """
+        self._trades: dict[int, list[Mapping[str, Any]]] = {}
+        self._last_trade_ids = {k: v for k, v in (last_trade_ids or {}).items() if v is not None}
+        self._held: set[int] = set()
+        self.watermark_ms = 0
+
+    def __len__(self) -> int:
+        """Return the number of buffered trades."""
+        return sum(len(trades) for trades in self._trades.values())
+
+    def last_trade_id(self, symbol_id: int) -> int | None:
+        """Return the last stored trade ID of a symbol."""
+        return self._last_trade_ids.get(symbol_id)
+
+    def hold(self, symbol_id: int) -> None:
+        """Keep a symbol's trades buffered until :meth:`resume_after` (backfill pending)."""
+        self._held.add(symbol_id)
+
+    def resume_after(self, symbol_id: int, trade_id: int | None) -> None:
+        """Release a held symbol whose trades up to ``trade_id`` were stored elsewhere.
+
+        Buffered and later trades up to ``trade_id`` are dropped.
+        """
+        self._held.discard(symbol_id)
+        if trade_id is not None:
+            self._last_trade_ids[symbol_id] = max(
+                trade_id,
+                self._last_trade_ids.get(symbol_id, trade_id),
+            )
+
+    def add(self, symbol_id: int, trade: Mapping[str, Any]) -> None:
+        """Buffer one aggTrade event unless it was already stored."""
+        last_trade_id = self._last_trade_ids.get(symbol_id)
+        if last_trade_id is not None and trade["a"] <= last_trade_id:
+            return
+        self._trades.setdefault(symbol_id, []).append(trade)
+        self.watermark_ms = max(self.watermark_ms, trade["T"])
+
+    def pop_closed(
+        self,
+        now_ms: int | None = None,
+        symbol_ids: Collection[int] | None = None,
+    ) -> list[CVDHourlySnapshot]:
+        """Remove the trades of closed hours and return them as hourly snapshots.
+
+        Held symbols are skipped. Trades up to a symbol's last stored trade ID
+        (buffered before a backfill stored them) are dropped.
+
+        Args:
+            now_ms: Wall-clock time in epoch ms; hours ending before the later of
+                this and the newest trade time are closed. None flushes every
+                buffered trade, including the current hour.
+            symbol_ids: Only flush these symbols (all when None)
+
+        Returns:
+            Snapshots of the closed hours, per symbol and oldest first
+
+        """
+        cutoff_ms = None
+        if now_ms is not None:
+            reference_ms = max(now_ms, self.watermark_ms)
+            cutoff_ms = reference_ms - reference_ms % MS_PER_HOUR
+
+        snapshots: list[CVDHourlySnapshot] = []
+        for symbol_id, trades in list(self._trades.items()):
+            if symbol_id in self._held or (symbol_ids is not None and symbol_id not in symbol_ids):
+                continue
+            columns = AggTradeColumns.from_payload(trades)
+            is_new = np.ones(len(trades), dtype=bool)
+            if symbol_id in self._last_trade_ids:
+                is_new = columns.trade_ids > self._last_trade_ids[symbol_id]
+            is_closed = is_new if cutoff_ms is None else is_new & (columns.times_ms < cutoff_ms)
+            self._trades[symbol_id] = [
+                trade for trade, keep in zip(trades, is_new & ~is_closed, strict=True) if keep
+            ]
+            if not self._trades[symbol_id]:
+                del self._trades[symbol_id]
+            if not is_closed.any():
+                continue
+            closed = columns.take(is_closed)
+            snapshots.extend(build_hourly_snapshots(closed, symbol_id))
+            self._last_trade_ids[symbol_id] = int(closed.trade_ids[-1])
+        return snapshots
+
+
+class AggTradeStreamCollector:
+    """Collects Binance Futures aggTrades for many symbols into hourly snapshots."""
+
+    def __init__(
+        self,
+        repo: CVDRepository,
+        symbols: list[Symbol],
+        url: str | None = None,
+        clock: Callable[[], int] = _now_ms,
+    ) -> None:
+        """Initialize the collector.
+
+        Args:
+            repo: Repository the hourly snapshots are written to
+            symbols: Tracked symbols (non-Binance symbols are ignored)
+            url: Combined-stream endpoint, defaults to the configured one
+            clock: Returns the current time in epoch ms
+
+        """
+        self.repo = repo
+        self.symbols = [s for s in symbols if s.source_id == SourceID.BINANCE]
+        self.url = url or get_cvd_stream_settings().url
+        self.clock = clock
+        self._symbol_ids = {s.binance_name: s.symbol_id for s in self.symbols}
+        self.buffer = HourlyTradeBuffer(
+            {s.symbol_id: repo.get_last_trade_id(s.symbol_id) for s in self.symbols},
+        )
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """Stream trades until ``stop`` is set, then flush what is buffered.
+
+        Args:
+            stop: Event that ends the collector (runs forever when None)
+
+        """
+        stop = stop or asyncio.Event()
+        chunks = [
+            self.symbols[i : i + MAX_STREAMS_PER_CONNECTION]
+            for i in range(0, len(self.symbols), MAX_STREAMS_PER_CONNECTION)
+        ]
+        app_logger.info(
+            "CVD stream: collecting aggTrades for %d symbols over %d connection(s)",
+            len(self.symbols),
+            len(chunks),
+        )
+        async with aiohttp.ClientSession() as session:
+            tasks = [asyncio.create_task(self._consume(session, chunk, stop)) for chunk in chunks]
+            tasks.append(asyncio.create_task(self._flush_on_clock(stop)))
+            try:
+                await stop.wait()
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                self.flush(final=True)
+
+    async def backfill(self, symbols: list[Symbol]) -> int:
+        """Store the trades the stream missed over REST and release the symbols.
+
+        Runs while the (re)opened connection is already buffering; the symbols
+        should be held (see :meth:`HourlyTradeBuffer.hold`) so no streamed hour is
+        written before the REST trades. Each symbol is fetched from its last stored
+        trade ID and released once its snapshots are saved.
+
+        Args:
+            symbols: Symbols of the connection
+
+        Returns:
+            Number of snapshots saved
+
+        """
+        saved = 0
+        for symbol in symbols:
+            backfilled_trade_id = None
+            try:
+                snapshots = await asyncio.to_thread(
+                    fetch_cvd_trades_incremental,
+                    symbol=symbol,
+                    symbol_id=symbol.symbol_id,
+                    last_trade_id=self.buffer.last_trade_id(symbol.symbol_id),
+                    max_hours=24,
+                )
+                trade_ids = [s.last_trade_id for s in snapshots if s.last_trade_id is not None]
+                if trade_ids and self.repo.save_hourly_snapshots(snapshots):
+                    saved += len(snapshots)
+                    backfilled_trade_id = max(trade_ids)
+            finally:
+                # Streamed trades up to the backfilled ones must not be counted twice
+                self.buffer.resume_after(symbol.symbol_id, backfilled_trade_id)
+        app_logger.info("CVD stream: backfilled %d hourly snapshots over REST", saved)
+        return saved
+
+    def flush(self, *, final: bool = False, symbols: list[Symbol] | None = None) -> int:
+        """Write the snapshots of closed hours (or of everything when final).
+
+        Args:
+            final: Also write the current, partial hour
+            symbols: Only flush these symbols (all when None)
+
+        Returns:
+            Number of snapshots saved
+
+        """
+        symbol_ids = None if symbols is None else {s.symbol_id for s in symbols}
+        snapshots = self.buffer.pop_closed(None if final else self.clock(), symbol_ids)
+        if not snapshots:
+            return 0
+        saved = self.repo.save_hourly_snapshots(snapshots)
+        app_logger.info("CVD stream: saved %d hourly snapshots", saved)
+        return saved
+
+    def handle_message(self, payload: Mapping[str, Any]) -> None:
+        """Buffer one combined-stream message and flush hours it closes."""
+        trade = payload.get("data", payload)
+        if trade.get("e") != "aggTrade":
+            return
+        symbol_id = self._symbol_ids.get(trade["s"])
+        if symbol_id is None:
+            return
+        previous_hour = self.buffer.watermark_ms // MS_PER_HOUR
+        self.buffer.add(symbol_id, trade)
+        if self.buffer.watermark_ms // MS_PER_HOUR > previous_hour:
+            self.flush()
+
+    async def _consume(
+        self,
+        session: aiohttp.ClientSession,
+        symbols: list[Symbol],
+        stop: asyncio.Event,
+    ) -> None:
+        """Read one multiplexed connection, reconnecting until stopped.
+
+        Every (re)connect backfills the connection's symbols over REST while the
+        stream is already buffering.
+        """
+        url = stream_url(self.url, symbols)
+        while not stop.is_set():
+            # Store what arrived before a disconnect; the backfill continues after it
+            self.flush(final=True, symbols=symbols)
+            for symbol in symbols:
+                self.buffer.hold(symbol.symbol_id)
+            try:
+                async with session.ws_connect(url, heartbeat=30) as ws:
+                    backfill = asyncio.create_task(self.backfill(symbols))
+                    try:
+                        async for message in ws:
+                            if message.type != aiohttp.WSMsgType.TEXT:
+                                break
+                            self.handle_message(json.loads(message.data))
+                    finally:
+                        if stop.is_set():
+                            backfill.cancel()
+                        else:
+                            await backfill
+            except (aiohttp.ClientError, TimeoutError, json.JSONDecodeError) as e:
+                app_logger.warning(f"CVD stream connection error: {e!s}")
+            if not stop.is_set():
+                app_logger.info("CVD stream: reconnecting in %.0fs", RECONNECT_DELAY_SECONDS)
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    async def _flush_on_clock(self, stop: asyncio.Event) -> None:
+        """Flush hours closed by the wall clock when no trade closes them."""
+        while not stop.is_set():
+            await asyncio.sleep(CLOCK_FLUSH_INTERVAL_SECONDS)
+            self.flush()
+
+
+async def run_cvd_stream_collector(
+    conn: "pyodbc.Connection | SQLiteConnectionWrapper",
+    stop: asyncio.Event | None = None,
+) -> None:
+    """Run the collector for all active symbols until stopped.
+
+    Args:
+        conn: Database connection the snapshots are written to
+        stop: Event that ends the collector (runs forever when None)
+
+    """
+    collector = AggTradeStreamCollector(CVDRepository(conn), fetch_symbols(conn))
+    await collector.run(stop)
@@ -0,0 +1,30 @@
+"""Integer epoch timestamps used by the SQLite time series columns.
+
+SQLite keeps timestamps as ISO text (``EndDate``, ``IndicatorDate``,
+``HourTimestamp``, ...). Comparing those strings depends on how each value was
+formatted ("2025-01-01", "2025-01-01T00:00:00", "...+00:00"), so every time series
+table also has an integer ``Ts`` column with the same instant in seconds since the
+Unix epoch (see ``database/migrations/add_epoch_timestamp_columns.py``). Range
+filters bind :func:`to_epoch` values against ``Ts`` instead of ISO strings.
+"""
+
+from datetime import UTC, date, datetime
+
+
+# Name of the epoch seconds column in the SQLite time series tables
+EPOCH_COLUMN = "Ts"
+
+
+def to_epoch(value: datetime | date | str) -> int:
+    """Convert a datetime, date or ISO string to whole seconds since the Unix epoch.
+
+    Naive datetimes are taken as UTC and dates as midnight UTC, matching how SQLite
+    computes ``Ts`` from the stored text.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return int(value.timestamp() // 1)
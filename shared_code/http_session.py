@@ -0,0 +1,131 @@
+"""Process-wide pooled HTTP connections shared by exchange clients and plain requests.
+
+Creating a ``BinanceClient()`` or calling ``requests.get`` without a session opens a
+new TCP + TLS connection every time (and the Binance client pings the API on
+creation). Instead, one module-level adapter keeps keep-alive connection pools per
+host for the whole process, which on Azure Functions also spans invocations on a
+warm instance:
+
+- :func:`pooled_client` mounts the shared adapter on an exchange client's own
+  ``requests`` session. Clients keep their own headers (which carry API keys),
+  but reuse the pooled connections and the shared rate limiters.
+- :func:`get_http_session` returns one shared session for plain HTTP calls.
+
+Requests without an explicit timeout get ``DEFAULT_TIMEOUT_SECONDS``; idempotent
+requests are retried on connection errors and 502/503/504 responses.
+
+Usage:
+------
+    ```python
+    client = pooled_client(BinanceClient(ping=False))
+    response = get_http_session().get(url, timeout=10)
+    ```
+"""
+
+import threading
+from typing import Any, TypeVar
+
+from requests import PreparedRequest, Response, Session
+from urllib3.util.retry import Retry
+
+from shared_code.rate_limiter import RateLimitedAdapter
+
+
+# Number of hosts with a cached connection pool, and connections kept per host
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 16
+DEFAULT_TIMEOUT_SECONDS = 30.0
+RETRY_STATUS_CODES = (502, 503, 504)
+
+_Client = TypeVar("_Client")
+
+
+class PooledAdapter(RateLimitedAdapter):
+    """Rate limited adapter with keep-alive pools, retries and a default timeout."""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT_SECONDS) -> None:
+        """Initialize the adapter with the process-wide pool sizes."""
+        super().__init__(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.5,
+                status_forcelist=RETRY_STATUS_CODES,
+                raise_on_status=False,
+            ),
+        )
+        self.timeout = timeout
+
+    def send(self, request: PreparedRequest, *args: Any, **kwargs: Any) -> Response:
+        """Send the request, applying the default timeout when none was given."""
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, *args, **kwargs)
+
+    def close(self) -> None:
+        """Keep the shared pools open when a client closes its own session.
+
+        python-binance clients close their session when garbage collected, which
+        would otherwise drop every pooled connection after each call.
+        """
+
+    def shutdown(self) -> None:
+        """Close all pooled connections."""
+        super().close()
+
+
+_adapter: PooledAdapter | None = None
+_session: Session | None = None
+_lock = threading.RLock()
+
+
+def get_http_adapter() -> PooledAdapter:
+    """Get the process-wide pooled adapter, creating it on first use."""
+    global _adapter  # noqa: PLW0603
+    with _lock:
+        if _adapter is None:
+            _adapter = PooledAdapter()
+        return _adapter
+
+
+def _mount(session: Session) -> Session:
+    adapter = get_http_adapter()
+    if session.get_adapter("https://") is not adapter:
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    return session
+
+
+def get_http_session() -> Session:
+    """Get the shared session for plain (unauthenticated) HTTP calls."""
+    global _session  # noqa: PLW0603
+    with _lock:
+        if _session is None:
+            _session = _mount(Session())
+        return _session
+
+
+def pooled_client(client: _Client) -> _Client:  # noqa: UP047
+    """Send all HTTP calls of an exchange client through the pooled connections.
+
+    Works with clients exposing their ``requests`` session as ``client.session``
+    (python-binance, python-kucoin, pycoingecko); other objects are returned
+    unchanged. Requests also go through the shared exchange rate limiters.
+    """
+    session = getattr(client, "session", None)
+    if isinstance(session, Session):
+        _mount(session)
+    return client
+
+
+def reset_http_sessions() -> None:
+    """Drop the pooled adapter and session so the next call starts fresh (used by tests)."""
+    global _adapter, _session  # noqa: PLW0603
+    with _lock:
+        adapter, session = _adapter, _session
+        _adapter = _session = None
+    if session is not None:
+        session.close()
+    if adapter is not None:
+        adapter.shutdown()
@@ -9,6 +9,7 @@ from kucoin import Client as KucoinClient
 from infra.configuration import get_kucoin_credentials
 from infra.telegram_logging_handler import app_logger
 from shared_code.common_price import Candle, TickerPrice
+from shared_code.http_session import pooled_client
 from source_repository import SourceID, Symbol
 
 
@@ -19,7 +20,7 @@ def fetch_kucoin_price(symbol: Symbol) -> TickerPrice | None:
     api_key = kucoin_credentials["api_key"]
     api_secret = kucoin_credentials["api_secret"]
     api_passphrase = kucoin_credentials["api_passphrase"]
-    client = KucoinClient(api_key, api_secret, api_passphrase)
+    client = pooled_client(KucoinClient(api_key, api_secret, api_passphrase))
     try:
         # Get 24hr stats
         ticker = client.get_24hr_stats(symbol.kucoin_name)
@@ -38,11 +39,44 @@ def fetch_kucoin_price(symbol: Symbol) -> TickerPrice | None:
         return None
 
 
+def fetch_kucoin_all_tickers() -> dict[str, TickerPrice]:
+    """Fetch 24hr stats for every KuCoin spot symbol in a single request.
+
+    Returns:
+        Dictionary of KuCoin symbol name (e.g. "BTC-USDT") -> TickerPrice,
+        empty if the request failed
+
+    """
+    client = pooled_client(KucoinClient())
+    try:
+        tickers = client.get_tickers()["ticker"]
+    except (KeyError, ValueError, TypeError, ConnectionError, OSError) as e:
+        app_logger.error(f"Kucoin error fetching all tickers: {e!s}")
+        return {}
+
+    result: dict[str, TickerPrice] = {}
+    for ticker in tickers:
+        try:
+            result[ticker["symbol"]] = TickerPrice(
+                source=SourceID.KUCOIN,
+                symbol=ticker["symbol"],
+                low=float(ticker["low"]),
+                high=float(ticker["high"]),
+                last=float(ticker["last"]),
+                volume=float(ticker["vol"]),
+                volume_quote=float(ticker["volValue"]),
+            )
+        except (KeyError, ValueError, TypeError):
+            # Delisted/inactive pairs report null prices
+            app_logger.debug("Skipping unparseable ticker %s", ticker.get("symbol"))
+    return result
+
+
 def fetch_kucoin_daily_kline(symbol: Symbol, end_date: date | None = None) -> Candle | None:
     """Fetch open, close, high, low prices and volume from KuCoin for the last full day."""
     if end_date is None:
         end_date = datetime.now(UTC).date()
-    client = KucoinClient()
+    client = pooled_client(KucoinClient())
 
     start_time = end_date - timedelta(days=1)
     # Get yesterday's date
@@ -88,7 +122,7 @@ def fetch_close_prices_from_kucoin(symbol: str, limit: int = 14) -> pd.DataFrame
         api_key = kucoin_credentials["api_key"]
         api_secret = kucoin_credentials["api_secret"]
         api_passphrase = kucoin_credentials["api_passphrase"]
-        client = KucoinClient(api_key, api_secret, api_passphrase)
+        client = pooled_client(KucoinClient(api_key, api_secret, api_passphrase))
 
         # Calculate start time (limit days ago)
         end_time = int(time.time())
@@ -142,7 +176,7 @@ def fetch_kucoin_hourly_kline(symbol: Symbol, end_time: datetime | None = None)
         Candle object if successful, None otherwise
 
     """
-    client = KucoinClient()
+    client = pooled_client(KucoinClient())
     # Handle end_time parameter
     if end_time is None:
         # Get the current time in UTC
@@ -202,7 +236,7 @@ def fetch_kucoin_fifteen_min_kline(symbol: Symbol, end_time: datetime) -> Candle
         Candle object if successful, None otherwise
 
     """
-    client = KucoinClient()
+    client = pooled_client(KucoinClient())
 
     if end_time.tzinfo is None:
         # Convert naive datetime to timezone-aware
@@ -288,7 +322,7 @@ def fetch_kucoin_daily_klines_batch(
         KuCoin API limit: 1500 candles per request
         For larger ranges, multiple API calls are needed
     """
-    client = KucoinClient()
+    client = pooled_client(KucoinClient())
 
     # Convert dates to timestamps
     start_time_int = int(datetime.combine(start_date, datetime.min.time(), UTC).timestamp())
@@ -360,7 +394,7 @@ def fetch_kucoin_hourly_klines_batch(
         KuCoin API limit: 1500 candles per request
         For larger ranges, multiple API calls are needed
     """
-    client = KucoinClient()
+    client = pooled_client(KucoinClient())
 
     # Convert to timestamps
     start_time_int = int(start_time.timestamp())
@@ -432,7 +466,7 @@ def fetch_kucoin_fifteen_min_klines_batch(
         KuCoin API limit: 1500 candles per request
         For larger ranges, multiple API calls are needed
     """
-    client = KucoinClient()
+    client = pooled_client(KucoinClient())
 
     # Convert to timestamps
     start_time_int = int(start_time.timestamp())
@@ -0,0 +1,66 @@
+"""Bulk 24h market snapshot shared by the per-symbol reports of one run.
+
+Current prices, the volume report and the StepN report all need 24h ticker stats.
+Rather than one or two HTTP calls per symbol, a snapshot pulls every Binance spot
+ticker (``GET /api/v3/ticker/24hr`` without a symbol) and every KuCoin ticker
+(``GET /api/v1/market/allTickers``) once, and serves lookups from memory.
+
+Usage:
+------
+    ```python
+    snapshot = MarketSnapshot.fetch()
+    ticker = snapshot.price_for(symbol)  # TickerPrice or None
+    volume = snapshot.quote_volume(symbol)  # Binance + KuCoin 24h USD volume
+    ```
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from shared_code.binance import fetch_binance_all_tickers
+from shared_code.common_price import TickerPrice
+from shared_code.kucoin import fetch_kucoin_all_tickers
+from source_repository import SourceID, Symbol
+
+
+@dataclass
+class MarketSnapshot:
+    """24h ticker stats for all Binance and KuCoin spot pairs at one point in time."""
+
+    binance: dict[str, TickerPrice] = field(default_factory=dict)
+    kucoin: dict[str, TickerPrice] = field(default_factory=dict)
+
+    @classmethod
+    def fetch(cls) -> "MarketSnapshot":
+        """Download both exchanges' ticker lists (two requests, issued in parallel)."""
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="market-snapshot") as executor:
+            binance_future = executor.submit(fetch_binance_all_tickers)
+            kucoin_future = executor.submit(fetch_kucoin_all_tickers)
+            return cls(binance=binance_future.result(), kucoin=kucoin_future.result())
+
+    def binance_ticker(self, symbol: Symbol) -> TickerPrice | None:
+        """Return the Binance ticker for a symbol, labelled with its symbol name."""
+        ticker = self.binance.get(symbol.binance_name)
+        return ticker._replace(symbol=symbol.symbol_name) if ticker else None
+
+    def kucoin_ticker(self, symbol: Symbol) -> TickerPrice | None:
+        """Return the KuCoin ticker for a symbol, labelled with its symbol name."""
+        ticker = self.kucoin.get(symbol.kucoin_name)
+        return ticker._replace(symbol=symbol.symbol_name) if ticker else None
+
+    def price_for(self, symbol: Symbol) -> TickerPrice | None:
+        """Return the ticker from the symbol's own price source, if it is covered."""
+        if symbol.source_id == SourceID.BINANCE:
+            return self.binance_ticker(symbol)
+        if symbol.source_id == SourceID.KUCOIN:
+            return self.kucoin_ticker(symbol)
+        return None
+
+    def quote_volume(self, symbol: Symbol) -> tuple[float, float]:
+        """Return the 24h quote (USD) volume on Binance and KuCoin for a symbol."""
+        binance_ticker = self.binance.get(symbol.binance_name)
+        kucoin_ticker = self.kucoin.get(symbol.kucoin_name)
+        return (
+            binance_ticker.volume_quote if binance_ticker else 0.0,
+            kucoin_ticker.volume_quote if kucoin_ticker else 0.0,
+        )
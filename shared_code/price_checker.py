@@ -70,6 +70,7 @@ Notes:
 from datetime import UTC, date, datetime, timedelta
 from typing import TYPE_CHECKING
 
+from infra.configuration import get_price_cache_settings
 from shared_code.binance import (
     fetch_binance_daily_kline,
     fetch_binance_fifteen_min_kline,
@@ -84,6 +85,7 @@ from shared_code.kucoin import (
     fetch_kucoin_hourly_kline,
     fetch_kucoin_price,
 )
+from shared_code.ttl_cache import CacheStats, TTLCache
 from source_repository import SourceID, Symbol
 from technical_analysis.repositories.daily_candle_repository import (
     DailyCandleRepository,
@@ -100,13 +102,21 @@ if TYPE_CHECKING:
     import pyodbc
 
     from infra.sql_connection import SQLiteConnectionWrapper
+    from shared_code.market_snapshot import MarketSnapshot
 
 
-# Simple cache stores
-_price_cache: dict[tuple[str, SourceID], TickerPrice] = {}
+# Ticker prices expire so a warm instance never serves the previous run's prices
+_price_cache_settings = get_price_cache_settings()
+_price_cache: TTLCache[tuple[str, SourceID], TickerPrice] = TTLCache(
+    max_age=_price_cache_settings.max_age_seconds,
+    max_size=_price_cache_settings.max_size,
+)
+
+# Sources with batch kline endpoints; others are fetched one candle at a time
+BATCH_KLINE_SOURCES = (SourceID.BINANCE, SourceID.KUCOIN)
 
 
-def _parse_candle_datetime(
+def parse_candle_datetime(
     candle_end_date: str | datetime | date,
     *,
     round_to_hour: bool = True,
@@ -152,11 +162,11 @@ def _add_candles_to_dict(
         round_to_hour: Whether to round timestamps to hour
     """
     for candle in candles:
-        candle_datetime = _parse_candle_datetime(candle.end_date, round_to_hour=round_to_hour)
+        candle_datetime = parse_candle_datetime(candle.end_date, round_to_hour=round_to_hour)
         candle_dict[candle_datetime] = candle
 
 
-def _fetch_missing_candles_batch(
+def fetch_missing_candles_batch(
     symbol: Symbol,
     missing_timestamps: list[datetime],
     timeframe: str,
@@ -202,6 +212,57 @@ def _fetch_missing_candles_batch(
     return []
 
 
+def fetch_candles_batch(
+    symbol: Symbol,
+    start_time: datetime,
+    end_time: datetime,
+    timeframe: str,
+) -> list[Candle]:
+    """Fetch a contiguous range of intraday candles with one batch API call.
+
+    Args:
+        symbol: Symbol to fetch candles for
+        start_time: First candle time of the range
+        end_time: Last candle time of the range
+        timeframe: 'hourly' or 'fifteen_min'
+
+    Returns:
+        List of fetched candles (empty for sources without a batch endpoint)
+    """
+    return fetch_missing_candles_batch(symbol, [start_time, end_time], timeframe)
+
+
+def fetch_missing_daily_candles_batch(
+    symbol: Symbol,
+    missing_dates: list[date],
+) -> list[Candle]:
+    """Fetch missing daily candles using batch API calls.
+
+    Args:
+        symbol: Symbol to fetch candles for
+        missing_dates: Sorted list of dates that need fetching
+
+    Returns:
+        List of fetched candles (empty for sources without a batch endpoint)
+    """
+    if not missing_dates:
+        return []
+
+    if symbol.source_id == SourceID.BINANCE:
+        # Local import to avoid circular dependency between price_checker and binance
+        from shared_code.binance import fetch_binance_daily_klines_batch  # noqa: PLC0415
+
+        return fetch_binance_daily_klines_batch(symbol, missing_dates[0], missing_dates[-1])
+
+    if symbol.source_id == SourceID.KUCOIN:
+        # Local import to avoid circular dependency between price_checker and kucoin
+        from shared_code.kucoin import fetch_kucoin_daily_klines_batch  # noqa: PLC0415
+
+        return fetch_kucoin_daily_klines_batch(symbol, missing_dates[0], missing_dates[-1])
+
+    return []
+
+
 def fetch_daily_candle(
     symbol: Symbol,
     end_date: date | None = None,
@@ -336,23 +397,18 @@ def fetch_hourly_candles(
 
     if missing_timestamps:
         # Fetch missing candles using source-aware batch strategy
-        fetched_candles = _fetch_missing_candles_batch(symbol, missing_timestamps, "hourly")
+        fetched_candles = fetch_missing_candles_batch(symbol, missing_timestamps, "hourly")
 
         # Save fetched candles to database and add to dictionary
         if conn and fetched_candles:
             repo = HourlyCandleRepository(conn)
-            for candle in fetched_candles:
-                repo.save_candle(symbol, candle, source=symbol.source_id.value)
-
-            # Re-fetch saved candles to get database-assigned IDs
-            refetched_candles = repo.get_candles(
+            # Bulk save returns the candles with their database-assigned IDs
+            saved_candles = repo.save_candles(
                 symbol,
-                missing_timestamps[0],
-                missing_timestamps[-1],
+                fetched_candles,
+                source=symbol.source_id.value,
             )
-
-            # Add refetched candles with IDs to dictionary using full datetime as key
-            _add_candles_to_dict(candle_dict, refetched_candles, round_to_hour=True)
+            _add_candles_to_dict(candle_dict, saved_candles, round_to_hour=True)
         elif fetched_candles:
             # No database connection, just use fetched candles without IDs
             _add_candles_to_dict(candle_dict, fetched_candles, round_to_hour=True)
@@ -462,7 +518,7 @@ def fetch_fifteen_min_candles(
 
         # Add cached candles to dictionary using full datetime as key
         for candle in cached_candles:
-            candle_datetime = _parse_candle_datetime(candle.end_date, round_to_hour=False)
+            candle_datetime = parse_candle_datetime(candle.end_date, round_to_hour=False)
             candle_dict[candle_datetime] = candle
 
     # Identify missing timestamps
@@ -470,23 +526,18 @@ def fetch_fifteen_min_candles(
 
     if missing_timestamps:
         # Fetch missing candles using source-aware batch strategy
-        fetched_candles = _fetch_missing_candles_batch(symbol, missing_timestamps, "fifteen_min")
+        fetched_candles = fetch_missing_candles_batch(symbol, missing_timestamps, "fifteen_min")
 
         # Save fetched candles to database and add to dictionary
         if conn and fetched_candles:
             repo = FifteenMinCandleRepository(conn)
-            for candle in fetched_candles:
-                repo.save_candle(symbol, candle, source=symbol.source_id.value)
-
-            # Re-fetch saved candles to get database-assigned IDs
-            refetched_candles = repo.get_candles(
+            # Bulk save returns the candles with their database-assigned IDs
+            saved_candles = repo.save_candles(
                 symbol,
-                missing_timestamps[0],
-                missing_timestamps[-1],
+                fetched_candles,
+                source=symbol.source_id.value,
             )
-
-            # Add refetched candles with IDs to dictionary using full datetime as key
-            _add_candles_to_dict(candle_dict, refetched_candles, round_to_hour=False)
+            _add_candles_to_dict(candle_dict, saved_candles, round_to_hour=False)
         elif fetched_candles:
             # No database connection, just use fetched candles without IDs
             _add_candles_to_dict(candle_dict, fetched_candles, round_to_hour=False)
@@ -539,16 +590,15 @@ def fetch_daily_candles(
     if conn:
         repo = DailyCandleRepository(conn)
         # Use max.time() for end_date to capture candles stored at end of day (23:59:59.999999)
-        # Must include tzinfo=UTC for proper string comparison in SQLite
         cached_candles = repo.get_candles(
             symbol,
-            datetime.combine(start_date, datetime.min.time(), tzinfo=UTC),
-            datetime.combine(end_date, datetime.max.time(), tzinfo=UTC),
+            datetime.combine(start_date, datetime.min.time()),
+            datetime.combine(end_date, datetime.max.time()),
         )
 
         # Add cached candles to dictionary
         for candle in cached_candles:
-            candle_date = _parse_candle_datetime(candle.end_date, round_to_hour=True)
+            candle_date = parse_candle_datetime(candle.end_date, round_to_hour=True)
             candle_dict[candle_date] = candle
 
     # Identify missing dates
@@ -556,23 +606,9 @@ def fetch_daily_candles(
 
     if missing_dates:
         # Fetch missing candles using source-aware batch strategy
-        if symbol.source_id == SourceID.BINANCE:
-            # Use batch API for BINANCE (up to 1000 candles per call)
-            # Local import to avoid circular dependency between price_checker and binance
-            from shared_code.binance import fetch_binance_daily_klines_batch  # noqa: PLC0415
-
-            batch_start = missing_dates[0]
-            batch_end = missing_dates[-1]
-            fetched_candles = fetch_binance_daily_klines_batch(symbol, batch_start, batch_end)
-
-        elif symbol.source_id == SourceID.KUCOIN:
-            # Use batch API for KUCOIN (up to 1500 candles per call)
-            # Local import to avoid circular dependency between price_checker and kucoin
-            from shared_code.kucoin import fetch_kucoin_daily_klines_batch  # noqa: PLC0415
-
-            batch_start = missing_dates[0]
-            batch_end = missing_dates[-1]
-            fetched_candles = fetch_kucoin_daily_klines_batch(symbol, batch_start, batch_end)
+        if symbol.source_id in BATCH_KLINE_SOURCES:
+            # BINANCE: up to 1000 candles per call, KUCOIN: up to 1500 candles per call
+            fetched_candles = fetch_missing_daily_candles_batch(symbol, missing_dates)
 
         else:
             # For other sources, fetch individually (fallback)
@@ -585,56 +621,63 @@ def fetch_daily_candles(
         # Save to database and add to dictionary
         if conn:
             repo = DailyCandleRepository(conn)
-            for candle in fetched_candles:
-                repo.save_candle(symbol, candle, source=symbol.source_id.value)
-
-            # Re-fetch saved candles to get database-assigned IDs
-            # This is critical for RSI and other operations that need candle IDs
-            # Use max.time() for end_date to capture candles stored at end of day (23:59:59.999999)
-            # Must include tzinfo=UTC for proper string comparison in SQLite
-            refetched_candles = repo.get_candles(
+            # Bulk save returns the candles with their database-assigned IDs,
+            # which RSI and other indicators need to reference the candles
+            saved_candles = repo.save_candles(
                 symbol,
-                datetime.combine(missing_dates[0], datetime.min.time(), tzinfo=UTC),
-                datetime.combine(missing_dates[-1], datetime.max.time(), tzinfo=UTC),
+                fetched_candles,
+                source=symbol.source_id.value,
             )
-
-            # Add refetched candles with IDs to dictionary
-            for candle in refetched_candles:
-                candle_date = _parse_candle_datetime(candle.end_date, round_to_hour=True)
+            for candle in saved_candles:
+                candle_date = parse_candle_datetime(candle.end_date, round_to_hour=True)
                 candle_dict[candle_date] = candle
         else:
             # No database connection, just use fetched candles without IDs
             for candle in fetched_candles:
-                candle_date = _parse_candle_datetime(candle.end_date, round_to_hour=True)
+                candle_date = parse_candle_datetime(candle.end_date, round_to_hour=True)
                 candle_dict[candle_date] = candle
 
     # Convert dictionary to sorted list
     return [candle_dict[d] for d in sorted(candle_dict.keys()) if d in candle_dict]
 
 
-def fetch_current_price(symbol: Symbol) -> TickerPrice:
-    """Fetch the current price for a symbol, using cache if available."""
-    cache_key = (symbol.symbol_name, symbol.source_id)
+def fetch_current_price(
+    symbol: Symbol,
+    snapshot: "MarketSnapshot | None" = None,
+) -> TickerPrice:
+    """Fetch the current price for a symbol, using cache if available.
 
-    # Check cache
-    if cache_key in _price_cache:
-        return _price_cache[cache_key]
+    Args:
+        symbol: Symbol to price
+        snapshot: Bulk market snapshot to serve the price from memory; symbols it
+            does not cover fall back to a per-symbol API call
 
-    # Fetch new price
-    price = None
-    if symbol.source_id == SourceID.KUCOIN:
-        price = fetch_kucoin_price(symbol)
-    if symbol.source_id == SourceID.BINANCE:
-        price = fetch_binance_price(symbol)
-    if symbol.source_id == SourceID.COINGECKO:
-        price = fetch_coingecko_price(symbol)
-
-    # Update cache
-    if price is None:
-        msg = f"Failed to fetch price for {symbol.symbol_name} from {symbol.source_id}"
-        raise ValueError(msg)
-    _price_cache[cache_key] = price
-    return price
+    """
+
+    def load() -> TickerPrice:
+        # Serve from the bulk snapshot when it covers the symbol
+        price = snapshot.price_for(symbol) if snapshot else None
+
+        # Fetch new price
+        if price is None and symbol.source_id == SourceID.KUCOIN:
+            price = fetch_kucoin_price(symbol)
+        if price is None and symbol.source_id == SourceID.BINANCE:
+            price = fetch_binance_price(symbol)
+        if price is None and symbol.source_id == SourceID.COINGECKO:
+            price = fetch_coingecko_price(symbol)
+
+        if price is None:
+            msg = f"Failed to fetch price for {symbol.symbol_name} from {symbol.source_id}"
+            raise ValueError(msg)
+        return price
+
+    # Concurrent misses for the same symbol share one fetch; failures are not cached
+    return _price_cache.get_or_load((symbol.symbol_name, symbol.source_id), load)
+
+
+def get_price_cache_stats() -> CacheStats:
+    """Return hit/miss counters of the ticker price cache for the run log."""
+    return _price_cache.stats()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,312 @@
+"""Weight-aware rate limiting shared by every Binance and KuCoin caller.
+
+Exchanges meter their public APIs by request *weight* rather than request count,
+and the budget is shared by every request coming from our IP. Instead of fixed
+``time.sleep`` calls between requests, each exchange API gets one token bucket:
+
+- ``acquire(weight)`` reserves weight and only sleeps when the bucket would go
+  negative, i.e. when the budget is actually close to exhausted.
+- After every response the bucket is re-synchronised with the weight the exchange
+  reports as used (Binance ``X-MBX-USED-WEIGHT-1m``, KuCoin ``gw-ratelimit-*``),
+  so requests we did not account for (e.g. the client's startup ping) still count.
+- HTTP 429/418 responses block the bucket for the ``Retry-After`` period.
+
+Buckets are process-wide singletons, so concurrent fetchers (candle refresh workers,
+CVD, order book) draw from one budget. Requests are routed through the limiter by
+:class:`RateLimitedAdapter`, which the pooled adapter of ``shared_code.http_session``
+builds on, so a client gets both connection pooling and rate limiting from one call:
+
+    ```python
+    client = pooled_client(BinanceClient(ping=False))
+    klines = client.get_klines(symbol="BTCUSDT", interval="1h", limit=24)
+    ```
+"""
+
+import threading
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+
+from infra.configuration import get_exchange_rate_limit_settings
+from infra.telegram_logging_handler import app_logger
+
+
+BINANCE_SPOT = "binance_spot"
+BINANCE_FUTURES = "binance_futures"
+KUCOIN = "kucoin"
+
+# Fraction of the published budget we allow ourselves to use
+SAFETY_MARGIN = 0.9
+
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_IP_BANNED = 418
+DEFAULT_RETRY_AFTER_SECONDS = 60.0
+
+# Binance weight tables: (max limit, weight) pairs, first matching entry wins
+_BINANCE_SPOT_DEPTH_WEIGHTS = ((100, 5), (500, 25), (1000, 50), (5000, 250))
+_BINANCE_FUTURES_DEPTH_WEIGHTS = ((50, 2), (100, 5), (500, 10), (1000, 20))
+_BINANCE_FUTURES_KLINE_WEIGHTS = ((99, 1), (499, 2), (1000, 5), (1500, 10))
+
+_BINANCE_SPOT_WEIGHTS = {
+    "/api/v3/klines": 2,
+    "/api/v3/aggTrades": 4,
+    "/api/v3/ticker/price": 2,
+    "/api/v3/exchangeInfo": 20,
+}
+_BINANCE_FUTURES_WEIGHTS = {
+    "/fapi/v1/aggTrades": 20,
+    "/fapi/v1/openInterest": 1,
+    "/fapi/v1/fundingRate": 1,
+}
+_KUCOIN_WEIGHTS = {
+    "/api/v1/market/candles": 3,
+    "/api/v1/market/stats": 15,
+    "/api/v1/market/allTickers": 15,
+    "/api/v1/market/orderbook/level1": 2,
+}
+
+
+class ExchangeRateLimiter:
+    """Thread-safe token bucket measured in exchange request weight."""
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        window_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize the limiter with a full bucket.
+
+        Args:
+            name: Exchange API name used in log messages
+            capacity: Usable weight per window (already including any safety margin)
+            window_seconds: Length of the exchange's rate limit window
+            clock: Monotonic clock, injectable for tests
+            sleep: Sleep function, injectable for tests
+
+        """
+        self.name = name
+        self.capacity = float(capacity)
+        self.refill_rate = self.capacity / window_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._blocked_until = 0.0
+
+    @property
+    def available(self) -> float:
+        """Weight currently available without waiting (negative when over-reserved)."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def _refill(self) -> None:
+        """Add the weight regained since the last update. Caller holds the lock."""
+        now = self._clock()
+        regained = (now - self._updated_at) * self.refill_rate
+        self._tokens = min(self.capacity, self._tokens + regained)
+        self._updated_at = now
+
+    def acquire(self, weight: float = 1) -> float:
+        """Reserve weight for one request, sleeping only if the budget is exhausted.
+
+        The weight is reserved immediately, so concurrent callers queue up behind
+        each other instead of all waking at once when the bucket refills.
+
+        Args:
+            weight: Request weight of the call about to be made
+
+        Returns:
+            Seconds spent waiting (0.0 when the request could go straight through)
+
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= weight
+            wait = max(0.0, -self._tokens / self.refill_rate)
+            wait = max(wait, self._blocked_until - self._updated_at)
+
+        if wait > 0:
+            app_logger.info(
+                "%s rate limit: waiting %.2fs for %s weight",
+                self.name,
+                wait,
+                weight,
+            )
+            self._sleep(wait)
+        return wait
+
+    def record_used_weight(self, used_weight: float, limit: float | None = None) -> None:
+        """Synchronise the bucket with the weight the exchange reports as used.
+
+        Args:
+            used_weight: Weight consumed in the current window according to the exchange
+            limit: Window limit reported by the exchange, if it sends one
+
+        """
+        capacity = self.capacity if limit is None else min(self.capacity, limit * SAFETY_MARGIN)
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, capacity - used_weight)
+
+    def block_for(self, seconds: float) -> None:
+        """Stop handing out weight for the given number of seconds (HTTP 429/418)."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+        app_logger.warning("%s rate limit hit: backing off for %.0fs", self.name, seconds)
+
+    def update_from_response(self, response: Response) -> None:
+        """Apply rate limit information from an exchange response."""
+        headers = response.headers
+        if response.status_code in (HTTP_TOO_MANY_REQUESTS, HTTP_IP_BANNED):
+            self.block_for(_parse_float(headers.get("Retry-After")) or DEFAULT_RETRY_AFTER_SECONDS)
+            return
+
+        used_weight = _parse_float(headers.get("X-MBX-USED-WEIGHT-1m"))
+        if used_weight is not None:
+            self.record_used_weight(used_weight)
+            return
+
+        limit = _parse_float(headers.get("gw-ratelimit-limit"))
+        remaining = _parse_float(headers.get("gw-ratelimit-remaining"))
+        if limit is not None and remaining is not None:
+            self.record_used_weight(limit - remaining, limit=limit)
+
+
+def _parse_float(value: str | None) -> float | None:
+    """Parse a numeric header value, returning None when absent or malformed."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _tiered_weight(tiers: tuple[tuple[int, int], ...], limit: int) -> int:
+    """Look up a limit-dependent weight in a (max limit, weight) table."""
+    for max_limit, weight in tiers:
+        if limit <= max_limit:
+            return weight
+    return tiers[-1][1]
+
+
+def _int_param(params: Mapping[str, list[str]], name: str, default: int) -> int:
+    """Read an integer query parameter from parse_qs output."""
+    try:
+        return int(params[name][0])
+    except (KeyError, IndexError, ValueError):
+        return default
+
+
+def estimate_request_weight(limiter_name: str, url: str) -> int:
+    """Estimate the weight of a request from its endpoint and query parameters.
+
+    Estimates only need to be close: the bucket is corrected from response headers
+    after every call.
+
+    Args:
+        limiter_name: Exchange API the request goes to
+        url: Full request URL including the query string
+
+    Returns:
+        Estimated request weight (at least 1)
+
+    """
+    parsed = urlparse(url)
+    params = parse_qs(parsed.query)
+    if limiter_name == BINANCE_SPOT:
+        return _binance_spot_weight(parsed.path, params)
+    if limiter_name == BINANCE_FUTURES:
+        return _binance_futures_weight(parsed.path, params)
+    if limiter_name == KUCOIN:
+        return _KUCOIN_WEIGHTS.get(parsed.path, 1)
+    return 1
+
+
+def _binance_spot_weight(path: str, params: Mapping[str, list[str]]) -> int:
+    """Weight of a Binance spot (api/v3) request."""
+    if path == "/api/v3/depth":
+        return _tiered_weight(_BINANCE_SPOT_DEPTH_WEIGHTS, _int_param(params, "limit", 100))
+    if path == "/api/v3/ticker/24hr":
+        return 2 if "symbol" in params else 80
+    return _BINANCE_SPOT_WEIGHTS.get(path, 1)
+
+
+def _binance_futures_weight(path: str, params: Mapping[str, list[str]]) -> int:
+    """Weight of a Binance USD-M futures (fapi) request."""
+    if path == "/fapi/v1/depth":
+        return _tiered_weight(_BINANCE_FUTURES_DEPTH_WEIGHTS, _int_param(params, "limit", 500))
+    if path == "/fapi/v1/klines":
+        return _tiered_weight(_BINANCE_FUTURES_KLINE_WEIGHTS, _int_param(params, "limit", 500))
+    if path == "/fapi/v1/premiumIndex":
+        return 1 if "symbol" in params else 10
+    if path == "/fapi/v1/ticker/price":
+        return 1 if "symbol" in params else 2
+    return _BINANCE_FUTURES_WEIGHTS.get(path, 1)
+
+
+def limiter_name_for_host(host: str) -> str | None:
+    """Map an API host name to its rate limiter, or None for non-exchange hosts."""
+    host = host.lower()
+    if host.endswith(("fapi.binance.com", "fapi.binance.us")):
+        return BINANCE_FUTURES
+    if ".binance." in host:
+        return BINANCE_SPOT
+    if host.endswith("kucoin.com"):
+        return KUCOIN
+    return None
+
+
+_limiters: dict[str, ExchangeRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str) -> ExchangeRateLimiter:
+    """Get the process-wide limiter for an exchange API, creating it on first use."""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            settings = get_exchange_rate_limit_settings()
+            budgets = {
+                BINANCE_SPOT: (settings.binance_spot_weight_per_minute, 60.0),
+                BINANCE_FUTURES: (settings.binance_futures_weight_per_minute, 60.0),
+                KUCOIN: (settings.kucoin_weight_per_30s, 30.0),
+            }
+            budget, window_seconds = budgets[name]
+            limiter = ExchangeRateLimiter(name, int(budget * SAFETY_MARGIN), window_seconds)
+            _limiters[name] = limiter
+        return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Drop all limiters so the next call starts with full buckets (used by tests)."""
+    with _limiters_lock:
+        _limiters.clear()
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTP adapter that routes exchange requests through their rate limiter."""
+
+    def send(self, request: PreparedRequest, *args: Any, **kwargs: Any) -> Response:
+        """Acquire weight before sending and resynchronise from the response headers."""
+        url = request.url or ""
+        name = limiter_name_for_host(urlparse(url).hostname or "")
+        if name is None:
+            return super().send(request, *args, **kwargs)
+
+        limiter = get_rate_limiter(name)
+        limiter.acquire(estimate_request_weight(name, url))
+        response = super().send(request, *args, **kwargs)
+        limiter.update_from_response(response)
+        return response
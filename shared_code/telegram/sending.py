@@ -10,6 +10,7 @@ from pathlib import Path
 import requests
 
 from infra.telegram_logging_handler import app_logger
+from shared_code.http_session import get_http_session
 
 from .constants import TELEGRAM_MAX_DOCUMENT_SIZE, TELEGRAM_MAX_MESSAGE_LENGTH
 from .text_processing import enforce_markdown_v2, sanitize_html, smart_split
@@ -67,7 +68,7 @@ async def send_telegram_message(
             if protect_content:
                 payload["protect_content"] = True
 
-            response = requests.post(url, json=payload, timeout=30)
+            response = get_http_session().post(url, json=payload, timeout=30)
 
             if not response.ok:
                 # Gather diagnostics
@@ -164,7 +165,7 @@ def _check_file_size(size: int, filename: str) -> bool:
 def _send_document_request(token: str, files: dict, data: dict, filename: str) -> bool:
     """Send document request to Telegram API."""
     url = f"https://api.telegram.org/bot{token}/sendDocument"
-    response = requests.post(url, data=data, files=files, timeout=30)
+    response = get_http_session().post(url, data=data, files=files, timeout=30)
     if not response.ok:
         try:
             err_json = response.json()
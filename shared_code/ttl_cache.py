@@ -0,0 +1,178 @@
+"""Thread-safe TTL + LRU cache with single-flight loading.
+
+Used for values that are cheap to keep for a few minutes but must not outlive
+a run on a warm Azure Functions instance (e.g. ticker prices). Entries expire
+after ``max_age`` seconds, the least recently used entry is evicted once the
+cache holds ``max_size`` entries, and concurrent misses for the same key share
+one loader call instead of each hitting the API.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters of a TTLCache."""
+
+    hits: int
+    misses: int
+    coalesced: int
+    expirations: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache (coalesced waits count as hits)."""
+        lookups = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+    def __str__(self) -> str:
+        """Format the counters for the run log."""
+        return (
+            f"{self.hits} hits, {self.misses} misses, {self.coalesced} coalesced, "
+            f"{self.expirations} expired, {self.evictions} evicted, size {self.size} "
+            f"(hit rate {self.hit_rate:.0%})"
+        )
+
+
+class TTLCache(Generic[K, V]):  # noqa: UP046
+    """Bounded key/value cache whose entries expire after a fixed age."""
+
+    def __init__(
+        self,
+        max_age: float,
+        max_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_age: Seconds an entry stays valid after it was stored
+            max_size: Maximum number of entries before LRU eviction
+            clock: Monotonic clock, injectable for tests
+
+        """
+        self.max_age = max_age
+        self.max_size = max_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._inflight: dict[K, Future[V]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._expirations = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored (possibly expired) entries."""
+        return len(self._entries)
+
+    def _lookup(self, key: K) -> tuple[bool, V | None]:
+        """Return (found, value) for a fresh entry. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        stored_at, value = entry
+        if self._clock() - stored_at > self.max_age:
+            del self._entries[key]
+            self._expirations += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: K, value: V) -> None:
+        """Insert or refresh an entry, evicting the LRU one if full. Caller holds the lock."""
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self._hits += 1
+            else:
+                self._misses += 1
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store a value, resetting its age."""
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_load(self, key: K, loader: Callable[[], V]) -> V:
+        """Return the cached value, calling loader once on a miss.
+
+        Concurrent callers missing the same key wait for the first caller's
+        loader instead of running their own. If the loader raises, nothing is
+        cached and every waiting caller receives the same exception.
+
+        Args:
+            key: Cache key
+            loader: Produces the value on a miss
+
+        Returns:
+            The cached or freshly loaded value
+
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self._hits += 1
+                return value  # type: ignore[return-value]
+            inflight = self._inflight.get(key)
+            is_owner = inflight is None
+            if inflight is None:
+                self._misses += 1
+                inflight = Future()
+                self._inflight[key] = inflight
+            else:
+                self._coalesced += 1
+        if not is_owner:
+            return inflight.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            inflight.set_exception(e)
+            raise
+
+        with self._lock:
+            self._store(key, value)
+            self._inflight.pop(key, None)
+        inflight.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                coalesced=self._coalesced,
+                expirations=self._expirations,
+                evictions=self._evictions,
+                size=len(self._entries),
+            )
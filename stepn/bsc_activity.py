@@ -5,6 +5,7 @@ from datetime import UTC, datetime, timedelta
 import requests
 
 from infra.telegram_logging_handler import app_logger
+from shared_code.http_session import get_http_session
 
 
 class BSCAPIError(Exception):
@@ -16,7 +17,7 @@ def get_yesterday_transaction_count(contract_address, api_key):
 
     # Get block numbers for time range
     def get_block_number(timestamp):
-        response = requests.get(
+        response = get_http_session().get(
             "https://api.bscscan.com/api",
             params={
                 "module": "block",
@@ -26,7 +27,8 @@ def get_yesterday_transaction_count(contract_address, api_key):
                 "apikey": api_key,
             },
             timeout=30,
-        ).json()
+        )
+        response = response.json()
         if response["status"] != "1":
             msg = f"Block API Error: {response['message']}"
             raise BSCAPIError(msg)
@@ -57,7 +59,7 @@ def get_yesterday_transaction_count(contract_address, api_key):
     url = "https://api.bscscan.com/api"
 
     # Make the API request
-    response = requests.get(url, params=params, timeout=30)
+    response = get_http_session().get(url, params=params, timeout=30)
     data = response.json()
 
     # Check if the response is successful
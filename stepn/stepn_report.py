@@ -19,10 +19,20 @@ if TYPE_CHECKING:
     import pyodbc
 
     from infra.sql_connection import SQLiteConnectionWrapper
+    from shared_code.market_snapshot import MarketSnapshot
 
 
-def fetch_stepn_report(conn: "pyodbc.Connection | SQLiteConnectionWrapper | None") -> PrettyTable:
-    """Fetch and generate a STEPN ecosystem report with token prices and ratios."""
+def fetch_stepn_report(
+    conn: "pyodbc.Connection | SQLiteConnectionWrapper | None",
+    snapshot: "MarketSnapshot | None" = None,
+) -> PrettyTable:
+    """Fetch and generate a STEPN ecosystem report with token prices and ratios.
+
+    Args:
+        conn: Database connection
+        snapshot: Bulk market snapshot used for exchange-listed token prices
+
+    """
     symbols = [
         Symbol(
             symbol_id=1,
@@ -43,7 +53,7 @@ def fetch_stepn_report(conn: "pyodbc.Connection | SQLiteConnectionWrapper | None
 
     for symbol in symbols:
         try:
-            ticker = fetch_current_price(symbol)
+            ticker = fetch_current_price(symbol, snapshot=snapshot)
             results.append((ticker.symbol, ticker.last))
         except Exception as e:
             app_logger.error(f"Unexpected error for {symbol}: {e!s}")
@@ -6,7 +6,8 @@ from typing import TYPE_CHECKING
 
 from infra.telegram_logging_handler import app_logger
 from shared_code.common_price import Candle
-from source_repository import Symbol
+from shared_code.price_checker import fetch_candles_batch
+from source_repository import SourceID, Symbol
 
 
 if TYPE_CHECKING:
@@ -15,21 +16,39 @@ if TYPE_CHECKING:
     from infra.sql_connection import SQLiteConnectionWrapper
 
 
+# Sources with batch kline endpoints (see shared_code.price_checker.fetch_candles_batch)
+BATCH_SOURCES = (SourceID.BINANCE, SourceID.KUCOIN)
+
+# Most candles requested per batch call: Binance returns at most 1000 klines per
+# request (KuCoin 1500) and one slot is spent on the extra leading candle
+MAX_CANDLES_PER_BATCH = 999
+
+
 class CandleFetcher:
     """Base class for fetching candles of different timeframes."""
 
-    def __init__(self, timeframe: str, fetch_function: Callable, repository_class: type):
+    def __init__(
+        self,
+        timeframe: str,
+        fetch_function: Callable,
+        repository_class: type,
+        batch_fetch_function: Callable[[Symbol, datetime, datetime, str], list[Candle]]
+        | None = fetch_candles_batch,
+    ):
         """Initialize the candle fetcher.
 
         Args:
             timeframe: String description of the timeframe (e.g., 'daily', 'hourly', '15min')
             fetch_function: Function to fetch a single candle from API
             repository_class: Repository class to use for database operations
+            batch_fetch_function: Function to fetch a range of candles in one API call
+                (symbol, start, end, timeframe); None to always fetch one at a time
 
         """
         self.timeframe = timeframe
         self.fetch_function = fetch_function
         self.repository_class = repository_class
+        self.batch_fetch_function = batch_fetch_function
         self.logger = app_logger
 
     def fetch_candles(
@@ -74,7 +93,7 @@ class CandleFetcher:
             return timedelta(days=1)
         if self.timeframe == "hourly":
             return timedelta(hours=1)
-        if self.timeframe == "15min":
+        if self.timeframe in ("15min", "fifteen_min"):
             return timedelta(minutes=15)
         return timedelta(hours=1)  # Default
 
@@ -82,106 +101,118 @@ class CandleFetcher:
         """Ensure datetime has UTC timezone."""
         return dt if dt.tzinfo is not None else dt.replace(tzinfo=UTC)
 
+    def _slot_for(self, end_date: str | datetime) -> datetime:
+        """Round a candle end date down to its slot on the timeframe grid."""
+        if isinstance(end_date, str):
+            end_date = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
+        end_date = self._ensure_timezone(end_date)
+        step_seconds = int(self._get_expected_time_diff().total_seconds())
+        return datetime.fromtimestamp(
+            int(end_date.timestamp()) // step_seconds * step_seconds,
+            tz=UTC,
+        )
+
+    def _find_missing_ranges(
+        self,
+        all_candles: list[Candle],
+        start_time: datetime,
+        end_time: datetime,
+    ) -> list[tuple[datetime, datetime]]:
+        """Find contiguous runs of missing slots between start_time and end_time.
+
+        Covers gaps at the beginning, between existing candles, at the end, and an
+        empty database (one range spanning the whole window).
+
+        Returns:
+            List of (first missing slot, last missing slot) tuples, both inclusive
+
+        """
+        expected_diff = self._get_expected_time_diff()
+        existing = {self._slot_for(candle.end_date) for candle in all_candles}
+
+        # First slot at or after start_time, last slot at or before end_time
+        current = self._slot_for(start_time)
+        if current < self._ensure_timezone(start_time):
+            current += expected_diff
+        last_slot = self._slot_for(end_time)
+
+        ranges: list[tuple[datetime, datetime]] = []
+        range_start: datetime | None = None
+        while current <= last_slot:
+            if current not in existing and range_start is None:
+                range_start = current
+            elif current in existing and range_start is not None:
+                ranges.append((range_start, current - expected_diff))
+                range_start = None
+            current += expected_diff
+        if range_start is not None:
+            ranges.append((range_start, last_slot))
+        return ranges
+
     def _fill_gaps_in_range(
         self,
         symbol: Symbol,
         start_time: datetime,
         end_time: datetime,
         conn: "pyodbc.Connection | SQLiteConnectionWrapper",
-        gap_type: str,
-    ):
-        """Fill gaps in a specific time range."""
+    ) -> int:
+        """Fill one contiguous range of missing candles.
+
+        The range is split into pages of at most MAX_CANDLES_PER_BATCH candles, each
+        fetched with a single batch API call and saved with one bulk insert. Sources
+        without a batch endpoint fall back to fetching one candle at a time.
+
+        Returns:
+            Number of candles saved
+
+        """
+        expected_diff = self._get_expected_time_diff()
         self.logger.info(
-            "Found %s gap: %s candles for %s missing from %s to %s",
-            gap_type,
+            "Found gap: %s candles for %s missing from %s to %s",
             self.timeframe,
             symbol.symbol_name,
             start_time,
             end_time,
         )
-        expected_diff = self._get_expected_time_diff()
-        current_time = start_time
-        while current_time <= end_time:
-            self.logger.debug(
-                "Fetching missing %s candle for %s at %s",
+
+        if self.batch_fetch_function is None or symbol.source_id not in BATCH_SOURCES:
+            count = 0
+            current_time = start_time
+            while current_time <= end_time:
+                if self.fetch_function(symbol, current_time, conn) is not None:
+                    count += 1
+                current_time += expected_diff
+            return count
+
+        repo = self.repository_class(conn)
+        saved = 0
+        page_start = start_time
+        while page_start <= end_time:
+            page_end = min(end_time, page_start + expected_diff * (MAX_CANDLES_PER_BATCH - 1))
+            # Ask for one extra leading slot: exchanges label klines by open or close
+            # time, so filtering on our own slots keeps exactly the requested candles
+            fetched = self.batch_fetch_function(
+                symbol,
+                page_start - expected_diff,
+                page_end,
                 self.timeframe,
-                symbol.symbol_name,
-                current_time,
             )
-            self.fetch_function(symbol, current_time, conn)
-            current_time += expected_diff
+            candles = [
+                candle
+                for candle in fetched
+                if page_start <= self._slot_for(candle.end_date) <= page_end
+            ]
+            repo.save_candles(symbol, candles, source=symbol.source_id.value)
+            saved += len(candles)
+            page_start = page_end + expected_diff
 
-    def _check_beginning_gap(
-        self,
-        symbol: Symbol,
-        all_candles: list[Candle],
-        start_time: datetime,
-        conn: "pyodbc.Connection | SQLiteConnectionWrapper",
-    ):
-        """Check and fill gaps at the beginning of the range."""
-        if all_candles:
-            first_candle_date_str = all_candles[0].end_date
-            first_candle_date = self._ensure_timezone(datetime.fromisoformat(first_candle_date_str))
-            if first_candle_date > start_time:
-                self._fill_gaps_in_range(
-                    symbol,
-                    start_time,
-                    first_candle_date - self._get_expected_time_diff(),
-                    conn,
-                    "beginning",
-                )
-
-    def _check_middle_gaps(self, symbol, all_candles, conn):
-        """Check and fill gaps between existing candles."""
-        if len(all_candles) > 1:
-            expected_diff = self._get_expected_time_diff()
-            for i in range(len(all_candles) - 1):
-                current_candle = all_candles[i]
-                next_candle = all_candles[i + 1]
-
-                current_date = self._ensure_timezone(current_candle.end_date)
-                next_date = self._ensure_timezone(next_candle.end_date)
-
-                actual_diff = next_date - current_date
-                if actual_diff > expected_diff:
-                    self.logger.info(
-                        "Found gap in %s candles for %s between %s and %s",
-                        self.timeframe,
-                        symbol.symbol_name,
-                        current_date,
-                        next_date,
-                    )
-                    # Fetch missing candles
-                    current_time = current_date + expected_diff
-                    while current_time < next_date:
-                        self.logger.debug(
-                            "Fetching missing %s candle for %s at %s",
-                            self.timeframe,
-                            symbol.symbol_name,
-                            current_time,
-                        )
-                        self.fetch_function(symbol, current_time, conn)
-                        current_time += expected_diff
-
-    def _check_end_gap(
-        self,
-        symbol: Symbol,
-        all_candles: list[Candle],
-        end_time: datetime,
-        conn: "pyodbc.Connection | SQLiteConnectionWrapper",
-    ):
-        """Check and fill gaps at the end of the range."""
-        if all_candles:
-            last_candle_date_str = all_candles[-1].end_date
-            last_candle_date = self._ensure_timezone(datetime.fromisoformat(last_candle_date_str))
-            if last_candle_date < end_time:
-                self._fill_gaps_in_range(
-                    symbol,
-                    last_candle_date + self._get_expected_time_diff(),
-                    end_time,
-                    conn,
-                    "end",
-                )
+        self.logger.info(
+            "Saved %d %s candles for %s from batch fetch",
+            saved,
+            self.timeframe,
+            symbol.symbol_name,
+        )
+        return saved
 
     def check_if_all_candles(
         self,
@@ -191,7 +222,8 @@ class CandleFetcher:
     ):
         """Check if all candles for the symbol are available in the database.
 
-        fetches missing ones from API.
+        Missing candles are grouped into contiguous ranges and each range is
+        fetched from the API in batches.
 
         Args:
             symbol: Symbol object
@@ -213,36 +245,19 @@ class CandleFetcher:
 
         # Get existing candles from DB
         all_candles = repo.get_candles(symbol, start_time, end_time)
-
-        if not all_candles:
+        if all_candles:
             self.logger.info(
-                "No %s candles found in DB for %s, fetching all",
+                "Found %d %s candles in DB for %s",
+                len(all_candles),
                 self.timeframe,
                 symbol.symbol_name,
             )
-            current_time = start_time
-            expected_diff = self._get_expected_time_diff()
-            while current_time <= end_time:
-                self.logger.debug(
-                    "Fetching %s candle for %s at %s",
-                    self.timeframe,
-                    symbol.symbol_name,
-                    current_time,
-                )
-                self.fetch_function(symbol, current_time, conn)
-                current_time += expected_diff
         else:
             self.logger.info(
-                "Found %d %s candles in DB for %s",
-                len(all_candles),
+                "No %s candles found in DB for %s, fetching all",
                 self.timeframe,
                 symbol.symbol_name,
             )
 
-            # Sort candles by end_date
-            all_candles.sort(key=lambda x: x.end_date)
-
-            # Check for gaps at different positions
-            self._check_beginning_gap(symbol, all_candles, start_time, conn)
-            self._check_middle_gaps(symbol, all_candles, conn)
-            self._check_end_gap(symbol, all_candles, end_time, conn)
+        for range_start, range_end in self._find_missing_ranges(all_candles, start_time, end_time):
+            self._fill_gaps_in_range(symbol, range_start, range_end, conn)
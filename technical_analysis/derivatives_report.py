@@ -14,8 +14,8 @@ from datetime import UTC, datetime
 from prettytable import PrettyTable
 
 from infra.telegram_logging_handler import app_logger
-from shared_code.binance import fetch_binance_futures_metrics
-from source_repository import SourceID, Symbol
+from shared_code.binance import fetch_binance_futures_metrics_bulk
+from source_repository import Symbol
 from technical_analysis.repositories.funding_rate_repository import (
     FundingRateRepository,
 )
@@ -65,14 +65,9 @@ def fetch_derivatives_report(
     successful = 0
     failed = 0
 
-    for symbol in symbols:
-        # Only fetch for Binance symbols (futures are on Binance)
-        if symbol.source_id != SourceID.BINANCE:
-            continue
-
+    # Futures are on Binance: bulk funding/price calls plus concurrent open interest
+    for symbol, metrics in fetch_binance_futures_metrics_bulk(symbols):
         try:
-            metrics = fetch_binance_futures_metrics(symbol)
-
             if metrics is None:
                 app_logger.warning(f"No futures data available for {symbol.symbol_name}")
                 failed += 1
@@ -0,0 +1,308 @@
+"""Incremental RSI, EMA and MACD state per symbol and timeframe.
+
+RSI (Wilder), EMA50/EMA200 and MACD(12, 26, 9) are recursive filters: the value
+after a candle depends only on the previous filter state and the new close. Instead
+of recomputing them from weeks of candles every run, the state after the last
+processed candle is persisted in the ``IndicatorState`` table and advanced with the
+candles that arrived since - O(1) per new candle.
+
+Only closed candles are folded into the stored state, so the still-forming candle
+(e.g. today's daily candle) never invalidates it; :func:`live_indicator_state`
+advances the state over a report's candle window for a live value without
+persisting anything. A candle counts as closed by its
+close time, not its label (KuCoin labels candles with their open time). The state
+is rebuilt from the full candle history when there is none yet or when the history
+was rewritten (the stored last candle is gone or its close changed).
+
+Conventions match the report calculations:
+- RSI: Wilder's smoothing seeded with the SMA of the first 14 changes
+  (see technical_analysis/rsi.py).
+- EMA/MACD: ``ewm(span=N, adjust=False)``, seeded with the first close.
+"""
+
+import math
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from infra.telegram_logging_handler import app_logger
+from shared_code.candle_resampling import candle_close_time
+from shared_code.common_price import Candle
+from source_repository import Symbol
+from technical_analysis.repositories.daily_candle_repository import DailyCandleRepository
+from technical_analysis.repositories.fifteen_min_candle_repository import (
+    FifteenMinCandleRepository,
+)
+from technical_analysis.repositories.hourly_candle_repository import HourlyCandleRepository
+from technical_analysis.repositories.indicator_state_repository import (
+    get_indicator_state,
+    save_indicator_state,
+)
+
+
+if TYPE_CHECKING:
+    import pyodbc
+
+    from infra.sql_connection import SQLiteConnectionWrapper
+    from technical_analysis.repositories.candle_repository import CandleRepository
+
+
+RSI_PERIODS = 14
+EMA_FAST_SPAN = 50
+EMA_SLOW_SPAN = 200
+MACD_FAST_SPAN = 12
+MACD_SLOW_SPAN = 26
+MACD_SIGNAL_SPAN = 9
+
+_REPOSITORIES: dict[str, type["CandleRepository"]] = {
+    "daily": DailyCandleRepository,
+    "hourly": HourlyCandleRepository,
+    "fifteen_min": FifteenMinCandleRepository,
+}
+
+_PERIODS = {
+    "daily": timedelta(days=1),
+    "hourly": timedelta(hours=1),
+    "fifteen_min": timedelta(minutes=15),
+}
+
+
+def _ema(previous: float, value: float, span: int) -> float:
+    """One ``ewm(span=span, adjust=False)`` step."""
+    alpha = 2.0 / (span + 1)
+    return (1 - alpha) * previous + alpha * value
+
+
+def _as_utc(value: str | datetime) -> datetime:
+    """Normalise a candle end date to an aware UTC datetime."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+def _closed(candles: list[Candle], period: timedelta, now: datetime) -> list[Candle]:
+    """Drop candles that are still forming (close time in the future)."""
+    return [candle for candle in candles if candle_close_time(candle, period) <= now]
+
+
+@dataclass(frozen=True)
+class IndicatorState:
+    """Filter state of the indicators after one symbol's last processed candle."""
+
+    symbol_id: int
+    timeframe: str
+    last_candle_end: datetime
+    last_close: float
+    candle_count: int
+    avg_gain: float
+    avg_loss: float
+    ema50: float
+    ema200: float
+    macd_fast_ema: float
+    macd_slow_ema: float
+    macd_signal: float
+
+    @classmethod
+    def start(
+        cls,
+        symbol_id: int,
+        timeframe: str,
+        end_date: str | datetime,
+        close: float,
+    ) -> "IndicatorState":
+        """Create the state after a symbol's first candle."""
+        return cls(
+            symbol_id=symbol_id,
+            timeframe=timeframe,
+            last_candle_end=_as_utc(end_date),
+            last_close=close,
+            candle_count=1,
+            avg_gain=0.0,
+            avg_loss=0.0,
+            ema50=close,
+            ema200=close,
+            macd_fast_ema=close,
+            macd_slow_ema=close,
+            macd_signal=0.0,
+        )
+
+    @classmethod
+    def from_candles(
+        cls,
+        symbol_id: int,
+        timeframe: str,
+        candles: list[Candle],
+    ) -> "IndicatorState | None":
+        """Compute the state from a full candle history sorted by end date."""
+        if not candles:
+            return None
+        first = candles[0]
+        state = cls.start(symbol_id, timeframe, first.end_date, float(first.close))
+        return state.advance_many(candles[1:])
+
+    def advance(self, end_date: str | datetime, close: float) -> "IndicatorState":
+        """Return the state after one more candle."""
+        change = close - self.last_close
+        # Running mean of the first RSI_PERIODS changes (the SMA seed), then Wilder
+        divisor = min(self.candle_count, RSI_PERIODS)
+        macd_fast_ema = _ema(self.macd_fast_ema, close, MACD_FAST_SPAN)
+        macd_slow_ema = _ema(self.macd_slow_ema, close, MACD_SLOW_SPAN)
+        return replace(
+            self,
+            last_candle_end=_as_utc(end_date),
+            last_close=close,
+            candle_count=self.candle_count + 1,
+            avg_gain=(self.avg_gain * (divisor - 1) + max(change, 0.0)) / divisor,
+            avg_loss=(self.avg_loss * (divisor - 1) + max(-change, 0.0)) / divisor,
+            ema50=_ema(self.ema50, close, EMA_FAST_SPAN),
+            ema200=_ema(self.ema200, close, EMA_SLOW_SPAN),
+            macd_fast_ema=macd_fast_ema,
+            macd_slow_ema=macd_slow_ema,
+            macd_signal=_ema(self.macd_signal, macd_fast_ema - macd_slow_ema, MACD_SIGNAL_SPAN),
+        )
+
+    def advance_many(self, candles: list[Candle]) -> "IndicatorState":
+        """Return the state after the given candles (sorted by end date)."""
+        state = self
+        for candle in candles:
+            state = state.advance(candle.end_date, float(candle.close))
+        return state
+
+    @property
+    def rsi(self) -> float | None:
+        """Wilder RSI, or None until RSI_PERIODS changes have been seen."""
+        if self.candle_count <= RSI_PERIODS:
+            return None
+        if self.avg_loss == 0:
+            return 100.0 if self.avg_gain > 0 else None
+        return 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+    @property
+    def macd(self) -> float:
+        """MACD line (EMA12 - EMA26)."""
+        return self.macd_fast_ema - self.macd_slow_ema
+
+    @property
+    def histogram(self) -> float:
+        """MACD histogram (MACD - signal)."""
+        return self.macd - self.macd_signal
+
+
+def refresh_indicator_state(
+    conn: "pyodbc.Connection | SQLiteConnectionWrapper",
+    symbol: Symbol,
+    timeframe: str,
+) -> IndicatorState | None:
+    """Advance a symbol's stored indicator state with the candles closed since.
+
+    Only candles from the stored last candle onwards are read. The full history is
+    read (and the state rebuilt) when no state exists or the stored last candle no
+    longer matches the database.
+
+    Args:
+        conn: Database connection
+        symbol: Symbol to update
+        timeframe: 'daily', 'hourly' or 'fifteen_min'
+
+    Returns:
+        The up-to-date state, or None when the symbol has no candles
+
+    """
+    repo = _REPOSITORIES[timeframe](conn)
+    period = _PERIODS[timeframe]
+    state = get_indicator_state(conn, symbol.symbol_id, timeframe)
+    now = datetime.now(UTC)
+
+    if state is not None:
+        candles = _closed(repo.get_candles(symbol, state.last_candle_end, now), period, now)
+        anchor = candles[0] if candles else None
+        if (
+            anchor is not None
+            and _as_utc(anchor.end_date) == state.last_candle_end
+            and math.isclose(float(anchor.close), state.last_close, rel_tol=1e-12)
+        ):
+            new_candles = candles[1:]
+            if new_candles:
+                state = state.advance_many(new_candles)
+                save_indicator_state(conn, state)
+            return state
+        app_logger.info(
+            "%s %s candle history changed, rebuilding indicator state",
+            symbol.symbol_name,
+            timeframe,
+        )
+
+    history = _closed(repo.get_all_candles(symbol), period, now)
+    state = IndicatorState.from_candles(symbol.symbol_id, timeframe, history)
+    if state is not None:
+        save_indicator_state(conn, state)
+    return state
+
+
+def refresh_indicator_states(
+    conn: "pyodbc.Connection | SQLiteConnectionWrapper",
+    symbols: list[Symbol],
+    timeframes: tuple[str, ...] = ("daily", "hourly", "fifteen_min"),
+) -> dict[str, dict[int, IndicatorState]]:
+    """Bring the stored indicator state of every symbol and timeframe up to date.
+
+    Args:
+        conn: Database connection
+        symbols: Symbols to update
+        timeframes: Timeframes to update
+
+    Returns:
+        States keyed by timeframe and symbol ID (symbols without candles are omitted)
+
+    """
+    states: dict[str, dict[int, IndicatorState]] = {timeframe: {} for timeframe in timeframes}
+    for timeframe in timeframes:
+        for symbol in symbols:
+            try:
+                state = refresh_indicator_state(conn, symbol, timeframe)
+            except Exception:  # noqa: BLE001 - one symbol must not stop the others
+                app_logger.exception(
+                    "Failed to update %s indicator state for %s",
+                    timeframe,
+                    symbol.symbol_name,
+                )
+                continue
+            if state is not None:
+                states[timeframe][symbol.symbol_id] = state
+    return states
+
+
+def live_indicator_state(
+    states: Mapping[int, IndicatorState] | None,
+    symbol: Symbol,
+    end_dates: Iterable[str | datetime],
+    closes: Iterable[float],
+) -> IndicatorState | None:
+    """Advance a symbol's stored state to the last candle of a report window.
+
+    The candles after the stored last candle (usually just the forming one) are
+    folded in; nothing is persisted.
+
+    Args:
+        states: States from :func:`refresh_indicator_states`, keyed by symbol ID
+        symbol: Symbol the window belongs to
+        end_dates: Candle end dates of the window, sorted
+        closes: Close prices matching ``end_dates``
+
+    Returns:
+        The state after the window's last candle, or None when there is no state or
+        the window does not contain the stored last candle (callers then compute
+        the indicators from the window)
+
+    """
+    state = states.get(symbol.symbol_id) if states else None
+    if state is None:
+        return None
+    candles = [(_as_utc(end), float(close)) for end, close in zip(end_dates, closes, strict=True)]
+    if not candles or not candles[0][0] <= state.last_candle_end <= candles[-1][0]:
+        return None
+    for end_date, close in candles:
+        if end_date > state.last_candle_end:
+            state = state.advance(end_date, close)
+    return state
@@ -8,9 +8,11 @@ import pandas as pd
 from prettytable import PrettyTable
 
 from infra.telegram_logging_handler import app_logger
+from shared_code.common_price import Candle
 from shared_code.number_format import format_to_6digits_without_trailing_zeros
 from shared_code.price_checker import fetch_daily_candles
 from source_repository import SourceID, Symbol
+from technical_analysis.indicator_state import live_indicator_state
 from technical_analysis.repositories.macd_repository import (
     fetch_yesterday_macd,
     save_macd_results,
@@ -18,17 +20,53 @@ from technical_analysis.repositories.macd_repository import (
 
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     import pyodbc
 
     from infra.sql_connection import SQLiteConnectionWrapper
+    from shared_code.candle_panel import CandlePanel
+    from technical_analysis.indicator_state import IndicatorState
+
+
+def _candles_to_frame(candles: list[Candle]) -> pd.DataFrame:
+    """Build a date-indexed OHLCV DataFrame from candles."""
+    df = pd.DataFrame(
+        [
+            {
+                "Date": candle.end_date,
+                "Close": candle.close,
+                "Open": candle.open,
+                "High": candle.high,
+                "Low": candle.low,
+                "Volume": candle.volume,
+            }
+            for candle in candles
+        ],
+    )
+
+    # Normalize dates to timezone-naive datetime objects for consistent comparison
+    if not df.empty and "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"], utc=True).dt.tz_localize(None)
+
+    df = df.set_index("Date")
+    return df.sort_index()
 
 
 def calculate_macd(
     symbols: list[Symbol],
     conn: "pyodbc.Connection | SQLiteConnectionWrapper | None",
     target_date: date,
+    panel: "CandlePanel | None" = None,
+    states: "Mapping[int, IndicatorState] | None" = None,
 ) -> PrettyTable:
-    """Calculate MACD indicators for given symbols and return a formatted table."""
+    """Calculate MACD indicators for given symbols and return a formatted table.
+
+    Daily candles are read from ``panel`` when it covers the 60-day window,
+    otherwise they are fetched per symbol. MACD and signal come from the stored
+    daily indicator ``states`` advanced over the window when available, instead of
+    being recomputed from the whole window.
+    """
     macd_values = []
     MACDData = namedtuple(
         "MACDData",
@@ -48,47 +86,35 @@ def calculate_macd(
 
             # Get historical data - 60 days for MACD calculation
             start_date = target_date - timedelta(days=60)
-            candles = fetch_daily_candles(symbol, start_date, target_date, conn)
+            series = panel.daily(symbol, start_date, target_date) if panel else None
+            if series is not None:
+                df = series.to_frame()
+            else:
+                candles = fetch_daily_candles(symbol, start_date, target_date, conn)
 
-            if not candles:
-                continue
-
-            # Create DataFrame from candles
-            df = pd.DataFrame(
-                [
-                    {
-                        "Date": candle.end_date,
-                        "Close": candle.close,
-                        "Open": candle.open,
-                        "High": candle.high,
-                        "Low": candle.low,
-                        "Volume": candle.volume,
-                    }
-                    for candle in candles
-                ],
-            )
+                if not candles:
+                    continue
 
-            # Normalize dates to timezone-naive datetime objects for consistent comparison
-            if not df.empty and "Date" in df.columns:
-                df["Date"] = pd.to_datetime(df["Date"], utc=True).dt.tz_localize(None)
-
-            df = df.set_index("Date")
-            df = df.sort_index()
+                df = _candles_to_frame(candles)
 
             if df.empty:
                 continue
 
-            # Calculate MACD
-            exp1 = df["Close"].ewm(span=12, adjust=False).mean()
-            exp2 = df["Close"].ewm(span=26, adjust=False).mean()
-            df["MACD"] = exp1 - exp2
-            df["Signal"] = df["MACD"].ewm(span=9, adjust=False).mean()
-            df["Histogram"] = df["MACD"] - df["Signal"]
-
             current_price = df["Close"].iloc[-1]
-            macd = df["MACD"].iloc[-1]
-            signal = df["Signal"].iloc[-1]
-            histogram = df["Histogram"].iloc[-1]
+            live = live_indicator_state(states, symbol, df.index, df["Close"])
+            if live is not None:
+                macd, signal, histogram = live.macd, live.macd_signal, live.histogram
+            else:
+                # Calculate MACD
+                exp1 = df["Close"].ewm(span=12, adjust=False).mean()
+                exp2 = df["Close"].ewm(span=26, adjust=False).mean()
+                df["MACD"] = exp1 - exp2
+                df["Signal"] = df["MACD"].ewm(span=9, adjust=False).mean()
+                df["Histogram"] = df["MACD"] - df["Signal"]
+
+                macd = df["MACD"].iloc[-1]
+                signal = df["Signal"].iloc[-1]
+                histogram = df["Histogram"].iloc[-1]
 
             # Determine status
             status = "🟢" if histogram > 0 else "🔴"
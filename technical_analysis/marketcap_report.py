@@ -3,10 +3,10 @@
 from http import HTTPStatus
 from typing import TYPE_CHECKING
 
-import requests
 from prettytable import PrettyTable
 
 from infra.telegram_logging_handler import app_logger
+from shared_code.http_session import get_http_session
 from source_repository import Symbol
 from technical_analysis.repositories.marketcap_repository import save_marketcap_results
 
@@ -38,7 +38,7 @@ def fetch_marketcap_report(
     }
 
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = get_http_session().get(url, params=params, timeout=30)
         if response.status_code == HTTPStatus.OK:
             data = response.json()
 
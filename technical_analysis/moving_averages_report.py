@@ -10,6 +10,7 @@ from prettytable import PrettyTable
 from infra.telegram_logging_handler import app_logger
 from shared_code.price_checker import fetch_daily_candles
 from source_repository import Symbol
+from technical_analysis.indicator_state import EMA_SLOW_SPAN, live_indicator_state
 from technical_analysis.repositories.moving_averages_repository import (
     fetch_yesterday_moving_averages,
     save_moving_averages_results,
@@ -18,10 +19,13 @@ from technical_analysis.repositories.moving_averages_repository import (
 
 if TYPE_CHECKING:
     import logging
+    from collections.abc import Mapping
 
     import pyodbc
 
     from infra.sql_connection import SQLiteConnectionWrapper
+    from shared_code.candle_panel import CandlePanel
+    from technical_analysis.indicator_state import IndicatorState
 
 
 def _detect_crossover(
@@ -66,8 +70,16 @@ def calculate_indicators(  # noqa: PLR0915
     symbols: list[Symbol],
     conn: "pyodbc.Connection | SQLiteConnectionWrapper | None",
     target_date: date,
+    panel: "CandlePanel | None" = None,
+    states: "Mapping[int, IndicatorState] | None" = None,
 ) -> tuple[PrettyTable, PrettyTable]:
-    """Calculate moving averages and RSI indicators for cryptocurrency symbols."""
+    """Calculate moving averages and RSI indicators for cryptocurrency symbols.
+
+    Daily candles are read from ``panel`` when it covers the 200-day window,
+    otherwise they are fetched per symbol. EMA50/EMA200 come from the stored daily
+    indicator ``states`` advanced over the window when available; symbols with
+    less than 200 days of history keep the shortened-period window EMAs.
+    """
     # If no date provided, use today's date
     ma_values = []
     ema_values = []
@@ -103,19 +115,25 @@ def calculate_indicators(  # noqa: PLR0915
         try:
             app_logger.info("Processing symbol: %s for date %s", symbol.symbol_name, target_date)
 
-            # Get historical data from database
+            # Get historical data from the run's candle panel or the database
             start_date = target_date - timedelta(days=200)
-            candles = fetch_daily_candles(symbol, start_date, target_date, conn)
-
-            if not candles:
-                app_logger.warning(f"No data available for {symbol.symbol_name} on {target_date}")
-                continue
+            series = panel.daily(symbol, start_date, target_date) if panel else None
+            if series is not None:
+                df = series.to_frame()[["Close"]]
+            else:
+                candles = fetch_daily_candles(symbol, start_date, target_date, conn)
+
+                if not candles:
+                    app_logger.warning(
+                        f"No data available for {symbol.symbol_name} on {target_date}",
+                    )
+                    continue
 
-            # Create DataFrame from candles
-            df = pd.DataFrame(
-                [{"Close": candle.close, "Date": candle.end_date} for candle in candles],
-            )
-            df = df.set_index("Date")
+                # Create DataFrame from candles
+                df = pd.DataFrame(
+                    [{"Close": candle.close, "Date": candle.end_date} for candle in candles],
+                )
+                df = df.set_index("Date")
 
             if df.empty:
                 app_logger.warning(
@@ -133,15 +151,18 @@ def calculate_indicators(  # noqa: PLR0915
             # Calculate indicators with adjusted periods
             df["MA50"] = df["Close"].rolling(window=ma50_period).mean()
             df["MA200"] = df["Close"].rolling(window=ma200_period).mean()
-            df["EMA50"] = df["Close"].ewm(span=ma50_period, adjust=False).mean()
-            df["EMA200"] = df["Close"].ewm(span=ma200_period, adjust=False).mean()
 
             # Get values for target date (last row of filtered DataFrame)
             target_price = df["Close"].iloc[-1]
             target_ma50 = df["MA50"].iloc[-1]
             target_ma200 = df["MA200"].iloc[-1]
-            target_ema50 = df["EMA50"].iloc[-1]
-            target_ema200 = df["EMA200"].iloc[-1]
+
+            live = live_indicator_state(states, symbol, df.index, df["Close"])
+            if live is not None and live.candle_count >= EMA_SLOW_SPAN:
+                target_ema50, target_ema200 = live.ema50, live.ema200
+            else:
+                target_ema50 = df["Close"].ewm(span=ma50_period, adjust=False).mean().iloc[-1]
+                target_ema200 = df["Close"].ewm(span=ma200_period, adjust=False).mean().iloc[-1]
 
             # Add warning indicator if using shorter periods
             min_recommended_periods = 200
@@ -1,7 +1,6 @@
 """Fetch and save Order Book liquidity data and CVD for symbols."""
 
 import sys
-import time
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -10,25 +9,32 @@ from typing import TYPE_CHECKING
 if __name__ == "__main__":
     sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
 from prettytable import PrettyTable
 
+from infra.configuration import get_cvd_stream_settings
 from infra.telegram_logging_handler import app_logger
 from shared_code.binance import (
+    CVDHourlySnapshot,
     CVDMetrics,
-    fetch_binance_order_book,
+    fetch_binance_order_books,
     fetch_cvd_trades_incremental,
 )
+from shared_code.order_book_depth import DEPTH_BANDS_PCT
 from source_repository import SourceID, Symbol
 from technical_analysis.repositories.cvd_repository import CVDRepository
 from technical_analysis.repositories.order_book_repository import OrderBookRepository
+from technical_analysis.repositories.order_book_snapshot_repository import (
+    OrderBookSnapshotRepository,
+)
 
 
 if TYPE_CHECKING:
     import pyodbc
 
     from infra.sql_connection import SQLiteConnectionWrapper
+    from shared_code.order_book_depth import OrderBookDepth
 
 
 # Constants for volume formatting thresholds
@@ -36,15 +42,13 @@ VOLUME_BILLION = 1_000_000_000
 VOLUME_MILLION = 1_000_000
 VOLUME_THOUSAND = 1_000
 
-# CVD rate limiting - wait between symbols to avoid API rate limits
-# Binance Futures has 2400 weight/min limit, each API call = 20 weight
-# Max 120 calls per minute (2400/20), so we need ~0.5s delay per call
-CVD_DELAY_BETWEEN_SYMBOLS = 3  # seconds - short delay to let rate limit recover
-
 # Constants for bid/ask ratio interpretation
 RATIO_BUY_PRESSURE = 1.2
 RATIO_SELL_PRESSURE = 0.8
 
+# Price levels per side kept in the order book snapshot archive
+ORDER_BOOK_ARCHIVE_LEVELS = 100
+
 # Minimum wall size to report in AI context (USD)
 MIN_SIGNIFICANT_WALL = 100_000
 
@@ -90,6 +94,33 @@ def _get_ratio_indicator(ratio: float) -> str:
     return "⚪"  # Neutral
 
 
+def _archive_order_book(
+    snapshot_repo: OrderBookSnapshotRepository,
+    symbol: Symbol,
+    market: str,
+    book: "OrderBookDepth",
+    snapshot_time: datetime,
+) -> None:
+    """Archive one order book, logging failures instead of raising.
+
+    The archive is a side product of the report: a missing OrderBookSnapshots
+    table (Azure SQL needs it created manually) or an encoding error must not
+    drop the symbol's metrics row or abort the report.
+    """
+    try:
+        snapshot_repo.save_snapshot(
+            symbol.symbol_id,
+            book,
+            snapshot_time,
+            market=market,
+            levels=ORDER_BOOK_ARCHIVE_LEVELS,
+        )
+    except Exception as e:  # noqa: BLE001
+        app_logger.warning(
+            f"Could not archive {market} order book for {symbol.symbol_name}: {e!s}",
+        )
+
+
 def fetch_order_book_report(
     symbols: list[Symbol],
     conn: "pyodbc.Connection | SQLiteConnectionWrapper | None",
@@ -105,6 +136,7 @@ def fetch_order_book_report(
 
     """
     repo = OrderBookRepository(conn)
+    snapshot_repo = OrderBookSnapshotRepository(conn)
 
     table = PrettyTable()
     table.field_names = [
@@ -132,14 +164,9 @@ def fetch_order_book_report(
     successful = 0
     failed = 0
 
-    for symbol in symbols:
-        # Only fetch for Binance symbols (order book API)
-        if symbol.source_id != SourceID.BINANCE:
-            continue
-
+    # Spot and futures books of all Binance symbols, fetched concurrently
+    for symbol, metrics, futures_metrics in fetch_binance_order_books(symbols, limit=100):
         try:
-            metrics = fetch_binance_order_book(symbol, limit=100)
-
             if metrics is None:
                 app_logger.warning(f"No order book data available for {symbol.symbol_name}")
                 failed += 1
@@ -152,6 +179,17 @@ def fetch_order_book_report(
                 indicator_date,
             )
 
+            # Archive the top levels so history can be re-analysed with new bands
+            for market, market_metrics in (("spot", metrics), ("futures", futures_metrics)):
+                if market_metrics is not None and market_metrics.book is not None:
+                    _archive_order_book(
+                        snapshot_repo,
+                        symbol,
+                        market,
+                        market_metrics.book,
+                        indicator_date,
+                    )
+
             # Get ratio indicator
             indicator = _get_ratio_indicator(metrics.bid_ask_ratio)
 
@@ -181,6 +219,45 @@ def fetch_order_book_report(
     return table
 
 
+def get_depth_band_history(
+    conn: "pyodbc.Connection | SQLiteConnectionWrapper",
+    symbol: Symbol,
+    days: int = 30,
+    bands_pct: tuple[float, ...] = DEPTH_BANDS_PCT,
+    market: str = "spot",
+) -> list[dict[str, object]]:
+    """Re-analyse archived order book snapshots with the given depth bands.
+
+    Args:
+        conn: Database connection
+        symbol: Symbol to analyse
+        days: Number of days of history to read
+        bands_pct: Depth bands (percent from mid-price) to compute
+        market: 'spot' or 'futures'
+
+    Returns:
+        One entry per snapshot, oldest first, with the mid-price, spread, depth
+        per band and the bid/ask imbalance of the widest band
+
+    """
+    snapshot_repo = OrderBookSnapshotRepository(conn)
+    start = datetime.now(UTC) - timedelta(days=days)
+    return [
+        {
+            "snapshot_time": snapshot_time,
+            "mid_price": book.mid_price,
+            "spread_pct": book.spread_pct,
+            "depth_levels": book.depth_levels(bands_pct),
+            "imbalance": book.imbalance(max(bands_pct)),
+        }
+        for snapshot_time, book in snapshot_repo.iter_snapshots(
+            symbol.symbol_id,
+            start,
+            market=market,
+        )
+    ]
+
+
 def _get_cvd_indicator(cvd: float, total_volume: float) -> str:
     """Get emoji indicator based on CVD relative to volume.
 
@@ -202,6 +279,44 @@ def _get_cvd_indicator(cvd: float, total_volume: float) -> str:
     return "⚪"
 
 
+def _fetch_cvd_snapshots_since_last_trade(
+    repo: CVDRepository,
+    symbol: Symbol,
+) -> list[CVDHourlySnapshot]:
+    """Fetch trades since the last stored one over REST, bucketed into hourly snapshots."""
+    # Step 1: Check if we have existing data and get last trade ID
+    last_trade_id = repo.get_last_trade_id(symbol.symbol_id)
+
+    if last_trade_id:
+        app_logger.info(
+            f"{symbol.symbol_name}: Incremental fetch from trade ID {last_trade_id}",
+        )
+    else:
+        app_logger.info(
+            f"{symbol.symbol_name}: Full 24h fetch (no existing data)",
+        )
+
+    # Step 2: Fetch new trades and bucket by hour
+    return fetch_cvd_trades_incremental(
+        symbol=symbol,
+        symbol_id=symbol.symbol_id,
+        last_trade_id=last_trade_id,
+        max_hours=24,
+    )
+
+
+def _fetch_new_cvd_snapshots(repo: CVDRepository, symbol: Symbol) -> None:
+    """Fetch trades since the last stored one over REST and save them as hourly snapshots."""
+    snapshots = _fetch_cvd_snapshots_since_last_trade(repo, symbol)
+
+    # Step 3: Save hourly snapshots to database
+    if snapshots:
+        saved = repo.save_hourly_snapshots(snapshots)
+        app_logger.info(
+            f"{symbol.symbol_name}: Saved {saved} hourly snapshots",
+        )
+
+
 def fetch_cvd_report(
     symbols: list[Symbol],
     conn: "pyodbc.Connection | SQLiteConnectionWrapper | None",
@@ -209,7 +324,10 @@ def fetch_cvd_report(
     """Fetch Cumulative Volume Delta (order flow) for all symbols.
 
     Uses incremental fetching with hourly snapshots for accurate 1h/4h/24h data.
-    Only fetches new trades since the last snapshot, then aggregates from DB.
+    Only fetches new trades since the last snapshot, then aggregates from DB. When
+    the streaming collector is enabled (CVD_STREAM_ENABLED) it is the only writer of
+    the snapshots and stores closed hours only, so the trades after its last stored
+    one (the current hour) are fetched the same way but only added in memory.
 
     Args:
         symbols: List of Symbol objects to fetch data for
@@ -244,52 +362,45 @@ def fetch_cvd_report(
     table.align["Lg Sells"] = "r"
 
     indicator_date = datetime.now(UTC)
+    stream_enabled = get_cvd_stream_settings().enabled
+    pending: list[CVDHourlySnapshot] = []
     successful = 0
     failed = 0
     binance_symbols = [s for s in symbols if s.source_id == SourceID.BINANCE]
     total_symbols = len(binance_symbols)
 
+    updated_symbols = []
     for idx, symbol in enumerate(binance_symbols):
         try:
-            # Rate limit: wait between symbols to avoid hitting API limits
-            if idx > 0:
-                app_logger.info(
-                    f"CVD rate limit: waiting {CVD_DELAY_BETWEEN_SYMBOLS}s "
-                    f"before {symbol.symbol_name} ({idx + 1}/{total_symbols})",
-                )
-                time.sleep(CVD_DELAY_BETWEEN_SYMBOLS)
-
-            # Step 1: Check if we have existing data and get last trade ID
-            last_trade_id = repo.get_last_trade_id(symbol.symbol_id)
-
-            if last_trade_id:
-                app_logger.info(
-                    f"{symbol.symbol_name}: Incremental fetch from trade ID {last_trade_id}",
-                )
+            # Binance Futures weight (2400/min, 20 per aggTrades call) is paced by the
+            # shared rate limiter, which only waits when the budget is nearly used up
+            app_logger.info(f"CVD: {symbol.symbol_name} ({idx + 1}/{total_symbols})")
+
+            # Steps 1-3: Bring the hourly snapshots up to date. With the streaming
+            # collector running, top up what it has not stored yet in memory only
+            if stream_enabled:
+                pending.extend(_fetch_cvd_snapshots_since_last_trade(repo, symbol))
             else:
-                app_logger.info(
-                    f"{symbol.symbol_name}: Full 24h fetch (no existing data)",
-                )
-
-            # Step 2: Fetch new trades and bucket by hour
-            snapshots = fetch_cvd_trades_incremental(
-                symbol=symbol,
-                symbol_id=symbol.symbol_id,
-                last_trade_id=last_trade_id,
-                max_hours=24,
-            )
+                _fetch_new_cvd_snapshots(repo, symbol)
+            updated_symbols.append(symbol)
 
-            # Step 3: Save hourly snapshots to database
-            if snapshots:
-                saved = repo.save_hourly_snapshots(snapshots)
-                app_logger.info(
-                    f"{symbol.symbol_name}: Saved {saved} hourly snapshots",
-                )
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            app_logger.error(f"Error processing CVD for {symbol.symbol_name}: {e!s}")
+            failed += 1
+
+    # Step 4: Aggregate 1h, 4h and 24h windows for all symbols in one query
+    aggregates = repo.aggregate_cvd_windows(
+        [s.symbol_id for s in updated_symbols],
+        (1, 4, 24),
+        pending=pending,
+    )
 
-            # Step 4: Aggregate from database for 1h, 4h, 24h windows
-            data_1h = repo.aggregate_cvd_for_hours(symbol.symbol_id, 1)
-            data_4h = repo.aggregate_cvd_for_hours(symbol.symbol_id, 4)
-            data_24h = repo.aggregate_cvd_for_hours(symbol.symbol_id, 24)
+    for symbol in updated_symbols:
+        try:
+            windows = aggregates.get(symbol.symbol_id, {})
+            data_1h = windows.get(1)
+            data_4h = windows.get(4)
+            data_24h = windows.get(24)
 
             if not data_24h:
                 app_logger.warning(f"No CVD data available for {symbol.symbol_name}")
@@ -453,23 +564,23 @@ def build_cvd_ai_context(
     """
     repo = CVDRepository(conn)
     lines = ["Order Flow Analysis (Cumulative Volume Delta):"]
+    binance_symbols = [s for s in symbols if s.source_id == SourceID.BINANCE]
+    aggregates = repo.aggregate_cvd_windows([s.symbol_id for s in binance_symbols], (1, 24))
 
-    for symbol in symbols:
-        if symbol.source_id != SourceID.BINANCE:
-            continue
-
+    for symbol in binance_symbols:
         try:
-            metrics = repo.get_latest_cvd_metrics(symbol.symbol_id)
+            windows = aggregates.get(symbol.symbol_id, {})
+            data_24h = windows.get(24)
 
-            if metrics is None:
+            if data_24h is None:
                 continue
 
-            cvd_1h = _to_float(metrics.get("cvd_1h", 0))
-            cvd_24h = _to_float(metrics.get("cvd_24h", 0))
-            buy_vol = _to_float(metrics.get("buy_volume_24h", 0))
-            sell_vol = _to_float(metrics.get("sell_volume_24h", 0))
-            large_buys = int(_to_float(metrics.get("large_buy_count", 0)))
-            large_sells = int(_to_float(metrics.get("large_sell_count", 0)))
+            cvd_1h = _to_float(windows.get(1, {}).get("cvd", 0))
+            cvd_24h = _to_float(data_24h["cvd"])
+            buy_vol = _to_float(data_24h["buy_volume"])
+            sell_vol = _to_float(data_24h["sell_volume"])
+            large_buys = int(data_24h["large_buy_count"])
+            large_sells = int(data_24h["large_sell_count"])
 
             # Determine flow direction
             total_vol = buy_vol + sell_vol
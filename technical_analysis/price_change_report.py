@@ -14,14 +14,20 @@ if TYPE_CHECKING:
     import pyodbc
 
     from infra.sql_connection import SQLiteConnectionWrapper
+    from shared_code.candle_panel import CandlePanel
 
 
 def fetch_price_change_report(
     symbols: list[Symbol],
     conn: "pyodbc.Connection | SQLiteConnectionWrapper | None",
     target_date: date,
+    panel: "CandlePanel | None" = None,
 ) -> PrettyTable:
-    """Fetch and generate a price change report showing 24h and 7d changes."""
+    """Fetch and generate a price change report showing 24h and 7d changes.
+
+    Daily closes are read from ``panel`` when it covers the 7-day window,
+    otherwise they are fetched per symbol.
+    """
     target_date = target_date or datetime.now(UTC).date()
     start_date = target_date - timedelta(days=7)  # Get 7 days of data
 
@@ -36,11 +42,15 @@ def fetch_price_change_report(
     min_candles_for_calculation = 7
     for symbol in symbols:
         try:
-            candles = fetch_daily_candles(symbol, start_date, target_date, conn)
-            if len(candles) >= min_candles_for_calculation:  # Ensure we have enough data
+            series = panel.daily(symbol, start_date, target_date) if panel else None
+            if series is not None:
+                closes = series.close.tolist()
+            else:
+                candles = fetch_daily_candles(symbol, start_date, target_date, conn)
                 # Convert candles to list of closing prices
                 closes = [candle.close for candle in candles]
 
+            if len(closes) >= min_candles_for_calculation:  # Ensure we have enough data
                 current_price = closes[-1]
                 day_ago_price = closes[-2]
                 week_ago_price = closes[0]
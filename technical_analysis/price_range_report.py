@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 from prettytable import PrettyTable
 
 from infra.telegram_logging_handler import app_logger
+from shared_code.candle_series import CandleSeries
 from shared_code.number_format import format_to_6digits_without_trailing_zeros
 from shared_code.price_checker import fetch_hourly_candles
 from source_repository import Symbol
@@ -18,16 +19,20 @@ if TYPE_CHECKING:
     import pyodbc
 
     from infra.sql_connection import SQLiteConnectionWrapper
+    from shared_code.candle_panel import CandlePanel
 
 
 def fetch_range_price(
     symbols: list[Symbol],
     conn: "pyodbc.Connection | SQLiteConnectionWrapper | None",
+    panel: "CandlePanel | None" = None,
 ) -> PrettyTable:
     """Calculate 24-hour price range using hourly candles.
 
-    Fetches hourly candles for the last 24 hours. If hourly data is missing from the database,
-    it will automatically fetch from the exchange API (Binance/KuCoin).
+    Uses the hourly window of ``panel`` (loaded for the last 24 hours of the run) when
+    given. Otherwise fetches hourly candles for the last 24 hours; if hourly data is
+    missing from the database, it will automatically fetch from the exchange API
+    (Binance/KuCoin).
     """
     results = []
 
@@ -41,17 +46,20 @@ def fetch_range_price(
                 app_logger.warning(f"No database connection, skipping {symbol.symbol_name}")
                 continue
 
-            # Fetch hourly candles for the last 24 hours
-            # This will fetch from DB if available, or from API if missing
-            candles = fetch_hourly_candles(symbol, start_time, end_time, conn)
+            series = panel.hourly(symbol) if panel else None
+            if series is None:
+                # Fetch hourly candles for the last 24 hours
+                # This will fetch from DB if available, or from API if missing
+                candles = fetch_hourly_candles(symbol, start_time, end_time, conn)
+                series = CandleSeries.from_candles(symbol.symbol_name, candles)
 
-            if not candles:
+            if not len(series):
                 app_logger.warning(f"No hourly candles found for {symbol.symbol_name}")
                 continue
 
             # Calculate high and low from all hourly candles in the 24-hour period
-            high_price = max(float(c.high) for c in candles)
-            low_price = min(float(c.low) for c in candles)
+            high_price = float(series.high.max())
+            low_price = float(series.low.min())
 
             # Create a result object with symbol name and price range
             price_data = type(
@@ -9,6 +9,7 @@ from prettytable import PrettyTable
 from infra.telegram_logging_handler import app_logger
 from shared_code.common_price import Candle
 from source_repository import Symbol
+from technical_analysis.indicator_state import live_indicator_state
 from technical_analysis.repositories.rsi_repository import (
     get_historical_rsi,
     save_rsi_results,
@@ -17,9 +18,12 @@ from technical_analysis.rsi import calculate_rsi_using_rma
 
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     import pyodbc
 
     from infra.sql_connection import SQLiteConnectionWrapper
+    from technical_analysis.indicator_state import IndicatorState
 
 
 def create_rsi_table_for_symbol(
@@ -132,10 +136,33 @@ def create_rsi_table_for_symbol(
     return rsi_table
 
 
+def _latest_rsi(
+    symbol: Symbol,
+    candles: list[Candle],
+    closes: pd.Series,
+    states: "Mapping[int, IndicatorState] | None",
+) -> float:
+    """Return the RSI after the last candle.
+
+    Uses the symbol's stored Wilder averages advanced over the candles when they
+    cover them, otherwise recomputes the RSI from the window's closes.
+    """
+    live = live_indicator_state(
+        states,
+        symbol,
+        [candle.end_date for candle in candles],
+        [candle.close for candle in candles],
+    )
+    if live is not None and live.rsi is not None:
+        return live.rsi
+    return float(calculate_rsi_using_rma(closes).iloc[-1])
+
+
 def create_rsi_table(
     symbols_with_candles: list[tuple[Symbol, list[Candle]]],
     conn: "pyodbc.Connection | SQLiteConnectionWrapper | None",
     target_date: date,
+    states: "Mapping[int, IndicatorState] | None" = None,
 ) -> PrettyTable:
     """Create RSI table for given symbols using pre-fetched daily candles.
 
@@ -144,6 +171,8 @@ def create_rsi_table(
                               Each candle list should cover at least 30 days
         conn: Database connection for saving RSI
         target_date: The date for which to calculate RSI
+        states: Stored daily indicator states keyed by symbol ID; when one covers
+                the candles, its Wilder averages give the RSI instead of the window
 
     Returns:
         PrettyTable with RSI data for all symbols
@@ -176,9 +205,9 @@ def create_rsi_table(
             df = df.sort_index()
 
             if not df.empty:
-                df["RSI"] = calculate_rsi_using_rma(df["close"])
                 # Create a proper copy of the latest row
                 latest_row = df.iloc[[-1]].copy()
+                latest_row["RSI"] = _latest_rsi(symbol, candles, df["close"], states)
                 # Get the date from the index
                 latest_date = latest_row.index[-1]
 
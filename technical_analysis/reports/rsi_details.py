@@ -8,7 +8,7 @@ from prettytable import PrettyTable
 
 from infra.telegram_logging_handler import app_logger
 from source_repository import Symbol
-from technical_analysis.repositories.rsi_repository import get_candles_with_rsi
+from technical_analysis.repositories.rsi_repository import get_candles_with_rsi_frame
 
 
 if TYPE_CHECKING:
@@ -31,15 +31,13 @@ def create_rsi_table_for_symbol(
     try:
         # Get 30 days of data with RSI values
         start_date = target_date - timedelta(days=30)
-        candles_with_rsi = get_candles_with_rsi(conn, symbol.symbol_id, start_date)
+        if conn is None:
+            return None
+        df = get_candles_with_rsi_frame(conn, symbol.symbol_id, start_date)
 
-        if not candles_with_rsi:
+        if df.empty:
             return None
 
-        # Create DataFrame from candles
-        df = pd.DataFrame(candles_with_rsi)
-        df = df.set_index("date")
-        df = df.sort_index()
         df["symbol"] = symbol.symbol_name
 
         if not df.empty:
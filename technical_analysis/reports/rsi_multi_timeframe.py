@@ -18,7 +18,7 @@ from technical_analysis.repositories.hourly_candle_repository import (
     HourlyCandleRepository,
 )
 from technical_analysis.repositories.rsi_repository import (
-    get_candles_with_rsi,
+    get_candles_with_rsi_frame,
     save_rsi_by_timeframe,
 )
 from technical_analysis.rsi import calculate_rsi_using_rma
@@ -90,14 +90,13 @@ def get_rsi_for_symbol_timeframe(  # noqa: PLR0915,PLR0912
 
     try:  # Get candle data with RSI values from the database, using the
         # extended date range for calculation
-        candles_with_rsi = get_candles_with_rsi(
-            conn,
-            symbol.symbol_id,
-            calculation_start_date,
-            timeframe,
+        df = (
+            get_candles_with_rsi_frame(conn, symbol.symbol_id, calculation_start_date, timeframe)
+            if conn is not None
+            else None
         )
 
-        if not candles_with_rsi:
+        if df is None or df.empty:
             app_logger.warning(
                 f"No {timeframe} RSI data found for {symbol.symbol_name}, "
                 f"attempting to calculate RSI",
@@ -126,10 +125,8 @@ def get_rsi_for_symbol_timeframe(  # noqa: PLR0915,PLR0912
                 app_logger.error(f"Failed to calculate RSI for {symbol.symbol_name} {timeframe}")
                 return None
 
-        # Create DataFrame from candles
-        df = pd.DataFrame(candles_with_rsi)
-        df = df.set_index("date")
-        df = df.sort_index()
+            df = pd.DataFrame(candles_with_rsi).set_index("date").sort_index()
+
         df["symbol"] = symbol.symbol_name
 
         # Ensure the index is DatetimeIndex
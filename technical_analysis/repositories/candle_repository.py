@@ -4,8 +4,13 @@ import os
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+import numpy as np
+
+from shared_code.candle_series import CandleSeries
 from shared_code.common_price import Candle
+from shared_code.epoch import EPOCH_COLUMN, to_epoch
 from source_repository import Symbol
+from technical_analysis.repositories.columnar import fetch_columns
 
 
 if TYPE_CHECKING:
@@ -14,9 +19,31 @@ if TYPE_CHECKING:
     from infra.sql_connection import SQLiteConnectionWrapper
 
 
+# Session-scoped temp table used by the SQL Server bulk upsert
+STAGING_TABLE = "#CandleStaging"
+
+# Symbols per IN (...) list, well below SQLite's and SQL Server's parameter limits
+MAX_SYMBOLS_PER_QUERY = 500
+
+
 class CandleRepository:
     """Repository for managing candle data operations."""
 
+    # Columns loaded into the staging table and the natural key the MERGE matches on
+    _merge_columns: tuple[str, ...] = (
+        "SymbolID",
+        "SourceID",
+        "EndDate",
+        "[Open]",
+        "[Close]",
+        "High",
+        "Low",
+        "Last",
+        "Volume",
+        "VolumeQuote",
+    )
+    _merge_key: tuple[str, ...] = ("SymbolID", "SourceID", "EndDate")
+
     def __init__(
         self,
         conn: "pyodbc.Connection | SQLiteConnectionWrapper",
@@ -32,43 +59,17 @@ class CandleRepository:
         self.conn = conn
         self.table_name = table_name
 
-    def save_candle(self, symbol: Symbol, candle: Candle, source: int) -> None:
-        """Save a candle to the database.
-
-        Args:
-            symbol: Symbol object
-            candle: Candle data to save
-            source: Source identifier
-
-        """
-        # Check if we're using SQLite or SQL Server
-        is_sqlite = os.getenv("DATABASE_TYPE", "azuresql").lower() == "sqlite"
-
+    def _upsert_sql(self, *, is_sqlite: bool) -> str:
+        """Return the single-row upsert statement for this table."""
         if is_sqlite:
             # SQLite uses INSERT OR REPLACE
-            sql = f"""
+            return f"""
             INSERT OR REPLACE INTO {self.table_name}
             (SymbolID, SourceID, EndDate, [Open], [Close], High, Low, Last, Volume, VolumeQuote)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """  # noqa: S608
-            self.conn.execute(
-                sql,
-                (
-                    symbol.symbol_id,
-                    source,
-                    candle.end_date,
-                    candle.open,
-                    candle.close,
-                    candle.high,
-                    candle.low,
-                    candle.last,
-                    candle.volume,
-                    candle.volume_quote,
-                ),
-            )
-        else:
-            # SQL Server uses MERGE
-            sql = f"""
+        # SQL Server uses MERGE
+        return f"""
             MERGE {self.table_name} AS target
             USING (SELECT ? as SymbolID, ? as SourceID, ? as EndDate) AS source
             ON (target.SymbolID = source.SymbolID
@@ -79,26 +80,194 @@ class CandleRepository:
                         Last, Volume, VolumeQuote)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
             """  # noqa: S608
-            self.conn.execute(
-                sql,
-                (
-                    symbol.symbol_id,
-                    source,
-                    candle.end_date,  # For the USING clause
-                    symbol.symbol_id,
-                    source,
-                    candle.end_date,  # For the INSERT clause
-                    candle.open,
-                    candle.close,
-                    candle.high,
-                    candle.low,
-                    candle.last,
-                    candle.volume,
-                    candle.volume_quote,
-                ),
-            )
+
+    def _upsert_params(
+        self,
+        symbol: Symbol,
+        candle: Candle,
+        source: int,
+        *,
+        is_sqlite: bool,
+    ) -> tuple:
+        """Return the parameters of the upsert statement for one candle."""
+        values = (
+            candle.open,
+            candle.close,
+            candle.high,
+            candle.low,
+            candle.last,
+            candle.volume,
+            candle.volume_quote,
+        )
+        if is_sqlite:
+            return (symbol.symbol_id, source, candle.end_date, *values)
+        return (
+            symbol.symbol_id,
+            source,
+            candle.end_date,  # For the USING clause
+            symbol.symbol_id,
+            source,
+            candle.end_date,  # For the INSERT clause
+            *values,
+        )
+
+    def save_candle(self, symbol: Symbol, candle: Candle, source: int) -> None:
+        """Save a candle to the database.
+
+        Args:
+            symbol: Symbol object
+            candle: Candle data to save
+            source: Source identifier
+
+        """
+        # Check if we're using SQLite or SQL Server
+        is_sqlite = os.getenv("DATABASE_TYPE", "azuresql").lower() == "sqlite"
+        self.conn.execute(
+            self._upsert_sql(is_sqlite=is_sqlite),
+            self._upsert_params(symbol, candle, source, is_sqlite=is_sqlite),
+        )
+        self.conn.commit()
+
+    def save_candles(self, symbol: Symbol, candles: list[Candle], source: int) -> list[Candle]:
+        """Save many candles in a single transaction and return them with their IDs.
+
+        SQLite runs the upsert with ``RETURNING Id`` for every candle (no network
+        round trips, one commit). SQL Server bulk-loads the candles into a temp
+        staging table with ``fast_executemany`` and merges them with one MERGE, so
+        ingestion costs a handful of round trips regardless of the batch size.
+
+        Args:
+            symbol: Symbol object
+            candles: Candles to save
+            source: Source identifier
+
+        Returns:
+            The same candles with ``id`` set to their database row ID
+
+        """
+        if not candles:
+            return []
+
+        is_sqlite = os.getenv("DATABASE_TYPE", "azuresql").lower() == "sqlite"
+        try:
+            if is_sqlite:
+                ids = self._upsert_returning_ids(symbol, candles, source)
+            else:
+                ids = self._merge_from_staging(symbol, candles, source)
+        except Exception:
+            self.conn.rollback()
+            raise
         self.conn.commit()
 
+        for candle, candle_id in zip(candles, ids, strict=True):
+            candle.id = candle_id
+        return candles
+
+    def _upsert_returning_ids(
+        self,
+        symbol: Symbol,
+        candles: list[Candle],
+        source: int,
+    ) -> list[int | None]:
+        """Upsert candles into SQLite, reading each row ID back via RETURNING."""
+        sql = self._upsert_sql(is_sqlite=True).rstrip() + "\n            RETURNING Id"
+        cursor = self.conn.cursor()
+        ids = []
+        for candle in candles:
+            cursor.execute(sql, self._upsert_params(symbol, candle, source, is_sqlite=True))
+            row = cursor.fetchone()
+            ids.append(row[0] if row else None)
+        return ids
+
+    def _merge_row(self, symbol: Symbol, candle: Candle, source: int) -> tuple:
+        """Return the staging table values (in ``_merge_columns`` order) for one candle."""
+        return (
+            symbol.symbol_id,
+            source,
+            candle.end_date,
+            candle.open,
+            candle.close,
+            candle.high,
+            candle.low,
+            candle.last,
+            candle.volume,
+            candle.volume_quote,
+        )
+
+    def _merge_from_staging(
+        self,
+        symbol: Symbol,
+        candles: list[Candle],
+        source: int,
+    ) -> list[int | None]:
+        """Bulk-load candles into a staging table and MERGE them into SQL Server.
+
+        Existing rows are left untouched (same as the single-row MERGE). The IDs of
+        new and existing rows are read back by joining the staging table on the key.
+        """
+        columns = ", ".join(self._merge_columns)
+        key_match = " AND ".join(f"target.{key} = source.{key}" for key in self._merge_key)
+        placeholders = ", ".join("?" for _ in range(len(self._merge_columns) + 1))
+
+        cursor = self.conn.cursor()
+        cursor.fast_executemany = True
+        cursor.execute(
+            f"""
+            IF OBJECT_ID('tempdb..{STAGING_TABLE}') IS NOT NULL DROP TABLE {STAGING_TABLE};
+            SELECT TOP 0 {columns}, CAST(0 AS INT) AS RowNum
+            INTO {STAGING_TABLE}
+            FROM {self.table_name}
+            """,  # noqa: S608
+        )
+        cursor.executemany(
+            f"INSERT INTO {STAGING_TABLE} ({columns}, RowNum) VALUES ({placeholders})",  # noqa: S608
+            [
+                (*self._merge_row(symbol, candle, source), row_num)
+                for row_num, candle in enumerate(candles)
+            ],
+        )
+        source_columns = ", ".join(f"source.{column}" for column in self._merge_columns)
+        cursor.execute(
+            f"""
+            MERGE {self.table_name} AS target
+            USING {STAGING_TABLE} AS source
+            ON ({key_match})
+            WHEN NOT MATCHED THEN
+                INSERT ({columns})
+                VALUES ({source_columns});
+            """,  # noqa: S608
+        )
+        rows = cursor.execute(
+            f"""
+            SELECT source.RowNum, target.Id
+            FROM {STAGING_TABLE} AS source
+            JOIN {self.table_name} AS target ON {key_match}
+            """,  # noqa: S608
+        ).fetchall()
+        cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+
+        ids: list[int | None] = [None] * len(candles)
+        for row_num, candle_id in rows:
+            ids[row_num] = candle_id
+        return ids
+
+    def _time_range(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> tuple[str, int | str, int | str]:
+        """Return the column and bounds of an inclusive EndDate range filter.
+
+        SQLite filters on the integer ``Ts`` epoch column, so stored and bound
+        dates compare as instants whatever their ISO formatting. SQL Server
+        compares EndDate with the ISO strings of the bounds.
+        """
+        if os.getenv("DATABASE_TYPE", "azuresql").lower() == "sqlite":
+            return EPOCH_COLUMN, to_epoch(start_date), to_epoch(end_date)
+        start = start_date.isoformat() if isinstance(start_date, datetime) else str(start_date)
+        end = end_date.isoformat() if isinstance(end_date, datetime) else str(end_date)
+        return "EndDate", start, end
+
     def get_candle(self, symbol: Symbol, end_date: datetime) -> Candle | None:
         """Retrieve a single candle for the given symbol and end date."""
         sql = f"""
@@ -135,13 +304,7 @@ class CandleRepository:
 
     def get_candles(self, symbol: Symbol, start_date: datetime, end_date: datetime) -> list[Candle]:
         """Retrieve candles for the given symbol within the date range."""
-        # Convert datetime objects to ISO format strings for comparison since
-        # EndDate is stored as text
-        start_date_str = (
-            start_date.isoformat() if isinstance(start_date, datetime) else str(start_date)
-        )
-        end_date_str = end_date.isoformat() if isinstance(end_date, datetime) else str(end_date)
-
+        time_column, start, end = self._time_range(start_date, end_date)
         sql = f"""
         SELECT [Id]
             ,[SymbolID]
@@ -156,11 +319,11 @@ class CandleRepository:
             ,[VolumeQuote]
         FROM {self.table_name}
         WHERE SymbolID = ?
-        AND EndDate >= ?
-        AND EndDate <= ?
-        ORDER BY EndDate
+        AND {time_column} >= ?
+        AND {time_column} <= ?
+        ORDER BY {time_column}
         """  # noqa: S608
-        rows = self.conn.execute(sql, (symbol.symbol_id, start_date_str, end_date_str)).fetchall()
+        rows = self.conn.execute(sql, (symbol.symbol_id, start, end)).fetchall()
         return [
             Candle(
                 id=row[0],
@@ -178,6 +341,65 @@ class CandleRepository:
             for row in rows
         ]
 
+    def get_candle_series(
+        self,
+        symbols: list[Symbol],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> dict[int, CandleSeries]:
+        """Load a date window for many symbols in one query.
+
+        Replaces one ``get_candles`` round trip per symbol with a single range scan
+        (``SymbolID IN (...)``), read with ``fetch_columns`` straight into the
+        series arrays instead of Candle objects.
+
+        Args:
+            symbols: Symbols to load
+            start_date: Inclusive start of the EndDate window
+            end_date: Inclusive end of the EndDate window
+
+        Returns:
+            Series keyed by symbol ID; symbols without candles get an empty series
+
+        """
+        time_column, start, end = self._time_range(start_date, end_date)
+        names = {symbol.symbol_id: symbol.symbol_name for symbol in symbols}
+        series = {
+            symbol.symbol_id: CandleSeries.from_rows(symbol.symbol_name, []) for symbol in symbols
+        }
+        for offset in range(0, len(symbols), MAX_SYMBOLS_PER_QUERY):
+            chunk = symbols[offset : offset + MAX_SYMBOLS_PER_QUERY]
+            placeholders = ", ".join("?" for _ in chunk)
+            sql = f"""
+            SELECT [Id]
+                ,[SymbolID]
+                ,[SourceID]
+                ,[EndDate]
+                ,[Open]
+                ,[Close]
+                ,[High]
+                ,[Low]
+                ,[Last]
+                ,[Volume]
+                ,[VolumeQuote]
+            FROM {self.table_name}
+            WHERE SymbolID IN ({placeholders})
+            AND {time_column} >= ?
+            AND {time_column} <= ?
+            ORDER BY SymbolID, {time_column}
+            """  # noqa: S608
+            params = (*(symbol.symbol_id for symbol in chunk), start, end)
+            columns = fetch_columns(self.conn, sql, params)
+
+            # Rows are sorted by symbol, so each symbol is one contiguous slice
+            symbol_ids, starts = np.unique(columns["SymbolID"], return_index=True)
+            ends = [*starts[1:], len(columns["SymbolID"])]
+            for symbol_id, start, end in zip(symbol_ids, starts, ends, strict=True):
+                window = {name: values[start:end] for name, values in columns.items()}
+                series[int(symbol_id)] = CandleSeries.from_columns(names[int(symbol_id)], window)
+
+        return series
+
     def get_min_candle_date(self) -> datetime | None:
         """Fetch the earliest date from the candles table.
 
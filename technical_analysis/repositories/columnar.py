@@ -0,0 +1,228 @@
+"""Column-wise (NumPy) reads of query results.
+
+Most readers turn ``cursor.fetchall()`` rows into ``Candle`` objects or dicts only
+to build a DataFrame from them right away. :func:`fetch_columns` streams a result
+with ``fetchmany`` straight into one preallocated NumPy array per column instead:
+
+- integer columns become ``int64`` (``float64`` with NaN once a NULL shows up)
+- float and decimal columns, and columns holding only NULLs, become ``float64``
+  with NaN for NULL
+- datetime/date columns, and text columns holding ISO dates, become ``int64``
+  seconds since the Unix epoch in UTC (naive values are taken as UTC), with
+  ``NAT_EPOCH`` for NULL so that ``values.astype("datetime64[s]")`` gives NaT
+- anything else is kept as an ``object`` array
+
+Every batch of rows is checked against the column type picked so far, and the
+column is widened when the batch doesn't fit: NULLs take the type of the first
+value that shows up, integers turn into floats on a REAL value, and mixed types
+(dates already read come back as ``datetime`` objects) end up as ``object``. On
+SQLite the rows are read without the wrapper's row decoding, so ISO date text is
+parsed once per batch instead of once per value.
+
+Usage:
+------
+    ```python
+    columns = fetch_columns(conn, "SELECT EndDate, [Close] FROM DailyCandles")
+    closes = pd.Series(columns["Close"], index=epoch_to_datetime64(columns["EndDate"]))
+    ```
+"""
+
+from collections.abc import Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    import pyodbc
+
+    from infra.sql_connection import SQLiteConnectionWrapper
+
+
+# Rows fetched per round trip; also the initial capacity of every column
+FETCH_BATCH_SIZE = 5000
+# Epoch value of NULL datetimes (the int64 representation of NaT)
+NAT_EPOCH = np.iinfo(np.int64).min
+# "YYYY-MM-DD" is the shortest ISO date string
+_MIN_ISO_LENGTH = 10
+
+_NULL = "null"
+_INT = "int"
+_FLOAT = "float"
+_EPOCH = "epoch"
+_OBJECT = "object"
+_DTYPES = {_NULL: np.float64, _INT: np.int64, _FLOAT: np.float64, _EPOCH: np.int64, _OBJECT: object}
+_NULLS = {_FLOAT: np.nan, _EPOCH: NAT_EPOCH, _OBJECT: None}
+
+
+def _is_iso_date(value: str) -> bool:
+    """Return True for text like "2025-10-23", "2025-10-23 20:00:00" or "...+00:00"."""
+    if len(value) < _MIN_ISO_LENGTH or value[4:5] != "-" or not value[:4].isdigit():
+        return False
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    return True
+
+
+def _column_kind(values: Sequence[Any]) -> str:
+    """Pick the narrowest storage kind holding every value of a batch.
+
+    Only the first text value is checked for an ISO date; the others are checked
+    when the batch is converted.
+    """
+    types = set(map(type, values))
+    has_null = type(None) in types
+    types.discard(type(None))
+    if not types:
+        return _NULL
+    if all(issubclass(t, int) for t in types):
+        return _FLOAT if has_null else _INT
+    if all(issubclass(t, int | float | Decimal) for t in types):
+        return _FLOAT
+    if all(issubclass(t, date) for t in types):
+        return _EPOCH
+    if all(issubclass(t, str | date) for t in types):
+        text = next(v for v in values if isinstance(v, str))
+        return _EPOCH if _is_iso_date(text) else _OBJECT
+    return _OBJECT
+
+
+def _common_kind(kind: str, other: str) -> str:
+    """Return the narrowest storage kind holding values of both kinds."""
+    if kind == other:
+        return kind
+    if _NULL in (kind, other):
+        known = other if kind == _NULL else kind
+        return _FLOAT if known == _INT else known
+    if {kind, other} == {_INT, _FLOAT}:
+        return _FLOAT
+    return _OBJECT
+
+
+def to_epoch_seconds(values: Sequence[Any]) -> np.ndarray:
+    """Convert datetimes, dates or ISO strings to int64 UTC epoch seconds.
+
+    Naive values are taken as UTC; NULLs become ``NAT_EPOCH``.
+    """
+    index = pd.to_datetime(list(values), utc=True, format="ISO8601")
+    return index.as_unit("s").asi8
+
+
+def epoch_to_datetime64(values: np.ndarray, unit: str = "s") -> np.ndarray:
+    """Return epoch seconds as naive-UTC ``datetime64`` values (NaT for ``NAT_EPOCH``)."""
+    return values.astype("datetime64[s]").astype(f"datetime64[{unit}]")
+
+
+class _Column:
+    """Growable NumPy buffer for one result column."""
+
+    def __init__(self, kind: str, capacity: int) -> None:
+        self.kind = kind
+        self.data = np.empty(capacity, dtype=_DTYPES[kind])
+
+    def _convert(self, values: Sequence[Any]) -> np.ndarray:
+        if self.kind == _EPOCH:
+            return to_epoch_seconds(values)
+        return np.asarray(values, dtype=_DTYPES[self.kind])
+
+    def widen(self, kind: str, size: int) -> None:
+        """Switch to a wider kind, converting the ``size`` values stored so far."""
+        data = np.empty(len(self.data), dtype=_DTYPES[kind])
+        stored = self.data[:size]
+        if self.kind == _NULL:
+            data[:size] = _NULLS[kind]
+        elif self.kind == _EPOCH:
+            data[:size] = epoch_to_datetime64(stored).astype(object)
+        else:
+            data[:size] = stored
+            if self.kind == _FLOAT and kind == _OBJECT:
+                data[:size][np.isnan(stored)] = None
+        self.kind = kind
+        self.data = data
+
+    def store(self, start: int, values: Sequence[Any]) -> None:
+        kind = _common_kind(self.kind, _column_kind(values))
+        if kind != self.kind:
+            self.widen(kind, start)
+        try:
+            chunk = self._convert(values)
+        except ValueError:
+            if self.kind != _EPOCH:
+                raise
+            # Text that is not an ISO date in a date column
+            self.widen(_OBJECT, start)
+            chunk = self._convert(values)
+        self.data[start : start + len(chunk)] = chunk
+
+    def resize(self, capacity: int, size: int) -> None:
+        data = np.empty(capacity, dtype=self.data.dtype)
+        data[:size] = self.data[:size]
+        self.data = data
+
+
+def _cursor(
+    conn: "pyodbc.Connection | SQLiteConnectionWrapper",
+) -> "pyodbc.Cursor | sqlite3.Cursor":
+    """Return a cursor yielding plain tuples (no per-row decoding on SQLite)."""
+    raw_cursor = getattr(conn, "raw_cursor", None)
+    return raw_cursor() if raw_cursor is not None else conn.cursor()
+
+
+def fetch_columns(
+    conn: "pyodbc.Connection | SQLiteConnectionWrapper",
+    query: str,
+    params: Sequence[Any] = (),
+    *,
+    batch_size: int = FETCH_BATCH_SIZE,
+) -> dict[str, np.ndarray]:
+    """Run a query and return its result as one NumPy array per column.
+
+    Args:
+        conn: Database connection
+        query: SQL query
+        params: Query parameters
+        batch_size: Rows fetched per round trip
+
+    Returns:
+        Arrays keyed by column name, in select order (see the module docstring for
+        the column types)
+
+    """
+    cursor = _cursor(conn)
+    if params:
+        cursor.execute(query, params)
+    else:
+        cursor.execute(query)
+    names = [column[0] for column in cursor.description]
+    columns: list[_Column] = []
+    size = capacity = 0
+
+    try:
+        while rows := cursor.fetchmany(batch_size):
+            transposed = list(zip(*rows, strict=True))
+            if not columns:
+                capacity = max(batch_size, len(rows))
+                columns = [_Column(_column_kind(values), capacity) for values in transposed]
+            elif size + len(rows) > capacity:
+                capacity = max(2 * capacity, size + len(rows))
+                for column in columns:
+                    column.resize(capacity, size)
+            for column, values in zip(columns, transposed, strict=True):
+                column.store(size, values)
+            size += len(rows)
+    finally:
+        cursor.close()
+
+    if not columns:
+        return {name: np.empty(0, dtype=np.float64) for name in names}
+    return {
+        name: column.data[:size] if size == capacity else column.data[:size].copy()
+        for name, column in zip(names, columns, strict=True)
+    }
@@ -6,12 +6,129 @@ from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
 
 from infra.telegram_logging_handler import app_logger
+from shared_code.epoch import EPOCH_COLUMN, to_epoch
 
 
 if TYPE_CHECKING:
     from shared_code.binance import CVDHourlySnapshot, CVDMetrics
 
 
+# Temp table the SQL Server snapshot upsert bulk-loads before its MERGE
+SNAPSHOT_STAGING_TABLE = "#CVDHourlyStaging"
+
+_SNAPSHOT_COLUMNS = (
+    "SymbolID, HourTimestamp, CVD, BuyVolume, SellVolume, TradeCount, "
+    "LargeBuyCount, LargeSellCount, AvgTradeSize, LastTradeId"
+)
+
+# Accumulating update of an existing hour with a newer snapshot
+_ACCUMULATE_SET = """CVD = {target}.CVD + {source}.CVD,
+                    BuyVolume = {target}.BuyVolume + {source}.BuyVolume,
+                    SellVolume = {target}.SellVolume + {source}.SellVolume,
+                    TradeCount = {target}.TradeCount + {source}.TradeCount,
+                    LargeBuyCount = {target}.LargeBuyCount + {source}.LargeBuyCount,
+                    LargeSellCount = {target}.LargeSellCount + {source}.LargeSellCount,
+                    AvgTradeSize = {source}.AvgTradeSize,
+                    LastTradeId = {source}.LastTradeId"""
+
+# Upper bound on symbols per IN (...) list, well below SQL Server's 2100 parameters
+MAX_SYMBOLS_PER_QUERY = 500
+
+# Conditional aggregates selected per window by aggregate_cvd_windows (one
+# placeholder per column, bound to the window's cutoff on the hour column)
+_WINDOW_AGGREGATES_SQL = """
+                SUM(CASE WHEN {hour} >= ? THEN CVD END),
+                SUM(CASE WHEN {hour} >= ? THEN BuyVolume END),
+                SUM(CASE WHEN {hour} >= ? THEN SellVolume END),
+                SUM(CASE WHEN {hour} >= ? THEN TradeCount END),
+                SUM(CASE WHEN {hour} >= ? THEN LargeBuyCount END),
+                SUM(CASE WHEN {hour} >= ? THEN LargeSellCount END),
+                AVG(CASE WHEN {hour} >= ? THEN AvgTradeSize END),
+                COUNT(CASE WHEN {hour} >= ? THEN 1 END)"""
+_AGGREGATE_COLUMNS = _WINDOW_AGGREGATES_SQL.count("?")
+
+
+def _snapshot_values(snapshot: "CVDHourlySnapshot") -> tuple:
+    """Return a snapshot's value columns in _SNAPSHOT_COLUMNS order (after the key)."""
+    return (
+        snapshot.cvd,
+        snapshot.buy_volume,
+        snapshot.sell_volume,
+        snapshot.trade_count,
+        snapshot.large_buy_count,
+        snapshot.large_sell_count,
+        snapshot.avg_trade_size,
+        snapshot.last_trade_id,
+    )
+
+
+def _parse_window_aggregates(
+    row: tuple,
+    windows: tuple[int, ...],
+) -> dict[int, dict[str, float | int]]:
+    """Split one aggregate_cvd_windows row into per-window metrics."""
+    aggregates = {}
+    for index, hours in enumerate(windows):
+        (
+            cvd,
+            buy_volume,
+            sell_volume,
+            trade_count,
+            large_buys,
+            large_sells,
+            avg_trade_size,
+            hour_count,
+        ) = (row[1 + index * _AGGREGATE_COLUMNS + k] for k in range(_AGGREGATE_COLUMNS))
+        if hour_count:
+            aggregates[hours] = {
+                "cvd": cvd or 0,
+                "buy_volume": buy_volume or 0,
+                "sell_volume": sell_volume or 0,
+                "trade_count": int(trade_count or 0),
+                "large_buy_count": int(large_buys or 0),
+                "large_sell_count": int(large_sells or 0),
+                "avg_trade_size": avg_trade_size or 0,
+                "hour_count": hour_count,
+            }
+    return aggregates
+
+
+def _add_pending_snapshot(
+    aggregates: dict[int, dict[str, float | int]],
+    snapshot: "CVDHourlySnapshot",
+    windows: tuple[int, ...],
+    cutoffs: list[datetime],
+) -> None:
+    """Add an unstored hourly snapshot to the windows it falls into."""
+    for hours, cutoff in zip(windows, cutoffs, strict=True):
+        if snapshot.hour_timestamp < cutoff:
+            continue
+        window = aggregates.setdefault(
+            hours,
+            {
+                "cvd": 0,
+                "buy_volume": 0,
+                "sell_volume": 0,
+                "trade_count": 0,
+                "large_buy_count": 0,
+                "large_sell_count": 0,
+                "avg_trade_size": 0,
+                "hour_count": 0,
+            },
+        )
+        hour_count = window["hour_count"]
+        window["avg_trade_size"] = (
+            window["avg_trade_size"] * hour_count + snapshot.avg_trade_size
+        ) / (hour_count + 1)
+        window["hour_count"] = hour_count + 1
+        window["cvd"] += snapshot.cvd
+        window["buy_volume"] += snapshot.buy_volume
+        window["sell_volume"] += snapshot.sell_volume
+        window["trade_count"] += snapshot.trade_count
+        window["large_buy_count"] += snapshot.large_buy_count
+        window["large_sell_count"] += snapshot.large_sell_count
+
+
 class CVDRepository:
     """Repository for Cumulative Volume Delta order flow metrics."""
 
@@ -278,131 +395,8 @@ class CVDRepository:
             snapshot: CVDHourlySnapshot object with hourly data
 
         """
-        cursor = self.conn.cursor()
-        hour_ts = snapshot.hour_timestamp.isoformat()
-
         try:
-            if self.is_sqlite:
-                # SQLite: Check if exists, then update or insert
-                cursor.execute(
-                    """
-                    SELECT Id, CVD, BuyVolume, SellVolume, TradeCount,
-                           LargeBuyCount, LargeSellCount, LastTradeId
-                    FROM CVDHourlySnapshots
-                    WHERE SymbolID = ? AND HourTimestamp = ?
-                    """,
-                    (snapshot.symbol_id, hour_ts),
-                )
-                existing = cursor.fetchone()
-
-                if existing:
-                    # Update: add new values to existing (accumulate)
-                    # Only update if we have newer trades
-                    existing_last_id = existing[7] or 0
-                    if snapshot.last_trade_id and snapshot.last_trade_id > existing_last_id:
-                        cursor.execute(
-                            """
-                            UPDATE CVDHourlySnapshots
-                            SET CVD = CVD + ?,
-                                BuyVolume = BuyVolume + ?,
-                                SellVolume = SellVolume + ?,
-                                TradeCount = TradeCount + ?,
-                                LargeBuyCount = LargeBuyCount + ?,
-                                LargeSellCount = LargeSellCount + ?,
-                                AvgTradeSize = ?,
-                                LastTradeId = ?,
-                                UpdatedAt = CURRENT_TIMESTAMP
-                            WHERE SymbolID = ? AND HourTimestamp = ?
-                            """,
-                            (
-                                snapshot.cvd,
-                                snapshot.buy_volume,
-                                snapshot.sell_volume,
-                                snapshot.trade_count,
-                                snapshot.large_buy_count,
-                                snapshot.large_sell_count,
-                                snapshot.avg_trade_size,
-                                snapshot.last_trade_id,
-                                snapshot.symbol_id,
-                                hour_ts,
-                            ),
-                        )
-                else:
-                    # Insert new snapshot
-                    cursor.execute(
-                        """
-                        INSERT INTO CVDHourlySnapshots
-                        (SymbolID, HourTimestamp, CVD, BuyVolume, SellVolume,
-                         TradeCount, LargeBuyCount, LargeSellCount,
-                         AvgTradeSize, LastTradeId)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            snapshot.symbol_id,
-                            hour_ts,
-                            snapshot.cvd,
-                            snapshot.buy_volume,
-                            snapshot.sell_volume,
-                            snapshot.trade_count,
-                            snapshot.large_buy_count,
-                            snapshot.large_sell_count,
-                            snapshot.avg_trade_size,
-                            snapshot.last_trade_id,
-                        ),
-                    )
-            else:
-                # Azure SQL: Use MERGE with accumulation logic
-                cursor.execute(
-                    """
-                    MERGE INTO CVDHourlySnapshots AS target
-                    USING (SELECT ? AS SymbolID, ? AS HourTimestamp) AS source
-                    ON target.SymbolID = source.SymbolID
-                       AND target.HourTimestamp = source.HourTimestamp
-                    WHEN MATCHED AND ? > ISNULL(target.LastTradeId, 0) THEN
-                        UPDATE SET
-                            CVD = target.CVD + ?,
-                            BuyVolume = target.BuyVolume + ?,
-                            SellVolume = target.SellVolume + ?,
-                            TradeCount = target.TradeCount + ?,
-                            LargeBuyCount = target.LargeBuyCount + ?,
-                            LargeSellCount = target.LargeSellCount + ?,
-                            AvgTradeSize = ?,
-                            LastTradeId = ?,
-                            UpdatedAt = GETUTCDATE()
-                    WHEN NOT MATCHED THEN
-                        INSERT (SymbolID, HourTimestamp, CVD, BuyVolume, SellVolume,
-                                TradeCount, LargeBuyCount, LargeSellCount,
-                                AvgTradeSize, LastTradeId)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
-                    """,
-                    (
-                        snapshot.symbol_id,
-                        hour_ts,
-                        # MATCHED condition
-                        snapshot.last_trade_id,
-                        # UPDATE values
-                        snapshot.cvd,
-                        snapshot.buy_volume,
-                        snapshot.sell_volume,
-                        snapshot.trade_count,
-                        snapshot.large_buy_count,
-                        snapshot.large_sell_count,
-                        snapshot.avg_trade_size,
-                        snapshot.last_trade_id,
-                        # INSERT values
-                        snapshot.symbol_id,
-                        hour_ts,
-                        snapshot.cvd,
-                        snapshot.buy_volume,
-                        snapshot.sell_volume,
-                        snapshot.trade_count,
-                        snapshot.large_buy_count,
-                        snapshot.large_sell_count,
-                        snapshot.avg_trade_size,
-                        snapshot.last_trade_id,
-                    ),
-                )
-
+            self._upsert_snapshots([snapshot])
             self.conn.commit()
 
         except Exception as e:
@@ -414,7 +408,7 @@ class CVDRepository:
         self,
         snapshots: list["CVDHourlySnapshot"],
     ) -> int:
-        """Save multiple hourly snapshots.
+        """Save multiple hourly snapshots, one transaction per symbol.
 
         Args:
             snapshots: List of CVDHourlySnapshot objects
@@ -423,17 +417,93 @@ class CVDRepository:
             Number of snapshots saved
 
         """
-        saved = 0
+        by_symbol: dict[int, list[CVDHourlySnapshot]] = {}
         for snapshot in snapshots:
+            by_symbol.setdefault(snapshot.symbol_id, []).append(snapshot)
+
+        saved = 0
+        for symbol_id, batch in by_symbol.items():
             try:
-                self.save_hourly_snapshot(snapshot)
-                saved += 1
+                self._upsert_snapshots(batch)
+                self.conn.commit()
+                saved += len(batch)
             except (sqlite3.Error, TypeError, ValueError) as exc:
+                self.conn.rollback()
                 app_logger.error(
-                    f"Failed to save snapshot for hour {snapshot.hour_timestamp}: {exc!s}",
+                    f"Failed to save {len(batch)} snapshots for symbol {symbol_id}: {exc!s}",
                 )
         return saved
 
+    def _upsert_snapshots(self, snapshots: list["CVDHourlySnapshot"]) -> None:
+        """Accumulate snapshots into CVDHourlySnapshots without committing.
+
+        A snapshot is added on top of the stored hour only when it carries newer
+        trades (higher LastTradeId); new hours are inserted. SQLite runs a native
+        ``INSERT ... ON CONFLICT DO UPDATE`` for the whole batch, SQL Server
+        bulk-loads a temp staging table and runs one MERGE. Both rely on the unique
+        (SymbolID, HourTimestamp) index.
+        """
+        if self.is_sqlite:
+            rows = [
+                (
+                    snapshot.symbol_id,
+                    snapshot.hour_timestamp.isoformat(),
+                    *_snapshot_values(snapshot),
+                )
+                for snapshot in snapshots
+            ]
+            self.conn.cursor().executemany(
+                f"""
+                INSERT INTO CVDHourlySnapshots ({_SNAPSHOT_COLUMNS})
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(SymbolID, HourTimestamp) DO UPDATE SET
+                    {_ACCUMULATE_SET.format(target="CVDHourlySnapshots", source="excluded")},
+                    UpdatedAt = CURRENT_TIMESTAMP
+                WHERE excluded.LastTradeId > COALESCE(CVDHourlySnapshots.LastTradeId, 0)
+                """,  # noqa: S608
+                rows,
+            )
+            return
+
+        rows = [
+            (snapshot.symbol_id, snapshot.hour_timestamp, *_snapshot_values(snapshot))
+            for snapshot in snapshots
+        ]
+        cursor = self.conn.cursor()
+        cursor.fast_executemany = True
+        cursor.execute(
+            f"""
+            IF OBJECT_ID('tempdb..{SNAPSHOT_STAGING_TABLE}') IS NOT NULL
+                DROP TABLE {SNAPSHOT_STAGING_TABLE};
+            SELECT TOP 0 {_SNAPSHOT_COLUMNS}
+            INTO {SNAPSHOT_STAGING_TABLE}
+            FROM CVDHourlySnapshots
+            """,  # noqa: S608
+        )
+        cursor.executemany(
+            f"""
+            INSERT INTO {SNAPSHOT_STAGING_TABLE} ({_SNAPSHOT_COLUMNS})
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,  # noqa: S608
+            rows,
+        )
+        cursor.execute(
+            f"""
+            MERGE INTO CVDHourlySnapshots AS target
+            USING {SNAPSHOT_STAGING_TABLE} AS source
+            ON target.SymbolID = source.SymbolID
+               AND target.HourTimestamp = source.HourTimestamp
+            WHEN MATCHED AND source.LastTradeId > ISNULL(target.LastTradeId, 0) THEN
+                UPDATE SET
+                    {_ACCUMULATE_SET.format(target="target", source="source")},
+                    UpdatedAt = GETUTCDATE()
+            WHEN NOT MATCHED THEN
+                INSERT ({_SNAPSHOT_COLUMNS})
+                VALUES ({", ".join(f"source.{c}" for c in _SNAPSHOT_COLUMNS.split(", "))});
+            """,  # noqa: S608
+        )
+        cursor.execute(f"DROP TABLE {SNAPSHOT_STAGING_TABLE}")
+
     def get_last_trade_id(self, symbol_id: int) -> int | None:
         """Get the last trade ID we have stored for a symbol.
 
@@ -488,6 +558,15 @@ class CVDRepository:
                 return datetime.fromisoformat(row[0]).replace(tzinfo=UTC)
             return None
 
+    def _hour_filter(self, cutoffs: list[datetime]) -> tuple[str, list[datetime | int]]:
+        """Return the snapshot hour column to filter on and the bound cutoffs.
+
+        SQLite compares the integer ``Ts`` epoch column, SQL Server HourTimestamp.
+        """
+        if self.is_sqlite:
+            return EPOCH_COLUMN, [to_epoch(cutoff) for cutoff in cutoffs]
+        return "HourTimestamp", list(cutoffs)
+
     def aggregate_cvd_for_hours(
         self,
         symbol_id: int,
@@ -503,63 +582,68 @@ class CVDRepository:
             Dictionary with aggregated CVD metrics or None if no data
 
         """
-        cursor = self.conn.cursor()
+        return self.aggregate_cvd_windows([symbol_id], (hours,)).get(symbol_id, {}).get(hours)
+
+    def aggregate_cvd_windows(
+        self,
+        symbol_ids: list[int],
+        windows: tuple[int, ...] = (1, 4, 24),
+        pending: list["CVDHourlySnapshot"] | None = None,
+    ) -> dict[int, dict[int, dict[str, float | int]]]:
+        """Aggregate CVD for several trailing windows and many symbols in one query.
+
+        Each window is a conditional aggregate (``SUM(CASE WHEN Ts >= ? ...)``)
+        over the snapshots of the longest window, grouped by symbol.
+
+        Args:
+            symbol_ids: The symbol IDs to query
+            windows: Window lengths in hours (e.g., 1, 4, 24)
+            pending: Snapshots that are not stored (e.g. the current hour fetched
+                on top of the streaming collector's closed hours), added to the
+                stored ones
+
+        Returns:
+            Aggregated CVD metrics keyed by symbol ID and window length; windows
+            (and symbols) without snapshots are left out
+
+        """
+        if not symbol_ids or not windows:
+            return {}
+
         now = datetime.now(UTC)
-        cutoff = now - timedelta(hours=hours)
+        cutoffs = [now - timedelta(hours=hours) for hours in windows]
+        hour_column, params = self._hour_filter(cutoffs)
+        window_columns = ",".join(_WINDOW_AGGREGATES_SQL.format(hour=hour_column) for _ in windows)
+        window_params = [param for param in params for _ in range(_AGGREGATE_COLUMNS)]
 
+        results: dict[int, dict[int, dict[str, float | int]]] = {}
+        cursor = self.conn.cursor()
         try:
-            if self.is_sqlite:
-                query = """
-                    SELECT
-                        SUM(CVD) as total_cvd,
-                        SUM(BuyVolume) as total_buy_volume,
-                        SUM(SellVolume) as total_sell_volume,
-                        SUM(TradeCount) as total_trade_count,
-                        SUM(LargeBuyCount) as total_large_buys,
-                        SUM(LargeSellCount) as total_large_sells,
-                        AVG(AvgTradeSize) as avg_trade_size,
-                        COUNT(*) as hour_count
+            for offset in range(0, len(symbol_ids), MAX_SYMBOLS_PER_QUERY):
+                chunk = symbol_ids[offset : offset + MAX_SYMBOLS_PER_QUERY]
+                placeholders = ", ".join("?" for _ in chunk)
+                query = f"""
+                    SELECT SymbolID,{window_columns}
                     FROM CVDHourlySnapshots
-                    WHERE SymbolID = ?
-                      AND HourTimestamp >= ?
-                """
-                cursor.execute(query, (symbol_id, cutoff.isoformat()))
-            else:
-                query = """
-                    SELECT
-                        SUM(CVD) as total_cvd,
-                        SUM(BuyVolume) as total_buy_volume,
-                        SUM(SellVolume) as total_sell_volume,
-                        SUM(TradeCount) as total_trade_count,
-                        SUM(LargeBuyCount) as total_large_buys,
-                        SUM(LargeSellCount) as total_large_sells,
-                        AVG(AvgTradeSize) as avg_trade_size,
-                        COUNT(*) as hour_count
-                    FROM CVDHourlySnapshots
-                    WHERE SymbolID = ?
-                      AND HourTimestamp >= ?
-                """
-                cursor.execute(query, (symbol_id, cutoff))
-
-            row = cursor.fetchone()
+                    WHERE SymbolID IN ({placeholders})
+                      AND {hour_column} >= ?
+                    GROUP BY SymbolID
+                """  # noqa: S608
+                cursor.execute(query, (*window_params, *chunk, min(params)))
+                for row in cursor.fetchall():
+                    results[row[0]] = _parse_window_aggregates(row, windows)
 
         except (sqlite3.Error, TypeError) as e:
-            app_logger.error(f"Error aggregating CVD for {hours}h: {e!s}")
-            return None
-        else:
-            if row and row[7] > 0:  # hour_count > 0
-                return {
-                    "cvd": row[0] or 0,
-                    "buy_volume": row[1] or 0,
-                    "sell_volume": row[2] or 0,
-                    "trade_count": int(row[3] or 0),
-                    "large_buy_count": int(row[4] or 0),
-                    "large_sell_count": int(row[5] or 0),
-                    "avg_trade_size": row[6] or 0,
-                    "hour_count": row[7],
-                }
+            app_logger.error(f"Error aggregating CVD windows {windows}: {e!s}")
+            return {}
 
-            return None
+        wanted = set(symbol_ids)
+        for snapshot in pending or []:
+            if snapshot.symbol_id in wanted:
+                aggregates = results.setdefault(snapshot.symbol_id, {})
+                _add_pending_snapshot(aggregates, snapshot, windows, cutoffs)
+
+        return results
 
     def cleanup_old_snapshots(self, symbol_id: int, keep_hours: int = 48) -> int:
         """Remove hourly snapshots older than keep_hours.
@@ -574,24 +658,16 @@ class CVDRepository:
         """
         cursor = self.conn.cursor()
         cutoff = datetime.now(UTC) - timedelta(hours=keep_hours)
+        hour_column, (cutoff_param,) = self._hour_filter([cutoff])
 
         try:
-            if self.is_sqlite:
-                cursor.execute(
-                    """
-                    DELETE FROM CVDHourlySnapshots
-                    WHERE SymbolID = ? AND HourTimestamp < ?
-                    """,
-                    (symbol_id, cutoff.isoformat()),
-                )
-            else:
-                cursor.execute(
-                    """
-                    DELETE FROM CVDHourlySnapshots
-                    WHERE SymbolID = ? AND HourTimestamp < ?
-                    """,
-                    (symbol_id, cutoff),
-                )
+            cursor.execute(
+                f"""
+                DELETE FROM CVDHourlySnapshots
+                WHERE SymbolID = ? AND {hour_column} < ?
+                """,  # noqa: S608
+                (symbol_id, cutoff_param),
+            )
 
             deleted = cursor.rowcount
             self.conn.commit()
@@ -1,6 +1,5 @@
 """Daily candle data repository for cryptocurrency markets."""
 
-import os
 from datetime import datetime
 from typing import TYPE_CHECKING
 
@@ -18,32 +17,46 @@ if TYPE_CHECKING:
 class DailyCandleRepository(CandleRepository):
     """Repository for managing daily candlestick data."""
 
+    _merge_columns = (
+        "SymbolID",
+        "SourceID",
+        "Date",
+        "EndDate",
+        "[Open]",
+        "[Close]",
+        "High",
+        "Low",
+        "Last",
+        "Volume",
+        "VolumeQuote",
+    )
+    _merge_key = ("SymbolID", "SourceID", "Date")
+
     def __init__(self, conn: "pyodbc.Connection | SQLiteConnectionWrapper") -> None:
         """Initialize the repository with a database connection."""
         super().__init__(conn, table_name="DailyCandles")
 
-    def save_candle(self, symbol: Symbol, candle: Candle, source: int) -> None:
-        """Override save_candle for DailyCandles table which has both Date and EndDate columns.
+    @staticmethod
+    def _date_value(candle: Candle) -> str:
+        """Extract the date portion (Date column) from a candle's end_date."""
+        if isinstance(candle.end_date, datetime):
+            return candle.end_date.date().isoformat()
+        # If it's already a string, try to parse it
+        return (
+            candle.end_date.split("T")[0]
+            if "T" in str(candle.end_date)
+            else str(candle.end_date).split()[0]
+        )
+
+    def _upsert_sql(self, *, is_sqlite: bool) -> str:
+        """Override for DailyCandles table which has both Date and EndDate columns.
 
         Date is the date portion only, EndDate is the full datetime.
         """
-        is_sqlite = os.getenv("DATABASE_TYPE", "azuresql").lower() == "sqlite"
-
-        # Extract date portion from end_date
-        if isinstance(candle.end_date, datetime):
-            date_value = candle.end_date.date().isoformat()
-        else:
-            # If it's already a string, try to parse it
-            date_value = (
-                candle.end_date.split("T")[0]
-                if "T" in str(candle.end_date)
-                else str(candle.end_date).split()[0]
-            )
-
         if is_sqlite:
             # SQLite: Use INSERT ... ON CONFLICT DO UPDATE to preserve row ID
             # This prevents orphaning RSI/indicator records that reference DailyCandleID
-            sql = f"""
+            return f"""
             INSERT INTO {self.table_name}
             (SymbolID, SourceID, Date, EndDate, [Open], [Close], High, Low,
              Last, Volume, VolumeQuote)
@@ -60,25 +73,8 @@ class DailyCandleRepository(CandleRepository):
                 Volume = excluded.Volume,
                 VolumeQuote = excluded.VolumeQuote
             """  # noqa: S608
-            self.conn.execute(
-                sql,
-                (
-                    symbol.symbol_id,
-                    source,
-                    date_value,
-                    candle.end_date,
-                    candle.open,
-                    candle.close,
-                    candle.high,
-                    candle.low,
-                    candle.last,
-                    candle.volume,
-                    candle.volume_quote,
-                ),
-            )
-        else:
-            # SQL Server uses MERGE
-            sql = f"""
+        # SQL Server uses MERGE
+        return f"""
             MERGE {self.table_name} AS target
             USING (SELECT ? as SymbolID, ? as SourceID, ? as Date, ? as EndDate) AS source
             ON (target.SymbolID = source.SymbolID
@@ -89,27 +85,55 @@ class DailyCandleRepository(CandleRepository):
                         High, Low, Last, Volume, VolumeQuote)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
             """  # noqa: S608
-            self.conn.execute(
-                sql,
-                (
-                    symbol.symbol_id,
-                    source,
-                    date_value,
-                    candle.end_date,  # For the USING clause
-                    symbol.symbol_id,
-                    source,
-                    date_value,
-                    candle.end_date,  # For the INSERT clause
-                    candle.open,
-                    candle.close,
-                    candle.high,
-                    candle.low,
-                    candle.last,
-                    candle.volume,
-                    candle.volume_quote,
-                ),
-            )
-        self.conn.commit()
+
+    def _upsert_params(
+        self,
+        symbol: Symbol,
+        candle: Candle,
+        source: int,
+        *,
+        is_sqlite: bool,
+    ) -> tuple:
+        """Override to add the Date column parameter."""
+        date_value = self._date_value(candle)
+        values = (
+            candle.open,
+            candle.close,
+            candle.high,
+            candle.low,
+            candle.last,
+            candle.volume,
+            candle.volume_quote,
+        )
+        if is_sqlite:
+            return (symbol.symbol_id, source, date_value, candle.end_date, *values)
+        return (
+            symbol.symbol_id,
+            source,
+            date_value,
+            candle.end_date,  # For the USING clause
+            symbol.symbol_id,
+            source,
+            date_value,
+            candle.end_date,  # For the INSERT clause
+            *values,
+        )
+
+    def _merge_row(self, symbol: Symbol, candle: Candle, source: int) -> tuple:
+        """Override to add the Date column value."""
+        return (
+            symbol.symbol_id,
+            source,
+            self._date_value(candle),
+            candle.end_date,
+            candle.open,
+            candle.close,
+            candle.high,
+            candle.low,
+            candle.last,
+            candle.volume,
+            candle.volume_quote,
+        )
 
     def get_candle(self, symbol: Symbol, end_date: datetime) -> Candle | None:
         """Override get_candle for DailyCandles table to query by Date column."""
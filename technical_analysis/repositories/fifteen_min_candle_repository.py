@@ -1,6 +1,5 @@
 """15-minute candle data repository for cryptocurrency markets."""
 
-import os
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
@@ -22,42 +21,48 @@ class FifteenMinCandleRepository(CandleRepository):
         """Initialize the repository with a database connection."""
         super().__init__(conn, table_name="FifteenMinCandles")
 
-    def save_candle(self, symbol: Symbol, candle: Candle, source: int) -> None:
+    def _upsert_sql(self, *, is_sqlite: bool) -> str:
         """Override to handle OpenTime column for SQLite."""
-        is_sqlite = os.getenv("DATABASE_TYPE", "azuresql").lower() == "sqlite"
-
-        if is_sqlite:
-            # Calculate OpenTime as 15 minutes before EndDate
-            end_date = candle.end_date
-            if isinstance(end_date, str):
-                end_date = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
-
-            open_time = end_date - timedelta(minutes=15)
+        if not is_sqlite:
+            # SQL Server doesn't need OpenTime override
+            return super()._upsert_sql(is_sqlite=is_sqlite)
 
-            # SQLite: Insert both OpenTime and EndDate
-            sql = f"""
+        # SQLite: Insert both OpenTime and EndDate
+        return f"""
             INSERT OR REPLACE INTO {self.table_name}
             (SymbolID, SourceID, OpenTime, EndDate, [Open], [Close], High, Low,
              Last, Volume, VolumeQuote)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """  # noqa: S608
-            self.conn.execute(
-                sql,
-                (
-                    symbol.symbol_id,
-                    source,
-                    open_time.isoformat(),
-                    end_date.isoformat() if hasattr(end_date, "isoformat") else end_date,
-                    candle.open,
-                    candle.close,
-                    candle.high,
-                    candle.low,
-                    candle.last,
-                    candle.volume,
-                    candle.volume_quote,
-                ),
-            )
-            self.conn.commit()
-        else:
-            # SQL Server doesn't need OpenTime override
-            super().save_candle(symbol, candle, source)
+
+    def _upsert_params(
+        self,
+        symbol: Symbol,
+        candle: Candle,
+        source: int,
+        *,
+        is_sqlite: bool,
+    ) -> tuple:
+        """Override to calculate OpenTime for SQLite."""
+        if not is_sqlite:
+            return super()._upsert_params(symbol, candle, source, is_sqlite=is_sqlite)
+
+        # Calculate OpenTime as 15 minutes before EndDate
+        end_date = candle.end_date
+        if isinstance(end_date, str):
+            end_date = datetime.fromisoformat(end_date.replace("Z", "+00:00"))
+
+        open_time = end_date - timedelta(minutes=15)
+        return (
+            symbol.symbol_id,
+            source,
+            open_time.isoformat(),
+            end_date.isoformat() if hasattr(end_date, "isoformat") else end_date,
+            candle.open,
+            candle.close,
+            candle.high,
+            candle.low,
+            candle.last,
+            candle.volume,
+            candle.volume_quote,
+        )
@@ -4,6 +4,7 @@ import os
 from datetime import datetime
 
 from infra.telegram_logging_handler import app_logger
+from technical_analysis.repositories.latest_indicators_repository import refresh_latest_indicators
 
 
 class FundingRateRepository:
@@ -40,6 +41,12 @@ class FundingRateRepository:
                         indicator_date.isoformat(),
                     ),
                 )
+                refresh_latest_indicators(
+                    cursor,
+                    "FundingRate",
+                    symbol_id,
+                    indicator_date.isoformat(),
+                )
             else:
                 # Azure SQL: Use MERGE
                 cursor.execute(
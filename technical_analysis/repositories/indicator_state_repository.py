@@ -0,0 +1,133 @@
+"""Indicator state repository for incremental RSI/EMA/MACD updates."""
+
+import os
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from infra.telegram_logging_handler import app_logger
+
+
+if TYPE_CHECKING:
+    import pyodbc
+
+    from infra.sql_connection import SQLiteConnectionWrapper
+    from technical_analysis.indicator_state import IndicatorState
+
+
+_STATE_COLUMNS = (
+    "LastCandleEnd",
+    "LastClose",
+    "CandleCount",
+    "AvgGain",
+    "AvgLoss",
+    "EMA50",
+    "EMA200",
+    "MACDFastEMA",
+    "MACDSlowEMA",
+    "MACDSignal",
+)
+
+
+def get_indicator_state(
+    conn: "pyodbc.Connection | SQLiteConnectionWrapper",
+    symbol_id: int,
+    timeframe: str,
+) -> "IndicatorState | None":
+    """Fetch the stored indicator state of a symbol and timeframe.
+
+    Args:
+        conn: Database connection
+        symbol_id: Symbol ID from Symbols table
+        timeframe: 'daily', 'hourly' or 'fifteen_min'
+
+    Returns:
+        The stored state, or None if there is none
+
+    """
+    from technical_analysis.indicator_state import IndicatorState  # noqa: PLC0415
+
+    query = f"""
+        SELECT {", ".join(_STATE_COLUMNS)}
+        FROM IndicatorState
+        WHERE SymbolID = ? AND Timeframe = ?
+    """  # noqa: S608
+    row = conn.execute(query, (symbol_id, timeframe)).fetchone()
+    if not row:
+        return None
+
+    last_candle_end = row[0]
+    if isinstance(last_candle_end, str):
+        last_candle_end = datetime.fromisoformat(last_candle_end.replace(" ", "T"))
+    if last_candle_end.tzinfo is None:
+        last_candle_end = last_candle_end.replace(tzinfo=UTC)
+    return IndicatorState(
+        symbol_id=symbol_id,
+        timeframe=timeframe,
+        last_candle_end=last_candle_end,
+        last_close=float(row[1]),
+        candle_count=int(row[2]),
+        avg_gain=float(row[3]),
+        avg_loss=float(row[4]),
+        ema50=float(row[5]),
+        ema200=float(row[6]),
+        macd_fast_ema=float(row[7]),
+        macd_slow_ema=float(row[8]),
+        macd_signal=float(row[9]),
+    )
+
+
+def save_indicator_state(
+    conn: "pyodbc.Connection | SQLiteConnectionWrapper",
+    state: "IndicatorState",
+) -> None:
+    """Insert or replace the indicator state of a symbol and timeframe.
+
+    Args:
+        conn: Database connection
+        state: State to persist
+
+    """
+    values = (
+        state.last_candle_end.isoformat(),
+        state.last_close,
+        state.candle_count,
+        state.avg_gain,
+        state.avg_loss,
+        state.ema50,
+        state.ema200,
+        state.macd_fast_ema,
+        state.macd_slow_ema,
+        state.macd_signal,
+    )
+    is_sqlite = os.getenv("DATABASE_TYPE", "azuresql").lower() == "sqlite"
+    columns = ", ".join(_STATE_COLUMNS)
+    placeholders = ", ".join("?" for _ in range(len(_STATE_COLUMNS) + 2))
+
+    if is_sqlite:
+        query = f"""
+            INSERT OR REPLACE INTO IndicatorState (SymbolID, Timeframe, {columns})
+            VALUES ({placeholders})
+        """  # noqa: S608
+    else:
+        source_columns = ", ".join(f"? AS {column}" for column in _STATE_COLUMNS)
+        updates = ", ".join(f"{column} = source.{column}" for column in _STATE_COLUMNS)
+        inserts = ", ".join(f"source.{column}" for column in _STATE_COLUMNS)
+        query = f"""
+            MERGE INTO IndicatorState AS target
+            USING (SELECT ? AS SymbolID, ? AS Timeframe, {source_columns}) AS source
+            ON target.SymbolID = source.SymbolID AND target.Timeframe = source.Timeframe
+            WHEN MATCHED THEN
+                UPDATE SET {updates}, UpdatedAt = GETDATE()
+            WHEN NOT MATCHED THEN
+                INSERT (SymbolID, Timeframe, {columns})
+                VALUES (source.SymbolID, source.Timeframe, {inserts});
+        """  # noqa: S608
+
+    conn.execute(query, (state.symbol_id, state.timeframe, *values))
+    conn.commit()
+    app_logger.debug(
+        "Saved %s indicator state for symbol_id %d up to %s",
+        state.timeframe,
+        state.symbol_id,
+        state.last_candle_end,
+    )
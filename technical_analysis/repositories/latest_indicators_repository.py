@@ -0,0 +1,155 @@
+"""Latest indicator values per symbol and day (SQLite).
+
+The daily report shows, for the last days of every symbol, the latest value of
+each indicator on that day. Instead of rebuilding that from the full history of
+every indicator table on each read, the ``LatestIndicators`` table keeps one row
+per symbol and day. Each indicator's save path calls
+:func:`refresh_latest_indicators` (or :func:`refresh_latest_rsi`) right after its
+own insert, which copies that day's latest row into the matching columns and
+drops days beyond ``LATEST_INDICATOR_DAYS``. Reads then cost the same however much
+history the indicator tables hold.
+
+SQL Server reads ``SymbolDataView`` instead and does not use this table.
+"""
+
+import sqlite3
+from datetime import date, datetime
+
+
+# Days kept per symbol (the most recent ones, like the report shows)
+LATEST_INDICATOR_DAYS = 7
+
+# Indicator table -> LatestIndicators column -> source column
+LATEST_INDICATOR_SOURCES: dict[str, dict[str, str]] = {
+    "MovingAverages": {
+        "MACurrentPrice": "CurrentPrice",
+        "MA50": "MA50",
+        "MA200": "MA200",
+        "EMA50": "EMA50",
+        "EMA200": "EMA200",
+    },
+    "MACD": {"MACD": "MACD", "MACDSignal": "Signal", "MACDHistogram": "Histogram"},
+    "PriceRange": {
+        "LowPrice": "LowPrice",
+        "HighPrice": "HighPrice",
+        "RangePercent": "RangePercent",
+    },
+    "VolumeHistory": {"Volume": "Volume"},
+    "MarketCapHistory": {"MarketCap": "MarketCap"},
+    "OpenInterest": {"OpenInterest": "OpenInterest", "OpenInterestValue": "OpenInterestValue"},
+    "FundingRate": {"FundingRate": "FundingRate", "FundingTime": "FundingTime"},
+    "OrderBookMetrics": {
+        "BidAskRatio": "BidAskRatio",
+        "SpreadPct": "SpreadPct",
+        "BidVolume2Pct": "BidVolume2Pct",
+        "AskVolume2Pct": "AskVolume2Pct",
+        "LargestBidWall": "LargestBidWall",
+        "LargestAskWall": "LargestAskWall",
+    },
+}
+
+# Daily RSI is stored per candle; its day and close price come from DailyCandles
+_RSI_FROM = "RSI r JOIN DailyCandles dc ON dc.Id = r.DailyCandleID"
+_RSI_COLUMNS = {"RSIClosePrice": "dc.Close", "RSI": "r.RSI"}
+
+# Rows of one symbol and day; "2025-01-01" and "2025-01-01T08:00:00+00:00" both match
+_SAME_DAY = "SymbolID = ? AND IndicatorDate >= DATE(?) AND IndicatorDate < DATE(?, '+1 day')"
+
+_TRIM_SQL = """
+    DELETE FROM LatestIndicators
+    WHERE IndicatorDate < (
+        SELECT recent.IndicatorDate
+        FROM LatestIndicators AS recent
+        WHERE recent.SymbolID = LatestIndicators.SymbolID
+        ORDER BY recent.IndicatorDate DESC
+        LIMIT 1 OFFSET ?
+    )
+"""
+
+
+def _upsert_sql(
+    columns: dict[str, str],
+    from_clause: str,
+    symbol_column: str,
+    date_column: str,
+    where: str,
+) -> str:
+    """Return an upsert copying the selected indicator rows into LatestIndicators.
+
+    Rows are copied oldest first, so when a day has several rows the latest wins.
+    """
+    targets = ", ".join(columns)
+    updates = ", ".join(f"{column} = excluded.{column}" for column in columns)
+    return f"""
+        INSERT INTO LatestIndicators (SymbolID, IndicatorDate, {targets})
+        SELECT {symbol_column}, DATE({date_column}), {", ".join(columns.values())}
+        FROM {from_clause}
+        WHERE {where}
+        ORDER BY {date_column}
+        ON CONFLICT (SymbolID, IndicatorDate) DO UPDATE SET {updates}
+    """  # noqa: S608
+
+
+def _trim(cursor: sqlite3.Cursor) -> None:
+    """Drop the days beyond ``LATEST_INDICATOR_DAYS`` of every symbol."""
+    cursor.execute(_TRIM_SQL, (LATEST_INDICATOR_DAYS - 1,))
+
+
+def refresh_latest_indicators(
+    cursor: sqlite3.Cursor,
+    table: str,
+    symbol_id: int,
+    indicator_date: date | datetime | str,
+) -> None:
+    """Copy the latest row of an indicator table for one symbol and day.
+
+    Called by the SQLite save paths right after their insert, in the same
+    transaction.
+
+    Args:
+        cursor: SQLite cursor
+        table: Indicator table, a key of ``LATEST_INDICATOR_SOURCES``
+        symbol_id: Symbol ID from Symbols table
+        indicator_date: IndicatorDate value just saved (any time on the day)
+
+    """
+    sql = _upsert_sql(
+        LATEST_INDICATOR_SOURCES[table],
+        table,
+        "SymbolID",
+        "IndicatorDate",
+        _SAME_DAY,
+    )
+    cursor.execute(sql, (symbol_id, indicator_date, indicator_date))
+    _trim(cursor)
+
+
+def refresh_latest_rsi(cursor: sqlite3.Cursor, daily_candle_id: int) -> None:
+    """Copy a daily RSI value and its candle's close price into LatestIndicators.
+
+    Args:
+        cursor: SQLite cursor
+        daily_candle_id: DailyCandle ID the RSI was just saved for
+
+    """
+    sql = _upsert_sql(_RSI_COLUMNS, _RSI_FROM, "dc.SymbolID", "dc.Date", "r.DailyCandleID = ?")
+    cursor.execute(sql, (daily_candle_id,))
+    _trim(cursor)
+
+
+def rebuild_latest_indicators(cursor: sqlite3.Cursor) -> None:
+    """Fill LatestIndicators from the full history of the indicator tables.
+
+    Used once for databases created before the table existed; afterwards the
+    save paths keep it current. Indicator tables missing from the database are
+    skipped.
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    tables = {row[0] for row in cursor.fetchall()}
+    cursor.execute("DELETE FROM LatestIndicators")
+    if {"RSI", "DailyCandles"} <= tables:
+        cursor.execute(_upsert_sql(_RSI_COLUMNS, _RSI_FROM, "dc.SymbolID", "dc.Date", "TRUE"))
+    for table, columns in LATEST_INDICATOR_SOURCES.items():
+        if table in tables:
+            cursor.execute(_upsert_sql(columns, table, "SymbolID", "IndicatorDate", "TRUE"))
+    _trim(cursor)
@@ -8,6 +8,7 @@ import pandas as pd
 import pyodbc
 
 from infra.telegram_logging_handler import app_logger
+from technical_analysis.repositories.latest_indicators_repository import refresh_latest_indicators
 
 
 if TYPE_CHECKING:
@@ -61,6 +62,7 @@ def save_macd_results(
                         histogram,
                     ),
                 )
+                refresh_latest_indicators(cursor, "MACD", symbol_id, indicator_date.isoformat())
             else:
                 # SQL Server uses MERGE
                 query = """
@@ -6,6 +6,7 @@ from datetime import UTC, datetime
 import pyodbc
 
 from infra.telegram_logging_handler import app_logger
+from technical_analysis.repositories.latest_indicators_repository import refresh_latest_indicators
 
 
 def save_marketcap_results(conn, sorted_results):
@@ -38,6 +39,12 @@ def save_marketcap_results(conn, sorted_results):
                         query,
                         (result["symbol_id"], result["market_cap"], today.isoformat()),
                     )
+                    refresh_latest_indicators(
+                        cursor,
+                        "MarketCapHistory",
+                        result["symbol_id"],
+                        today.isoformat(),
+                    )
             else:
                 # SQL Server uses MERGE
                 query = """
@@ -8,6 +8,7 @@ import pandas as pd
 import pyodbc
 
 from infra.telegram_logging_handler import app_logger
+from technical_analysis.repositories.latest_indicators_repository import refresh_latest_indicators
 
 
 if TYPE_CHECKING:
@@ -79,6 +80,8 @@ def save_moving_averages_results(
                 query,
                 (symbol_id, indicator_date, current_price, ma50, ma200, ema50, ema200),
             )
+            if is_sqlite:
+                refresh_latest_indicators(cursor, "MovingAverages", symbol_id, indicator_date)
             conn.commit()
             cursor.close()
             app_logger.info(
@@ -4,6 +4,7 @@ import os
 from datetime import datetime
 
 from infra.telegram_logging_handler import app_logger
+from technical_analysis.repositories.latest_indicators_repository import refresh_latest_indicators
 
 
 class OpenInterestRepository:
@@ -40,6 +41,12 @@ class OpenInterestRepository:
                         indicator_date.isoformat(),
                     ),
                 )
+                refresh_latest_indicators(
+                    cursor,
+                    "OpenInterest",
+                    symbol_id,
+                    indicator_date.isoformat(),
+                )
             else:
                 # Azure SQL: Use MERGE
                 cursor.execute(
@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 
 from infra.telegram_logging_handler import app_logger
+from technical_analysis.repositories.latest_indicators_repository import refresh_latest_indicators
 
 
 if TYPE_CHECKING:
@@ -64,6 +65,12 @@ class OrderBookRepository:
                         indicator_date.isoformat(),
                     ),
                 )
+                refresh_latest_indicators(
+                    cursor,
+                    "OrderBookMetrics",
+                    symbol_id,
+                    indicator_date.isoformat(),
+                )
             else:
                 # Azure SQL: Use MERGE
                 cursor.execute(
@@ -0,0 +1,141 @@
+"""Repository for the archived order book snapshots (top-N levels per run)."""
+
+import os
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from infra.telegram_logging_handler import app_logger
+from shared_code.order_book_codec import decode_order_book, encode_order_book
+
+
+if TYPE_CHECKING:
+    from shared_code.order_book_depth import OrderBookDepth
+
+
+# Rows fetched per round trip while streaming snapshots back
+FETCH_BATCH_SIZE = 100
+
+
+def _as_utc(value: datetime | str) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace(" ", "T"))
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+class OrderBookSnapshotRepository:
+    """Repository for compressed order book snapshots."""
+
+    def __init__(self, conn):
+        """Initialize the snapshot repository with a database connection."""
+        self.conn = conn
+        self.is_sqlite = os.getenv("DATABASE_TYPE", "azuresql").lower() == "sqlite"
+
+    def _time_param(self, value: datetime) -> datetime | str:
+        """Bind times as UTC ISO strings on SQLite (sortable) and datetimes on Azure SQL."""
+        value = _as_utc(value)
+        return value.isoformat() if self.is_sqlite else value.replace(tzinfo=None)
+
+    def save_snapshot(
+        self,
+        symbol_id: int,
+        book: "OrderBookDepth",
+        snapshot_time: datetime,
+        market: str = "spot",
+        levels: int | None = None,
+    ) -> int:
+        """Archive the best ``levels`` levels per side of a book.
+
+        Args:
+            symbol_id: The symbol ID in the database
+            book: Parsed order book
+            snapshot_time: Time the book was fetched
+            market: 'spot' or 'futures'
+            levels: Levels kept per side (all when None)
+
+        Returns:
+            Size of the stored blob in bytes
+
+        """
+        blob = encode_order_book(book, levels)
+        stored_levels = max(len(book.bids), len(book.asks))
+        if levels is not None:
+            stored_levels = min(stored_levels, levels)
+        params = (symbol_id, market, self._time_param(snapshot_time), stored_levels, blob)
+        cursor = self.conn.cursor()
+
+        try:
+            if self.is_sqlite:
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO OrderBookSnapshots
+                    (SymbolID, Market, SnapshotTime, Levels, Snapshot)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    params,
+                )
+            else:
+                cursor.execute(
+                    """
+                    MERGE INTO OrderBookSnapshots AS target
+                    USING (SELECT ? AS SymbolID, ? AS Market, ? AS SnapshotTime,
+                                  ? AS Levels, ? AS Snapshot) AS source
+                    ON target.SymbolID = source.SymbolID
+                       AND target.Market = source.Market
+                       AND target.SnapshotTime = source.SnapshotTime
+                    WHEN MATCHED THEN
+                        UPDATE SET Levels = source.Levels, Snapshot = source.Snapshot
+                    WHEN NOT MATCHED THEN
+                        INSERT (SymbolID, Market, SnapshotTime, Levels, Snapshot)
+                        VALUES (source.SymbolID, source.Market, source.SnapshotTime,
+                                source.Levels, source.Snapshot);
+                    """,
+                    params,
+                )
+            self.conn.commit()
+
+        except Exception as e:
+            app_logger.error(f"Error saving order book snapshot: {e!s}")
+            self.conn.rollback()
+            raise
+
+        return len(blob)
+
+    def iter_snapshots(
+        self,
+        symbol_id: int,
+        start: datetime,
+        end: datetime | None = None,
+        market: str = "spot",
+    ) -> Iterator[tuple[datetime, "OrderBookDepth"]]:
+        """Stream archived books of a symbol back, oldest first.
+
+        Rows are fetched in batches and decoded one at a time, so a long history
+        never has to be held in memory at once.
+
+        Args:
+            symbol_id: The symbol ID to query
+            start: Earliest snapshot time (inclusive)
+            end: Latest snapshot time (inclusive), or None for up to now
+            market: 'spot' or 'futures'
+
+        Yields:
+            (snapshot time, order book arrays) pairs
+
+        """
+        query = """
+            SELECT SnapshotTime, Snapshot
+            FROM OrderBookSnapshots
+            WHERE SymbolID = ? AND Market = ? AND SnapshotTime >= ?
+        """
+        params: list = [symbol_id, market, self._time_param(start)]
+        if end is not None:
+            query += " AND SnapshotTime <= ?"
+            params.append(self._time_param(end))
+        query += " ORDER BY SnapshotTime"
+
+        cursor = self.conn.cursor()
+        cursor.execute(query, params)
+        while rows := cursor.fetchmany(FETCH_BATCH_SIZE):
+            for row in rows:
+                yield _as_utc(row[0]), decode_order_book(bytes(row[1]))
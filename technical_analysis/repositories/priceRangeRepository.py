@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 import pyodbc
 
 from infra.telegram_logging_handler import app_logger
+from technical_analysis.repositories.latest_indicators_repository import refresh_latest_indicators
 
 
 if TYPE_CHECKING:
@@ -57,6 +58,7 @@ def save_price_range_results(
                         range_percent,
                     ),
                 )
+                refresh_latest_indicators(cursor, "PriceRange", symbol_id, today.isoformat())
             else:
                 # SQL Server uses MERGE
                 query = """
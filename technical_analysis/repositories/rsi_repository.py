@@ -4,9 +4,14 @@ import os
 from datetime import date, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+import pandas as pd
 import pyodbc
 
 from infra.telegram_logging_handler import app_logger
+from shared_code.epoch import EPOCH_COLUMN, to_epoch
+from technical_analysis.repositories.columnar import epoch_to_datetime64, fetch_columns
+from technical_analysis.repositories.latest_indicators_repository import refresh_latest_rsi
 
 
 if TYPE_CHECKING:
@@ -54,6 +59,8 @@ def save_rsi_results(
                 """
 
             cursor.execute(query, (daily_candle_id, rsi))
+            if is_sqlite:
+                refresh_latest_rsi(cursor, daily_candle_id)
             conn.commit()
             cursor.close()
             app_logger.info(
@@ -130,6 +137,8 @@ def save_rsi_by_timeframe(
                         VALUES (source.{id_column}, source.RSI);
                 """  # noqa: S608
             cursor.execute(query, (candle_id, rsi))
+            if is_sqlite and table_name == "RSI":
+                refresh_latest_rsi(cursor, candle_id)
             conn.commit()
             cursor.close()
             app_logger.info(
@@ -143,6 +152,55 @@ def save_rsi_by_timeframe(
         raise
 
 
+def _candles_with_rsi_query(
+    symbol_id: int,
+    from_date: date | datetime,
+    timeframe: str,
+    order: str,
+) -> tuple[str, tuple]:
+    """Build the candles-with-RSI query of a timeframe, sorted by date in ``order``."""
+    # Map timeframe to the correct tables
+    table_map = {
+        "daily": ("DailyCandles", "RSI", "DailyCandleID"),
+        "hourly": ("HourlyCandles", "HourlyRSI", "HourlyCandleID"),
+        "fifteen_min": (
+            "FifteenMinCandles",
+            "FifteenMinRSI",
+            "FifteenMinCandleID",
+        ),
+    }
+
+    candle_table, rsi_table, id_column = table_map.get(
+        timeframe.lower(),
+        table_map["daily"],
+    )
+
+    # SQLite compares the integer epoch column, SQL Server the EndDate column
+    if os.getenv("DATABASE_TYPE", "azuresql").lower() == "sqlite":
+        time_column, from_param = EPOCH_COLUMN, to_epoch(from_date)
+    elif isinstance(from_date, date | datetime):
+        time_column, from_param = "EndDate", from_date.isoformat()
+    else:
+        time_column, from_param = "EndDate", str(from_date)
+
+    query = f"""
+        SELECT
+            dc.ID,
+            dc.SymbolId,
+            dc.EndDate as date,
+            r.RSI,
+            dc.[Close],
+            dc.[Open],
+            dc.High,
+            dc.Low
+        FROM {candle_table} dc
+        LEFT JOIN {rsi_table} r ON dc.ID = r.{id_column}
+        WHERE dc.SymbolId = ? AND dc.{time_column} >= ?
+        ORDER BY dc.{time_column} {order}
+    """  # noqa: S608
+    return query, (symbol_id, from_param)
+
+
 def get_candles_with_rsi(
     conn: "pyodbc.Connection | SQLiteConnectionWrapper | None",
     symbol_id: int,
@@ -166,46 +224,8 @@ def get_candles_with_rsi(
     try:
         if conn:
             cursor = conn.cursor()
-
-            # Map timeframe to the correct tables
-            table_map = {
-                "daily": ("DailyCandles", "RSI", "DailyCandleID"),
-                "hourly": ("HourlyCandles", "HourlyRSI", "HourlyCandleID"),
-                "fifteen_min": (
-                    "FifteenMinCandles",
-                    "FifteenMinRSI",
-                    "FifteenMinCandleID",
-                ),
-            }
-
-            candle_table, rsi_table, id_column = table_map.get(
-                timeframe.lower(),
-                table_map["daily"],
-            )
-
-            # Convert date/datetime to ISO string for SQL comparison
-            # SQLite stores EndDate as text, so we need string comparison
-            if isinstance(from_date, date | datetime):
-                from_date_str = from_date.isoformat()
-            else:
-                from_date_str = str(from_date)
-
-            query = f"""
-                SELECT
-                    dc.ID,
-                    dc.SymbolId,
-                    dc.EndDate as date,
-                    r.RSI,
-                    dc.[Close],
-                    dc.[Open],
-                    dc.High,
-                    dc.Low
-                FROM {candle_table} dc
-                LEFT JOIN {rsi_table} r ON dc.ID = r.{id_column}
-                WHERE dc.SymbolId = ? AND dc.EndDate >= ?
-                ORDER BY dc.EndDate DESC
-            """  # noqa: S608
-            cursor.execute(query, (symbol_id, from_date_str))
+            query, params = _candles_with_rsi_query(symbol_id, from_date, timeframe, "DESC")
+            cursor.execute(query, params)
 
             # Fetch column names
             columns = [column[0] for column in cursor.description]
@@ -228,6 +248,44 @@ def get_candles_with_rsi(
         raise
 
 
+def get_candles_with_rsi_frame(
+    conn: "pyodbc.Connection | SQLiteConnectionWrapper",
+    symbol_id: int,
+    from_date: date | datetime,
+    timeframe: str = "daily",
+) -> pd.DataFrame:
+    """Fetch candle data with RSI for a symbol as a date-indexed DataFrame.
+
+    Same data as ``get_candles_with_rsi``, but read with ``fetch_columns`` straight
+    into the DataFrame columns, without a dict per row.
+
+    Args:
+        conn: Database connection
+        symbol_id (int): Symbol ID to filter the data
+        from_date: The start date to filter the candles (inclusive)
+        timeframe (str): Timeframe type ("daily", "hourly", "fifteen_min")
+
+    Returns:
+        DataFrame with the same columns as ``get_candles_with_rsi`` (RSI is NaN where
+        missing), indexed by naive-UTC ``date`` in ascending order
+
+    """
+    query, params = _candles_with_rsi_query(symbol_id, from_date, timeframe, "ASC")
+    try:
+        columns = fetch_columns(conn, query, params)
+    except pyodbc.Error as e:
+        app_logger.error(f"ODBC Error while fetching {timeframe} candle data with RSI: {e}")
+        raise
+    except Exception as e:
+        app_logger.error(f"Error fetching {timeframe} candle data with RSI: {e!s}")
+        raise
+
+    # An empty result has no typed columns, so the dates are cast explicitly
+    dates = columns.pop("date").astype(np.int64)
+    index = pd.DatetimeIndex(epoch_to_datetime64(dates), name="date")
+    return pd.DataFrame(columns, index=index)
+
+
 def _get_timeframe_config(timeframe: str) -> tuple[str, str, str, int, int]:
     """Get timeframe configuration for database queries."""
     table_map = {
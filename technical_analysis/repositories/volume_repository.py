@@ -6,6 +6,7 @@ from datetime import UTC, datetime
 import pyodbc
 
 from infra.telegram_logging_handler import app_logger
+from technical_analysis.repositories.latest_indicators_repository import refresh_latest_indicators
 
 
 def save_volume_results(conn, sorted_results):
@@ -35,6 +36,12 @@ def save_volume_results(conn, sorted_results):
                 """
                 for result in sorted_results:
                     cursor.execute(query, (result["symbol_id"], result["total"], today.isoformat()))
+                    refresh_latest_indicators(
+                        cursor,
+                        "VolumeHistory",
+                        result["symbol_id"],
+                        today.isoformat(),
+                    )
             else:
                 # SQL Server uses MERGE
                 query = """
@@ -4,6 +4,9 @@ This module provides various implementations of RSI calculations for technical a
 including different smoothing methods and timeframes.
 """
 
+import math
+
+import numpy as np
 import pandas as pd
 
 from infra.telegram_logging_handler import app_logger
@@ -79,6 +82,95 @@ def calculate_ema(series, period):
     return series.ewm(com=period - 1, adjust=False).mean()
 
 
+def _block_size(beta: float) -> int:
+    """Longest block whose growth factor beta**-k stays well inside float64 range."""
+    return max(1, min(1024, int(150 * math.log(10) / -math.log(beta))))
+
+
+def _wilder_smooth(values: np.ndarray, seed_at: np.ndarray, periods: int) -> np.ndarray:
+    """Apply Wilder's smoothing to every row of a 2-D array.
+
+    Each row is seeded with the SMA of the ``periods`` values ending at ``seed_at``
+    and then follows ``avg = (prev_avg * (periods - 1) + value) / periods``. The
+    recurrence is evaluated block-wise in closed form (cumulative sums scaled by
+    powers of the decay factor), so the Python loop runs once per block of up to
+    1024 columns instead of once per value.
+
+    Args:
+        values: Gains or losses, shape (rows, time)
+        seed_at: Per-row column index of the SMA seed
+        periods: Smoothing period
+
+    Returns:
+        Smoothed values, NaN before each row's seed
+
+    """
+    rows, length = values.shape
+    columns = np.arange(length)
+    seeded = np.where(columns > seed_at[:, None], values, 0.0)
+
+    # Fold the SMA seed into the input: starting from 0, value * periods at the seed
+    # column makes the recurrence produce exactly the SMA there
+    has_seed = np.nonzero(seed_at < length)[0]
+    window = seed_at[has_seed, None] - np.arange(periods)[::-1]
+    seeded[has_seed, seed_at[has_seed]] = values[has_seed[:, None], window].mean(axis=1) * periods
+
+    alpha = 1.0 / periods
+    beta = 1.0 - alpha
+    if beta == 0.0:
+        smoothed = seeded
+    else:
+        smoothed = np.empty_like(seeded)
+        previous = np.zeros(rows)
+        block = _block_size(beta)
+        for block_start in range(0, length, block):
+            chunk = seeded[:, block_start : block_start + block]
+            offsets = np.arange(chunk.shape[1])
+            scaled_sum = alpha * np.cumsum(chunk * beta**-offsets, axis=1)
+            result = beta**offsets * (beta * previous[:, None] + scaled_sum)
+            smoothed[:, block_start : block_start + block] = result
+            previous = result[:, -1]
+
+    return np.where(columns >= seed_at[:, None], smoothed, np.nan)
+
+
+def wilder_rsi(prices: np.ndarray, periods: int = 14) -> np.ndarray:
+    """Calculate Wilder's RSI for one price history or many at once.
+
+    NumPy kernel behind :func:`calculate_rsi_using_rma`. A 2-D input holds one
+    symbol per row (symbols x time); shorter histories are padded with leading
+    NaNs and each row is seeded from its own first price.
+
+    Args:
+        prices: Close prices, 1-D (time) or 2-D (symbols x time)
+        periods: RSI period (default 14)
+
+    Returns:
+        RSI values (0-100) with the same shape as ``prices``, NaN until each row
+        has ``periods`` price changes
+
+    """
+    prices = np.asarray(prices, dtype=float)
+    matrix = np.atleast_2d(prices)
+    length = matrix.shape[1]
+
+    has_price = ~np.isnan(matrix)
+    first = np.where(has_price.any(axis=1), has_price.argmax(axis=1), length)
+
+    delta = np.diff(matrix, axis=1, prepend=np.nan)
+    # Missing changes (first price, gaps) count as neither gain nor loss
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+
+    seed_at = first + periods
+    avg_gain = _wilder_smooth(gains, seed_at, periods)
+    avg_loss = _wilder_smooth(losses, seed_at, periods)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    return rsi[0] if prices.ndim == 1 else rsi
+
+
 def calculate_rsi_using_rma(series, periods=14):
     """Calculate RSI using Wilder's smoothing (RMA - Relative Moving Average).
 
@@ -98,34 +190,8 @@ def calculate_rsi_using_rma(series, periods=14):
         pandas Series of RSI values (0-100)
 
     """
-    delta = series.diff()
-
-    # Separate gains and losses
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-
-    # Initialize series for average gain/loss
-    avg_gain = pd.Series(index=gain.index, dtype=float)
-    avg_loss = pd.Series(index=loss.index, dtype=float)
-
-    # Need at least 'periods + 1' data points for RSI calculation
-    if len(series) <= periods:
-        # Return NaN series if insufficient data
-        return pd.Series([float("nan")] * len(series), index=series.index)
-
-    # Calculate initial SMA for the first 'periods' values
-    avg_gain.iloc[periods] = gain.iloc[1 : periods + 1].mean()
-    avg_loss.iloc[periods] = loss.iloc[1 : periods + 1].mean()
-
-    # Use Wilder's smoothing for subsequent values
-    for i in range(periods + 1, len(series)):
-        avg_gain.iloc[i] = (avg_gain.iloc[i - 1] * (periods - 1) + gain.iloc[i]) / periods
-        avg_loss.iloc[i] = (avg_loss.iloc[i - 1] * (periods - 1) + loss.iloc[i]) / periods
-
-    # Calculate RS and RSI
-    rs = avg_gain / avg_loss
-
-    return 100 - (100 / (1 + rs))
+    prices = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+    return pd.Series(wilder_rsi(prices, periods), index=series.index)
 
 
 def calculate_all_rsi_for_symbol(conn, symbol):
@@ -10,7 +10,7 @@ from infra.sql_connection import connect_to_sql
 from infra.telegram_logging_handler import app_logger
 from source_repository import Symbol, fetch_symbols
 from technical_analysis.repositories.rsi_repository import (
-    get_candles_with_rsi,
+    get_candles_with_rsi_frame,
     save_rsi_by_timeframe,
 )
 from technical_analysis.rsi import calculate_rsi_using_rma
@@ -51,6 +51,9 @@ def get_optimized_rsi_for_symbol_timeframe(
         DataFrame: DataFrame with RSI data or None if no data
 
     """
+    if conn is None:
+        return None
+
     # Calculate appropriate start date based on the timeframe
     target_date = datetime.now(UTC).date()
     start_date = target_date - timedelta(days=lookback_days)
@@ -73,21 +76,17 @@ def get_optimized_rsi_for_symbol_timeframe(
     try:
         # Get candle data with RSI values from the database, using the
         # extended date range for calculation
-        candles_with_rsi = get_candles_with_rsi(
+        df = get_candles_with_rsi_frame(
             conn,
             symbol.symbol_id,
             calculation_start_date,
             timeframe,
         )
 
-        if not candles_with_rsi:
+        if df.empty:
             app_logger.warning(f"No {timeframe} RSI data found for {symbol.symbol_name}")
             return None
 
-        # Create DataFrame from candles
-        df = pd.DataFrame(candles_with_rsi)
-        df = df.set_index("date")
-        df = df.sort_index()
         df["symbol"] = symbol.symbol_name
 
         # Check if any candles in the requested date range are missing RSI values
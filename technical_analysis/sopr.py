@@ -8,6 +8,7 @@ import requests
 from prettytable import PrettyTable
 
 from infra.telegram_logging_handler import app_logger
+from shared_code.http_session import get_http_session
 from technical_analysis.repositories.sopr_repository import save_sopr_results
 
 
@@ -24,7 +25,11 @@ API_BASE = "https://bitcoin-data.com/"
 def _fetch_sopr_data(endpoint: str, date_str: str) -> dict | None:
     """Fetch SOPR data from a specific endpoint."""
     try:
-        response = requests.get(f"{API_BASE}/v1/{endpoint}", params={"day": date_str}, timeout=10)
+        response = get_http_session().get(
+            f"{API_BASE}/v1/{endpoint}",
+            params={"day": date_str},
+            timeout=10,
+        )
         if response.status_code != HTTPStatus.OK:
             app_logger.warning(f"{endpoint.upper()} API error (status {response.status_code})")
             return None
@@ -53,7 +58,7 @@ def fetch_sopr_metrics(
     yesterday = (datetime.now(UTC) - timedelta(days=1)).strftime("%Y-%m-%d")
 
     # Check rate limit first
-    response = requests.get(f"{API_BASE}/v1/sopr", params={"day": yesterday}, timeout=10)
+    response = get_http_session().get(f"{API_BASE}/v1/sopr", params={"day": yesterday}, timeout=10)
     if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
         app_logger.warning(
             "SOPR API rate limit exceeded (5 requests/hour for free tier). "
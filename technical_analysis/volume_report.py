@@ -1,12 +1,10 @@
 """Volume analysis and reporting utilities."""
 
-from http import HTTPStatus
 from typing import TYPE_CHECKING
 
-import requests
 from prettytable import PrettyTable
 
-from infra.telegram_logging_handler import app_logger
+from shared_code.market_snapshot import MarketSnapshot
 from source_repository import Symbol
 from technical_analysis.repositories.volume_repository import save_volume_results
 
@@ -20,12 +18,14 @@ if TYPE_CHECKING:
 def fetch_volume_report(
     symbols: list[Symbol],
     conn: "pyodbc.Connection | SQLiteConnectionWrapper | None",
+    snapshot: MarketSnapshot | None = None,
 ) -> PrettyTable:
     """Fetch and format volume report for given symbols.
 
     Args:
         symbols: List of Symbol objects to analyze
         conn: Database connection
+        snapshot: Bulk market snapshot (fetched here if not provided)
 
     Returns:
         PrettyTable: Formatted volume report table
@@ -33,36 +33,12 @@ def fetch_volume_report(
     """
     results = []
     missing_symbols = []
+    if snapshot is None:
+        snapshot = MarketSnapshot.fetch()
 
     for crypto in symbols:
-        # Get Binance volume
-        binance_volume = 0.0
-        try:
-            binance_response = requests.get(
-                "https://api.binance.com/api/v3/ticker/24hr",
-                params={"symbol": crypto.binance_name},
-                timeout=30,
-            )
-            if binance_response.status_code == HTTPStatus.OK:
-                binance_data = binance_response.json()
-                binance_volume = float(binance_data.get("quoteVolume", 0))
-        except (requests.RequestException, KeyError, ValueError, TypeError):
-            app_logger.exception("Failed to get Binance volume for %s", crypto.binance_name)
-
-        # Get KuCoin volume
-        kucoin_volume = 0.0
-        try:
-            kucoin_response = requests.get(
-                "https://api.kucoin.com/api/v1/market/stats",
-                params={"symbol": crypto.kucoin_name},
-                timeout=30,
-            )
-            if kucoin_response.status_code == HTTPStatus.OK:
-                kucoin_data = kucoin_response.json()
-                kucoin_volume = float(kucoin_data.get("data", {}).get("volValue", 0))
-        except (requests.RequestException, KeyError, ValueError, TypeError):
-            app_logger.exception("Failed to get KuCoin volume for %s", crypto.kucoin_name)
-
+        # 24h quote volume on each exchange, 0 where the pair is not listed
+        binance_volume, kucoin_volume = snapshot.quote_volume(crypto)
         total_volume = binance_volume + kucoin_volume
 
         if total_volume > 0:
@@ -4,11 +4,13 @@ Sets up test environment to use SQLite database instead of Azure SQL.
 """
 
 import os
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
 
 from database.init_sqlite import create_sqlite_database
+from infra.sql_connection import SQLiteConnectionWrapper
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -36,3 +38,15 @@ def setup_test_environment():
     os.environ["SQLITE_DB_PATH"] = str(local_db.absolute())
 
     # Cleanup is optional - we can keep the test database for inspection
+
+
+@pytest.fixture
+def sqlite_conn(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[SQLiteConnectionWrapper]:
+    """Fresh SQLite database with the production schema, closed after the test."""
+    monkeypatch.setenv("DATABASE_TYPE", "sqlite")
+    conn = SQLiteConnectionWrapper(create_sqlite_database(str(tmp_path / "test.db")))
+    yield conn
+    conn.close()
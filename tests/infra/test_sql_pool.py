@@ -0,0 +1,115 @@
+"""Tests for the database connection pool and the cached Azure SQL token."""
+
+import sqlite3
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from infra import sql_connection
+from infra.sql_connection import AccessTokenCache, SQLiteConnectionWrapper
+from infra.sql_pool import ConnectionPool
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _pool(size: int = 2) -> tuple[ConnectionPool, _Clock]:
+    clock = _Clock()
+    pool = ConnectionPool(
+        lambda: SQLiteConnectionWrapper(sqlite3.connect(":memory:")),
+        size=size,
+        health_check_after=30,
+        clock=clock,
+    )
+    return pool, clock
+
+
+def test_pool_reuses_returned_connections():
+    """A returned connection is handed out again instead of opening a new one."""
+    pool, _ = _pool()
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert second is first
+    assert (pool.created, pool.reused) == (1, 1)
+
+
+def test_pool_rolls_back_uncommitted_work_on_return():
+    """The next borrower does not see what the previous one left uncommitted."""
+    pool, _ = _pool()
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE Items (Id INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO Items VALUES (1)")
+
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM Items").fetchone()[0] == 0
+
+
+def test_pool_replaces_dead_connections_after_idle_time():
+    """A connection idle past the health check interval is checked and replaced if dead."""
+    pool, clock = _pool()
+    with pool.connection() as conn:
+        pass
+    conn._conn.close()
+
+    # Within the interval the connection is trusted without a round trip
+    assert pool.acquire() is conn
+    pool._idle.append((conn, clock.now))
+    clock.now += 31
+
+    replacement = pool.acquire()
+
+    assert replacement is not conn
+    assert replacement.execute("SELECT 1").fetchone()[0] == 1
+    assert (pool.created, pool.discarded) == (2, 1)
+
+
+def test_pool_keeps_at_most_size_idle_connections():
+    """Connections beyond the pool size are closed when returned."""
+    pool, _ = _pool(size=1)
+    first, second = pool.acquire(), pool.acquire()
+
+    pool.release(first)
+    pool.release(second)
+
+    assert len(pool) == 1
+    with pytest.raises(sqlite3.ProgrammingError):
+        second.execute("SELECT 1")
+    pool.close()
+    assert len(pool) == 0
+
+
+def test_access_token_is_reused_until_shortly_before_expiry(monkeypatch):
+    """The credential is asked for a new token only when the cached one runs out."""
+    expires = {"at": time.time() + 3600}
+    calls = []
+
+    class _Credential:
+        def __init__(self, **_kwargs: object) -> None:
+            pass
+
+        def get_token(self, scope: str) -> SimpleNamespace:
+            calls.append(scope)
+            return SimpleNamespace(token=f"token-{len(calls)}", expires_on=expires["at"])
+
+    monkeypatch.setattr(sql_connection.identity, "DefaultAzureCredential", _Credential)
+    cache = AccessTokenCache(refresh_margin=300)
+
+    assert cache.get() == "token-1"
+    assert cache.get() == "token-1"
+    expires["at"] = time.time() + 60
+    cache.invalidate()
+    assert cache.get() == "token-2"
+    # Expires within the refresh margin, so the next call fetches a fresh token
+    assert cache.get() == "token-3"
+    assert len(calls) == 3
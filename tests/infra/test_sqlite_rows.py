@@ -0,0 +1,174 @@
+"""Tests and micro-benchmark for SQLite row decoding in SQLiteConnectionWrapper.
+
+The benchmark is not part of the test run; run ``python tests/infra/test_sqlite_rows.py``
+to print its timings.
+"""
+
+import sqlite3
+import time
+from collections.abc import Callable
+from contextlib import suppress
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+
+from database.init_sqlite import create_sqlite_database
+from infra.sql_connection import SQLiteConnectionWrapper
+from source_repository import SourceID, Symbol
+from technical_analysis.repositories.hourly_candle_repository import HourlyCandleRepository
+from technical_analysis.repositories.rsi_repository import get_candles_with_rsi
+
+
+BTC = Symbol(
+    symbol_id=1,
+    symbol_name="BTC",
+    full_name="Bitcoin",
+    source_id=SourceID.BINANCE,
+    coingecko_name="bitcoin",
+)
+START = datetime(2021, 1, 1, tzinfo=UTC)
+
+
+class _LegacyRow:
+    """The previous per-row decoding: name map rebuilt and every string parsed."""
+
+    def __init__(self, cursor: sqlite3.Cursor, row: tuple) -> None:
+        self._data = []
+        self._names = {}
+        for idx, col in enumerate(cursor.description):
+            value = row[idx]
+            if value is not None and isinstance(value, str):
+                if "T" in value or " " in value:
+                    with suppress(ValueError, AttributeError):
+                        value = datetime.fromisoformat(value.replace(" ", "T"))
+                elif len(value) == 10 and value.count("-") == 2:
+                    with suppress(ValueError, AttributeError):
+                        value = datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=UTC).date()
+            self._data.append(value)
+            self._names[col[0]] = idx
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._data[key]
+        return self._data[self._names[key]]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _connect(path: Path, hours: int = 0) -> SQLiteConnectionWrapper:
+    raw = create_sqlite_database(str(path))
+    raw.executemany(
+        "INSERT INTO HourlyCandles (SymbolID, SourceID, OpenTime, EndDate, Open, High, Low, "
+        "Close, Last, Volume, VolumeQuote) VALUES (1, 1, ?, ?, 1, 2, 0.5, 1.5, 1.5, 10, 15)",
+        (
+            ((START + timedelta(hours=h)).isoformat(), (START + timedelta(hours=h + 1)).isoformat())
+            for h in range(hours)
+        ),
+    )
+    raw.execute("INSERT INTO HourlyRSI (HourlyCandleID, RSI) SELECT Id, 55.0 FROM HourlyCandles")
+    raw.commit()
+    return SQLiteConnectionWrapper(raw)
+
+
+def test_rows_convert_dates_and_support_index_slice_and_name_access(tmp_path):
+    """Rows decode ISO dates like before and share one name map per query."""
+    conn = _connect(tmp_path / "rows.db")
+    rows = conn.execute(
+        "SELECT 1 AS Id, 'BTC' AS Name, '2025-10-23 20:00:00' AS Ts, '2025-10-23' AS Day, "
+        "'2025-10-23T20:00:00+00:00' AS TsUtc, NULL AS Missing, 2.5 AS Price, "
+        "'10 days' AS Note UNION ALL "
+        "SELECT 2, 'ETH', 'not a date', '2025-13-45', NULL, '2025-01-01', 3.5, 'x'",
+    ).fetchall()
+
+    first, second = rows
+    assert first["Ts"] == datetime(2025, 10, 23, 20)  # noqa: DTZ001
+    assert first["Day"] == date(2025, 10, 23)
+    assert first["TsUtc"] == datetime(2025, 10, 23, 20, tzinfo=UTC)
+    assert first[0:3] == (1, "BTC", datetime(2025, 10, 23, 20))  # noqa: DTZ001
+    assert (first["Missing"], first["Price"], first["Note"]) == (None, 2.5, "10 days")
+    assert second == (2, "ETH", "not a date", "2025-13-45", None, date(2025, 1, 1), 3.5, "x")
+    assert dict(first)["Name"] == "BTC"
+    assert type(first) is type(second)
+    conn.close()
+
+
+def _best_of(runs: int, func: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def _queries(conn: SQLiteConnectionWrapper, hours: int) -> dict[str, Callable[[], object]]:
+    repo = HourlyCandleRepository(conn)
+    end = START + timedelta(hours=hours + 1)
+    return {
+        "get_candles": lambda: repo.get_candles(BTC, START, end),
+        "get_candles_with_rsi": lambda: get_candles_with_rsi(conn, 1, START, "hourly"),
+    }
+
+
+def benchmark_row_decoding(path: Path, hours: int = 5 * 365 * 24) -> dict[str, tuple[float, float]]:
+    """Time get_candles and get_candles_with_rsi with the legacy and the new decoding.
+
+    Returns:
+        Query name -> (legacy seconds, new seconds), best of three runs
+
+    """
+    conn = _connect(path, hours)
+    raw = conn._conn
+    new_factory = raw.row_factory
+    results = {}
+    for name, query in _queries(conn, hours).items():
+        raw.row_factory = _LegacyRow
+        legacy = _best_of(3, query)
+        raw.row_factory = new_factory
+        results[name] = (legacy, _best_of(3, query))
+    conn.close()
+    return results
+
+
+def test_benchmarked_queries_decode_like_legacy_rows(tmp_path):
+    """get_candles and get_candles_with_rsi return the same values as before."""
+    conn = _connect(tmp_path / "bench.db", hours=48)
+    raw = conn._conn
+    new_factory = raw.row_factory
+
+    for name, query in _queries(conn, 48).items():
+        raw.row_factory = _LegacyRow
+        legacy = query()
+        raw.row_factory = new_factory
+        result = query()
+        assert result, name
+        assert result == legacy, name
+    conn.close()
+
+
+def test_converter_plan_follows_declared_types_not_the_first_row(tmp_path):
+    """Undeclared and TEXT columns are decoded in every row; numeric columns never."""
+    conn = _connect(tmp_path / "plan.db")
+    # Created after the first query: the plan picks up the schema change
+    conn.execute("SELECT 1").fetchall()
+    conn.execute("CREATE TABLE Codes (Code INTEGER, Label TEXT)")
+    # Text that does not look like a number keeps its TEXT storage class
+    conn.execute("INSERT INTO Codes VALUES (1, 'x'), ('2025-01-01', '2025-01-02')")
+
+    mixed = conn.execute("SELECT 1 AS Mixed UNION ALL SELECT '2025-01-01'").fetchall()
+    codes = conn.execute("SELECT Code, Label FROM Codes ORDER BY rowid").fetchall()
+
+    assert [row["Mixed"] for row in mixed] == [1, date(2025, 1, 1)]
+    assert codes[1] == ("2025-01-01", date(2025, 1, 2))
+    conn.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (legacy, new) in benchmark_row_decoding(Path(directory) / "bench.db").items():
+            print(f"{name}: {legacy:.3f}s -> {new:.3f}s ({legacy / new:.1f}x)")
@@ -0,0 +1,143 @@
+"""Tests for the vectorised CVD calculations over aggregate trades."""
+
+from collections import defaultdict
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from shared_code.agg_trades import AggTradeColumns
+from shared_code.binance import (
+    CVD_LARGE_TRADE_MULTIPLIER,
+    fetch_binance_cvd,
+    fetch_cvd_trades_incremental,
+)
+from source_repository import SourceID, Symbol
+
+
+SYMBOL = Symbol(
+    symbol_id=1,
+    symbol_name="BTC",
+    full_name="Bitcoin",
+    source_id=SourceID.BINANCE,
+    coingecko_name="bitcoin",
+)
+
+
+def _trades(count: int, hours: float = 30) -> list[dict]:
+    """Random aggTrades payload spread over the last ``hours`` hours."""
+    rng = np.random.default_rng(count)
+    now_ms = int(datetime.now(UTC).timestamp() * 1000)
+    times = np.sort(rng.integers(now_ms - int(hours * 3_600_000), now_ms - 1000, count))
+    return [
+        {
+            "a": 1000 + i,
+            "p": f"{rng.uniform(90, 110):.2f}",
+            "q": f"{rng.lognormal(0, 1):.3f}",
+            "T": int(t),
+            "m": bool(rng.integers(0, 2)),
+        }
+        for i, t in enumerate(times)
+    ]
+
+
+class _FakeFuturesApi:
+    """Serves ``futures_aggregate_trades`` pages from a fixed trade list."""
+
+    def __init__(self, trades: list[dict]) -> None:
+        self.trades = trades
+        self.calls = 0
+
+    def futures_aggregate_trades(self, symbol, limit, endTime=None, fromId=None):  # noqa: ARG002, N803
+        self.calls += 1
+        if fromId is not None:
+            return [t for t in self.trades if t["a"] >= fromId][:limit]
+        return [t for t in self.trades if t["T"] <= endTime][-limit:]
+
+
+def _reference_buckets(trades: list[dict]) -> dict[datetime, dict]:
+    """Per-trade loop the hourly snapshots used to be built with."""
+    sizes = [float(t["q"]) * float(t["p"]) for t in trades]
+    threshold = sum(sizes) / len(sizes) * CVD_LARGE_TRADE_MULTIPLIER
+    buckets: dict[datetime, dict] = defaultdict(lambda: defaultdict(float))
+    for trade, usd in zip(trades, sizes, strict=True):
+        hour = datetime.fromtimestamp(trade["T"] / 1000, tz=UTC).replace(
+            minute=0,
+            second=0,
+            microsecond=0,
+        )
+        bucket = buckets[hour]
+        side = "sell" if trade["m"] else "buy"
+        bucket["cvd"] += -usd if trade["m"] else usd
+        bucket[f"{side}_volume"] += usd
+        bucket["trade_count"] += 1
+        bucket["volume"] += usd
+        bucket[f"large_{side}_count"] += usd >= threshold
+        bucket["last_trade_id"] = max(bucket["last_trade_id"], trade["a"])
+    return buckets
+
+
+def test_columns_sort_and_deduplicate_batches():
+    """Batches joined out of order come back sorted by trade ID, each trade once."""
+    trades = _trades(10)
+    newer = AggTradeColumns.from_payload(trades[5:])
+    older = AggTradeColumns.from_payload(trades[:6])
+
+    columns = AggTradeColumns.concat([newer, older])
+
+    assert columns.trade_ids.tolist() == [t["a"] for t in trades]
+    assert columns.prices.tolist() == [float(t["p"]) for t in trades]
+
+
+def test_fetch_binance_cvd_matches_per_trade_sums():
+    """Window sums, counts and large-trade counts match a per-trade calculation."""
+    trades = _trades(2500, hours=20)
+    api = _FakeFuturesApi(trades)
+    now_ms = datetime.now(UTC).timestamp() * 1000
+    usd = [float(t["q"]) * float(t["p"]) for t in trades]
+    signed = [-v if t["m"] else v for t, v in zip(trades, usd, strict=True)]
+    recent = [t["T"] >= now_ms - 3_600_000 for t in trades]
+    threshold = sum(usd) / len(usd) * CVD_LARGE_TRADE_MULTIPLIER
+
+    with patch("shared_code.binance.BinanceClient", return_value=api):
+        metrics = fetch_binance_cvd(SYMBOL)
+
+    assert metrics is not None
+    assert api.calls == 3
+    assert metrics.trade_count_24h == len(trades)
+    assert metrics.trade_count_1h == sum(recent)
+    assert metrics.cvd_24h == pytest.approx(sum(signed))
+    assert metrics.cvd_1h == pytest.approx(sum(s for s, r in zip(signed, recent, strict=True) if r))
+    assert metrics.sell_volume_24h == pytest.approx(
+        sum(v for t, v in zip(trades, usd, strict=True) if t["m"]),
+    )
+    assert metrics.avg_trade_size == pytest.approx(sum(usd) / len(usd))
+    assert metrics.large_sell_count == sum(
+        1 for t, v in zip(trades, usd, strict=True) if t["m"] and v >= threshold
+    )
+    assert metrics.large_buy_count == sum(
+        1 for t, v in zip(trades, usd, strict=True) if not t["m"] and v >= threshold
+    )
+
+
+def test_fetch_cvd_trades_incremental_matches_per_trade_buckets():
+    """Hourly snapshots match the per-trade bucketing, oldest hour first."""
+    trades = _trades(2500, hours=6)
+    api = _FakeFuturesApi(trades)
+    expected = _reference_buckets(trades[200:])
+
+    with patch("shared_code.binance.BinanceClient", return_value=api):
+        snapshots = fetch_cvd_trades_incremental(SYMBOL, 1, last_trade_id=trades[199]["a"])
+
+    assert [s.hour_timestamp for s in snapshots] == sorted(expected)
+    for snapshot in snapshots:
+        bucket = expected[snapshot.hour_timestamp]
+        assert snapshot.cvd == pytest.approx(bucket["cvd"])
+        assert snapshot.buy_volume == pytest.approx(bucket["buy_volume"])
+        assert snapshot.sell_volume == pytest.approx(bucket["sell_volume"])
+        assert snapshot.trade_count == bucket["trade_count"]
+        assert snapshot.large_buy_count == bucket["large_buy_count"]
+        assert snapshot.large_sell_count == bucket["large_sell_count"]
+        assert snapshot.avg_trade_size == pytest.approx(bucket["volume"] / bucket["trade_count"])
+        assert snapshot.last_trade_id == bucket["last_trade_id"]
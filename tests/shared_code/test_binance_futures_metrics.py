@@ -0,0 +1,80 @@
+"""Tests for the bulk Binance futures metrics fetch."""
+
+import threading
+from datetime import UTC, datetime
+from typing import ClassVar
+from unittest.mock import patch
+
+import pytest
+
+from shared_code.binance import fetch_binance_futures_metrics_bulk
+from source_repository import SourceID, Symbol
+
+
+NEXT_FUNDING_MS = int(datetime(2025, 1, 1, 8, tzinfo=UTC).timestamp() * 1000)
+
+
+def _symbol(symbol_id: int, name: str, source_id: SourceID = SourceID.BINANCE) -> Symbol:
+    return Symbol(
+        symbol_id=symbol_id,
+        symbol_name=name,
+        full_name=name,
+        source_id=source_id,
+        coingecko_name=name.lower(),
+    )
+
+
+class _FakeFuturesClient:
+    """Futures API stand-in that counts calls per endpoint."""
+
+    calls: ClassVar[dict[str, int]] = {}
+    lock = threading.Lock()
+
+    def __init__(self, *, ping: bool = True) -> None:  # noqa: ARG002
+        self.session = object()
+
+    def _count(self, endpoint: str) -> None:
+        with self.lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+
+    def futures_mark_price(self) -> list[dict]:
+        self._count("premiumIndex")
+        return [
+            {
+                "symbol": name,
+                "markPrice": "9.0",
+                "lastFundingRate": "0.0001",
+                "nextFundingTime": NEXT_FUNDING_MS,
+            }
+            for name in ("BTCUSDT", "ETHUSDT")
+        ]
+
+    def futures_symbol_ticker(self) -> list[dict]:
+        self._count("ticker/price")
+        return [{"symbol": "BTCUSDT", "price": "100.0"}]
+
+    def futures_open_interest(self, symbol: str) -> dict:
+        self._count("openInterest")
+        return {"symbol": symbol, "openInterest": "2.5", "time": NEXT_FUNDING_MS}
+
+
+def test_bulk_metrics_use_two_bulk_calls_and_one_open_interest_call_per_symbol():
+    """Funding and prices come from the bulk endpoints; only OI is requested per symbol."""
+    symbols = [
+        _symbol(1, "BTC"),
+        _symbol(2, "AKT", SourceID.KUCOIN),
+        _symbol(3, "ETH"),
+        _symbol(4, "OSMO"),
+    ]
+
+    with patch("shared_code.binance.BinanceClient", _FakeFuturesClient):
+        results = fetch_binance_futures_metrics_bulk(symbols, max_workers=3)
+
+    assert [symbol.symbol_name for symbol, _ in results] == ["BTC", "ETH", "OSMO"]
+    btc, eth, osmo = (metrics for _, metrics in results)
+    assert osmo is None  # no perpetual contract
+    assert btc.open_interest_value == pytest.approx(250.0)
+    assert eth.open_interest_value == pytest.approx(2.5 * 9.0)  # falls back to mark price
+    assert btc.funding_rate == pytest.approx(0.01)
+    assert btc.next_funding_time == datetime(2025, 1, 1, 8, tzinfo=UTC)
+    assert _FakeFuturesClient.calls == {"premiumIndex": 1, "ticker/price": 1, "openInterest": 2}
@@ -0,0 +1,94 @@
+"""Tests for the run-scoped candle panel."""
+
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+
+from infra.sql_connection import SQLiteConnectionWrapper
+from shared_code.candle_panel import CandlePanel
+from shared_code.candle_refresh import TIMEFRAME_DAILY, CandleRefreshRequest
+from shared_code.common_price import Candle
+from source_repository import SourceID, Symbol
+from technical_analysis import price_change_report
+from technical_analysis.repositories.daily_candle_repository import DailyCandleRepository
+
+
+SYMBOL = Symbol(
+    symbol_id=1,
+    symbol_name="BTC",
+    full_name="Bitcoin",
+    source_id=SourceID.BINANCE,
+    coingecko_name="bitcoin",
+)
+TODAY = date(2025, 1, 10)
+
+
+def _daily_candle(day: date, close: float) -> Candle:
+    return Candle(
+        symbol="BTC",
+        source=SourceID.BINANCE.value,
+        end_date=datetime.combine(day, datetime.max.time(), tzinfo=UTC).isoformat(),
+        open=close,
+        close=close,
+        high=close,
+        low=close,
+        last=close,
+        volume=1.0,
+        volume_quote=1.0,
+    )
+
+
+@pytest.fixture
+def panel(sqlite_conn: SQLiteConnectionWrapper) -> CandlePanel:
+    """Panel over ten days of daily candles closing at 1, 2, ..., 10."""
+    DailyCandleRepository(sqlite_conn).save_candles(
+        SYMBOL,
+        [_daily_candle(TODAY - timedelta(days=9 - i), float(i + 1)) for i in range(10)],
+        source=SourceID.BINANCE.value,
+    )
+    request = CandleRefreshRequest(TIMEFRAME_DAILY, TODAY - timedelta(days=9), TODAY)
+    return CandlePanel.load(sqlite_conn, [SYMBOL], [request])
+
+
+def test_daily_slices_window_from_loaded_candles(panel):
+    """A sub-window is served from memory with database IDs intact."""
+    series = panel.daily(SYMBOL, TODAY - timedelta(days=2), TODAY)
+
+    assert series is not None
+    assert series.close.tolist() == [8.0, 9.0, 10.0]
+    assert all(candle.id is not None for candle in series.to_candles())
+
+
+def test_uncovered_requests_return_none(panel):
+    """Windows, timeframes or symbols the panel was not loaded for fall back to the DB."""
+    other = Symbol(
+        symbol_id=2,
+        symbol_name="ETH",
+        full_name="Ethereum",
+        source_id=SourceID.BINANCE,
+        coingecko_name="ethereum",
+    )
+
+    assert panel.daily(SYMBOL, TODAY - timedelta(days=30), TODAY) is None
+    assert panel.hourly(SYMBOL) is None
+    assert panel.daily(other, TODAY, TODAY) is None
+
+
+def test_price_change_report_reads_from_panel(panel, monkeypatch):
+    """With a panel the report makes no per-symbol candle reads."""
+
+    def fail(*args, **kwargs):
+        msg = "fetch_daily_candles should not be called"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(price_change_report, "fetch_daily_candles", fail)
+
+    table = price_change_report.fetch_price_change_report(
+        [SYMBOL],
+        None,
+        target_date=TODAY,
+        panel=panel,
+    )
+
+    # Closes 3..10 over the 7-day window: 24h +11.11%, 7d +233.33%
+    assert table.rows == [["BTC", "+11.11", "+233.33"]]
@@ -0,0 +1,282 @@
+"""Tests for the concurrent multi-symbol candle refresh engine."""
+
+import threading
+import time
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+
+from shared_code import candle_refresh as cr
+from shared_code.common_price import Candle
+from source_repository import SourceID, Symbol
+
+
+def _symbol(symbol_id: int, name: str, source: SourceID) -> Symbol:
+    return Symbol(
+        symbol_id=symbol_id,
+        symbol_name=name,
+        full_name=name,
+        source_id=source,
+        coingecko_name=name.lower(),
+    )
+
+
+def _candle(symbol: Symbol, end: datetime, close: float = 1.0) -> Candle:
+    return Candle(
+        symbol=symbol.symbol_name,
+        source=symbol.source_id.value,
+        end_date=end.isoformat(),
+        close=close,
+        high=close,
+        low=close,
+        last=close,
+        volume=1.0,
+        volume_quote=1.0,
+        open=close,
+    )
+
+
+def _fake_fetch(symbol: Symbol, timeframe: str, missing: list) -> list[Candle]:
+    if timeframe == cr.TIMEFRAME_DAILY:
+        return [
+            _candle(symbol, datetime.combine(day, datetime.max.time(), tzinfo=UTC))
+            for day in missing
+        ]
+    return [_candle(symbol, slot) for slot in missing]
+
+
+class _FakeRepository:
+    """In-memory stand-in for a candle repository that records the calling thread."""
+
+    rows: dict[tuple[int, str], Candle]
+    writer_threads: set[int]
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def get_candles(self, symbol, start_date, end_date):
+        return sorted(
+            (
+                candle
+                for (symbol_id, _), candle in self.rows.items()
+                if symbol_id == symbol.symbol_id
+                and start_date <= datetime.fromisoformat(candle.end_date) <= end_date
+            ),
+            key=lambda c: c.end_date,
+        )
+
+    def save_candle(self, symbol, candle, source):  # noqa: ARG002
+        type(self).writer_threads.add(threading.get_ident())
+        candle.id = len(self.rows) + 1
+        self.rows[(symbol.symbol_id, candle.end_date)] = candle
+
+    def save_candles(self, symbol, candles, source):
+        for candle in candles:
+            self.save_candle(symbol, candle, source)
+        return candles
+
+
+@pytest.fixture
+def fake_hourly_repository(monkeypatch: pytest.MonkeyPatch) -> type[_FakeRepository]:
+    """Route hourly persistence (and its empty 15-minute source) to memory."""
+    repository = type("HourlyFake", (_FakeRepository,), {"rows": {}, "writer_threads": set()})
+    source = type("FifteenMinFake", (_FakeRepository,), {"rows": {}, "writer_threads": set()})
+    monkeypatch.setattr(cr._TIMEFRAMES[cr.TIMEFRAME_HOURLY], "repository_class", repository)
+    monkeypatch.setattr(cr._TIMEFRAMES[cr.TIMEFRAME_FIFTEEN_MIN], "repository_class", source)
+    return repository
+
+
+def test_refresh_without_connection_returns_candles_per_symbol():
+    """Every symbol gets a full, sorted candle list for each requested timeframe."""
+    symbols = [
+        _symbol(1, "BTC", SourceID.BINANCE),
+        _symbol(2, "AKT", SourceID.KUCOIN),
+    ]
+    end_time = datetime(2025, 1, 2, 12, 30, tzinfo=UTC)
+    engine = cr.CandleRefreshEngine(None, max_workers=4, fetch_function=_fake_fetch)
+
+    result = engine.refresh(
+        symbols,
+        [
+            cr.CandleRefreshRequest(cr.TIMEFRAME_DAILY, date(2025, 1, 1), date(2025, 1, 2)),
+            cr.CandleRefreshRequest(
+                cr.TIMEFRAME_HOURLY,
+                end_time - timedelta(hours=3),
+                end_time,
+            ),
+        ],
+    )
+
+    assert set(result[cr.TIMEFRAME_DAILY]) == {1, 2}
+    assert len(result[cr.TIMEFRAME_DAILY][1]) == 2
+    hourly = result[cr.TIMEFRAME_HOURLY][2]
+    assert len(hourly) == 4
+    assert [c.end_date for c in hourly] == sorted(c.end_date for c in hourly)
+
+
+def test_refresh_respects_per_exchange_concurrency():
+    """No more than the configured number of requests hit one exchange at once."""
+    symbols = [_symbol(i, f"S{i}", SourceID.BINANCE) for i in range(1, 9)]
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_fetch(symbol, timeframe, missing):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return _fake_fetch(symbol, timeframe, missing)
+
+    engine = cr.CandleRefreshEngine(
+        None,
+        max_workers=8,
+        exchange_concurrency={SourceID.BINANCE: 2},
+        fetch_function=slow_fetch,
+    )
+    engine.refresh(
+        symbols,
+        [cr.CandleRefreshRequest(cr.TIMEFRAME_DAILY, date(2025, 1, 1), date(2025, 1, 3))],
+    )
+
+    assert peak == 2
+
+
+def test_refresh_persists_on_calling_thread_and_skips_cached(fake_hourly_repository):
+    """Only missing slots are fetched, and all saves happen on the calling thread."""
+    symbol = _symbol(1, "BTC", SourceID.BINANCE)
+    end_time = datetime(2025, 1, 2, 12, 0, tzinfo=UTC)
+    start_time = end_time - timedelta(hours=2)
+    cached = _candle(symbol, start_time)
+    cached.id = 99
+    fake_hourly_repository.rows[(1, cached.end_date)] = cached
+
+    requested: list[list] = []
+
+    def recording_fetch(symbol, timeframe, missing):
+        requested.append(list(missing))
+        return _fake_fetch(symbol, timeframe, missing)
+
+    engine = cr.CandleRefreshEngine(object(), fetch_function=recording_fetch)  # type: ignore[arg-type]
+    result = engine.refresh(
+        [symbol],
+        [cr.CandleRefreshRequest(cr.TIMEFRAME_HOURLY, start_time, end_time)],
+    )
+
+    assert requested == [[start_time + timedelta(hours=1), end_time]]
+    assert fake_hourly_repository.writer_threads == {threading.get_ident()}
+    assert all(c.id is not None for c in result[cr.TIMEFRAME_HOURLY][1])
+
+
+def test_hourly_candles_are_resampled_from_fifteen_minute_candles():
+    """Hours fully covered by 15-minute candles fetched in the same run skip the API."""
+    symbol = _symbol(1, "BTC", SourceID.BINANCE)
+    end_time = datetime(2025, 1, 2, 12, 0, tzinfo=UTC)
+    requested: list[tuple[str, list]] = []
+
+    def recording_fetch(symbol, timeframe, missing):
+        requested.append((timeframe, list(missing)))
+        return _fake_fetch(symbol, timeframe, missing)
+
+    engine = cr.CandleRefreshEngine(None, fetch_function=recording_fetch)
+    result = engine.refresh(
+        [symbol],
+        [
+            cr.CandleRefreshRequest(cr.TIMEFRAME_HOURLY, end_time - timedelta(hours=2), end_time),
+            cr.CandleRefreshRequest(
+                cr.TIMEFRAME_FIFTEEN_MIN,
+                end_time - timedelta(hours=1),
+                end_time,
+            ),
+        ],
+    )
+
+    # 15-minute slots 11:00..12:00 cover the hour ending 12:00 only
+    assert requested[0][0] == cr.TIMEFRAME_FIFTEEN_MIN
+    assert requested[1] == (
+        cr.TIMEFRAME_HOURLY,
+        [end_time - timedelta(hours=2), end_time - timedelta(hours=1)],
+    )
+    assert len(result[cr.TIMEFRAME_HOURLY][1]) == 3
+
+
+def test_sources_without_batch_endpoint_fall_back_to_single_candles(monkeypatch):
+    """CoinGecko-style sources are fetched one slot at a time instead of getting nothing."""
+    symbol = _symbol(3, "XYZ", SourceID.COINGECKO)
+    requested: list[date] = []
+
+    def fetch_daily(symbol: Symbol, day: date) -> Candle | None:
+        requested.append(day)
+        if day == date(2025, 1, 2):
+            return None
+        return _candle(symbol, datetime.combine(day, datetime.max.time(), tzinfo=UTC))
+
+    monkeypatch.setitem(cr._SINGLE_CANDLE_FETCHERS, cr.TIMEFRAME_DAILY, fetch_daily)
+
+    candles = cr._fetch_missing(symbol, cr.TIMEFRAME_DAILY, [date(2025, 1, 1), date(2025, 1, 2)])
+
+    assert requested == [date(2025, 1, 1), date(2025, 1, 2)]
+    assert [c.end_date[:10] for c in candles] == ["2025-01-01"]
+
+
+def test_open_time_labelled_candles_are_not_resampled():
+    """KuCoin labels candles with their open time, so its hours always come from the API."""
+    symbol = _symbol(2, "AKT", SourceID.KUCOIN)
+    end_time = datetime(2025, 1, 2, 12, 0, tzinfo=UTC)
+    requested: list[tuple[str, list]] = []
+
+    def kucoin_fetch(symbol: Symbol, timeframe: str, missing: list) -> list[Candle]:
+        requested.append((timeframe, list(missing)))
+        step = cr._TIMEFRAMES[timeframe].step
+        return [_candle(symbol, slot - step) for slot in missing]
+
+    engine = cr.CandleRefreshEngine(None, fetch_function=kucoin_fetch)
+    engine.refresh(
+        [symbol],
+        [
+            cr.CandleRefreshRequest(cr.TIMEFRAME_HOURLY, end_time - timedelta(hours=2), end_time),
+            cr.CandleRefreshRequest(
+                cr.TIMEFRAME_FIFTEEN_MIN,
+                end_time - timedelta(hours=2),
+                end_time,
+            ),
+        ],
+    )
+
+    assert requested[1] == (
+        cr.TIMEFRAME_HOURLY,
+        [end_time - timedelta(hours=2), end_time - timedelta(hours=1), end_time],
+    )
+
+
+def test_forming_parts_are_neither_resampled_nor_stored(fake_hourly_repository):
+    """A 15-minute candle still forming at fetch time cannot complete an hour."""
+    symbol = _symbol(1, "BTC", SourceID.BINANCE)
+    end_time = datetime.now(UTC).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    requested: list[tuple[str, list]] = []
+
+    def recording_fetch(symbol: Symbol, timeframe: str, missing: list) -> list[Candle]:
+        requested.append((timeframe, list(missing)))
+        return _fake_fetch(symbol, timeframe, missing)
+
+    engine = cr.CandleRefreshEngine(object(), fetch_function=recording_fetch)  # type: ignore[arg-type]
+    result = engine.refresh(
+        [symbol],
+        [
+            cr.CandleRefreshRequest(cr.TIMEFRAME_HOURLY, end_time - timedelta(hours=1), end_time),
+            cr.CandleRefreshRequest(
+                cr.TIMEFRAME_FIFTEEN_MIN,
+                end_time - timedelta(hours=1),
+                end_time,
+            ),
+        ],
+    )
+
+    now = datetime.now(UTC)
+    stored = cr._TIMEFRAMES[cr.TIMEFRAME_FIFTEEN_MIN].repository_class.rows  # type: ignore[attr-defined]
+    assert requested[1] == (cr.TIMEFRAME_HOURLY, [end_time - timedelta(hours=1), end_time])
+    assert all(datetime.fromisoformat(end) <= now for _, end in stored)
+    assert len(result[cr.TIMEFRAME_FIFTEEN_MIN][1]) == 5
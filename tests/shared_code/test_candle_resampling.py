@@ -0,0 +1,65 @@
+"""Tests for resampling finer candles into hourly and daily candles."""
+
+from datetime import UTC, datetime, timedelta
+
+from shared_code.candle_resampling import resample_to_daily, resample_to_hourly
+from shared_code.common_price import Candle
+
+
+def _candle(end: datetime, open_: float, close: float, high: float, low: float) -> Candle:
+    return Candle(
+        symbol="BTC",
+        source=1,
+        end_date=end.isoformat(),
+        open=open_,
+        close=close,
+        high=high,
+        low=low,
+        last=close,
+        volume=1.0,
+        volume_quote=close,
+    )
+
+
+def test_resample_to_hourly_aggregates_ohlcv():
+    """Open from the first, close from the last, extremes and sums across all four."""
+    hour_end = datetime(2025, 1, 2, 13, 0, tzinfo=UTC)
+    parts = [
+        _candle(hour_end - timedelta(minutes=45), 100, 101, 102, 99),
+        _candle(hour_end - timedelta(minutes=30), 101, 105, 106, 100),
+        _candle(hour_end - timedelta(minutes=15), 105, 103, 105, 95),
+        _candle(hour_end, 103, 104, 104, 102),
+    ]
+
+    (hourly,) = resample_to_hourly(list(reversed(parts)))
+
+    assert hourly.end_date == hour_end.isoformat()
+    assert (hourly.open, hourly.close, hourly.high, hourly.low) == (100, 104, 106, 95)
+    assert hourly.volume == 4.0
+    assert hourly.volume_quote == 101 + 105 + 103 + 104
+    assert hourly.id is None
+
+
+def test_incomplete_periods_are_skipped():
+    """An hour with a missing quarter or a day with a missing hour is not built."""
+    hour_end = datetime(2025, 1, 2, 13, 0, tzinfo=UTC)
+    quarters = [_candle(hour_end - timedelta(minutes=15 * i), 1, 1, 1, 1) for i in range(3)]
+    assert resample_to_hourly(quarters) == []
+
+    day_start = datetime(2025, 1, 2, tzinfo=UTC)
+    hours = [_candle(day_start + timedelta(hours=h), 1, 1, 1, 1) for h in range(1, 24)]
+    assert resample_to_daily(hours) == []
+
+
+def test_resample_to_daily_uses_end_of_day_convention():
+    """Hourly candles ending 01:00 through next-day 00:00 form one daily candle."""
+    day_start = datetime(2025, 1, 2, tzinfo=UTC)
+    hours = [
+        _candle(day_start + timedelta(hours=h), open_=h, close=h + 1, high=h + 2, low=h - 1)
+        for h in range(1, 25)
+    ]
+
+    (daily,) = resample_to_daily(hours)
+
+    assert daily.end_date == datetime(2025, 1, 2, 23, 59, 59, 999999, tzinfo=UTC).isoformat()
+    assert (daily.open, daily.close, daily.high, daily.low) == (1, 25, 26, 0)
@@ -0,0 +1,65 @@
+"""Tests for the columnar candle series."""
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from shared_code.candle_series import CandleSeries
+from shared_code.common_price import Candle
+
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _candle(end: datetime, close: float, candle_id: int | None = None) -> Candle:
+    return Candle(
+        symbol="BTC",
+        source=1,
+        end_date=end.isoformat(),
+        open=close,
+        close=close,
+        high=close + 1,
+        low=close - 1,
+        last=close,
+        volume=1.0,
+        volume_quote=1.0,
+        id=candle_id,
+    )
+
+
+@pytest.fixture
+def series() -> CandleSeries:
+    """Five daily candles, deliberately passed out of order."""
+    candles = [_candle(START + timedelta(days=i), float(i), i + 1) for i in range(5)]
+    return CandleSeries.from_candles("BTC", reversed(candles))
+
+
+def test_from_candles_sorts_by_end_date(series):
+    """Columns come out ordered by end date with naive-UTC timestamps."""
+    assert series.close.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert series.end_dates[0] == np.datetime64("2025-01-01T00:00:00")
+
+
+def test_columns_are_read_only(series):
+    """Consumers sharing a series cannot modify it."""
+    with pytest.raises(ValueError, match="read-only"):
+        series.close[0] = 42.0
+
+
+def test_between_is_inclusive(series):
+    """A window keeps candles whose end date lies within both bounds."""
+    window = series.between(START + timedelta(days=1), START + timedelta(days=3))
+
+    assert window.ids.tolist() == [2, 3, 4]
+
+
+def test_to_frame_and_to_candles_round_trip(series):
+    """The DataFrame and Candle views expose the same values as the arrays."""
+    frame = series.to_frame()
+    candles = series.to_candles()
+
+    assert frame["High"].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert frame.index.name == "Date"
+    assert candles[0].id == 1
+    assert candles[-1].end_date == (START + timedelta(days=4)).isoformat()
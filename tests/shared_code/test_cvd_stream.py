@@ -0,0 +1,278 @@
+"""Tests for the streaming aggTrade CVD collector against a local WebSocket stand-in."""
+
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+from aiohttp import web
+
+from infra.sql_connection import SQLiteConnectionWrapper
+from shared_code import cvd_stream
+from shared_code.agg_trades import MS_PER_HOUR, AggTradeColumns
+from shared_code.binance import CVDHourlySnapshot, build_hourly_snapshots
+from shared_code.cvd_stream import AggTradeStreamCollector, HourlyTradeBuffer
+from source_repository import SourceID, Symbol
+from technical_analysis import order_book_report
+from technical_analysis.repositories.cvd_repository import CVDRepository
+
+
+SYMBOLS = [
+    Symbol(
+        symbol_id=1,
+        symbol_name="BTC",
+        full_name="Bitcoin",
+        source_id=SourceID.BINANCE,
+        coingecko_name="bitcoin",
+    ),
+    Symbol(
+        symbol_id=2,
+        symbol_name="ETH",
+        full_name="Ethereum",
+        source_id=SourceID.BINANCE,
+        coingecko_name="ethereum",
+    ),
+]
+START_MS = int(datetime(2025, 1, 1, tzinfo=UTC).timestamp() * 1000)
+
+
+def _recorded_trades(count: int = 600, hours: int = 3) -> list[dict]:
+    """Combined-stream aggTrade events for both symbols, in stream order."""
+    rng = np.random.default_rng(42)
+    times = np.sort(rng.integers(START_MS, START_MS + hours * MS_PER_HOUR, count))
+    return [
+        {
+            "stream": f"{SYMBOLS[i % 2].binance_name.lower()}@aggTrade",
+            "data": {
+                "e": "aggTrade",
+                "s": SYMBOLS[i % 2].binance_name,
+                "a": 5000 + i,
+                "p": f"{rng.uniform(90, 110):.2f}",
+                "q": f"{rng.lognormal(0, 1):.3f}",
+                "T": int(t),
+                "m": bool(rng.integers(0, 2)),
+            },
+        }
+        for i, t in enumerate(times)
+    ]
+
+
+@pytest.fixture
+def repo(sqlite_conn: SQLiteConnectionWrapper) -> CVDRepository:
+    """CVD repository over the shared fresh SQLite database."""
+    return CVDRepository(sqlite_conn)
+
+
+async def _replay(collector: AggTradeStreamCollector, *connections: list[dict]) -> list[str]:
+    """Serve each message list on one connection of a local WebSocket and run the collector."""
+    stop = asyncio.Event()
+    requested: list[str] = []
+
+    async def handler(request: web.Request) -> web.WebSocketResponse:
+        requested.append(request.query_string)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        if len(requested) > len(connections):
+            # The collector reconnected, so it has processed the whole replay
+            stop.set()
+        else:
+            for message in connections[len(requested) - 1]:
+                await ws.send_str(json.dumps(message))
+        await ws.close()
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/stream", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    collector.url = f"http://127.0.0.1:{port}/stream"
+    try:
+        await asyncio.wait_for(collector.run(stop), timeout=10)
+    finally:
+        await runner.cleanup()
+    return requested
+
+
+def test_collector_writes_hourly_snapshots_from_replayed_stream(repo, monkeypatch):
+    """Replayed trades end up in the DB exactly as bucketing them by hour gives."""
+    monkeypatch.setattr(cvd_stream, "RECONNECT_DELAY_SECONDS", 0)
+    monkeypatch.setattr(cvd_stream, "fetch_cvd_trades_incremental", lambda **_: [])
+    messages = _recorded_trades()
+    collector = AggTradeStreamCollector(repo, SYMBOLS, clock=lambda: START_MS)
+
+    requested = asyncio.run(_replay(collector, messages))
+
+    assert requested[0] == "streams=btcusdt@aggTrade/ethusdt@aggTrade"
+    for symbol in SYMBOLS:
+        trades = [m["data"] for m in messages if m["data"]["s"] == symbol.binance_name]
+        columns = AggTradeColumns.from_payload(trades)
+        rows = repo.conn.execute(
+            "SELECT CVD, TradeCount, LastTradeId FROM CVDHourlySnapshots "
+            "WHERE SymbolID = ? ORDER BY HourTimestamp",
+            (symbol.symbol_id,),
+        ).fetchall()
+        expected = build_hourly_snapshots(columns, symbol.symbol_id)
+        assert [row[1] for row in rows] == [s.trade_count for s in expected]
+        assert [row[2] for row in rows] == [s.last_trade_id for s in expected]
+        np.testing.assert_allclose([row[0] for row in rows], [s.cvd for s in expected])
+        assert repo.get_last_trade_id(symbol.symbol_id) == trades[-1]["a"]
+
+
+def test_buffer_flushes_only_closed_hours_and_skips_stored_trades():
+    """Trades of the current hour stay buffered; already stored trade IDs are dropped."""
+    buffer = HourlyTradeBuffer({1: 10})
+    buffer.add(1, {"a": 10, "T": START_MS, "p": "1", "q": "1", "m": False})
+    buffer.add(1, {"a": 11, "T": START_MS + 1, "p": "1", "q": "2", "m": False})
+    buffer.add(1, {"a": 12, "T": START_MS + MS_PER_HOUR, "p": "1", "q": "3", "m": True})
+
+    [closed] = buffer.pop_closed(now_ms=START_MS)
+
+    assert (closed.trade_count, closed.cvd, closed.last_trade_id) == (1, 2.0, 11)
+    assert len(buffer) == 1
+    [partial] = buffer.pop_closed()
+    assert partial.cvd == -3.0
+    assert len(buffer) == 0
+
+
+def test_backfill_fills_restart_gap_without_double_counting(repo, monkeypatch):
+    """Trades missed while down come from REST; streamed copies of them are skipped."""
+    messages = _recorded_trades()
+    trades = [m["data"] for m in messages if m["data"]["s"] == SYMBOLS[0].binance_name]
+    missed = trades[: len(trades) // 2]
+    calls = []
+
+    def fetch_rest(
+        symbol: Symbol,
+        symbol_id: int,
+        last_trade_id: int | None,
+        max_hours: int,
+    ) -> list[CVDHourlySnapshot]:
+        calls.append((symbol.symbol_name, last_trade_id, max_hours))
+        if symbol_id != SYMBOLS[0].symbol_id:
+            return []
+        return build_hourly_snapshots(AggTradeColumns.from_payload(missed), symbol_id)
+
+    monkeypatch.setattr(cvd_stream, "fetch_cvd_trades_incremental", fetch_rest)
+    collector = AggTradeStreamCollector(repo, SYMBOLS[:1], clock=lambda: START_MS)
+    collector.buffer.hold(SYMBOLS[0].symbol_id)
+
+    # The stream is already buffering trades the backfill also returns
+    for message in messages:
+        collector.handle_message(message)
+    stored_before_backfill = repo.get_last_trade_id(SYMBOLS[0].symbol_id)
+    asyncio.run(collector.backfill(SYMBOLS[:1]))
+    collector.flush(final=True)
+
+    assert stored_before_backfill is None
+    assert calls == [("BTC", None, 24)]
+    [(trade_count, last_trade_id)] = repo.conn.execute(
+        "SELECT SUM(TradeCount), MAX(LastTradeId) FROM CVDHourlySnapshots WHERE SymbolID = 1",
+    ).fetchall()
+    assert (trade_count, last_trade_id) == (len(trades), trades[-1]["a"])
+
+
+def test_reconnect_backfills_trades_missed_during_the_outage(repo, monkeypatch):
+    """Trades sent while disconnected come from REST after the reconnect, once."""
+    monkeypatch.setattr(cvd_stream, "RECONNECT_DELAY_SECONDS", 0)
+    messages = _recorded_trades()
+    before, missed, after = messages[:200], messages[200:300], messages[300:]
+    # REST returns everything after the last stored trade up to "now", which
+    # overlaps the trades the new connection is already streaming
+    rest_trades = [m["data"] for m in missed + after[:50]]
+    calls = []
+
+    def fetch_rest(
+        symbol: Symbol,
+        symbol_id: int,
+        last_trade_id: int | None,
+        max_hours: int,
+    ) -> list[CVDHourlySnapshot]:
+        calls.append((symbol.symbol_name, last_trade_id))
+        if last_trade_id is None:
+            return []
+        trades = [
+            t for t in rest_trades if t["s"] == symbol.binance_name and t["a"] > last_trade_id
+        ]
+        if not trades:
+            return []
+        return build_hourly_snapshots(AggTradeColumns.from_payload(trades), symbol_id)
+
+    monkeypatch.setattr(cvd_stream, "fetch_cvd_trades_incremental", fetch_rest)
+    collector = AggTradeStreamCollector(repo, SYMBOLS, clock=lambda: START_MS)
+
+    asyncio.run(_replay(collector, before, after))
+
+    for symbol in SYMBOLS:
+        trades = [m["data"] for m in messages if m["data"]["s"] == symbol.binance_name]
+        last_before = max(m["data"]["a"] for m in before if m["data"]["s"] == symbol.binance_name)
+        assert (symbol.symbol_name, last_before) in calls
+        expected = build_hourly_snapshots(AggTradeColumns.from_payload(trades), symbol.symbol_id)
+        rows = repo.conn.execute(
+            "SELECT CVD, TradeCount FROM CVDHourlySnapshots "
+            "WHERE SymbolID = ? ORDER BY HourTimestamp",
+            (symbol.symbol_id,),
+        ).fetchall()
+        assert [row[1] for row in rows] == [s.trade_count for s in expected]
+        np.testing.assert_allclose([row[0] for row in rows], [s.cvd for s in expected])
+
+
+def test_buffer_drops_trades_a_backfill_stored_while_held():
+    """Held trades stay buffered; those the backfill covered are dropped on release."""
+    buffer = HourlyTradeBuffer({1: 10})
+    buffer.hold(1)
+    for trade_id in (11, 12, 13):
+        buffer.add(1, {"a": trade_id, "T": START_MS, "p": "1", "q": "1", "m": False})
+
+    assert buffer.pop_closed() == []
+    buffer.resume_after(1, 12)
+    [partial] = buffer.pop_closed()
+
+    assert (partial.trade_count, partial.last_trade_id) == (1, 13)
+    assert buffer.last_trade_id(1) == 13
+
+
+def test_report_tops_up_current_hour_in_memory_when_streaming(repo, monkeypatch):
+    """The collector stores closed hours only; the report adds the current hour itself."""
+    monkeypatch.setenv("CVD_STREAM_ENABLED", "true")
+    current_hour = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+    closed = [
+        CVDHourlySnapshot(
+            1,
+            current_hour - timedelta(hours=h),
+            1.0,
+            2.0,
+            1.0,
+            3,
+            0,
+            0,
+            1.0,
+            100 - h,
+        )
+        for h in (1, 2)
+    ]
+    repo.save_hourly_snapshots(closed)
+    current = CVDHourlySnapshot(1, current_hour, 5.0, 6.0, 1.0, 7, 0, 0, 1.0, 101)
+    requested = []
+
+    def fetch_rest(
+        symbol: Symbol,
+        symbol_id: int,
+        last_trade_id: int | None,
+        max_hours: int,
+    ) -> list[CVDHourlySnapshot]:
+        requested.append(last_trade_id)
+        return [current]
+
+    monkeypatch.setattr(order_book_report, "fetch_cvd_trades_incremental", fetch_rest)
+
+    table = order_book_report.fetch_cvd_report(SYMBOLS[:1], repo.conn)
+
+    assert requested == [99]
+    assert table.rows[0][1] == "+5"
+    assert table.rows[0][6] == "7"
+    stored = repo.conn.execute("SELECT COUNT(*) FROM CVDHourlySnapshots").fetchone()[0]
+    assert stored == len(closed)
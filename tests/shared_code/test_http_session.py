@@ -0,0 +1,63 @@
+"""Tests for the process-wide pooled HTTP connections."""
+
+import pytest
+from requests import PreparedRequest, Request, Response, Session
+
+from shared_code import http_session
+from shared_code.rate_limiter import RateLimitedAdapter
+
+
+@pytest.fixture(autouse=True)
+def fresh_pools():
+    """Start every test without pooled adapter or session."""
+    http_session.reset_http_sessions()
+    yield
+    http_session.reset_http_sessions()
+
+
+class _Client:
+    def __init__(self, api_key: str) -> None:
+        self.session = Session()
+        self.session.headers["X-API-KEY"] = api_key
+
+
+def test_clients_share_connection_pools_but_keep_their_headers():
+    """Every client session mounts the one pooled adapter; credentials stay per client."""
+    first = http_session.pooled_client(_Client("a"))
+    second = http_session.pooled_client(_Client("b"))
+
+    adapter = http_session.get_http_adapter()
+    assert first.session.get_adapter("https://api.binance.com") is adapter
+    assert second.session.get_adapter("https://api.kucoin.com") is adapter
+    assert http_session.get_http_session().get_adapter("https://example.com") is adapter
+    assert (first.session.headers["X-API-KEY"], second.session.headers["X-API-KEY"]) == ("a", "b")
+    assert http_session.pooled_client(object) is object  # no session: untouched
+
+
+def test_closing_a_client_session_keeps_pooled_connections():
+    """Clients closing their session on garbage collection must not drop the shared pools."""
+    client = http_session.pooled_client(_Client("a"))
+    adapter = http_session.get_http_adapter()
+    adapter.poolmanager.connection_from_url("https://api.binance.com")
+
+    client.session.close()
+
+    assert len(adapter.poolmanager.pools) == 1
+
+
+def test_requests_without_timeout_get_the_default(monkeypatch):
+    """An explicit timeout wins; otherwise the adapter applies the default one."""
+    sent: list[dict] = []
+
+    def fake_send(_self, _request: PreparedRequest, **kwargs: object) -> Response:
+        sent.append(kwargs)
+        return Response()
+
+    monkeypatch.setattr(RateLimitedAdapter, "send", fake_send)
+    adapter = http_session.get_http_adapter()
+    request = Request("GET", "https://example.com").prepare()
+
+    adapter.send(request)
+    adapter.send(request, timeout=5)
+
+    assert [kwargs["timeout"] for kwargs in sent] == [http_session.DEFAULT_TIMEOUT_SECONDS, 5]
@@ -0,0 +1,115 @@
+"""Tests for the bulk market snapshot."""
+
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from shared_code import price_checker
+from shared_code.market_snapshot import MarketSnapshot
+from shared_code.ttl_cache import TTLCache
+from source_repository import SourceID, Symbol
+
+
+def _symbol(name: str, source: SourceID) -> Symbol:
+    return Symbol(
+        symbol_id=1,
+        symbol_name=name,
+        full_name=name,
+        source_id=source,
+        coingecko_name=name.lower(),
+    )
+
+
+@pytest.fixture
+def snapshot() -> MarketSnapshot:
+    """Snapshot built from mocked all-ticker responses of both exchanges."""
+    with (
+        patch("shared_code.binance.BinanceClient") as binance_client,
+        patch("shared_code.kucoin.KucoinClient") as kucoin_client,
+    ):
+        binance_client.return_value.get_ticker.return_value = [
+            {
+                "symbol": "BTCUSDT",
+                "lowPrice": "90000",
+                "highPrice": "95000",
+                "lastPrice": "94000",
+                "volume": "10",
+                "quoteVolume": "940000",
+            },
+        ]
+        kucoin_client.return_value.get_tickers.return_value = {
+            "time": 1,
+            "ticker": [
+                {
+                    "symbol": "BTC-USDT",
+                    "low": "90100",
+                    "high": "95100",
+                    "last": "94100",
+                    "vol": "2",
+                    "volValue": "188200",
+                },
+                # Inactive pairs come back with null prices and are skipped
+                {"symbol": "OLD-USDT", "low": None, "high": None, "last": None},
+            ],
+        }
+        yield MarketSnapshot.fetch()
+
+
+def test_snapshot_indexes_both_exchanges(snapshot):
+    """Tickers are looked up by exchange name and relabelled with the symbol name."""
+    btc_binance = _symbol("BTC", SourceID.BINANCE)
+    btc_kucoin = _symbol("BTC", SourceID.KUCOIN)
+
+    assert snapshot.price_for(btc_binance).last == 94000
+    assert snapshot.price_for(btc_kucoin).last == 94100
+    assert snapshot.price_for(btc_kucoin).symbol == "BTC"
+    assert snapshot.quote_volume(btc_binance) == (940000, 188200)
+    assert "OLD-USDT" not in snapshot.kucoin
+
+
+def test_snapshot_missing_symbol_and_coingecko(snapshot):
+    """Unlisted and CoinGecko symbols are not served from the snapshot."""
+    assert snapshot.price_for(_symbol("NOPE", SourceID.BINANCE)) is None
+    assert snapshot.price_for(_symbol("GST", SourceID.COINGECKO)) is None
+    assert snapshot.quote_volume(_symbol("NOPE", SourceID.BINANCE)) == (0.0, 0.0)
+
+
+def test_fetch_current_price_uses_snapshot_without_api_call(snapshot, monkeypatch):
+    """A covered symbol never triggers a per-symbol ticker request."""
+    monkeypatch.setattr(price_checker, "_price_cache", TTLCache(max_age=60, max_size=8))
+    with patch("shared_code.price_checker.fetch_binance_price") as per_symbol:
+        ticker = price_checker.fetch_current_price(
+            _symbol("BTC", SourceID.BINANCE),
+            snapshot=snapshot,
+        )
+
+    per_symbol.assert_not_called()
+    assert ticker.last == 94000
+
+
+def test_binance_timeout_leaves_kucoin_snapshot_usable():
+    """A failed Binance download does not abort the snapshot (or the report)."""
+    with (
+        patch("shared_code.binance.BinanceClient") as binance_client,
+        patch("shared_code.kucoin.KucoinClient") as kucoin_client,
+    ):
+        binance_client.return_value.get_ticker.side_effect = requests.Timeout("read timed out")
+        kucoin_client.return_value.get_tickers.return_value = {
+            "time": 1,
+            "ticker": [
+                {
+                    "symbol": "BTC-USDT",
+                    "low": "90100",
+                    "high": "95100",
+                    "last": "94100",
+                    "vol": "2",
+                    "volValue": "188200",
+                },
+            ],
+        }
+        snapshot = MarketSnapshot.fetch()
+
+    assert snapshot.binance == {}
+    assert snapshot.price_for(_symbol("BTC", SourceID.BINANCE)) is None
+    assert snapshot.price_for(_symbol("BTC", SourceID.KUCOIN)).last == 94100
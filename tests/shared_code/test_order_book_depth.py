@@ -0,0 +1,139 @@
+"""Tests for the cumulative-sum order book depth queries."""
+
+import threading
+import time
+from typing import ClassVar
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from binance.exceptions import BinanceAPIException
+
+from shared_code.binance import _calculate_order_book_metrics, fetch_binance_order_books
+from shared_code.order_book_depth import DEPTH_BANDS_PCT, OrderBookDepth
+from source_repository import SourceID, Symbol
+
+
+def _book(levels: int = 2000, seed: int = 7) -> tuple[list, list]:
+    """Binance-style string levels around a price of 100."""
+    rng = np.random.default_rng(seed)
+    bid_prices = 99.99 - np.cumsum(rng.uniform(0.001, 0.02, levels))
+    ask_prices = 100.01 + np.cumsum(rng.uniform(0.001, 0.02, levels))
+    bid_qty, ask_qty = rng.lognormal(0, 1, (2, levels))
+    bids = [[f"{p:.4f}", f"{q:.3f}"] for p, q in zip(bid_prices, bid_qty, strict=True)]
+    asks = [[f"{p:.4f}", f"{q:.3f}"] for p, q in zip(ask_prices, ask_qty, strict=True)]
+    return bids, asks
+
+
+def _reference_depth(orders: list, mid: float, pct: float, *, is_bid: bool) -> float:
+    """Level-by-level depth, as the metrics were computed before."""
+    total = 0.0
+    for price_str, qty_str in orders:
+        price, qty = float(price_str), float(qty_str)
+        inside = price >= mid * (1 - pct / 100) if is_bid else price <= mid * (1 + pct / 100)
+        if inside:
+            total += price * qty
+    return total
+
+
+def _reference_wall(orders: list, mid: float, pct: float, *, is_bid: bool) -> tuple:
+    largest_value, largest_price = 0.0, 0.0
+    for price_str, qty_str in orders:
+        price, qty = float(price_str), float(qty_str)
+        inside = price >= mid * (1 - pct / 100) if is_bid else price <= mid * (1 + pct / 100)
+        if inside and price * qty > largest_value:
+            largest_value, largest_price = price * qty, price
+    return largest_value, largest_price
+
+
+def test_depth_bands_and_walls_match_level_by_level_scan():
+    """Every band and wall equals the per-level loop over the same book."""
+    bids, asks = _book()
+    book = OrderBookDepth.from_levels(bids, asks)
+    mid = book.mid_price
+
+    for pct in DEPTH_BANDS_PCT:
+        bid, ask = book.depth(pct)
+        assert bid == pytest.approx(_reference_depth(bids, mid, pct, is_bid=True))
+        assert ask == pytest.approx(_reference_depth(asks, mid, pct, is_bid=False))
+        bid_wall, ask_wall = book.largest_walls(pct)
+        assert bid_wall == pytest.approx(_reference_wall(bids, mid, pct, is_bid=True))
+        assert ask_wall == pytest.approx(_reference_wall(asks, mid, pct, is_bid=False))
+
+    metrics = _calculate_order_book_metrics("TEST", bids, asks)
+    assert metrics is not None
+    assert list(metrics.depth_levels) == ["0.5%", "1.0%", "2.0%", "5.0%", "10.0%"]
+    assert metrics.bid_volume_2pct == pytest.approx(_reference_depth(bids, mid, 2.0, is_bid=True))
+    assert metrics.best_bid_qty == float(bids[0][1])
+
+
+def test_slippage_walks_the_book_and_reports_thin_books():
+    """Slippage averages the fill over consumed levels; None when depth runs out."""
+    book = OrderBookDepth.from_levels(
+        bids=[["99", "1"], ["98", "1"]],
+        asks=[["101", "1"], ["102", "1"], ["104", "2"]],
+    )
+
+    assert book.slippage_pct(50) == 0.0
+    # 101 + 102 fully, then 1 unit at 104: 307 USD for 3 units
+    assert book.slippage_pct(307) == pytest.approx((307 / 3 - 101) / 101 * 100)
+    assert book.slippage_pct(99 + 98, buy=False) == pytest.approx((99 - 98.5) / 99 * 100)
+    assert book.slippage_pct(10_000) is None
+    assert book.imbalance(1.0) == pytest.approx((99 - 101) / (99 + 101))
+
+
+class _FakeClient:
+    """Binance client stand-in that records concurrency and fails futures for DOGE."""
+
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    pings: ClassVar[list[bool]] = []
+
+    def __init__(self, *, ping: bool = True) -> None:
+        self.session = object()
+        self.pings.append(ping)
+
+    def _depth(self, symbol: str) -> dict:
+        with self.lock:
+            type(self).in_flight += 1
+            type(self).max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            type(self).in_flight -= 1
+        price = float(len(symbol))
+        return {"bids": [[str(price - 0.1), "1"]], "asks": [[str(price + 0.1), "1"]]}
+
+    def get_order_book(self, symbol: str, limit: int) -> dict:  # noqa: ARG002
+        return self._depth(symbol)
+
+    def futures_order_book(self, symbol: str, limit: int) -> dict:  # noqa: ARG002
+        if symbol == "DOGEUSDT":
+            raise BinanceAPIException(None, 400, '{"code": -1121, "msg": "Invalid symbol."}')
+        return self._depth(symbol)
+
+
+def test_order_books_are_fetched_concurrently_and_returned_in_symbol_order():
+    """Spot and futures books come back per symbol in input order, fetched in parallel."""
+    names = ["BTC", "DOGE", "ETH", "SOL", "XRP", "LINK"]
+    symbols = [
+        Symbol(
+            symbol_id=i,
+            symbol_name=name,
+            full_name=name,
+            source_id=SourceID.BINANCE,
+            coingecko_name=name.lower(),
+        )
+        for i, name in enumerate(names, 1)
+    ]
+
+    with patch("shared_code.binance.BinanceClient", _FakeClient):
+        pairs = fetch_binance_order_books(symbols, max_workers=4)
+
+    assert [pair.symbol.symbol_name for pair in pairs] == names
+    assert all(pair.spot is not None for pair in pairs)
+    assert [pair.futures is None for pair in pairs] == [name == "DOGE" for name in names]
+    assert pairs[0].spot.best_bid == pytest.approx(len("BTCUSDT") - 0.1)
+    assert _FakeClient.max_in_flight > 1
+    # No client pings the API on creation
+    assert not any(_FakeClient.pings)
@@ -0,0 +1,141 @@
+"""Tests for the shared exchange rate limiter."""
+
+import threading
+
+import pytest
+from requests import Response, Session
+
+from shared_code import rate_limiter as rl
+from shared_code.http_session import pooled_client
+
+
+class _FakeClock:
+    """Manually advanced clock whose sleep just moves time forward."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _limiter(
+    clock: _FakeClock,
+    capacity: int = 100,
+    window: float = 10.0,
+) -> rl.ExchangeRateLimiter:
+    return rl.ExchangeRateLimiter("test", capacity, window, clock=clock.time, sleep=clock.sleep)
+
+
+def _response(status: int = 200, **headers: str) -> Response:
+    response = Response()
+    response.status_code = status
+    response.headers.update(headers)
+    return response
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiters():
+    rl.reset_rate_limiters()
+    yield
+    rl.reset_rate_limiters()
+
+
+def test_acquire_only_sleeps_when_budget_exhausted():
+    """Requests within the budget go straight through; the overflow waits for refill."""
+    clock = _FakeClock()
+    limiter = _limiter(clock)
+
+    for _ in range(5):
+        assert limiter.acquire(20) == 0.0
+    assert clock.sleeps == []
+
+    # Bucket is empty, 20 weight refills at 10/s -> 2 seconds
+    assert limiter.acquire(20) == pytest.approx(2.0)
+
+
+def test_binance_used_weight_header_resynchronises_bucket():
+    """Weight the exchange reports as used reduces the local budget."""
+    clock = _FakeClock()
+    limiter = _limiter(clock)
+
+    limiter.update_from_response(_response(**{"X-MBX-USED-WEIGHT-1m": "95"}))
+
+    assert limiter.available == pytest.approx(5.0)
+    assert limiter.acquire(10) == pytest.approx(0.5)
+
+
+def test_kucoin_headers_and_retry_after():
+    """KuCoin remaining quota and 429 Retry-After are both honoured."""
+    clock = _FakeClock()
+    limiter = _limiter(clock)
+
+    limiter.update_from_response(
+        _response(**{"gw-ratelimit-limit": "100", "gw-ratelimit-remaining": "60"}),
+    )
+    # 100 * 0.9 safety margin - 40 used
+    assert limiter.available == pytest.approx(50.0)
+
+    limiter.update_from_response(_response(429, **{"Retry-After": "7"}))
+    assert limiter.acquire(1) == pytest.approx(7.0)
+
+
+def test_concurrent_callers_share_one_budget():
+    """Reservations from parallel threads never exceed the bucket."""
+    clock = _FakeClock()
+    limiter = _limiter(clock, capacity=50)
+    waits: list[float] = []
+    lock = threading.Lock()
+
+    def worker():
+        wait = limiter.acquire(10)
+        with lock:
+            waits.append(wait)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(1 for wait in waits if wait == 0.0) == 5
+
+
+@pytest.mark.parametrize(
+    "url,limiter_name,weight",
+    (
+        ("https://api.binance.com/api/v3/klines?symbol=BTCUSDT&limit=24", rl.BINANCE_SPOT, 2),
+        ("https://api.binance.com/api/v3/depth?symbol=BTCUSDT&limit=1000", rl.BINANCE_SPOT, 50),
+        ("https://api.binance.com/api/v3/ticker/24hr", rl.BINANCE_SPOT, 80),
+        ("https://fapi.binance.com/fapi/v1/aggTrades?symbol=BTCUSDT", rl.BINANCE_FUTURES, 20),
+        ("https://fapi.binance.com/fapi/v1/premiumIndex", rl.BINANCE_FUTURES, 10),
+        ("https://fapi.binance.com/fapi/v1/ticker/price", rl.BINANCE_FUTURES, 2),
+        ("https://api.kucoin.com/api/v1/market/candles?symbol=AKT-USDT", rl.KUCOIN, 3),
+    ),
+)
+def test_request_routing_and_weight_estimates(url, limiter_name, weight):
+    """Exchange hosts map to their limiter and endpoints to their documented weight."""
+    host = url.split("/")[2]
+    assert rl.limiter_name_for_host(host) == limiter_name
+    assert rl.estimate_request_weight(limiter_name, url) == weight
+
+
+def test_pooled_clients_are_rate_limited_once():
+    """Pooled clients send through a rate limited adapter, mounted only once."""
+
+    class _Client:
+        def __init__(self) -> None:
+            self.session = Session()
+
+    client = pooled_client(_Client())
+    adapter = client.session.get_adapter("https://api.binance.com")
+    pooled_client(client)
+
+    assert isinstance(adapter, rl.RateLimitedAdapter)
+    assert client.session.get_adapter("https://api.binance.com") is adapter
+    assert rl.limiter_name_for_host("api.telegram.org") is None
@@ -0,0 +1,87 @@
+"""Tests for the TTL + LRU cache."""
+
+import threading
+import time
+
+import pytest
+
+from shared_code.ttl_cache import TTLCache
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_max_age():
+    """A value older than max_age is reloaded and counted as expired."""
+    clock = _FakeClock()
+    cache: TTLCache[str, int] = TTLCache(max_age=10, max_size=4, clock=clock)
+    cache.set("btc", 1)
+
+    clock.now = 10
+    assert cache.get("btc") == 1
+    clock.now = 10.5
+    assert cache.get("btc") is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.expirations, stats.size) == (1, 1, 1, 0)
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Reading an entry protects it from eviction."""
+    cache: TTLCache[str, int] = TTLCache(max_age=60, max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats().evictions == 1
+
+
+def test_concurrent_misses_share_one_load():
+    """Single-flight: parallel callers for one key trigger a single loader call."""
+    cache: TTLCache[str, int] = TTLCache(max_age=60, max_size=4)
+    calls = 0
+    barrier = threading.Barrier(5)
+    results: list[int] = []
+
+    def loader() -> int:
+        nonlocal calls
+        calls += 1
+        time.sleep(0.05)
+        return 42
+
+    def worker() -> None:
+        barrier.wait()
+        results.append(cache.get_or_load("btc", loader))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == 1
+    assert results == [42] * 5
+    stats = cache.stats()
+    assert stats.misses == 1
+    assert stats.coalesced == 4
+
+
+def test_failed_load_is_not_cached():
+    """Loader errors propagate and the next call retries."""
+    cache: TTLCache[str, int] = TTLCache(max_age=60, max_size=4)
+
+    def failing() -> int:
+        msg = "exchange down"
+        raise ValueError(msg)
+
+    with pytest.raises(ValueError, match="exchange down"):
+        cache.get_or_load("btc", failing)
+    assert cache.get_or_load("btc", lambda: 7) == 7
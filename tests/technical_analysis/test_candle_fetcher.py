@@ -0,0 +1,99 @@
+"""Tests for range-based gap filling in CandleFetcher."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from shared_code.common_price import Candle
+from source_repository import SourceID, Symbol
+from technical_analysis.candle_fetcher import MAX_CANDLES_PER_BATCH, CandleFetcher
+from technical_analysis.repositories.hourly_candle_repository import HourlyCandleRepository
+
+
+SYMBOL = Symbol(
+    symbol_id=1,
+    symbol_name="BTC",
+    full_name="Bitcoin",
+    source_id=SourceID.BINANCE,
+    coingecko_name="bitcoin",
+)
+
+
+def _candle(end: datetime) -> Candle:
+    return Candle(
+        symbol="BTC",
+        source=SourceID.BINANCE.value,
+        end_date=end.isoformat(),
+        open=1.0,
+        close=1.0,
+        high=1.0,
+        low=1.0,
+        last=1.0,
+        volume=1.0,
+        volume_quote=1.0,
+    )
+
+
+class _RecordingBatch:
+    """Batch fetch stand-in that labels klines by close time like Binance."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[datetime, datetime]] = []
+
+    def __call__(self, symbol, start, end, timeframe):  # noqa: ARG002
+        self.calls.append((start, end))
+        candles = []
+        current = start + timedelta(hours=1)
+        while current <= end + timedelta(hours=1):
+            candles.append(_candle(current))
+            current += timedelta(hours=1)
+        return candles
+
+
+def _fetcher(batch: _RecordingBatch) -> CandleFetcher:
+    def single(*_args):
+        pytest.fail("per-candle fetch should not be used for batch sources")
+
+    return CandleFetcher("hourly", single, HourlyCandleRepository, batch_fetch_function=batch)
+
+
+def test_missing_ranges_cover_beginning_middle_and_end():
+    """Gaps are coalesced into contiguous inclusive ranges."""
+    fetcher = _fetcher(_RecordingBatch())
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    existing = [_candle(base + timedelta(hours=h)) for h in (2, 3, 6)]
+
+    ranges = fetcher._find_missing_ranges(existing, base, base + timedelta(hours=8, minutes=30))
+
+    hour = timedelta(hours=1)
+    assert ranges == [
+        (base, base + 1 * hour),
+        (base + 4 * hour, base + 5 * hour),
+        (base + 7 * hour, base + 8 * hour),
+    ]
+
+
+def test_empty_database_backfill_uses_one_batch_per_page(sqlite_conn):
+    """A 30-day hourly backfill is one batch call and one bulk insert, not 720 calls."""
+    batch = _RecordingBatch()
+    fetcher = _fetcher(batch)
+
+    fetcher.check_if_all_candles(SYMBOL, sqlite_conn, days_back=30)
+
+    assert len(batch.calls) == 1
+    stored = HourlyCandleRepository(sqlite_conn).get_all_candles(SYMBOL)
+    assert len(stored) == 30 * 24
+
+
+def test_long_ranges_are_paginated_without_overlap(sqlite_conn):
+    """Ranges above the exchange limit are split into consecutive pages."""
+    batch = _RecordingBatch()
+    fetcher = _fetcher(batch)
+    start = datetime(2025, 1, 1, 1, tzinfo=UTC)
+    end = start + timedelta(hours=MAX_CANDLES_PER_BATCH + 10)
+
+    saved = fetcher._fill_gaps_in_range(SYMBOL, start, end, sqlite_conn)
+
+    assert len(batch.calls) == 2
+    assert saved == MAX_CANDLES_PER_BATCH + 11
+    assert len(HourlyCandleRepository(sqlite_conn).get_all_candles(SYMBOL)) == saved
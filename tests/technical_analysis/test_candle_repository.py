@@ -0,0 +1,221 @@
+"""Tests for the bulk candle upsert in CandleRepository."""
+
+import sqlite3
+from datetime import UTC, datetime, timedelta
+
+from infra.sql_connection import connect_to_sql_sqlite
+from shared_code.common_price import Candle
+from shared_code.epoch import to_epoch
+from source_repository import SourceID, Symbol
+from technical_analysis.repositories.candle_repository import STAGING_TABLE
+from technical_analysis.repositories.daily_candle_repository import DailyCandleRepository
+from technical_analysis.repositories.hourly_candle_repository import HourlyCandleRepository
+
+
+SYMBOL = Symbol(
+    symbol_id=1,
+    symbol_name="BTC",
+    full_name="Bitcoin",
+    source_id=SourceID.BINANCE,
+    coingecko_name="bitcoin",
+)
+START = datetime(2025, 1, 1, 1, 0, tzinfo=UTC)
+
+
+def _candle(end: datetime, close: float = 1.0) -> Candle:
+    return Candle(
+        symbol="BTC",
+        source=SourceID.BINANCE.value,
+        end_date=end.isoformat(),
+        open=close,
+        close=close,
+        high=close,
+        low=close,
+        last=close,
+        volume=1.0,
+        volume_quote=1.0,
+    )
+
+
+def test_save_candles_returns_database_ids(sqlite_conn):
+    """Saved candles carry the same IDs a later read returns."""
+    repo = HourlyCandleRepository(sqlite_conn)
+    candles = [_candle(START + timedelta(hours=i)) for i in range(3)]
+
+    saved = repo.save_candles(SYMBOL, candles, source=SourceID.BINANCE.value)
+
+    stored = repo.get_candles(SYMBOL, START, START + timedelta(hours=2))
+    assert [c.id for c in saved] == [c.id for c in stored]
+    assert all(c.id is not None for c in saved)
+
+
+def test_save_candles_keeps_daily_ids_on_update(sqlite_conn):
+    """Re-saving a daily candle updates it in place instead of assigning a new ID."""
+    repo = DailyCandleRepository(sqlite_conn)
+    end = datetime(2025, 1, 1, 23, 59, 59, 999999, tzinfo=UTC)
+    [first] = repo.save_candles(SYMBOL, [_candle(end)], source=SourceID.BINANCE.value)
+
+    [second] = repo.save_candles(SYMBOL, [_candle(end, close=2.0)], source=SourceID.BINANCE.value)
+
+    assert second.id == first.id
+    assert repo.get_candle(SYMBOL, end).close == 2.0  # type: ignore[union-attr]
+
+
+def test_save_candles_empty_list_does_nothing(sqlite_conn):
+    """An empty batch neither touches the database nor fails."""
+    assert HourlyCandleRepository(sqlite_conn).save_candles(SYMBOL, [], source=1) == []
+
+
+class _FakeCursor:
+    """Records statements and answers the ID lookup like SQL Server would."""
+
+    def __init__(self) -> None:
+        self.fast_executemany = False
+        self.statements: list[str] = []
+        self.staged: list[tuple] = []
+
+    def execute(self, sql, params=None):  # noqa: ARG002
+        self.statements.append(sql)
+        return self
+
+    def executemany(self, sql, rows):
+        assert self.fast_executemany
+        self.statements.append(sql)
+        self.staged = list(rows)
+
+    def fetchall(self):
+        # Return IDs out of order to check they are mapped back by RowNum
+        return [(row[-1], 100 + row[-1]) for row in reversed(self.staged)]
+
+
+class _FakeConnection:
+    def __init__(self) -> None:
+        self.cursor_obj = _FakeCursor()
+        self.commits = 0
+
+    def cursor(self):
+        return self.cursor_obj
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        raise AssertionError
+
+
+def test_save_candles_merges_from_staging_table_on_sql_server(monkeypatch):
+    """SQL Server gets one bulk insert, one MERGE and one commit for the whole batch."""
+    monkeypatch.setenv("DATABASE_TYPE", "azuresql")
+    fake = _FakeConnection()
+    repo = DailyCandleRepository(fake)  # type: ignore[arg-type]
+    candles = [_candle(START + timedelta(days=i)) for i in range(3)]
+
+    saved = repo.save_candles(SYMBOL, candles, source=SourceID.BINANCE.value)
+
+    statements = fake.cursor_obj.statements
+    assert sum("MERGE" in sql for sql in statements) == 1
+    assert all(STAGING_TABLE in sql for sql in statements)
+    assert fake.cursor_obj.staged[0][2] == "2025-01-01"  # Date column
+    assert fake.commits == 1
+    assert [c.id for c in saved] == [100, 101, 102]
+
+
+def test_get_candle_series_loads_many_symbols_in_one_query(sqlite_conn):
+    """One windowed read returns dense per-symbol columns, including empty symbols."""
+    other = Symbol(
+        symbol_id=2,
+        symbol_name="ETH",
+        full_name="Ethereum",
+        source_id=SourceID.BINANCE,
+        coingecko_name="ethereum",
+    )
+    missing = Symbol(
+        symbol_id=3,
+        symbol_name="SOL",
+        full_name="Solana",
+        source_id=SourceID.BINANCE,
+        coingecko_name="solana",
+    )
+    repo = HourlyCandleRepository(sqlite_conn)
+    repo.save_candles(SYMBOL, [_candle(START + timedelta(hours=i), i) for i in range(4)], 1)
+    repo.save_candles(other, [_candle(START + timedelta(hours=i), 10 + i) for i in range(2)], 1)
+
+    window_start, window_end = START + timedelta(hours=1), START + timedelta(hours=3)
+
+    series = repo.get_candle_series([SYMBOL, other, missing], window_start, window_end)
+
+    assert series[1].close.tolist() == [1.0, 2.0, 3.0]
+    assert series[2].close.tolist() == [11.0]
+    assert len(series[3]) == 0
+    assert series[1].ids.tolist() == [
+        c.id for c in repo.get_candles(SYMBOL, window_start, window_end)
+    ]
+
+
+def test_sqlite_ranges_compare_instants_not_iso_text(sqlite_conn, monkeypatch):
+    """Stored "Z", offset and naive EndDates all match an aware or naive window by instant."""
+    monkeypatch.setenv("DATABASE_TYPE", "sqlite")
+    sqlite_conn._conn.executemany(
+        "INSERT INTO HourlyCandles (SymbolID, SourceID, OpenTime, EndDate, Open, High, Low, "
+        "Close, Last, Volume, VolumeQuote) VALUES (1, 1, '', ?, ?, 1, 1, 1, 1, 1, 1)",
+        [
+            ("2025-01-01T01:00:00Z", 1.0),
+            ("2025-01-01T02:00:00+00:00", 2.0),
+            ("2025-01-01 03:00:00", 3.0),
+            ("2025-01-01T05:30:00+02:00", 3.5),
+            ("2025-01-01T04:00:00.5+00:00", 4.0),
+            ("2025-01-01T05:00:00+00:00", 5.0),
+        ],
+    )
+    repo = HourlyCandleRepository(sqlite_conn)
+    aware_end = datetime(2025, 1, 1, 4, 0, 0, 999999, tzinfo=UTC)
+
+    candles = repo.get_candles(SYMBOL, START, aware_end)
+    naive = repo.get_candles(SYMBOL, START.replace(tzinfo=None), aware_end.replace(tzinfo=None))
+
+    assert [c.open for c in candles] == [1.0, 2.0, 3.0, 3.5, 4.0]
+    assert [c.open for c in naive] == [1.0, 2.0, 3.0, 3.5, 4.0]
+    assert repo.get_candle_series([SYMBOL], START, aware_end)[1].open.tolist() == [
+        1.0,
+        2.0,
+        3.0,
+        3.5,
+        4.0,
+    ]
+
+
+def test_epoch_column_truncates_fractional_seconds(sqlite_conn):
+    """Ts floors like to_epoch, so an end-of-day candle stays on its own day."""
+    end = datetime(2025, 1, 1, 23, 59, 59, 999999, tzinfo=UTC)
+    DailyCandleRepository(sqlite_conn).save_candles(SYMBOL, [_candle(end)], 1)
+
+    [ts] = sqlite_conn._conn.execute("SELECT Ts FROM DailyCandles").fetchone()
+    plan = sqlite_conn._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT Id FROM DailyCandles WHERE SymbolID = 1 AND Ts >= 0",
+    ).fetchall()
+
+    assert ts == to_epoch(end) == to_epoch(end.date()) + 86399
+    assert "idx_dailycandles_symbol_ts" in plan[0][3]
+
+
+def test_connect_adds_epoch_columns_to_old_databases(tmp_path):
+    """Databases created before the Ts columns get them on first connect."""
+    path = tmp_path / "old.db"
+    old = sqlite3.connect(path)
+    old.executescript(
+        """
+        CREATE TABLE HourlyCandles (Id INTEGER PRIMARY KEY, SymbolID INTEGER, EndDate TEXT);
+        INSERT INTO HourlyCandles (SymbolID, EndDate) VALUES (1, '2025-01-01T01:00:00Z');
+        """,
+    )
+    old.close()
+
+    conn = connect_to_sql_sqlite(str(path))
+    try:
+        [ts] = conn._conn.execute("SELECT Ts FROM HourlyCandles").fetchone()
+        indexes = {row[1] for row in conn._conn.execute("PRAGMA index_list('HourlyCandles')")}
+    finally:
+        conn.close()
+
+    assert ts == to_epoch(START)
+    assert "idx_hourlycandles_symbol_ts" in indexes
@@ -0,0 +1,118 @@
+"""Tests for the column-wise query reads."""
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from infra.sql_connection import SQLiteConnectionWrapper
+from technical_analysis.repositories.columnar import (
+    NAT_EPOCH,
+    epoch_to_datetime64,
+    fetch_columns,
+)
+from technical_analysis.repositories.rsi_repository import (
+    get_candles_with_rsi,
+    get_candles_with_rsi_frame,
+)
+
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _seed_daily_candles(conn: SQLiteConnectionWrapper, days: int) -> None:
+    raw = conn._conn
+    for day in range(days):
+        end_date = (START + timedelta(days=day)).date().isoformat()
+        cursor = raw.execute(
+            "INSERT INTO DailyCandles (SymbolID, SourceID, Date, EndDate, Open, High, Low, "
+            "Close, Last, Volume, VolumeQuote) VALUES (1, 1, ?, ?, ?, ?, ?, ?, ?, 1, 1) "
+            "RETURNING Id",
+            (end_date, end_date, *(100.0 + day,) * 5),
+        )
+        candle_id = cursor.fetchone()[0]
+        if day % 3:
+            raw.execute("INSERT INTO RSI (DailyCandleID, RSI) VALUES (?, ?)", (candle_id, day))
+    raw.commit()
+
+
+def test_fetch_columns_types_columns_and_grows_across_batches(sqlite_conn):
+    """Ints, floats, dates and text land in typed arrays, whatever the batch size."""
+    sqlite_conn._conn.executescript(
+        """
+        CREATE TABLE Samples (Id INTEGER, Price REAL, Ts TEXT, Label TEXT, Extra INTEGER);
+        INSERT INTO Samples VALUES
+            (1, 1.5, '2025-01-01T00:00:00+00:00', 'a', 7),
+            (2, NULL, '2025-01-01 01:00:00', 'b', 8),
+            (3, 3.5, NULL, 'c', NULL),
+            (4, 4.5, '2025-01-02', 'd', 9),
+            (5, 5.5, '2025-01-02T01:00:00Z', 'e', 10);
+        """,
+    )
+
+    columns = fetch_columns(sqlite_conn, "SELECT * FROM Samples ORDER BY Id", batch_size=2)
+
+    assert list(columns) == ["Id", "Price", "Ts", "Label", "Extra"]
+    assert columns["Id"].dtype == np.int64
+    assert columns["Id"].tolist() == [1, 2, 3, 4, 5]
+    np.testing.assert_array_equal(columns["Price"], [1.5, np.nan, 3.5, 4.5, 5.5])
+    hour = 3600
+    first = int(START.timestamp())
+    assert columns["Ts"].tolist() == [
+        first,
+        first + hour,
+        NAT_EPOCH,
+        first + 24 * hour,
+        first + 25 * hour,
+    ]
+    assert np.isnat(epoch_to_datetime64(columns["Ts"])[2])
+    assert columns["Label"].tolist() == ["a", "b", "c", "d", "e"]
+    # A NULL after the first batch turns an integer column into floats
+    np.testing.assert_array_equal(columns["Extra"], [7, 8, np.nan, 9, 10])
+
+
+def test_fetch_columns_widens_columns_that_change_type_after_the_first_batch(sqlite_conn):
+    """All-NULL or integer first batches don't fix the type of later values."""
+    sqlite_conn._conn.executescript(
+        """
+        CREATE TABLE Samples (Id INTEGER, Price NUMERIC, Note TEXT, Ts TEXT, Mixed);
+        INSERT INTO Samples VALUES
+            (1, 1, NULL, NULL, 1),
+            (2, 2, NULL, NULL, 2.5),
+            (3, 2.5, 'late', '2025-01-01', '2025-01-01'),
+            (4, NULL, NULL, '2025-01-02', 'n/a');
+        """,
+    )
+
+    columns = fetch_columns(sqlite_conn, "SELECT * FROM Samples ORDER BY Id", batch_size=2)
+
+    np.testing.assert_array_equal(columns["Price"], [1.0, 2.0, 2.5, np.nan])
+    assert columns["Note"].tolist() == [None, None, "late", None]
+    first = int(START.timestamp())
+    assert columns["Ts"].tolist() == [NAT_EPOCH, NAT_EPOCH, first, first + 24 * 3600]
+    assert columns["Mixed"].tolist() == [1.0, 2.5, "2025-01-01", "n/a"]
+
+
+def test_fetch_columns_returns_empty_columns_for_no_rows(sqlite_conn):
+    """An empty result still has every selected column."""
+    columns = fetch_columns(sqlite_conn, "SELECT Id, EndDate FROM DailyCandles WHERE Id < 0")
+
+    assert {name: len(values) for name, values in columns.items()} == {"Id": 0, "EndDate": 0}
+
+
+def test_candles_with_rsi_frame_matches_row_dicts(sqlite_conn):
+    """The frame holds the same candles as the dict rows, oldest first by date."""
+    _seed_daily_candles(sqlite_conn, days=10)
+    from_date = (START + timedelta(days=2)).date()
+
+    frame = get_candles_with_rsi_frame(sqlite_conn, 1, from_date)
+    rows = get_candles_with_rsi(sqlite_conn, 1, from_date)
+
+    expected = pd.DataFrame(rows).set_index("date").sort_index()
+    assert frame.index.dtype == "datetime64[s]"
+    assert list(frame.index) == [pd.Timestamp(value) for value in expected.index]
+    assert list(frame.columns) == list(expected.columns)
+    assert frame["Id"].tolist() == expected["Id"].tolist()
+    np.testing.assert_array_equal(frame["RSI"], expected["RSI"].astype(float))
+    np.testing.assert_array_equal(frame["Close"], expected["Close"])
+    assert get_candles_with_rsi_frame(sqlite_conn, 2, from_date).empty
@@ -0,0 +1,126 @@
+"""Tests for the CVD hourly snapshot queries in CVDRepository."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from infra.sql_connection import SQLiteConnectionWrapper
+from shared_code.binance import CVDHourlySnapshot
+from technical_analysis.repositories.cvd_repository import CVDRepository
+
+
+CURRENT_HOUR = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+
+
+def _snapshot(symbol_id: int, hours_ago: int, cvd: float) -> CVDHourlySnapshot:
+    return CVDHourlySnapshot(
+        symbol_id=symbol_id,
+        hour_timestamp=CURRENT_HOUR - timedelta(hours=hours_ago),
+        cvd=cvd,
+        buy_volume=max(cvd, 0.0) + 10,
+        sell_volume=max(-cvd, 0.0) + 10,
+        trade_count=5,
+        large_buy_count=1,
+        large_sell_count=0,
+        avg_trade_size=4.0,
+        last_trade_id=1000 * symbol_id + 100 - hours_ago,
+    )
+
+
+@pytest.fixture
+def repo(sqlite_conn: SQLiteConnectionWrapper) -> CVDRepository:
+    """CVD repository over the shared fresh SQLite database."""
+    return CVDRepository(sqlite_conn)
+
+
+def test_aggregate_cvd_windows_returns_all_windows_for_all_symbols(repo):
+    """One query yields the 1h/4h/24h aggregates of every symbol with snapshots."""
+    repo.save_hourly_snapshots([_snapshot(1, hours_ago, 1.0) for hours_ago in range(30)])
+    repo.save_hourly_snapshots([_snapshot(2, hours_ago, -2.0) for hours_ago in (10, 40)])
+
+    aggregates = repo.aggregate_cvd_windows([1, 2, 3], (1, 4, 24))
+
+    assert set(aggregates) == {1, 2}
+    assert {hours: data["cvd"] for hours, data in aggregates[1].items()} == {
+        1: 1.0,
+        4: 4.0,
+        24: 24.0,
+    }
+    assert aggregates[1][24]["trade_count"] == 24 * 5
+    assert aggregates[1][24]["hour_count"] == 24
+    assert aggregates[1][4]["avg_trade_size"] == 4.0
+    # Symbol 2 only has a snapshot inside the 24h window
+    assert set(aggregates[2]) == {24}
+    assert aggregates[2][24]["sell_volume"] == 12.0
+    assert repo.aggregate_cvd_for_hours(2, 24) == aggregates[2][24]
+    assert repo.aggregate_cvd_for_hours(2, 1) is None
+
+
+def test_aggregate_cvd_windows_merges_pending_current_hour(repo):
+    """Snapshots not yet stored are added to the windows that cover their hour."""
+    repo.save_hourly_snapshots([_snapshot(1, hours_ago, 1.0) for hours_ago in range(1, 30)])
+    pending = [_snapshot(1, 0, 3.0), _snapshot(2, 0, -2.0), _snapshot(3, 0, 5.0)]
+
+    aggregates = repo.aggregate_cvd_windows([1, 2], (1, 4, 24), pending=pending)
+
+    assert set(aggregates) == {1, 2}
+    assert {hours: data["cvd"] for hours, data in aggregates[1].items()} == {
+        1: 3.0,
+        4: 6.0,
+        24: 26.0,
+    }
+    assert aggregates[1][24]["hour_count"] == 24
+    assert aggregates[2][1]["sell_volume"] == 12.0
+    assert repo.conn.execute("SELECT COUNT(*) FROM CVDHourlySnapshots").fetchone()[0] == 29
+
+
+def test_save_hourly_snapshots_accumulates_only_newer_trades(repo):
+    """Re-saving an hour adds newer trades on top and ignores already stored ones."""
+    first = _snapshot(1, 0, 5.0)
+    newer = _snapshot(1, 0, -2.0)
+    newer.last_trade_id = first.last_trade_id + 10
+
+    assert repo.save_hourly_snapshots([first, _snapshot(2, 0, 1.0)]) == 2
+    repo.save_hourly_snapshots([newer])
+    repo.save_hourly_snapshots([first])  # replayed trades are not counted twice
+
+    row = repo.conn.execute(
+        "SELECT CVD, TradeCount, LastTradeId FROM CVDHourlySnapshots WHERE SymbolID = 1",
+    ).fetchall()
+    assert [tuple(r[i] for i in range(3)) for r in row] == [(3.0, 10, newer.last_trade_id)]
+
+
+def test_save_hourly_snapshots_merges_from_staging_table_on_sql_server(monkeypatch):
+    """SQL Server gets one bulk insert and one MERGE per symbol batch."""
+    monkeypatch.setenv("DATABASE_TYPE", "azuresql")
+    statements: list[str] = []
+    staged: list[list[tuple]] = []
+
+    class _Cursor:
+        fast_executemany = False
+
+        def execute(self, sql: str) -> None:
+            statements.append(sql)
+
+        def executemany(self, sql: str, rows: list[tuple]) -> None:
+            assert self.fast_executemany
+            statements.append(sql)
+            staged.append(rows)
+
+    class _Connection:
+        commits = 0
+
+        def cursor(self) -> _Cursor:
+            return _Cursor()
+
+        def commit(self) -> None:
+            self.commits += 1
+
+    conn = _Connection()
+    snapshots = [_snapshot(1, h, 1.0) for h in range(3)] + [_snapshot(2, 0, 1.0)]
+
+    assert CVDRepository(conn).save_hourly_snapshots(snapshots) == 4
+
+    assert sum("MERGE" in sql for sql in statements) == 2
+    assert [len(rows) for rows in staged] == [3, 1]
+    assert conn.commits == 2
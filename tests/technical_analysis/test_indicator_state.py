@@ -0,0 +1,250 @@
+"""Tests for the incremental indicator state store."""
+
+import sqlite3
+from datetime import UTC, date, datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from infra.sql_connection import connect_to_sql_sqlite
+from shared_code.candle_panel import CandlePanel
+from shared_code.candle_refresh import TIMEFRAME_DAILY, CandleRefreshRequest
+from shared_code.common_price import Candle
+from source_repository import SourceID, Symbol
+from technical_analysis.indicator_state import (
+    IndicatorState,
+    live_indicator_state,
+    refresh_indicator_state,
+    refresh_indicator_states,
+)
+from technical_analysis.macd_report import calculate_macd
+from technical_analysis.moving_averages_report import calculate_indicators
+from technical_analysis.reports.rsi_daily import create_rsi_table
+from technical_analysis.repositories.daily_candle_repository import DailyCandleRepository
+from technical_analysis.repositories.hourly_candle_repository import HourlyCandleRepository
+from technical_analysis.repositories.indicator_state_repository import get_indicator_state
+from technical_analysis.rsi import calculate_rsi_using_rma
+
+
+SYMBOL = Symbol(
+    symbol_id=1,
+    symbol_name="BTC",
+    full_name="Bitcoin",
+    source_id=SourceID.BINANCE,
+    coingecko_name="bitcoin",
+)
+START = datetime(2025, 1, 1, 1, 0, tzinfo=UTC)
+
+
+def _closes(length: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, length)))
+
+
+def _candles(closes: np.ndarray) -> list[Candle]:
+    return [
+        Candle(
+            symbol="BTC",
+            source=SourceID.BINANCE.value,
+            end_date=(START + timedelta(hours=i)).isoformat(),
+            open=float(close),
+            close=float(close),
+            high=float(close),
+            low=float(close),
+            last=float(close),
+            volume=1.0,
+            volume_quote=1.0,
+        )
+        for i, close in enumerate(closes)
+    ]
+
+
+def _daily_candles(closes: np.ndarray, last_day: date) -> list[Candle]:
+    """Binance daily candles labelled with their close time, the last on ``last_day``."""
+    first_day = last_day - timedelta(days=len(closes) - 1)
+    return [
+        Candle(
+            symbol="BTC",
+            source=SourceID.BINANCE.value,
+            end_date=datetime.combine(first_day + timedelta(days=i), time.max, UTC).isoformat(),
+            open=float(close),
+            close=float(close),
+            high=float(close),
+            low=float(close),
+            last=float(close),
+            volume=1.0,
+            volume_quote=1.0,
+        )
+        for i, close in enumerate(closes)
+    ]
+
+
+def test_state_matches_batch_indicator_calculations():
+    """RSI, EMAs and MACD equal the batch pandas calculations on the same closes."""
+    closes = _closes(400)
+    series = pd.Series(closes)
+
+    state = IndicatorState.from_candles(SYMBOL.symbol_id, "hourly", _candles(closes))
+
+    assert state is not None
+    assert state.candle_count == len(closes)
+    assert state.rsi == pytest.approx(calculate_rsi_using_rma(series).iloc[-1], rel=1e-10)
+    assert state.ema50 == pytest.approx(series.ewm(span=50, adjust=False).mean().iloc[-1])
+    assert state.ema200 == pytest.approx(series.ewm(span=200, adjust=False).mean().iloc[-1])
+    macd = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+    assert state.macd == pytest.approx(macd.iloc[-1])
+    assert state.macd_signal == pytest.approx(macd.ewm(span=9, adjust=False).mean().iloc[-1])
+
+
+def test_rsi_is_none_during_warm_up():
+    """No RSI until 14 price changes have been seen."""
+    state = IndicatorState.from_candles(SYMBOL.symbol_id, "hourly", _candles(_closes(14)))
+
+    assert state is not None
+    assert state.rsi is None
+
+
+def test_refresh_advances_stored_state_incrementally(sqlite_conn, monkeypatch):
+    """A second refresh reads only the new candles and matches a full rebuild."""
+    closes = _closes(120)
+    repo = HourlyCandleRepository(sqlite_conn)
+    repo.save_candles(SYMBOL, _candles(closes[:100]), source=SourceID.BINANCE.value)
+    first = refresh_indicator_state(sqlite_conn, SYMBOL, "hourly")
+    repo.save_candles(SYMBOL, _candles(closes)[100:], source=SourceID.BINANCE.value)
+
+    def fail(*args, **kwargs):
+        msg = "a matching stored state must not trigger a full rebuild"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(HourlyCandleRepository, "get_all_candles", fail)
+    second = refresh_indicator_state(sqlite_conn, SYMBOL, "hourly")
+
+    assert first is not None
+    assert first.candle_count == 100
+    assert second == IndicatorState.from_candles(SYMBOL.symbol_id, "hourly", _candles(closes))
+    assert get_indicator_state(sqlite_conn, SYMBOL.symbol_id, "hourly") == second
+
+
+def test_refresh_rebuilds_when_history_was_rewritten(sqlite_conn):
+    """A changed close of the last processed candle triggers a rebuild."""
+    closes = _closes(50)
+    repo = HourlyCandleRepository(sqlite_conn)
+    repo.save_candles(SYMBOL, _candles(closes), source=SourceID.BINANCE.value)
+    refresh_indicator_state(sqlite_conn, SYMBOL, "hourly")
+
+    closes[-1] *= 1.1
+    repo.save_candles(SYMBOL, _candles(closes)[-1:], source=SourceID.BINANCE.value)
+    state = refresh_indicator_state(sqlite_conn, SYMBOL, "hourly")
+
+    assert state == IndicatorState.from_candles(SYMBOL.symbol_id, "hourly", _candles(closes))
+
+
+def test_open_time_labelled_forming_candle_is_not_folded_in(sqlite_conn):
+    """KuCoin labels candles with their open time; today's candle is still forming."""
+    kucoin = Symbol(
+        symbol_id=2,
+        symbol_name="AKT",
+        full_name="Akash",
+        source_id=SourceID.KUCOIN,
+        coingecko_name="akash-network",
+    )
+    today = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    candles = [
+        Candle(
+            symbol="AKT",
+            source=SourceID.KUCOIN.value,
+            end_date=(today - timedelta(days=days_ago)).isoformat(),
+            open=1.0,
+            close=float(10 - days_ago),
+            high=1.0,
+            low=1.0,
+            last=1.0,
+            volume=1.0,
+            volume_quote=1.0,
+        )
+        for days_ago in (2, 1, 0)
+    ]
+    DailyCandleRepository(sqlite_conn).save_candles(kucoin, candles, source=SourceID.KUCOIN.value)
+
+    state = refresh_indicator_state(sqlite_conn, kucoin, "daily")
+
+    assert state is not None
+    assert (state.candle_count, state.last_close) == (2, 9.0)
+    assert state.last_candle_end == today - timedelta(days=1)
+
+
+def test_connect_creates_indicator_state_table_in_old_databases(tmp_path):
+    """Databases created before the state store get the IndicatorState table on connect."""
+    path = tmp_path / "old.db"
+    sqlite3.connect(path).close()
+
+    conn = connect_to_sql_sqlite(str(path))
+    try:
+        assert get_indicator_state(conn, SYMBOL.symbol_id, "hourly") is None
+        tables = {row[0] for row in conn._conn.execute("SELECT name FROM sqlite_master")}
+    finally:
+        conn.close()
+
+    assert "IndicatorState" in tables
+
+
+def test_live_state_adds_forming_candle_without_persisting(sqlite_conn):
+    """The window's candles after the stored one are folded in; nothing is saved."""
+    closes = _closes(60)
+    candles = _candles(closes)
+    stored = IndicatorState.from_candles(SYMBOL.symbol_id, "hourly", candles[:-1])
+    window = candles[-30:]
+
+    live = live_indicator_state(
+        {SYMBOL.symbol_id: stored},
+        SYMBOL,
+        [candle.end_date for candle in window],
+        [candle.close for candle in window],
+    )
+
+    assert live == IndicatorState.from_candles(SYMBOL.symbol_id, "hourly", candles)
+    assert get_indicator_state(sqlite_conn, SYMBOL.symbol_id, "hourly") is None
+    # A window that does not reach back to the stored candle is not trusted
+    assert (
+        live_indicator_state({SYMBOL.symbol_id: stored}, SYMBOL, [window[-1].end_date], [1.0])
+        is None
+    )
+    assert live_indicator_state(None, SYMBOL, [window[-1].end_date], [1.0]) is None
+
+
+def test_daily_reports_read_indicators_from_the_stored_state(sqlite_conn):
+    """RSI, EMAs and MACD equal the full-history values, not a recompute of the window."""
+    today = datetime.now(UTC).date()
+    closes = _closes(300)
+    DailyCandleRepository(sqlite_conn).save_candles(
+        SYMBOL,
+        _daily_candles(closes, today),
+        source=SourceID.BINANCE.value,
+    )
+    states = refresh_indicator_states(sqlite_conn, [SYMBOL], (TIMEFRAME_DAILY,))[TIMEFRAME_DAILY]
+    panel = CandlePanel.load(
+        sqlite_conn,
+        [SYMBOL],
+        [CandleRefreshRequest(TIMEFRAME_DAILY, today - timedelta(days=200), today)],
+    )
+    rsi_window = panel.daily(SYMBOL, today - timedelta(days=30), today)
+
+    create_rsi_table([(SYMBOL, rsi_window.to_candles())], sqlite_conn, today, states=states)
+    calculate_indicators([SYMBOL], sqlite_conn, today, panel=panel, states=states)
+    calculate_macd([SYMBOL], sqlite_conn, today, panel=panel, states=states)
+
+    # Today's candle is still forming, so it is not part of the stored state
+    assert states[SYMBOL.symbol_id].candle_count == len(closes) - 1
+    series = pd.Series(closes)
+    macd = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+    [rsi] = sqlite_conn.execute("SELECT RSI FROM RSI").fetchone()
+    ema50, ema200 = sqlite_conn.execute("SELECT EMA50, EMA200 FROM MovingAverages").fetchone()
+    saved_macd, signal = sqlite_conn.execute("SELECT MACD, Signal FROM MACD").fetchone()
+    assert rsi == pytest.approx(calculate_rsi_using_rma(series).iloc[-1])
+    assert ema50 == pytest.approx(series.ewm(span=50, adjust=False).mean().iloc[-1])
+    assert ema200 == pytest.approx(series.ewm(span=200, adjust=False).mean().iloc[-1])
+    assert saved_macd == pytest.approx(macd.iloc[-1])
+    assert signal == pytest.approx(macd.ewm(span=9, adjust=False).mean().iloc[-1])
+    # The 30-day window alone gives a different RSI
+    assert rsi != pytest.approx(calculate_rsi_using_rma(series[-31:]).iloc[-1])
@@ -0,0 +1,113 @@
+"""Tests for the incrementally maintained LatestIndicators table."""
+
+from datetime import UTC, date, datetime, time, timedelta
+
+from infra.sql_connection import SQLiteConnectionWrapper
+from shared_code.binance import OrderBookMetrics
+from technical_analysis.repositories.aggregated_repository import get_aggregated_data
+from technical_analysis.repositories.funding_rate_repository import FundingRateRepository
+from technical_analysis.repositories.latest_indicators_repository import (
+    LATEST_INDICATOR_DAYS,
+    rebuild_latest_indicators,
+)
+from technical_analysis.repositories.macd_repository import save_macd_results
+from technical_analysis.repositories.marketcap_repository import save_marketcap_results
+from technical_analysis.repositories.moving_averages_repository import (
+    save_moving_averages_results,
+)
+from technical_analysis.repositories.open_interest_repository import OpenInterestRepository
+from technical_analysis.repositories.order_book_repository import OrderBookRepository
+from technical_analysis.repositories.priceRangeRepository import save_price_range_results
+from technical_analysis.repositories.rsi_repository import save_rsi_results
+from technical_analysis.repositories.volume_repository import save_volume_results
+
+
+TODAY = datetime.now(UTC).date()
+
+
+def _save_daily_rsi(conn: SQLiteConnectionWrapper, symbol_id: int, day: date, close: float) -> None:
+    end_date = datetime.combine(day, time.max, tzinfo=UTC).isoformat()
+    cursor = conn._conn.execute(
+        "INSERT INTO DailyCandles (SymbolID, SourceID, Date, EndDate, Open, High, Low, "
+        "Close, Last, Volume, VolumeQuote) VALUES (?, 1, ?, ?, ?, ?, ?, ?, ?, 1, 1) "
+        "RETURNING Id",
+        (symbol_id, day.isoformat(), end_date, *(close,) * 5),
+    )
+    save_rsi_results(conn, cursor.fetchone()[0], close / 2)
+
+
+def _order_book(ratio: float) -> OrderBookMetrics:
+    return OrderBookMetrics(
+        symbol="BTC",
+        best_bid=1.0,
+        best_bid_qty=1.0,
+        best_ask=1.0,
+        best_ask_qty=1.0,
+        spread_pct=0.01,
+        bid_volume_2pct=10.0,
+        ask_volume_2pct=20.0,
+        bid_ask_ratio=ratio,
+        largest_bid_wall=5.0,
+        largest_bid_wall_price=1.0,
+        largest_ask_wall=6.0,
+        largest_ask_wall_price=1.0,
+        depth_levels={},
+        timestamp=datetime.now(UTC),
+    )
+
+
+def _save_history(conn: SQLiteConnectionWrapper, days: int) -> None:
+    for offset in range(days - 1, -1, -1):
+        day = TODAY - timedelta(days=offset)
+        _save_daily_rsi(conn, 1, day, 100.0 + offset)
+        save_moving_averages_results(conn, 1, 100.0 + offset, 1.0, 2.0, 3.0, 4.0, day)
+        save_macd_results(conn, 1, 100.0 + offset, 0.5, 0.25, 0.25, day)
+    save_price_range_results(conn, 1, 90.0, 110.0, 20.0)
+    save_volume_results(conn, [{"symbol_id": 1, "total": 1000.0}])
+    save_marketcap_results(conn, [{"symbol_id": 1, "market_cap": 5000.0}])
+    morning = datetime.combine(TODAY, time(8), tzinfo=UTC)
+    # Two intraday saves: the later one is the value of the day
+    for hour, value in ((0, 1.0), (4, 2.0)):
+        saved_at = morning + timedelta(hours=hour)
+        OpenInterestRepository(conn).save_open_interest(1, value, value * 10, saved_at)
+        FundingRateRepository(conn).save_funding_rate(1, value / 100, saved_at, saved_at)
+        OrderBookRepository(conn).save_order_book_metrics(1, _order_book(value), saved_at)
+
+
+def _latest_rows(conn: SQLiteConnectionWrapper) -> list[tuple]:
+    return conn._conn.execute(
+        "SELECT * FROM LatestIndicators ORDER BY SymbolID, IndicatorDate",
+    ).fetchall()
+
+
+def test_save_paths_keep_latest_values_of_recent_days(sqlite_conn):
+    """Each save path fills its columns; only the most recent days are kept."""
+    _save_history(sqlite_conn, days=10)
+
+    rows = get_aggregated_data(sqlite_conn)
+
+    assert len(rows) == LATEST_INDICATOR_DAYS
+    assert all(row["SymbolName"] == "BTC" for row in rows)
+    latest, oldest = rows[0], rows[-1]
+    assert latest["IndicatorDate"] == TODAY
+    assert oldest["IndicatorDate"] == TODAY - timedelta(days=LATEST_INDICATOR_DAYS - 1)
+    assert (latest["RSIClosePrice"], latest["RSI"]) == (100.0, 50.0)
+    assert (oldest["RSIClosePrice"], oldest["MACurrentPrice"]) == (106.0, 106.0)
+    assert (latest["MA50"], latest["EMA200"], latest["MACDSignal"]) == (1.0, 4.0, 0.25)
+    assert (latest["RangePercent"], latest["Volume"], latest["MarketCap"]) == (20.0, 1000.0, 5000.0)
+    assert (latest["OpenInterest"], latest["FundingRate"], latest["BidAskRatio"]) == (
+        2.0,
+        0.02,
+        2.0,
+    )
+    assert oldest["Volume"] is None
+
+
+def test_rebuild_matches_incremental_updates(sqlite_conn):
+    """Filling the table from history gives the rows the save paths maintained."""
+    _save_history(sqlite_conn, days=10)
+    incremental = _latest_rows(sqlite_conn)
+
+    rebuild_latest_indicators(sqlite_conn._conn.cursor())
+
+    assert _latest_rows(sqlite_conn) == incremental
@@ -0,0 +1,127 @@
+"""Tests for the compressed order book snapshot archive."""
+
+import sqlite3
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from infra.sql_connection import connect_to_sql_sqlite
+from shared_code.binance import OrderBookMetrics
+from shared_code.order_book_codec import decode_order_book, encode_order_book
+from shared_code.order_book_depth import OrderBookDepth
+from source_repository import SourceID, Symbol
+from technical_analysis import order_book_report
+from technical_analysis.order_book_report import fetch_order_book_report, get_depth_band_history
+from technical_analysis.repositories.order_book_snapshot_repository import (
+    OrderBookSnapshotRepository,
+)
+
+
+BTC = Symbol(
+    symbol_id=1,
+    symbol_name="BTC",
+    full_name="Bitcoin",
+    source_id=SourceID.BINANCE,
+    coingecko_name="bitcoin",
+)
+
+
+def _book(levels: int = 500, seed: int = 3) -> OrderBookDepth:
+    """A BTC-like book on a 0.1 tick grid."""
+    rng = np.random.default_rng(seed)
+    bid_prices = 65000.0 - 0.1 * np.cumsum(rng.integers(1, 30, levels))
+    ask_prices = 65000.1 + 0.1 * np.cumsum(rng.integers(0, 30, levels))
+    bid_qty, ask_qty = np.round(rng.lognormal(-2, 1.5, (2, levels)), 5)
+    return OrderBookDepth.from_levels(
+        np.column_stack((np.round(bid_prices, 1), bid_qty)),
+        np.column_stack((np.round(ask_prices, 1), ask_qty)),
+    )
+
+
+def test_snapshot_round_trips_top_levels_compactly():
+    """Prices come back exactly, quantities at float32 precision, in ~1 KB for top 100."""
+    book = _book()
+    blob = encode_order_book(book, levels=100)
+    decoded = decode_order_book(blob)
+
+    np.testing.assert_array_equal(decoded.bids.prices, book.bids.prices[:100])
+    np.testing.assert_array_equal(decoded.asks.prices, book.asks.prices[:100])
+    np.testing.assert_allclose(decoded.asks.quantities, book.asks.quantities[:100], rtol=1e-6)
+    assert decoded.depth(0.1) == pytest.approx(book.depth(0.1), rel=1e-6)
+    # Hourly snapshots for a month stay around 1 MB per symbol
+    assert len(blob) * 24 * 31 < 2_000_000
+
+
+def test_archive_streams_snapshots_back_for_band_analytics(sqlite_conn, monkeypatch):
+    """Saved snapshots are read back in time order and re-analysed with new bands."""
+    monkeypatch.setattr(
+        "technical_analysis.repositories.order_book_snapshot_repository.FETCH_BATCH_SIZE",
+        2,
+    )
+    repo = OrderBookSnapshotRepository(sqlite_conn)
+    now = datetime.now(UTC).replace(microsecond=0)
+    for hours_ago, seed in ((2, 1), (0, 3), (1, 2), (24 * 40, 4)):
+        repo.save_snapshot(1, _book(seed=seed), now - timedelta(hours=hours_ago), levels=50)
+
+    history = get_depth_band_history(sqlite_conn, BTC, days=30, bands_pct=(0.01, 0.05))
+
+    assert [entry["snapshot_time"] for entry in history] == [
+        now - timedelta(hours=2),
+        now - timedelta(hours=1),
+        now,
+    ]
+    expected = _book(seed=3).top(50)
+    assert history[-1]["depth_levels"]["0.05%"]["bid"] == pytest.approx(
+        expected.depth(0.05)[0],
+        rel=1e-6,
+    )
+    assert history[-1]["mid_price"] == expected.mid_price
+
+
+def test_connect_creates_snapshot_table_in_old_databases(tmp_path):
+    """Databases created before the archive get the OrderBookSnapshots table on connect."""
+    path = tmp_path / "old.db"
+    sqlite3.connect(path).close()
+
+    conn = connect_to_sql_sqlite(str(path))
+    try:
+        tables = {row[0] for row in conn._conn.execute("SELECT name FROM sqlite_master")}
+    finally:
+        conn.close()
+
+    assert "OrderBookSnapshots" in tables
+
+
+def test_failed_archive_keeps_order_book_metrics(sqlite_conn, monkeypatch):
+    """Archiving is best effort: the metrics row and the report row survive a failure."""
+    book = _book()
+    metrics = OrderBookMetrics(
+        symbol="BTC",
+        best_bid=book.best_bid,
+        best_bid_qty=1.0,
+        best_ask=book.best_ask,
+        best_ask_qty=1.0,
+        spread_pct=0.01,
+        bid_volume_2pct=10.0,
+        ask_volume_2pct=20.0,
+        bid_ask_ratio=0.5,
+        largest_bid_wall=5.0,
+        largest_bid_wall_price=1.0,
+        largest_ask_wall=6.0,
+        largest_ask_wall_price=1.0,
+        depth_levels={},
+        timestamp=datetime.now(UTC),
+        book=book,
+    )
+    monkeypatch.setattr(
+        order_book_report,
+        "fetch_binance_order_books",
+        lambda symbols, limit: [(symbol, metrics, None) for symbol in symbols],  # noqa: ARG005
+    )
+    sqlite_conn._conn.execute("DROP TABLE OrderBookSnapshots")
+
+    table = fetch_order_book_report([BTC], sqlite_conn)
+
+    assert len(table.rows) == 1
+    assert sqlite_conn._conn.execute("SELECT COUNT(*) FROM OrderBookMetrics").fetchone()[0] == 1
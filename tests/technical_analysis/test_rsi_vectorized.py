@@ -0,0 +1,70 @@
+"""Parity tests for the vectorized Wilder RSI kernel."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from technical_analysis.rsi import calculate_rsi_using_rma, wilder_rsi
+
+
+def _reference_rsi(series: pd.Series, periods: int = 14) -> pd.Series:
+    """Original loop-based Wilder RSI, kept as the parity reference."""
+    delta = series.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    avg_gain = pd.Series(index=gain.index, dtype=float)
+    avg_loss = pd.Series(index=loss.index, dtype=float)
+    if len(series) <= periods:
+        return pd.Series([float("nan")] * len(series), index=series.index)
+    avg_gain.iloc[periods] = gain.iloc[1 : periods + 1].mean()
+    avg_loss.iloc[periods] = loss.iloc[1 : periods + 1].mean()
+    for i in range(periods + 1, len(series)):
+        avg_gain.iloc[i] = (avg_gain.iloc[i - 1] * (periods - 1) + gain.iloc[i]) / periods
+        avg_loss.iloc[i] = (avg_loss.iloc[i - 1] * (periods - 1) + loss.iloc[i]) / periods
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def _random_walk(length: int, seed: int) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, length))))
+
+
+@pytest.mark.parametrize(
+    "length,periods",
+    ((3000, 14), (40, 14), (15, 14), (14, 14), (500, 2), (200, 1), (2500, 50)),
+)
+def test_matches_loop_implementation(length, periods):
+    """The vectorized kernel reproduces the original loop, including the NaN warm-up."""
+    prices = _random_walk(length, seed=length + periods)
+
+    expected = _reference_rsi(prices, periods)
+    actual = calculate_rsi_using_rma(prices, periods)
+
+    pd.testing.assert_index_equal(actual.index, prices.index)
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-10, atol=1e-10)
+
+
+def test_matches_loop_on_flat_and_one_sided_prices():
+    """Division edge cases (no losses, no moves) match: 100 and NaN."""
+    prices = pd.Series([1.0] * 10 + [float(i) for i in range(2, 30)] + [29.0] * 20)
+
+    np.testing.assert_allclose(
+        calculate_rsi_using_rma(prices).to_numpy(),
+        _reference_rsi(prices).to_numpy(),
+        rtol=1e-10,
+    )
+
+
+def test_two_dimensional_input_matches_per_row_results():
+    """Symbols x time input gives each row's 1-D result; leading NaNs pad short rows."""
+    long_history = _random_walk(300, seed=1).to_numpy()
+    short_history = _random_walk(120, seed=2).to_numpy()
+    padded = np.concatenate([np.full(180, np.nan), short_history])
+
+    result = wilder_rsi(np.vstack([long_history, padded]))
+
+    assert result.shape == (2, 300)
+    np.testing.assert_allclose(result[0], wilder_rsi(long_history), rtol=1e-12)
+    np.testing.assert_allclose(result[1, 180:], wilder_rsi(short_history), rtol=1e-12)
+    assert np.isnan(result[1, :194]).all()